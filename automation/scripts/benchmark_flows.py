@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Benchmark deploy, validation, layout, status and purge on synthetic flows.
+
+By default each size runs against an in-process FakeNiFi with a fixed per-request
+latency, so results compare request counts and client-side overhead run to run.
+``--live`` targets the NiFi configured in the environment instead; the root
+process group is purged before and after every size.
+
+    python scripts/benchmark_flows.py --sizes 10,100,1000 --output build/bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import math
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from nifi_automation.app.client import open_client
+from nifi_automation.app.models import AppConfig
+from nifi_automation.app.status_rules import rollup_connections, rollup_controllers, rollup_flow, rollup_processors
+from nifi_automation.auth import get_access_token
+from nifi_automation.client import NiFiClient
+from nifi_automation.flow_builder import FlowDeployer, load_flow_spec
+from nifi_automation.infra import purge_adapter, status_adapter
+from nifi_automation.infra.diag_adapter import validate_topology_against_spec
+from nifi_automation.infra.layout_checker import check_layout
+from nifi_automation.instrumentation import profiling
+from nifi_automation.testing import FakeNiFi, FakeNiFiConfig, write_synthetic_flow
+
+DEFAULT_SIZES = (10, 100, 1000)
+STAGES = ("deploy", "snapshot", "validate", "layout", "status", "purge")
+
+
+def default_depth(processors: int) -> int:
+    """Nest larger flows deeper: 10 -> 1 level, 100 -> 2, 1000 -> 3."""
+
+    return max(1, round(math.log10(processors)))
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _status_rollup(client: NiFiClient) -> Dict[str, Any]:
+    snapshot = status_adapter.capture_status(client)
+    processors = rollup_processors(status_adapter.fetch_processors(client, snapshot=snapshot)["items"])
+    controllers = rollup_controllers(status_adapter.fetch_controllers(client)["items"])
+    connections = rollup_connections(status_adapter.fetch_connections(client, snapshot=snapshot)["items"])
+    status, _ = rollup_flow(processors, controllers)
+    return {"status": status, "processors": processors.counts, "connections": connections.counts}
+
+
+def _timed(name: str, action: Callable[[], Any], top: int) -> Dict[str, Any]:
+    with profiling() as profiler:
+        started = time.perf_counter()
+        action()
+        seconds = time.perf_counter() - started
+    profile = profiler.as_dict()
+    endpoints = sorted(profile["endpoints"].items(), key=lambda item: item[1]["count"], reverse=True)
+    return {
+        "stage": name,
+        "seconds": round(seconds, 4),
+        "requests": profile["requests"],
+        "retries": profile["retries"],
+        "conflicts": profile["conflicts"],
+        "bytes": profile["bytes"],
+        "top_endpoints": {key: stats["count"] for key, stats in endpoints[:top]},
+    }
+
+
+def run_size(client: NiFiClient, flow_path: Path, *, top: int = 5) -> Dict[str, Any]:
+    """Run every stage once against ``client`` for the flow at ``flow_path``."""
+
+    spec = load_flow_spec(flow_path)
+    results: Dict[str, Dict[str, Any]] = {}
+    snapshot: Dict[str, Any] = {}
+
+    def capture() -> None:
+        snapshot["value"] = status_adapter.capture_snapshot(client)
+
+    actions: Dict[str, Callable[[], Any]] = {
+        "deploy": lambda: FlowDeployer(client, spec).deploy(),
+        "snapshot": capture,
+        "validate": lambda: validate_topology_against_spec(client, spec, snapshot=snapshot["value"]),
+        "layout": lambda: check_layout(client, snapshot=snapshot["value"]),
+        "status": lambda: _status_rollup(client),
+        "purge": lambda: purge_adapter.graceful_purge(client),
+    }
+    for name in STAGES:
+        results[name] = _timed(name, actions[name], top)
+    return results
+
+
+@contextlib.contextmanager
+def _fake_client(latency: float) -> Iterator[NiFiClient]:
+    with FakeNiFi(FakeNiFiConfig(latency=latency)) as nifi:
+        settings = nifi.settings()
+        with NiFiClient(settings, get_access_token(settings)) as client:
+            yield client
+
+
+@contextlib.contextmanager
+def _live_client(timeout: float) -> Iterator[NiFiClient]:
+    cfg = AppConfig(
+        base_url=None, username=None, password=None, token=None,
+        timeout_seconds=timeout, output="json", verbose=False, dry_run=False,
+    )
+    with open_client(cfg) as client:
+        purge_adapter.graceful_purge(client)
+        yield client
+
+
+def run_benchmarks(
+    sizes: List[int],
+    *,
+    depth: Optional[int] = None,
+    latency: float = 0.002,
+    live: bool = False,
+    timeout: float = 120.0,
+    workdir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Run every size and return the results document written by ``--output``."""
+
+    runs: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(workdir or tmp)
+        for size in sizes:
+            levels = depth or default_depth(size)
+            flow_path = write_synthetic_flow(base / f"synthetic-{size}.yaml", size, depth=levels)
+            client_cm = _live_client(timeout) if live else _fake_client(latency)
+            with client_cm as client:
+                stages = run_size(client, flow_path)
+            runs.append(
+                {
+                    "processors": size,
+                    "depth": levels,
+                    "wall_seconds": round(sum(stage["seconds"] for stage in stages.values()), 4),
+                    "requests": sum(stage["requests"] for stage in stages.values()),
+                    "stages": stages,
+                }
+            )
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "target": "live" if live else "fake",
+        "latency_seconds": None if live else latency,
+        "runs": runs,
+    }
+
+
+def _print_table(document: Dict[str, Any]) -> None:
+    print(f"{'procs':>6} {'depth':>5} {'stage':<9} {'seconds':>9} {'requests':>9} {'retries':>8}", file=sys.stderr)
+    for run in document["runs"]:
+        for name, stage in run["stages"].items():
+            print(
+                f"{run['processors']:>6} {run['depth']:>5} {name:<9} {stage['seconds']:>9.3f} "
+                f"{stage['requests']:>9} {stage['retries']:>8}",
+                file=sys.stderr,
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Benchmark flow deploy/validate/status/purge on synthetic flows")
+    ap.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="Comma-separated processor counts")
+    ap.add_argument("--depth", type=int, default=None, help="Group nesting depth (default grows with size)")
+    ap.add_argument("--latency", type=float, default=0.002, help="FakeNiFi per-request latency in seconds")
+    ap.add_argument("--live", action="store_true", help="Run against the configured NiFi (purges the root group)")
+    ap.add_argument("--timeout", type=float, default=120.0, help="HTTP timeout for --live")
+    ap.add_argument("--output", type=Path, default=None, help="Write results JSON here (default: stdout)")
+    args = ap.parse_args(argv)
+
+    sizes = [int(part) for part in args.sizes.split(",") if part.strip()]
+    document = run_benchmarks(sizes, depth=args.depth, latency=args.latency, live=args.live, timeout=args.timeout)
+    _print_table(document)
+    payload = json.dumps(document, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
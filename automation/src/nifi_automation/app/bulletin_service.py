@@ -1,15 +1,23 @@
 """Bulletin inspection service for CLI.
 
-Provides a simple one-shot summary of recent NiFi bulletins so operators can
-triage runtime errors without blocking deploys.
+``inspect bulletins`` gives a one-shot summary of recent NiFi bulletins so
+operators can triage runtime errors without blocking deploys. ``tail bulletins``
+reads only what is new since the previous run, using a cursor stored on disk,
+and folds repeats into counted groups. With ``--follow`` it keeps polling and
+streams the groups as NDJSON events.
 """
 
 from __future__ import annotations
 
-from typing import Dict, List
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
 
+from ..bulletin_tail import BulletinCursor, TailResult, dedupe, tail_bulletins
 from .client import open_client
 from .models import AppConfig, CommandResult
+from .polling import Backoff
 
 
 SEVERITY_ORDER = {"ERROR": 3, "WARN": 2, "WARNING": 2, "INFO": 1}
@@ -49,3 +57,102 @@ def inspect(*, config: AppConfig) -> CommandResult:
     summary = _summarize(payload, min_severity)
     return CommandResult(message="Recent bulletins", data=summary)
 
+
+
+Emit = Callable[[Dict[str, Any]], None]
+
+# Quiet polls stretch the follow interval by this factor up to --max-interval
+QUIET_FACTOR = 1.5
+
+
+def _log(config: AppConfig, message: str) -> None:
+    if config.verbose:
+        print(message, file=sys.stderr)
+
+
+def _timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _at_least(items: List[Dict[str, Any]], min_sev: str) -> List[Dict[str, Any]]:
+    min_score = SEVERITY_ORDER.get(min_sev.upper(), 1)
+    return [it for it in items if SEVERITY_ORDER.get(str(it.get("level", "INFO")), 1) >= min_score]
+
+
+def _read(client, store: Optional[BulletinCursor], after: Optional[int]) -> TailResult:
+    result = tail_bulletins(client, after=after)
+    if store is not None and result.cursor != (after or 0):
+        store.put(client.settings, result.cursor)
+    return result
+
+
+def _follow(client, config: AppConfig, store: Optional[BulletinCursor], after: Optional[int], emit: Emit) -> Dict[str, Any]:
+    backoff = Backoff(
+        initial=config.watch_interval,
+        factor=QUIET_FACTOR,
+        maximum=max(config.watch_interval, config.watch_max_interval),
+        jitter=0.0,
+    )
+    started = time.monotonic()
+    deadline = started + config.run_duration if config.run_duration is not None else None
+    polls = total = 0
+    reason = "duration"
+    delays = backoff.delays()
+    try:
+        while True:
+            result = _read(client, store, after)
+            after = result.cursor
+            polls += 1
+            if result.skipped:
+                emit({"ts": _timestamp(), "event": "skipped", "count": result.skipped, "cursor": result.cursor})
+            groups = dedupe(_at_least(result.items, config.bulletin_severity))
+            for group in groups:
+                emit({"ts": _timestamp(), "event": "bulletin", **group})
+            total += sum(group["count"] for group in groups)
+            if result.items:
+                # Bulletins are arriving; go back to the fastest interval
+                delays = backoff.delays()
+            delay = next(delays)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                delay = min(delay, remaining)
+            time.sleep(delay)
+    except KeyboardInterrupt:
+        reason = "interrupted"
+    end = {
+        "event": "end",
+        "reason": reason,
+        "polls": polls,
+        "bulletins": total,
+        "cursor": after,
+        "elapsed": round(time.monotonic() - started, 3),
+    }
+    emit({"ts": _timestamp(), **end})
+    return end
+
+
+def tail(*, config: AppConfig, emit: Emit) -> CommandResult:
+    """Bulletins newer than the stored cursor, grouped by source and message fingerprint."""
+
+    with open_client(config) as client:
+        store = BulletinCursor.from_settings(client.settings)
+        after = store.get(client.settings) if store is not None else None
+        _log(config, f"[bulletins] reading after id {after}" if after is not None else "[bulletins] no cursor; reading the newest bulletins")
+        if config.bulletin_follow:
+            end = _follow(client, config, store, after, emit)
+            return CommandResult(message=f"Followed bulletins for {end['polls']} polls", data=end)
+        result = _read(client, store, after)
+    items = _at_least(result.items, config.bulletin_severity)
+    groups = dedupe(items)
+    return CommandResult(
+        message=f"{len(items)} new bulletins in {len(groups)} groups" if items else "No new bulletins",
+        data={
+            "after": result.after,
+            "cursor": result.cursor,
+            "skipped": result.skipped,
+            "total": len(items),
+            "groups": groups,
+        },
+    )
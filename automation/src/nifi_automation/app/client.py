@@ -8,8 +8,9 @@ from typing import Iterator
 
 import httpx
 
-from ..auth import AuthenticationError, obtain_access_token
+from ..auth import AuthenticationError, get_access_token
 from ..config import build_settings
+from ..token_cache import TokenCache
 from ..infra.nifi_client import NiFiClient
 from .errors import HTTPError
 from .models import AppConfig
@@ -35,8 +36,8 @@ def open_client(config: AppConfig) -> Iterator[NiFiClient]:
     token = config.token
     try:
         if not token:
-            _log(config, "[client] requesting access token")
-            token = obtain_access_token(settings)
+            _log(config, "[client] requesting access token (cached when still valid)")
+            token = get_access_token(settings, cache=TokenCache.from_settings(settings))
         else:
             _log(config, "[client] using provided access token")
     except AuthenticationError as exc:  # pragma: no cover - network dependent
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import sys
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from ..infra import purge_adapter, status_adapter
+from ..queue_history import QueueHistory, QueueRecorder
 from .client import open_client
 from .models import AppConfig, CommandResult, ExitCode
 from .status_rules import rollup_connections
@@ -27,24 +28,57 @@ def truncate_all(*, config: AppConfig, force: bool = False, max_messages: Option
     )
 
 
+def _record(client, config: AppConfig, connections: List[Dict[str, Any]]) -> QueueRecorder:
+    """Add this sample to the persisted queue history and return the updated recorder."""
+
+    history = QueueHistory.from_settings(client.settings)
+    if history is None:
+        recorder = QueueRecorder()
+        recorder.record(connections)
+        return recorder
+    recorder = history.load()
+    recorder.record(connections)
+    history.save(recorder)
+    _log(config, f"[conn] queue history for {len(recorder.rings)} connections in {history.path}")
+    return recorder
+
+
+def _predicted_message(predicted: List[Dict[str, Any]], horizon: float) -> Optional[str]:
+    if not predicted:
+        return None
+    return f"{len(predicted)} connections predicted to hit back-pressure within {horizon:g}s"
+
+
 def status(*, config: AppConfig) -> CommandResult:
     with open_client(config) as client:
         _log(config, "[conn] collecting connection status")
         connections = status_adapter.fetch_connections(client)["items"]
+        recorder = _record(client, config, connections)
     rollup = rollup_connections(connections)
+    predicted = recorder.at_risk(connections, config.backpressure_horizon)
     exit_code = ExitCode.VALIDATION if rollup.worst == "BLOCKED" else ExitCode.SUCCESS
     return CommandResult(
         exit_code=exit_code,
         status_token=rollup.worst,
-        data={"counts": rollup.counts, "worst": rollup.worst},
+        message=_predicted_message(predicted, config.backpressure_horizon),
+        data={"counts": rollup.counts, "worst": rollup.worst, "predicted": predicted},
     )
 
 
 def inspect(*, config: AppConfig) -> CommandResult:
     with open_client(config) as client:
         connections = status_adapter.fetch_connections(client)["items"]
-    blocked = [item for item in connections if item.get("queuedCount", 0) or item.get("percentUseCount", 0)]
+        recorder = _record(client, config, connections)
+    predicted = recorder.at_risk(connections, config.backpressure_horizon)
+    at_risk = {entry["id"] for entry in predicted}
+    blocked = [
+        {**item, **recorder.forecast(item)}
+        for item in connections
+        if item.get("queuedCount", 0) or item.get("percentUseCount", 0) or item.get("id") in at_risk
+    ]
+    message = f"Found {len(blocked)} connections with queued data" if blocked else "All connections empty"
+    warning = _predicted_message(predicted, config.backpressure_horizon)
     return CommandResult(
-        message=f"Found {len(blocked)} connections with queued data" if blocked else "All connections empty",
-        data={"items": blocked},
+        message=f"{message}; {warning}" if warning else message,
+        data={"items": blocked, "predicted": predicted},
     )
@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
-import time
 from pathlib import Path
 import sys
 
+from ..bulletin_tail import latest_bulletin_id, tail_bulletins
 from ..infra import ctrl_adapter, deploy_adapter, diag_adapter, purge_adapter, status_adapter
+from ..instrumentation import phase
 from .client import open_client
 from .errors import TimeoutError, ValidationError
 from .models import AppConfig, CommandResult, ExitCode
+from .polling import Backoff, wait_until
 from .status_rules import rollup_controllers, rollup_flow, rollup_processors, rollup_connections
 
-POLL_INTERVAL = 0.5
+# Each probe is a recursive status fetch plus a controller listing, so start a little slower
+STABLE_BACKOFF = Backoff(initial=0.05, maximum=2.0)
 
 
 def _log(config: AppConfig, message: str) -> None:
@@ -21,26 +24,30 @@ def _log(config: AppConfig, message: str) -> None:
 
 
 def _await_stable_states(config: AppConfig, client) -> None:
-    deadline = time.time() + config.timeout_seconds
-    while True:
-        processors = status_adapter.fetch_processors(client)["items"]
+    def probe() -> bool:
+        processors = status_adapter.fetch_processors(client, snapshot=status_adapter.capture_status(client))["items"]
         controllers = status_adapter.fetch_controllers(client)["items"]
         proc_roll = rollup_processors(processors)
         ctrl_roll = rollup_controllers(controllers)
         if proc_roll.has_invalid or ctrl_roll.has_invalid:
             details = diag_adapter.gather_validation_details(client)
             raise ValidationError("Invalid components detected", details=details)
-        if not proc_roll.has_transitional and not ctrl_roll.has_transitional:
-            return
-        if time.time() > deadline:
-            raise TimeoutError("Components did not settle into a stable state before timeout")
-        time.sleep(POLL_INTERVAL)
+        return not proc_roll.has_transitional and not ctrl_roll.has_transitional
+
+    wait_until(
+        probe,
+        timeout=config.timeout_seconds,
+        label="components stable",
+        backoff=STABLE_BACKOFF,
+        on_timeout=lambda _: TimeoutError("Components did not settle into a stable state before timeout"),
+    )
 
 
-def _collect_flow_status(client):
-    processors = status_adapter.fetch_processors(client)["items"]
+def _collect_flow_status(client, snapshot=None):
+    snapshot = snapshot or status_adapter.capture_status(client)
+    processors = status_adapter.fetch_processors(client, snapshot=snapshot)["items"]
     controllers = status_adapter.fetch_controllers(client)["items"]
-    ports = status_adapter.fetch_ports(client)["items"]
+    ports = status_adapter.fetch_ports(client, snapshot=snapshot)["items"]
     proc_roll = rollup_processors(processors)
     ctrl_roll = rollup_controllers(controllers)
     # Ports are reported separately; for now do not gate flow status on them.
@@ -52,35 +59,56 @@ def _collect_flow_status(client):
     return status, proc_roll, ctrl_roll, details
 
 
+def _deploy(config: AppConfig, client, flowfile: Path):
+    """Purge and redeploy, or with ``--incremental`` apply only the diff against the live flow.
+
+    ``--resume`` skips the purge and continues an interrupted deploy from its journal.
+    """
+
+    if not (config.incremental or config.resume):
+        _log(config, "[flow] purging NiFi root before deployment")
+        with phase("purge"):
+            purge_adapter.graceful_purge(client)
+    mode = " incrementally" if config.incremental else " (resuming)" if config.resume else ""
+    _log(config, "[flow] deploying flow specification" + mode)
+    with phase("deploy"):
+        return deploy_adapter.deploy_flow(
+            client, flowfile, dry_run=False, incremental=config.incremental, resume=config.resume
+        )
+
+
+def _dry_run(config: AppConfig, client, flowfile: Path, *, start: bool = False) -> CommandResult:
+    _log(config, "[flow] generating dry-run deployment plan")
+    result = deploy_adapter.deploy_flow(
+        client, flowfile, dry_run=True, incremental=config.incremental, start=start
+    )
+    return CommandResult(message="Dry-run deployment plan", data=result["summary"])
+
+
 def run_flow(*, config: AppConfig, flowfile: Path) -> CommandResult:
     if config.dry_run:
         with open_client(config) as client:
-            _log(config, "[flow] generating dry-run deployment plan")
-            result = deploy_adapter.deploy_flow(client, flowfile, dry_run=True)
-        return CommandResult(message="Dry-run deployment plan", data=result["summary"])
+            return _dry_run(config, client, flowfile, start=True)
 
     with open_client(config) as client:
         try:
             # Baseline last bulletin id to filter runtime errors for this session
             baseline_last_id = 0
             try:
-                payload = client.get_bulletins(limit=100, after=None)
-                if payload:
-                    baseline_last_id = max(int(it.get("id", 0)) for it in payload if isinstance(it.get("id"), int) or str(it.get("id")).isdigit())
+                baseline_last_id = latest_bulletin_id(client)
             except Exception:
                 baseline_last_id = 0
-            _log(config, "[flow] purging NiFi root before deployment")
-            purge_adapter.graceful_purge(client)
-            _log(config, "[flow] deploying flow specification")
-            deploy_result = deploy_adapter.deploy_flow(client, flowfile, dry_run=False)
+            deploy_result = _deploy(config, client, flowfile)
             _log(config, "[flow] validating deployed topology against spec")
-            topo = diag_adapter.validate_deployed_topology(client, flowfile)
-            if not topo.get("ok", False):
-                raise ValidationError("Topology validation failed (missing processors or count mismatch)", details={"topology": topo})
-            # Layout validation: attach report and fail when overlaps exist
-            from ..infra.layout_checker import check_layout as _check_layout
+            with phase("validate"):
+                deployed = status_adapter.capture_snapshot(client)
+                topo = diag_adapter.validate_deployed_topology(client, flowfile, snapshot=deployed)
+                if not topo.get("ok", False):
+                    raise ValidationError("Topology validation failed (missing processors or count mismatch)", details={"topology": topo})
+                # Layout validation: attach report and fail when overlaps exist
+                from ..infra.layout_checker import check_layout as _check_layout
 
-            layout = _check_layout(client)
+                layout = _check_layout(client, snapshot=deployed)
             if layout.get("overlaps"):
                 return CommandResult(
                     exit_code=ExitCode.VALIDATION,
@@ -90,19 +118,24 @@ def run_flow(*, config: AppConfig, flowfile: Path) -> CommandResult:
                 )
 
             _log(config, "[flow] waiting for deployed components to stabilize")
-            _await_stable_states(config, client)
+            with phase("settle"):
+                _await_stable_states(config, client)
             # Pre-emptively stop Tools_* HTTP listeners to free ports used by workflows
             ctrl_adapter.stop_tools_http_listeners(client)
             _log(config, "[flow] enabling controller services")
-            ctrl_adapter.enable_all_controllers(client, timeout=config.timeout_seconds)
+            with phase("enable"):
+                ctrl_adapter.enable_all_controllers(client, timeout=config.timeout_seconds)
             _log(config, "[flow] starting processors")
-            ctrl_adapter.start_all_processors(client, timeout=config.timeout_seconds)
-            # Immediately stop Tools_* HTTP listeners to avoid port conflicts with workflow listeners
-            ctrl_adapter.stop_tools_http_listeners(client)
-            _await_stable_states(config, client)
-            status_token, proc_roll, ctrl_roll, details = _collect_flow_status(client)
+            with phase("start"):
+                ctrl_adapter.start_all_processors(client, timeout=config.timeout_seconds)
+                # Immediately stop Tools_* HTTP listeners to avoid port conflicts with workflow listeners
+                ctrl_adapter.stop_tools_http_listeners(client)
+            with phase("settle"):
+                _await_stable_states(config, client)
+            snapshot = status_adapter.capture_status(client)
+            status_token, proc_roll, ctrl_roll, details = _collect_flow_status(client, snapshot)
             # Include connections rollup and elevate status if backpressure is hit
-            connections = status_adapter.fetch_connections(client)["items"]
+            connections = status_adapter.fetch_connections(client, snapshot=snapshot)["items"]
             conn_roll = rollup_connections(connections)
             details["connections"] = {"counts": conn_roll.counts, "worst": conn_roll.worst}
             if conn_roll.worst == "BLOCKED":
@@ -112,8 +145,9 @@ def run_flow(*, config: AppConfig, flowfile: Path) -> CommandResult:
                 status_token = "INVALID"
             # Check for runtime ERROR bulletins emitted after baseline and flag as invalid
             try:
-                bulletins = client.get_bulletins(limit=200, after=None)
-                new_errors = [b for b in bulletins if (b.get("level") == "ERROR" and int(b.get("id", 0)) > baseline_last_id)]
+                # Only bulletins newer than the baseline cross the wire
+                bulletins = tail_bulletins(client, after=baseline_last_id).items
+                new_errors = [b for b in bulletins if b.get("level") == "ERROR"]
                 if new_errors:
                     details = details or {}
                     details["bulletins"] = {"errors": new_errors}
@@ -154,15 +188,12 @@ def run_flow(*, config: AppConfig, flowfile: Path) -> CommandResult:
 def deploy_flow(*, config: AppConfig, flowfile: Path) -> CommandResult:
     with open_client(config) as client:
         if config.dry_run:
-            _log(config, "[flow] generating dry-run deployment plan")
-            result = deploy_adapter.deploy_flow(client, flowfile, dry_run=True)
-            return CommandResult(message="Dry-run deployment plan", data=result["summary"])
-        _log(config, "[flow] purging NiFi root before deployment")
-        purge_adapter.graceful_purge(client)
-        _log(config, "[flow] deploying flow specification")
-        result = deploy_adapter.deploy_flow(client, flowfile, dry_run=False)
+            return _dry_run(config, client, flowfile)
+        result = _deploy(config, client, flowfile)
         from ..infra.layout_checker import check_layout as _check_layout
-        layout = _check_layout(client)
+        with phase("validate"):
+            deployed = status_adapter.capture_snapshot(client)
+            layout = _check_layout(client, snapshot=deployed)
         if layout.get("overlaps"):
             return CommandResult(
                 exit_code=ExitCode.VALIDATION,
@@ -174,11 +205,12 @@ def deploy_flow(*, config: AppConfig, flowfile: Path) -> CommandResult:
                 details={"layout": layout},
             )
         _log(config, "[flow] validating deployed topology against spec")
-        topo = diag_adapter.validate_deployed_topology(client, flowfile)
+        with phase("validate"):
+            topo = diag_adapter.validate_deployed_topology(client, flowfile, snapshot=deployed)
         if not topo.get("ok", False):
             raise ValidationError("Topology validation failed (missing processors or count mismatch)", details={"topology": topo})
-        status_token, proc_roll, ctrl_roll, details = _collect_flow_status(client)
-        connections = status_adapter.fetch_connections(client)["items"]
+        status_token, proc_roll, ctrl_roll, details = _collect_flow_status(client, deployed)
+        connections = status_adapter.fetch_connections(client, snapshot=deployed)["items"]
         conn_roll = rollup_connections(connections)
         details["connections"] = {"counts": conn_roll.counts, "worst": conn_roll.worst}
         if conn_roll.worst == "BLOCKED":
@@ -193,6 +225,7 @@ def deploy_flow(*, config: AppConfig, flowfile: Path) -> CommandResult:
             "status": status_token,
             "processors": proc_roll.counts,
             "controllers": ctrl_roll.counts,
+            **({"changes": result["changes"]} if "changes" in result else {}),
         },
         details=details if exit_code != ExitCode.SUCCESS else {},
     )
@@ -203,30 +236,33 @@ def up_flow(*, config: AppConfig) -> CommandResult:
         try:
             baseline_last_id = 0
             try:
-                payload = client.get_bulletins(limit=100, after=None)
-                if payload:
-                    baseline_last_id = max(int(it.get("id", 0)) for it in payload if isinstance(it.get("id"), int) or str(it.get("id")).isdigit())
+                baseline_last_id = latest_bulletin_id(client)
             except Exception:
                 baseline_last_id = 0
             # Pre-emptively stop Tools_* HTTP listeners
             ctrl_adapter.stop_tools_http_listeners(client)
             _log(config, "[flow] enabling controller services")
-            ctrl_adapter.enable_all_controllers(client, timeout=config.timeout_seconds)
+            with phase("enable"):
+                ctrl_adapter.enable_all_controllers(client, timeout=config.timeout_seconds)
             _log(config, "[flow] starting processors")
-            ctrl_adapter.start_all_processors(client, timeout=config.timeout_seconds)
-            # Stop Tools_* HTTP listeners to avoid port conflicts
-            ctrl_adapter.stop_tools_http_listeners(client)
-            _await_stable_states(config, client)
-            status_token, proc_roll, ctrl_roll, details = _collect_flow_status(client)
-            connections = status_adapter.fetch_connections(client)["items"]
+            with phase("start"):
+                ctrl_adapter.start_all_processors(client, timeout=config.timeout_seconds)
+                # Stop Tools_* HTTP listeners to avoid port conflicts
+                ctrl_adapter.stop_tools_http_listeners(client)
+            with phase("settle"):
+                _await_stable_states(config, client)
+            snapshot = status_adapter.capture_status(client)
+            status_token, proc_roll, ctrl_roll, details = _collect_flow_status(client, snapshot)
+            connections = status_adapter.fetch_connections(client, snapshot=snapshot)["items"]
             conn_roll = rollup_connections(connections)
             details["connections"] = {"counts": conn_roll.counts, "worst": conn_roll.worst}
             if conn_roll.worst == "BLOCKED":
                 status_token = "INVALID"
             # Bulletin check after start
             try:
-                bulletins = client.get_bulletins(limit=200, after=None)
-                new_errors = [b for b in bulletins if (b.get("level") == "ERROR" and int(b.get("id", 0)) > baseline_last_id)]
+                # Only bulletins newer than the baseline cross the wire
+                bulletins = tail_bulletins(client, after=baseline_last_id).items
+                new_errors = [b for b in bulletins if b.get("level") == "ERROR"]
                 if new_errors:
                     details = details or {}
                     details["bulletins"] = {"errors": new_errors}
@@ -255,8 +291,9 @@ def down_flow(*, config: AppConfig) -> CommandResult:
         ctrl_adapter.stop_all_processors(client, timeout=config.timeout_seconds)
         _log(config, "[flow] disabling controller services")
         ctrl_adapter.disable_all_controllers(client, timeout=config.timeout_seconds)
-        status_token, proc_roll, ctrl_roll, details = _collect_flow_status(client)
-        connections = status_adapter.fetch_connections(client)["items"]
+        snapshot = status_adapter.capture_status(client)
+        status_token, proc_roll, ctrl_roll, details = _collect_flow_status(client, snapshot)
+        connections = status_adapter.fetch_connections(client, snapshot=snapshot)["items"]
         conn_roll = rollup_connections(connections)
         details["connections"] = {"counts": conn_roll.counts, "worst": conn_roll.worst}
         if conn_roll.worst == "BLOCKED":
@@ -273,20 +310,23 @@ def down_flow(*, config: AppConfig) -> CommandResult:
 def purge_flow(*, config: AppConfig) -> CommandResult:
     with open_client(config) as client:
         _log(config, "[flow] purging NiFi root")
-        summary = purge_adapter.graceful_purge(client)
+        with phase("purge"):
+            summary = purge_adapter.graceful_purge(client)
     return CommandResult(message="Purged NiFi root", data=summary)
 
 
 def status_flow(*, config: AppConfig) -> CommandResult:
     with open_client(config) as client:
-        status_token, proc_roll, ctrl_roll, details = _collect_flow_status(client)
+        # One tree walk feeds processors, ports and connections below
+        snapshot = status_adapter.capture_status(client)
+        status_token, proc_roll, ctrl_roll, details = _collect_flow_status(client, snapshot)
         # Always compute ports and include in data for visibility
         from .status_rules import rollup_ports  # local import to avoid cycle
 
-        ports = status_adapter.fetch_ports(client)["items"]
+        ports = status_adapter.fetch_ports(client, snapshot=snapshot)["items"]
         port_roll = rollup_ports(ports)
         # Attach connection rollup in details for richer status payload
-        connections = status_adapter.fetch_connections(client)["items"]
+        connections = status_adapter.fetch_connections(client, snapshot=snapshot)["items"]
         conn_roll = rollup_connections(connections)
         details["connections"] = {"counts": conn_roll.counts, "worst": conn_roll.worst}
     exit_code = ExitCode.VALIDATION if status_token == "INVALID" else ExitCode.SUCCESS
@@ -0,0 +1,302 @@
+"""OpenMetrics/Prometheus exporter for flow status (``export metrics``).
+
+The exporter serves ``GET /metrics`` from a snapshot cache. A background thread
+refreshes the cache every ``--refresh`` seconds with one recursive status call
+and one controller service listing, however often Prometheus scrapes. If a
+refresh fails, the previous samples are served and ``nifi_exporter_up`` drops to 0.
+
+Every component gauge is labelled with ``id``, ``name``, ``path`` (the
+process-group path, e.g. ``NiFi Flow/Ingest``) and ``group`` (the last path
+segment). State gauges are 1 for the component's current ``state``. The
+``status_rules`` roll-ups are exported as per-state counts plus
+``nifi_flow_status{status=...}``, which matches the token ``status flow`` prints.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..diagnostics import StatusSnapshot
+from ..infra import status_adapter
+from .client import open_client
+from .errors import BadInputError
+from .models import AppConfig, CommandResult
+from .status_rules import rollup_connections, rollup_controllers, rollup_flow, rollup_ports, rollup_processors
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Dict[str, str]
+
+
+def _log(config: AppConfig, message: str) -> None:
+    if config.verbose:
+        print(message, file=sys.stderr)
+
+
+@dataclass
+class MetricFamily:
+    name: str
+    help: str
+    type: str = "gauge"
+    samples: List[Tuple[Labels, float]] = field(default_factory=list)
+
+    def add(self, value: float, **labels: Any) -> None:
+        self.samples.append(({key: "" if item is None else str(item) for key, item in labels.items()}, float(value)))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def render(families: Iterable[MetricFamily], *, openmetrics: bool = True) -> str:
+    """Text exposition of ``families``; OpenMetrics when ``openmetrics`` else Prometheus 0.0.4."""
+
+    lines: List[str] = []
+    for family in families:
+        # Counters are declared without ``_total`` in OpenMetrics and with it in the Prometheus format
+        declared = family.name if openmetrics or family.type != "counter" else f"{family.name}_total"
+        sample_name = f"{family.name}_total" if family.type == "counter" else family.name
+        lines.append(f"# HELP {declared} {family.help}")
+        lines.append(f"# TYPE {declared} {family.type}")
+        for labels, value in family.samples:
+            rendered = ",".join(f'{key}="{_escape(item)}"' for key, item in labels.items())
+            lines.append(f"{sample_name}{{{rendered}}} {_format_value(value)}" if rendered else f"{sample_name} {_format_value(value)}")
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def _component(item: Dict[str, Any]) -> Labels:
+    path = item.get("path") or ""
+    return {"id": item.get("id"), "name": item.get("name"), "path": path, "group": path.rsplit("/", 1)[-1]}
+
+
+def _counts(family: MetricFamily, counts: Dict[str, int], label: str) -> MetricFamily:
+    for state, count in sorted(counts.items()):
+        family.add(count, **{label: state})
+    return family
+
+
+def collect(client) -> List[MetricFamily]:
+    """Gauges for every processor, port, connection and controller service, plus the roll-ups."""
+
+    snapshot = StatusSnapshot.capture(client, validation_details=False)
+    processors = status_adapter.fetch_processors(client, snapshot=snapshot)["items"]
+    ports = status_adapter.fetch_ports(client, snapshot=snapshot)["items"]
+    connections = status_adapter.fetch_connections(client, snapshot=snapshot)["items"]
+    controllers = status_adapter.fetch_controllers(client)["items"]
+
+    processor_state = MetricFamily("nifi_processor_state", "Processor run state (1 for the current state).")
+    processor_invalid = MetricFamily("nifi_processor_invalid", "1 when NiFi reports the processor as invalid.")
+    for item in processors:
+        labels = _component(item)
+        processor_state.add(1, **labels, state=item.get("state"))
+        processor_invalid.add(1 if item.get("validationStatus") == "INVALID" else 0, **labels)
+
+    port_state = MetricFamily("nifi_port_state", "Input/output port run state (1 for the current state).")
+    for item in ports:
+        port_state.add(1, **_component(item), port_type=item.get("portType"), state=item.get("state"))
+
+    controller_state = MetricFamily("nifi_controller_service_state", "Controller service state (1 for the current state).")
+    controller_invalid = MetricFamily("nifi_controller_service_invalid", "1 when NiFi reports the service as invalid.")
+    for item in controllers:
+        labels = _component(item)
+        controller_state.add(1, **labels, state=item.get("state"))
+        controller_invalid.add(1 if item.get("validationStatus") == "INVALID" else 0, **labels)
+
+    queue = {
+        "queuedCount": MetricFamily("nifi_connection_queued_count", "FlowFiles queued on the connection."),
+        "queuedBytes": MetricFamily("nifi_connection_queued_bytes", "Bytes queued on the connection."),
+        "percentUseCount": MetricFamily(
+            "nifi_connection_percent_use_count", "Queued FlowFiles as a percentage of the back-pressure object threshold."
+        ),
+        "percentUseBytes": MetricFamily(
+            "nifi_connection_percent_use_bytes", "Queued bytes as a percentage of the back-pressure data size threshold."
+        ),
+        "backpressureObjectThreshold": MetricFamily(
+            "nifi_connection_backpressure_object_threshold", "Back-pressure object threshold of the connection."
+        ),
+    }
+    for item in connections:
+        labels = _component(item)
+        for key, family in queue.items():
+            family.add(item.get(key) or 0, **labels)
+
+    proc_roll = rollup_processors(processors)
+    ctrl_roll = rollup_controllers(controllers)
+    status, _ = rollup_flow(proc_roll, ctrl_roll)
+    flow_status = MetricFamily("nifi_flow_status", "Flow roll-up reported by 'status flow' (1 for the current status).")
+    flow_status.add(1, status=status)
+    return [
+        processor_state,
+        processor_invalid,
+        port_state,
+        controller_state,
+        controller_invalid,
+        *queue.values(),
+        _counts(MetricFamily("nifi_processors", "Processors per roll-up state."), proc_roll.counts, "state"),
+        _counts(MetricFamily("nifi_ports", "Ports per roll-up state."), rollup_ports(ports).counts, "state"),
+        _counts(
+            MetricFamily("nifi_controller_services", "Controller services per roll-up state."), ctrl_roll.counts, "state"
+        ),
+        _counts(
+            MetricFamily("nifi_connections", "Connections per queue status (EMPTY, HEALTHY, BLOCKED)."),
+            rollup_connections(connections).counts,
+            "status",
+        ),
+        flow_status,
+    ]
+
+
+class MetricsExporter:
+    """Serve cached flow metrics over HTTP while a background thread keeps them fresh.
+
+    ``start()`` refreshes once before listening, so the first scrape is never empty.
+    Use ``port=0`` to bind an ephemeral port and read it back from ``address``.
+    """
+
+    def __init__(self, client, *, refresh: float = 15.0, host: str = "127.0.0.1", port: int = 9464):
+        self.client = client
+        self.refresh = refresh
+        self.scrapes = 0
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self._families: List[MetricFamily] = []
+        self._refreshed_at = 0.0
+        self._refresh_seconds = 0.0
+        self._up = False
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def refresh_now(self) -> bool:
+        """Replace the cached samples; on failure keep the previous ones and mark the exporter down."""
+
+        began = time.perf_counter()
+        try:
+            families = collect(self.client)
+        except Exception as exc:
+            with self._lock:
+                self.failures += 1
+                self.last_error = str(exc)
+                self._up = False
+            return False
+        with self._lock:
+            self._families = families
+            self.refreshes += 1
+            self._refreshed_at = time.time()
+            self._refresh_seconds = time.perf_counter() - began
+            self._up = True
+        return True
+
+    def render(self, *, openmetrics: bool = True) -> str:
+        with self._lock:
+            own = [
+                MetricFamily("nifi_exporter_up", "1 when the last refresh from NiFi succeeded."),
+                MetricFamily("nifi_exporter_last_refresh_timestamp_seconds", "Unix time of the last successful refresh."),
+                MetricFamily("nifi_exporter_refresh_duration_seconds", "Duration of the last successful refresh."),
+                MetricFamily("nifi_exporter_refresh_failures", "Refreshes that failed.", type="counter"),
+            ]
+            for family, value in zip(own, (self._up, self._refreshed_at, self._refresh_seconds, self.failures)):
+                family.add(value)
+            self.scrapes += 1
+            return render([*self._families, *own], openmetrics=openmetrics)
+
+    def _handler(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404, "Metrics are served at /metrics")
+                    return
+                openmetrics = "application/openmetrics-text" in (self.headers.get("Accept") or "")
+                body = exporter.render(openmetrics=openmetrics).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - signature from the base class
+                pass
+
+        return Handler
+
+    def _refresh_loop(self) -> None:
+        while not self._stopping.wait(self.refresh):
+            self.refresh_now()
+
+    def start(self) -> "MetricsExporter":
+        self.refresh_now()
+        for target in (self._server.serve_forever, self._refresh_loop):
+            thread = threading.Thread(target=target, name=f"metrics-{target.__name__}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._server.shutdown()
+        self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def __enter__(self) -> "MetricsExporter":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def _listen_address(listen: str) -> Tuple[str, int]:
+    host, _, port = listen.rpartition(":")
+    try:
+        return host or "0.0.0.0", int(port)
+    except ValueError:
+        raise BadInputError(f"--listen must be HOST:PORT, got '{listen}'") from None
+
+
+def export_metrics(*, config: AppConfig) -> CommandResult:
+    """Serve ``/metrics`` until ``--duration`` elapses or the command is interrupted."""
+
+    host, port = _listen_address(config.metrics_listen)
+    with open_client(config) as client:
+        try:
+            exporter = MetricsExporter(client, refresh=config.metrics_refresh, host=host, port=port)
+        except OSError as exc:
+            raise BadInputError(f"Cannot listen on {config.metrics_listen}: {exc}") from exc
+        with exporter:
+            bound_host, bound_port = exporter.address
+            print(f"Serving metrics on http://{bound_host}:{bound_port}/metrics", file=sys.stderr)
+            _log(config, f"[metrics] refreshing from NiFi every {config.metrics_refresh}s")
+            try:
+                if config.run_duration is None:
+                    threading.Event().wait()
+                else:
+                    time.sleep(config.run_duration)
+            except KeyboardInterrupt:
+                pass
+    return CommandResult(
+        message=f"Served {exporter.scrapes} scrapes from {exporter.refreshes} refreshes",
+        data={"scrapes": exporter.scrapes, "refreshes": exporter.refreshes, "failures": exporter.failures},
+    )
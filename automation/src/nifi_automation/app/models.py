@@ -55,6 +55,23 @@ class AppConfig:
     output: str
     verbose: bool
     dry_run: bool = False
+    # Diff against the live flow and apply only the changes instead of purge-and-redeploy
+    incremental: bool = False
+    # Continue an interrupted deploy from its journal instead of purge-and-redeploy
+    resume: bool = False
+    # watch and 'tail bulletins --follow': first poll interval and the cap it stretches to while nothing changes
+    watch_interval: float = 2.0
+    watch_max_interval: float = 30.0
+    # export metrics: HOST:PORT to serve /metrics on and seconds between refreshes from NiFi
+    metrics_listen: str = "127.0.0.1:9464"
+    metrics_refresh: float = 15.0
+    # How long 'watch', 'export metrics' and 'tail bulletins --follow' run; None runs until interrupted
+    run_duration: Optional[float] = None
+    # status/inspect connections: report queues forecast to hit back-pressure within this many seconds
+    backpressure_horizon: float = 300.0
+    # tail bulletins: keep polling (interval and duration as for 'watch') and the lowest level reported
+    bulletin_follow: bool = False
+    bulletin_severity: str = "INFO"
     # Optional: processor type hint for describe commands
     proc_type: Optional[str] = None
     # Trust ops parameters
@@ -1,22 +1,183 @@
-"""Polling helpers for the CLI app layer."""
+"""Polling helpers for the CLI app layer.
+
+Every wait on NiFi goes through :func:`wait_until` or :func:`wait_all`. The first
+probe runs immediately, and the delay between probes grows geometrically from a
+few milliseconds up to a cap. State changes that are already done cost one
+request, short transitions finish in tens of milliseconds, and slow ones poll
+about once every couple of seconds instead of hammering the API. Each wait
+produces a :class:`WaitReport`, and :func:`collect_waits` gathers them.
+"""
 
 from __future__ import annotations
 
+import random
 import time
-from typing import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterator, List, Mapping, Optional, TypeVar
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
 
 
 class TimeoutExpired(RuntimeError):
     """Raised when a polling loop exceeds the configured timeout."""
 
 
-def poll_until(predicate: Callable[[], bool], *, timeout: float, interval: float = 0.5) -> None:
-    """Invoke *predicate* until it returns ``True`` or the timeout expires."""
+@dataclass(frozen=True)
+class Backoff:
+    """Delay schedule between probes: ``initial * factor**n`` capped at ``maximum``."""
+
+    initial: float = 0.02
+    factor: float = 2.0
+    maximum: float = 2.0
+    jitter: float = 0.1
+
+    def delays(self) -> Iterator[float]:
+        delay = self.initial
+        while True:
+            spread = delay * self.jitter
+            yield max(0.0, delay + random.uniform(-spread, spread)) if spread else delay
+            delay = min(self.maximum, delay * self.factor)
+
+
+DEFAULT_BACKOFF = Backoff()
+
+
+@dataclass(frozen=True)
+class WaitReport:
+    """Outcome of one wait: what was awaited, how long it took and how many probes it used."""
+
+    label: str
+    elapsed: float
+    probes: int
+    targets: int
+    satisfied: bool
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "label": self.label,
+            "elapsed": round(self.elapsed, 4),
+            "probes": self.probes,
+            "targets": self.targets,
+            "satisfied": self.satisfied,
+        }
+
+
+_collector: ContextVar[Optional[List[WaitReport]]] = ContextVar("nifi_wait_reports", default=None)
+
+
+@contextmanager
+def collect_waits() -> Iterator[List[WaitReport]]:
+    """Collect a :class:`WaitReport` for every wait finished inside the block."""
+
+    reports: List[WaitReport] = []
+    token = _collector.set(reports)
+    try:
+        yield reports
+    finally:
+        _collector.reset(token)
+
 
-    deadline = time.time() + timeout
+def _record(report: WaitReport) -> WaitReport:
+    reports = _collector.get()
+    if reports is not None:
+        reports.append(report)
+    return report
+
+
+def _sleep_before_next(delays: Iterator[float], deadline: float) -> bool:
+    """Sleep for the next backoff step; return ``False`` once the deadline has passed."""
+
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        return False
+    time.sleep(min(next(delays), remaining))
+    return True
+
+
+def wait_until(
+    probe: Callable[[], T],
+    *,
+    until: Callable[[T], bool] = bool,
+    timeout: float,
+    label: str = "wait",
+    backoff: Backoff = DEFAULT_BACKOFF,
+    on_timeout: Optional[Callable[[T], Exception]] = None,
+    raise_on_timeout: bool = True,
+) -> T:
+    """Call ``probe`` until ``until(value)`` holds and return that value.
+
+    On timeout, raises ``on_timeout(last_value)`` if given, otherwise
+    :class:`TimeoutExpired`. With ``raise_on_timeout=False`` the last probed value
+    is returned instead.
+    """
+
+    values = wait_all(
+        {label: probe},
+        until=until,
+        timeout=timeout,
+        label=label,
+        backoff=backoff,
+        on_timeout=(lambda pending: on_timeout(pending[label])) if on_timeout else None,
+        raise_on_timeout=raise_on_timeout,
+    )
+    return values[label]
+
+
+def wait_all(
+    probes: Mapping[K, Callable[[], T]],
+    *,
+    until: Callable[[T], bool] = bool,
+    timeout: float,
+    label: str = "wait",
+    backoff: Backoff = DEFAULT_BACKOFF,
+    on_timeout: Optional[Callable[[Dict[K, T]], Exception]] = None,
+    raise_on_timeout: bool = True,
+) -> Dict[K, T]:
+    """Wait for every probe in ``probes`` to satisfy ``until`` within one shared loop.
+
+    Each round probes only the targets that are still pending, then sleeps once.
+    Returns the last value seen per key. On timeout, ``on_timeout`` receives the
+    pending keys and their last values.
+    """
+
+    start = time.monotonic()
+    deadline = start + timeout
+    delays = backoff.delays()
+    pending = dict(probes)
+    values: Dict[K, T] = {}
+    count = 0
     while True:
-        if predicate():
-            return
-        if time.time() > deadline:
-            raise TimeoutExpired("Condition not satisfied before timeout")
-        time.sleep(interval)
+        for key in list(pending):
+            value = pending[key]()
+            count += 1
+            values[key] = value
+            if until(value):
+                del pending[key]
+        if not pending:
+            _record(WaitReport(label, time.monotonic() - start, count, len(probes), True))
+            return values
+        if not _sleep_before_next(delays, deadline):
+            break
+    _record(WaitReport(label, time.monotonic() - start, count, len(probes), False))
+    if not raise_on_timeout:
+        return values
+    stuck = {key: values[key] for key in pending}
+    if on_timeout is not None:
+        raise on_timeout(stuck)
+    raise TimeoutExpired(f"{label}: condition not satisfied before timeout ({len(stuck)} pending)")
+
+
+def poll_until(predicate: Callable[[], bool], *, timeout: float, interval: Optional[float] = None) -> None:
+    """Invoke *predicate* until it returns ``True`` or the timeout expires.
+
+    ``interval`` caps the delay between probes; the schedule otherwise follows
+    :data:`DEFAULT_BACKOFF`.
+    """
+
+    backoff = DEFAULT_BACKOFF
+    if interval is not None:
+        backoff = Backoff(initial=min(DEFAULT_BACKOFF.initial, interval), maximum=interval)
+    wait_until(predicate, timeout=timeout, label="poll_until", backoff=backoff)
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import re
-import time
 from pathlib import Path
 import secrets
 from typing import Dict, Optional, Tuple
@@ -11,6 +10,8 @@ from typing import Dict, Optional, Tuple
 from .client import open_client
 from .errors import BadInputError, TimeoutError
 from .models import AppConfig, CommandResult, ExitCode
+from .polling import wait_until
+from ..client import _delete_params, _revision_of
 from ..infra import purge_adapter, deploy_adapter
 import httpx
 
@@ -50,15 +51,26 @@ def _find_processor_by_name(client, pg_id: str, name: str) -> Optional[str]:
 
 
 def _update_processor_properties(client, processor_id: str, props: Dict[str, str]) -> None:
-    entity = client._client.get(f"/processors/{processor_id}").json()
-    rev = entity.get("revision", {})
-    comp = entity.get("component", {})
-    cfg = comp.get("config", {})
-    cfg_props = cfg.get("properties", {}) or {}
-    cfg_props.update(props)
-    cfg["properties"] = cfg_props
-    body = {"revision": rev, "component": {"id": processor_id, "config": cfg}}
-    client._client.put(f"/processors/{processor_id}", json=body).raise_for_status()
+    # NiFi merges the supplied properties; the revision comes from the flow fetched by the caller
+    client._with_revision(
+        f"/processors/{processor_id}",
+        processor_id,
+        lambda entity: client._client.put(
+            f"/processors/{processor_id}",
+            json={"revision": _revision_of(entity), "component": {"id": processor_id, "config": {"properties": props}}},
+        ),
+    ).raise_for_status()
+
+
+def _update_service_properties(client, svc_id: str, name: str, props: Dict[str, str]) -> None:
+    client._with_revision(
+        f"/controller-services/{svc_id}",
+        svc_id,
+        lambda entity: client._client.put(
+            f"/controller-services/{svc_id}",
+            json={"revision": _revision_of(entity), "component": {"id": svc_id, "name": name, "properties": props}},
+        ),
+    ).raise_for_status()
 
 
 def _assert_pg_valid(client, pg_name: str) -> None:
@@ -81,13 +93,13 @@ def _assert_pg_valid(client, pg_name: str) -> None:
         raise BadInputError(f"Invalid processors in tools PG '{pg_name}'", details=invalid)
 
 
-def _wait_pg_ready(client, pg_name: str, *, timeout: float = 30.0, poll: float = 1.0) -> None:
+def _wait_pg_ready(client, pg_name: str, *, timeout: float = 30.0) -> None:
     """Wait until all processors in the given PG are VALID (or DISABLED) and scheduled (RUNNING/STOPPED/DISABLED)."""
     pg_id = _find_pg_by_name(client, pg_name)
     if not pg_id:
         raise BadInputError(f"Process group '{pg_name}' not found after deploy")
-    deadline = time.time() + timeout
-    while True:
+
+    def probe() -> Dict[str, list]:
         flow = client._client.get(f"/flow/process-groups/{pg_id}").json()["processGroupFlow"]["flow"]
         procs = flow.get("processors") or []
         invalid = []
@@ -101,60 +113,61 @@ def _wait_pg_ready(client, pg_name: str, *, timeout: float = 30.0, poll: float =
             s = comp.get("state") or "STOPPED"
             if s not in {"RUNNING", "STOPPED", "DISABLED"}:
                 not_ready.append({"name": name, "state": s})
-        if not invalid and not not_ready:
-            return
-        if time.time() > deadline:
-            raise TimeoutError(f"Tools PG '{pg_name}' did not become ready", details={"invalid": invalid, "not_ready": not_ready})
-        time.sleep(poll)
+        return {"invalid": invalid, "not_ready": not_ready}
+
+    wait_until(
+        probe,
+        until=lambda report: not report["invalid"] and not report["not_ready"],
+        timeout=timeout,
+        label=f"{pg_name} ready",
+        on_timeout=lambda report: TimeoutError(f"Tools PG '{pg_name}' did not become ready", details=report),
+    )
+
+
+def _processor_state(client, processor_id: str) -> Optional[str]:
+    return client._client.get(f"/processors/{processor_id}").json().get("component", {}).get("state")
+
 
-def _wait_processor_running(client, pg_name: str, proc_name: str, *, timeout: float = 15.0, poll: float = 0.25) -> None:
+def _wait_processor_running(client, pg_name: str, proc_name: str, *, timeout: float = 15.0) -> None:
     pg_id = _find_pg_by_name(client, pg_name)
     if not pg_id:
         raise BadInputError(f"Process group '{pg_name}' not found")
-    deadline = time.time() + timeout
-    while True:
-        pid = _find_processor_by_name(client, pg_id, proc_name)
-        if not pid:
-            raise BadInputError(f"Processor '{proc_name}' not found in '{pg_name}'")
-        ent = client._client.get(f"/processors/{pid}").json()
-        st = ent.get("component", {}).get("state")
-        if st == "RUNNING":
-            return
-        if time.time() > deadline:
-            raise TimeoutError(f"Processor '{proc_name}' in '{pg_name}' did not enter RUNNING (state={st})")
-        time.sleep(poll)
+    pid = _find_processor_by_name(client, pg_id, proc_name)
+    if not pid:
+        raise BadInputError(f"Processor '{proc_name}' not found in '{pg_name}'")
+    wait_until(
+        lambda: _processor_state(client, pid),
+        until=lambda st: st == "RUNNING",
+        timeout=timeout,
+        label=f"{proc_name} running",
+        on_timeout=lambda st: TimeoutError(f"Processor '{proc_name}' in '{pg_name}' did not enter RUNNING (state={st})"),
+    )
 
 
 def _run_once(client, processor_id: str, *, timeout: float = DEFAULT_TIMEOUT) -> None:
     # PUT run-status RUN_ONCE
-    entity = client._client.get(f"/processors/{processor_id}").json()
-    rev = entity.get("revision", {})
-    body = {"revision": rev, "state": "RUN_ONCE"}
-    client._client.put(f"/processors/{processor_id}/run-status", json=body).raise_for_status()
+    client.set_processor_run_status(processor_id, "RUN_ONCE")
     # Wait briefly for completion
-    deadline = time.time() + timeout
-    while time.time() < deadline:
-        ent = client._client.get(f"/processors/{processor_id}").json()
-        st = ent.get("component", {}).get("state")
-        if st in {"RUNNING", "STOPPED", "DISABLED"}:
-            return
-        time.sleep(0.2)
+    wait_until(
+        lambda: _processor_state(client, processor_id),
+        until=lambda st: st in {"RUNNING", "STOPPED", "DISABLED"},
+        timeout=timeout,
+        label="run once",
+        raise_on_timeout=False,
+    )
 
 
 def _stop_processor(client, processor_id: str) -> None:
     try:
-        entity = client._client.get(f"/processors/{processor_id}").json()
-        rev = entity.get("revision", {})
-        body = {"revision": rev, "state": "STOPPED"}
-        client._client.put(f"/processors/{processor_id}/run-status", json=body).raise_for_status()
+        client.set_processor_run_status(processor_id, "STOPPED")
         # Wait until processor enters STOPPED or DISABLED
-        deadline = time.time() + 10.0
-        while time.time() < deadline:
-            ent = client._client.get(f"/processors/{processor_id}").json()
-            st = ent.get("component", {}).get("state")
-            if st in {"STOPPED", "DISABLED"}:
-                break
-            time.sleep(0.2)
+        wait_until(
+            lambda: _processor_state(client, processor_id),
+            until=lambda st: st in {"STOPPED", "DISABLED"},
+            timeout=10.0,
+            label="processor stopped",
+            raise_on_timeout=False,
+        )
     except Exception:
         pass
 
@@ -188,10 +201,29 @@ def _deploy_and_trigger(config: AppConfig, spec_path: Path, params: Dict[str, st
         return CommandResult(message=f"trust op '{pg_name}' triggered", data={"pg": pg_name}, exit_code=ExitCode.SUCCESS)
 
 
-def _start_root(client) -> None:
+def _validating(client, pg_id: str) -> list:
+    flow = client._client.get(f"/flow/process-groups/{pg_id}").json()["processGroupFlow"]["flow"]
+    return [
+        proc.get("component", {}).get("name")
+        for proc in flow.get("processors") or []
+        if proc.get("component", {}).get("validationStatus") == "VALIDATING"
+    ]
+
+
+def _start_root(client, pg_name: str, *, timeout: float = 10.0) -> None:
+    """Start the root PG, then wait for ``pg_name``'s processors to finish validating."""
     try:
         client.schedule_process_group("root", "RUNNING")
-        time.sleep(1.0)
+        pg_id = _find_pg_by_name(client, pg_name)
+        if pg_id:
+            # _assert_pg_valid checks once, so let validation settle first
+            wait_until(
+                lambda: _validating(client, pg_id),
+                until=lambda names: not names,
+                timeout=timeout,
+                label=f"{pg_name} validated",
+                raise_on_timeout=False,
+            )
     except Exception:
         pass
 
@@ -209,7 +241,7 @@ def create(*, config: AppConfig) -> CommandResult:
             inj = _find_processor_by_name(client, pg_id, "Inject Key")
             if inj:
                 _update_processor_properties(client, inj, {"tools.expected.key": shared_key})
-        _start_root(client)
+        _start_root(client, "Tools_Trust_Create_HTTP")
         _assert_pg_valid(client, "Tools_Trust_Create_HTTP")
         _wait_pg_ready(client, "Tools_Trust_Create_HTTP")
         _wait_processor_running(client, "Tools_Trust_Create_HTTP", "HandleHttpRequest")
@@ -236,7 +268,7 @@ def add(*, config: AppConfig) -> CommandResult:
             inj = _find_processor_by_name(client, pg_id, "Inject Key")
             if inj:
                 _update_processor_properties(client, inj, {"tools.expected.key": shared_key})
-        _start_root(client)
+        _start_root(client, "Tools_Trust_Add_HTTP")
         _assert_pg_valid(client, "Tools_Trust_Add_HTTP")
         _wait_pg_ready(client, "Tools_Trust_Add_HTTP")
         _wait_processor_running(client, "Tools_Trust_Add_HTTP", "HandleHttpRequest")
@@ -285,7 +317,7 @@ def remove(*, config: AppConfig) -> CommandResult:
             inj = _find_processor_by_name(client, pg_id, "Inject Key")
             if inj:
                 _update_processor_properties(client, inj, {"tools.expected.key": shared_key})
-        _start_root(client)
+        _start_root(client, "Tools_Trust_Remove_HTTP")
         _assert_pg_valid(client, "Tools_Trust_Remove_HTTP")
         _wait_pg_ready(client, "Tools_Trust_Remove_HTTP")
         _wait_processor_running(client, "Tools_Trust_Remove_HTTP", "HandleHttpRequest")
@@ -313,7 +345,7 @@ def inspect(*, config: AppConfig) -> CommandResult:
             inj = _find_processor_by_name(client, pg_id, "Inject Key")
             if inj:
                 _update_processor_properties(client, inj, {"tools.expected.key": shared_key})
-        _start_root(client)
+        _start_root(client, "Tools_Trust_Inspect_HTTP")
         _assert_pg_valid(client, "Tools_Trust_Inspect_HTTP")
         _wait_pg_ready(client, "Tools_Trust_Inspect_HTTP")
         _wait_processor_running(client, "Tools_Trust_Inspect_HTTP", "HandleHttpRequest")
@@ -324,20 +356,24 @@ def inspect(*, config: AppConfig) -> CommandResult:
         "pass": config.ts_pass,
     }
     # Probe with a short readiness window to avoid racing the HTTP listener bind
-    deadline = time.time() + 12.0
     last_resp: Optional[httpx.Response] = None
-    while True:
+
+    def probe() -> Optional[httpx.Response]:
+        nonlocal last_resp
         try:
-            r = _tools_get("/tools/trust/inspect", params=params, timeout=5.0, key=shared_key)
-            last_resp = r
-            if r.status_code < 400:
-                break
+            last_resp = _tools_get("/tools/trust/inspect", params=params, timeout=5.0, key=shared_key)
         except Exception:
-            pass
-        if time.time() > deadline:
-            # fall through with last_resp (may be None)
-            break
-        time.sleep(0.5)
+            return None
+        return last_resp
+
+    # On timeout fall through with last_resp (may be None)
+    wait_until(
+        probe,
+        until=lambda resp: resp is not None and resp.status_code < 400,
+        timeout=12.0,
+        label="trust inspect endpoint",
+        raise_on_timeout=False,
+    )
     r = last_resp or httpx.Response(599, text="inspect endpoint unreachable")
     # Do not raise; return body on error to aid debugging
     # Parse: expect plain text with a listing block followed by '---' then keytool output
@@ -374,9 +410,14 @@ def _delete_tools_pg(config: AppConfig, *, pg_name: str) -> None:
                     client._client.put(f"/flow/process-groups/{gid}", json={"id": gid, "state": "STOPPED"}).raise_for_status()
                 except Exception:
                     pass
-                ent = client._client.get(f"/process-groups/{gid}").json()
-                rev = ent.get("revision", {}).get("version", 0)
-                client._client.delete(f"/process-groups/{gid}", params={"version": rev, "clientId": "tools-clean", "recursive": "true"}).raise_for_status()
+                client._with_revision(
+                    f"/process-groups/{gid}",
+                    gid,
+                    lambda entity: client._client.delete(
+                        f"/process-groups/{gid}",
+                        params={**_delete_params(entity, recursive="true"), "clientId": "tools-clean"},
+                    ),
+                ).raise_for_status()
                 break
 
 
@@ -426,13 +467,7 @@ def _ensure_workflow_ssl_context(
 
         if svc_id:
             # Update properties and enable
-            ent = client.get_controller_service(svc_id)
-            rev = ent.get("revision", {})
-            comp = ent.get("component", {})
-            cfg = comp.get("properties", {}) or {}
-            cfg.update(props)
-            body = {"revision": rev, "component": {"id": svc_id, "name": "Workflow SSL", "properties": cfg}}
-            client._client.put(f"/controller-services/{svc_id}", json=body).raise_for_status()
+            _update_service_properties(client, svc_id, "Workflow SSL", props)
             client.enable_controller_service(svc_id)
         else:
             # Create new service
@@ -474,11 +509,7 @@ def create_ssl_context(*, config: AppConfig) -> CommandResult:
             if comp.get("name") == svc_name and comp.get("type") == "org.apache.nifi.ssl.StandardSSLContextService":
                 svc_id = comp.get("id"); break
         if svc_id:
-            ent = client.get_controller_service(svc_id)
-            rev = ent.get("revision", {})
-            cfg = ent.get("component", {}).get("properties", {}) or {}
-            cfg.update(props)
-            client._client.put(f"/controller-services/{svc_id}", json={"revision": rev, "component": {"id": svc_id, "name": svc_name, "properties": cfg}}).raise_for_status()
+            _update_service_properties(client, svc_id, svc_name, props)
             client.enable_controller_service(svc_id)
             return CommandResult(message=f"Updated and enabled {svc_name}")
         created = client.create_controller_service(parent_id="root", name=svc_name, type_name="org.apache.nifi.ssl.StandardSSLContextService", properties=props)
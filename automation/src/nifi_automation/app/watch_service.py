@@ -0,0 +1,219 @@
+"""Live ``watch`` mode: stream status changes as NDJSON events.
+
+``watch flow|processors|connections`` opens one session. It then polls the
+recursive status endpoint, which is one request per poll whatever the size of
+the tree. After an initial ``snapshot`` event, it emits only what changed since
+the previous poll:
+
+- ``added`` / ``removed``: a component appeared or disappeared.
+- ``state``: a processor or port changed run state (``from``/``to``).
+- ``invalid`` / ``valid``: a component became invalid (with its validation
+  errors) or recovered. Validation errors are fetched only when a component
+  turns invalid.
+- ``queue``: a connection's queued count or size changed, with the deltas.
+
+The poll interval starts at ``--interval``. It grows by half after each quiet
+poll, up to ``--max-interval``, and drops back to ``--interval`` on the next
+change. The stream ends with an ``end`` event after ``--duration`` seconds or
+on Ctrl-C.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from ..diagnostics import StatusSnapshot
+from ..infra import status_adapter
+from .client import open_client
+from .models import AppConfig, CommandResult
+from .polling import Backoff
+
+Event = Dict[str, Any]
+Emit = Callable[[Event], None]
+
+# Quiet polls stretch the interval by this factor up to the maximum
+QUIET_FACTOR = 1.5
+
+
+def _log(config: AppConfig, message: str) -> None:
+    if config.verbose:
+        print(message, file=sys.stderr)
+
+
+def _timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _items(client, snapshot: StatusSnapshot, target: str) -> Dict[str, Dict[str, Any]]:
+    observed: Dict[str, Dict[str, Any]] = {}
+    if target in {"flow", "processors"}:
+        for item in status_adapter.fetch_processors(client, snapshot=snapshot)["items"]:
+            observed[item["id"]] = {**item, "kind": "processor"}
+    if target == "flow":
+        for item in status_adapter.fetch_ports(client, snapshot=snapshot)["items"]:
+            observed[item["id"]] = {**item, "kind": "port"}
+    if target in {"flow", "connections"}:
+        for item in status_adapter.fetch_connections(client, snapshot=snapshot)["items"]:
+            observed[item["id"]] = {**item, "kind": "connection"}
+    return observed
+
+
+def observe(client, target: str, previous: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+    """Return ``{component id: status item}`` for ``target`` from one recursive status call."""
+
+    previous = previous or {}
+    snapshot = StatusSnapshot.capture(client, validation_details=False)
+    observed = _items(client, snapshot, target)
+    newly_invalid = any(
+        item.get("validationStatus") == "INVALID"
+        and (previous.get(item_id) or {}).get("validationStatus") != "INVALID"
+        for item_id, item in observed.items()
+    )
+    if newly_invalid:
+        snapshot.fill_validation_details(client)
+        observed = _items(client, snapshot, target)
+    return observed
+
+
+def _identity(item: Dict[str, Any]) -> Event:
+    return {"kind": item["kind"], "id": item.get("id"), "name": item.get("name"), "path": item.get("path")}
+
+
+def diff_observations(previous: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]]) -> List[Event]:
+    """Events describing how ``current`` differs from ``previous`` (without timestamps)."""
+
+    events: List[Event] = []
+    for item_id, item in current.items():
+        before = previous.get(item_id)
+        if before is None:
+            events.append({"event": "added", **_identity(item)})
+            continue
+        if item["kind"] == "connection":
+            count, size = item.get("queuedCount", 0), item.get("queuedBytes", 0)
+            old_count, old_size = before.get("queuedCount", 0), before.get("queuedBytes", 0)
+            if (count, size) != (old_count, old_size):
+                events.append(
+                    {
+                        "event": "queue",
+                        **_identity(item),
+                        "queuedCount": count,
+                        "queuedBytes": size,
+                        "delta": count - old_count,
+                        "bytesDelta": size - old_size,
+                        "percentUseCount": item.get("percentUseCount"),
+                    }
+                )
+            continue
+        if item.get("state") != before.get("state"):
+            events.append({"event": "state", **_identity(item), "from": before.get("state"), "to": item.get("state")})
+        status, old_status = item.get("validationStatus"), before.get("validationStatus")
+        if status == "INVALID" and old_status != "INVALID":
+            events.append({"event": "invalid", **_identity(item), "errors": item.get("validationErrors") or []})
+        elif old_status == "INVALID" and status != "INVALID":
+            events.append({"event": "valid", **_identity(item)})
+    for item_id, item in previous.items():
+        if item_id not in current:
+            events.append({"event": "removed", **_identity(item)})
+    return events
+
+
+def _summary(target: str, observed: Dict[str, Dict[str, Any]]) -> Event:
+    states: Dict[str, int] = {}
+    queued = 0
+    for item in observed.values():
+        if item["kind"] == "connection":
+            queued += item.get("queuedCount", 0)
+        else:
+            state = item.get("state") or "UNKNOWN"
+            states[state] = states.get(state, 0) + 1
+    return {"event": "snapshot", "target": target, "components": len(observed), "states": states, "queued": queued}
+
+
+def watch(
+    client,
+    target: str,
+    *,
+    emit: Emit,
+    interval: float = 2.0,
+    max_interval: float = 30.0,
+    duration: Optional[float] = None,
+    polls: Optional[int] = None,
+) -> Event:
+    """Poll ``target`` and ``emit`` change events until ``duration`` or ``polls`` runs out.
+
+    Returns the closing ``end`` event, which is also emitted.
+    """
+
+    backoff = Backoff(initial=interval, factor=QUIET_FACTOR, maximum=max(interval, max_interval), jitter=0.0)
+    started = time.monotonic()
+    deadline = started + duration if duration is not None else None
+    count = emitted = 0
+    reason = "duration" if duration is not None else "polls"
+
+    def send(event: Event) -> None:
+        nonlocal emitted
+        emitted += 1
+        emit({"ts": _timestamp(), **event})
+
+    try:
+        current = observe(client, target)
+        count = 1
+        send(_summary(target, current))
+        delays = backoff.delays()
+        while polls is None or count < polls:
+            delay = next(delays)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                delay = min(delay, remaining)
+            time.sleep(delay)
+            previous, current = current, observe(client, target, current)
+            count += 1
+            events = diff_observations(previous, current)
+            for event in events:
+                send(event)
+            if events:
+                # Changes are arriving; go back to the fastest interval
+                delays = backoff.delays()
+    except KeyboardInterrupt:
+        reason = "interrupted"
+    end = {
+        "event": "end",
+        "target": target,
+        "reason": reason,
+        "polls": count,
+        "events": emitted,
+        "elapsed": round(time.monotonic() - started, 3),
+    }
+    emit({"ts": _timestamp(), **end})
+    return end
+
+
+def _watch(target: str, config: AppConfig, emit: Emit) -> CommandResult:
+    with open_client(config) as client:
+        _log(config, f"[watch] polling {target} status every {config.watch_interval}s")
+        end = watch(
+            client,
+            target,
+            emit=emit,
+            interval=config.watch_interval,
+            max_interval=config.watch_max_interval,
+            duration=config.run_duration,
+        )
+    return CommandResult(message=f"Watched {target} for {end['polls']} polls", data=end)
+
+
+def watch_flow(*, config: AppConfig, emit: Emit) -> CommandResult:
+    return _watch("flow", config, emit)
+
+
+def watch_processors(*, config: AppConfig, emit: Emit) -> CommandResult:
+    return _watch("processors", config, emit)
+
+
+def watch_connections(*, config: AppConfig, emit: Emit) -> CommandResult:
+    return _watch("connections", config, emit)
@@ -0,0 +1,627 @@
+"""Asynchronous NiFi client with bounded request fan-out."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from contextlib import AbstractAsyncContextManager
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, TypeVar
+
+import httpx
+
+from .client import (
+    CLIENT_ID,
+    _autoterminate_body,
+    _bulletin_params,
+    _bulletin_rows,
+    _candidate_params,
+    _connection_body,
+    _controller_service_body,
+    _definition_path,
+    _delete_params,
+    _explicit_bundle,
+    _find_child_group,
+    _index_bundles,
+    _label_body,
+    _metadata_cache_key,
+    _port_body,
+    _port_path,
+    _process_group_body,
+    _processor_body,
+    _raise_with_body,
+    _revision_of,
+    _verify_flag,
+)
+from . import instrumentation
+from .auth import TokenAuth
+from .catalog_cache import ABOUT_PATH, CatalogCache
+from .config import AuthSettings
+from .revisions import RevisionStore, is_stale_revision
+from .token_cache import TokenCache
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class AsyncNiFiClient(AbstractAsyncContextManager["AsyncNiFiClient"]):
+    """Async counterpart of :class:`~nifi_automation.client.NiFiClient`.
+
+    Method names and return shapes mirror the synchronous client. At most
+    ``max_in_flight`` requests are outstanding at any time, so callers can
+    fan out hundreds of coroutines without flooding NiFi.
+    """
+
+    def __init__(
+        self,
+        settings: AuthSettings,
+        token: str,
+        *,
+        max_in_flight: Optional[int] = None,
+        auth: Optional[TokenAuth] = None,
+        revisions: Optional[RevisionStore] = None,
+    ):
+        limit = max(1, int(max_in_flight or settings.max_in_flight))
+        # Sharing the sync client's auth and revisions keeps both clients consistent
+        self._auth = auth or TokenAuth(settings, token, cache=TokenCache.from_settings(settings))
+        self.revisions = revisions or RevisionStore()
+        self._client = httpx.AsyncClient(
+            base_url=str(settings.base_url),
+            verify=_verify_flag(settings),
+            timeout=settings.timeout,
+            auth=self._auth,
+            limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+        )
+        self._max_in_flight = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        self._bundle_lock = asyncio.Lock()
+        self._bundle_cache: Dict[str, Dict[str, str]] = {}
+        self._processor_metadata_cache: Dict[str, Dict[str, Any]] = {}
+        self._controller_service_bundle_cache: Dict[str, Dict[str, str]] = {}
+        self._catalog = CatalogCache.from_settings(settings)
+        self._catalog_lock = asyncio.Lock()
+        self._catalog_live: set[str] = set()
+
+    @property
+    def max_in_flight(self) -> int:
+        return self._max_in_flight
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        async with self._semaphore:
+            response = await self._client.request(method, path, **kwargs)
+        self.revisions.observe_response(response)
+        instrumentation.record_response(response)
+        return response
+
+    async def _with_revision(
+        self,
+        path: str,
+        component_id: str,
+        send: Callable[[Dict[str, Any]], Awaitable[httpx.Response]],
+        *,
+        missing_ok: bool = False,
+        attempts: int = 5,
+        backoff: float = 0.2,
+    ) -> Optional[httpx.Response]:
+        """Async counterpart of ``NiFiClient._with_revision``."""
+
+        response: Optional[httpx.Response] = None
+        for attempt in range(attempts):
+            entity = self.revisions.entity(component_id)
+            if entity is None:
+                current = await self._request("GET", path)
+                if current.status_code == 404 and missing_ok:
+                    return None
+                current.raise_for_status()
+                entity = current.json() or {}
+            response = await send(entity)
+            if not is_stale_revision(response):
+                return response
+            self.revisions.forget(component_id)
+            instrumentation.record_retry(response.request.method, response.request.url.path)
+            if attempt:
+                await asyncio.sleep(backoff)
+        return response
+
+    async def _get_json(self, path: str, **kwargs: Any) -> Dict[str, Any]:
+        response = await self._request("GET", path, **kwargs)
+        response.raise_for_status()
+        return response.json() or {}
+
+    # ----- fan-out helpers -----
+
+    async def gather(self, *aws: Awaitable[T]) -> List[T]:
+        """Await *aws* concurrently; in-flight requests stay bounded by the semaphore."""
+
+        return list(await asyncio.gather(*aws))
+
+    async def map(self, func: Callable[[T], Awaitable[R]], items: Iterable[T]) -> List[R]:
+        """Apply coroutine *func* to each item concurrently, preserving input order."""
+
+        return await self.gather(*(func(item) for item in items))
+
+    async def walk_tree(self) -> List[Tuple[str, List[str], Dict[str, Any]]]:
+        """Return ``(pg_id, path, flow)`` for every process group in breadth-first order.
+
+        Each level of the tree is fetched concurrently. The root group is reported
+        under the ``root`` alias.
+        """
+
+        root_json = await self._get_json("/flow/process-groups/root")
+        root_group = root_json.get("processGroupFlow", {})
+        root_name = root_group.get("breadcrumb", {}).get("breadcrumb", {}).get("name", "root")
+        results: List[Tuple[str, List[str], Dict[str, Any]]] = []
+        level = [("root", [root_name], root_group.get("flow", {}) or {})]
+        while level:
+            results.extend(level)
+            pending: List[Tuple[str, List[str]]] = []
+            for _, path, flow in level:
+                for child in flow.get("processGroups") or []:
+                    component = child.get("component", {})
+                    child_id = component.get("id")
+                    if child_id:
+                        pending.append((child_id, path + [component.get("name", child_id)]))
+            payloads = await self.map(lambda item: self._get_json(f"/flow/process-groups/{item[0]}"), pending)
+            level = [
+                (pg_id, path, payload.get("processGroupFlow", {}).get("flow", {}) or {})
+                for (pg_id, path), payload in zip(pending, payloads)
+            ]
+        return results
+
+    async def walk_process_groups(self) -> List[Tuple[List[str], Dict[str, Any]]]:
+        """Return ``(path, flow)`` for every process group, fetching siblings concurrently.
+
+        The result matches the pairs yielded by ``diagnostics._walk_process_groups`` so
+        existing adapters can consume it unchanged.
+        """
+
+        return [(path, flow) for _, path, flow in await self.walk_tree()]
+
+    # ----- NiFiClient surface -----
+
+    async def get_root_flow(self) -> Dict[str, Any]:
+        return await self._get_json("/flow/process-groups/root")
+
+    async def get_process_group_flow(self, pg_id: str) -> Dict[str, Any]:
+        payload = await self._get_json(f"/flow/process-groups/{pg_id}")
+        return payload.get("processGroupFlow", {}).get("flow", {}) or {}
+
+    async def find_child_process_group_by_name(self, parent_id: str, name: str) -> Optional[Dict[str, Any]]:
+        return _find_child_group(await self._get_json(f"/flow/process-groups/{parent_id}"), name)
+
+    async def get_process_group(self, pg_id: str) -> Dict[str, Any]:
+        return await self._get_json(f"/process-groups/{pg_id}")
+
+    async def create_process_group(
+        self,
+        parent_id: str,
+        name: str,
+        position: tuple[float, float] | None,
+        *,
+        comments: str | None = None,
+    ) -> Dict[str, Any]:
+        body = _process_group_body(name, position, comments)
+        response = await self._request("POST", f"/process-groups/{parent_id}/process-groups", json=body)
+        response.raise_for_status()
+        return response.json()["component"]
+
+    async def delete_process_group(self, pg_id: str, version: int) -> None:
+        params = {"version": str(version), "clientId": CLIENT_ID, "recursive": "true"}
+        response = await self._request("DELETE", f"/process-groups/{pg_id}", params=params)
+        response.raise_for_status()
+
+    async def _get_catalog_json(
+        self,
+        path: str,
+        params: Optional[Dict[str, str]] = None,
+        *,
+        refresh: bool = False,
+    ) -> Dict[str, Any]:
+        """GET a type listing or definition, served from the on-disk catalog when possible."""
+
+        if self._catalog is not None and not self._catalog.bound:
+            async with self._catalog_lock:
+                if self._catalog is not None and not self._catalog.bound:
+                    try:
+                        self._catalog.bind(await self._get_json(ABOUT_PATH))
+                    except httpx.HTTPError:
+                        self._catalog = None
+        catalog = self._catalog
+        if catalog is not None and not refresh:
+            cached = catalog.get(path, params)
+            if cached is not None:
+                return cached
+        data = await self._get_json(path, params=params) if params else await self._get_json(path)
+        self._catalog_live.add(path)
+        if catalog is not None:
+            catalog.put(path, data, params)
+        return data
+
+    async def _index_types(self, path: str, key: str, cache: Dict[str, Dict[str, str]], type_name: str) -> None:
+        # Serialise the first lookup so concurrent misses share one type listing
+        async with self._bundle_lock:
+            if type_name in cache:
+                return
+            for known, bundle in _index_bundles((await self._get_catalog_json(path)).get(key, [])).items():
+                cache.setdefault(known, bundle)
+            if type_name not in cache and path not in self._catalog_live:
+                payload = await self._get_catalog_json(path, refresh=True)
+                for known, bundle in _index_bundles(payload.get(key, [])).items():
+                    cache.setdefault(known, bundle)
+
+    async def _resolve_bundle(self, type_name: str) -> Dict[str, str]:
+        if type_name in self._bundle_cache:
+            return self._bundle_cache[type_name]
+        await self._index_types("/flow/processor-types", "processorTypes", self._bundle_cache, type_name)
+        if type_name in self._bundle_cache:
+            return self._bundle_cache[type_name]
+        raise ValueError(f"Processor type not found: {type_name}")
+
+    async def get_processor_metadata(self, type_name: str) -> Dict[str, Any]:
+        bundle = await self._resolve_bundle(type_name)
+        cache_key = _metadata_cache_key(type_name, bundle)
+        if cache_key in self._processor_metadata_cache:
+            return self._processor_metadata_cache[cache_key]
+        data = await self._get_catalog_json(_definition_path("processor", bundle, type_name))
+        self._processor_metadata_cache[cache_key] = data
+        return data
+
+    async def create_processor(
+        self,
+        parent_id: str,
+        name: str,
+        type_name: str,
+        position: tuple[float, float],
+        properties: Optional[Dict[str, str]] = None,
+        *,
+        scheduling_strategy: Optional[str] = None,
+        scheduling_period: Optional[str] = None,
+        auto_terminate: Optional[List[str]] = None,
+        comments: Optional[str] = None,
+        concurrent_tasks: Optional[int] = None,
+        run_duration_millis: Optional[int] = None,
+        penalty_duration: Optional[str] = None,
+        yield_duration: Optional[str] = None,
+        execution_node: Optional[str] = None,
+        state: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        bundle = await self._resolve_bundle(type_name)
+        body = _processor_body(
+            name,
+            type_name,
+            bundle,
+            position,
+            properties,
+            scheduling_strategy,
+            scheduling_period,
+            auto_terminate=auto_terminate,
+            comments=comments,
+            concurrent_tasks=concurrent_tasks,
+            run_duration_millis=run_duration_millis,
+            penalty_duration=penalty_duration,
+            yield_duration=yield_duration,
+            execution_node=execution_node,
+            state=state,
+        )
+        # NiFi can return a transient 404 for a just-created child PG; retry briefly
+        for attempt in range(10):
+            response = await self._request("POST", f"/process-groups/{parent_id}/processors", json=body)
+            if response.status_code == 404 and attempt < 9:
+                await asyncio.sleep(0.2)
+                continue
+            response.raise_for_status()
+            return response.json()["component"]
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    async def set_processor_state(self, processor_id: str, state: str) -> None:
+        response = await self._with_revision(
+            f"/processors/{processor_id}",
+            processor_id,
+            lambda entity: self._request(
+                "PUT",
+                f"/processors/{processor_id}",
+                json={"revision": _revision_of(entity), "component": {"id": processor_id, "state": state}},
+            ),
+        )
+        response.raise_for_status()
+
+    async def set_processor_run_status(self, processor_id: str, state: str) -> None:
+        response = await self._with_revision(
+            f"/processors/{processor_id}",
+            processor_id,
+            lambda entity: self._request(
+                "PUT",
+                f"/processors/{processor_id}/run-status",
+                json={"revision": _revision_of(entity), "state": state},
+            ),
+        )
+        response.raise_for_status()
+
+    async def schedule_process_group(self, process_group_id: str, state: str) -> None:
+        for attempt in range(5):
+            response = await self._request(
+                "PUT",
+                f"/flow/process-groups/{process_group_id}",
+                json={"id": process_group_id, "state": state},
+            )
+            if response.status_code == 409 and attempt < 4:
+                await asyncio.sleep(0.2)
+                continue
+            response.raise_for_status()
+            return
+
+    async def update_processor_autoterminate(self, processor_id: str, relationships: List[str]) -> None:
+        response = await self._with_revision(
+            f"/processors/{processor_id}",
+            processor_id,
+            lambda entity: self._request(
+                "PUT", f"/processors/{processor_id}", json=_autoterminate_body(processor_id, entity, relationships)
+            ),
+        )
+        response.raise_for_status()
+
+    async def create_label(
+        self,
+        parent_id: str,
+        text: str,
+        position: tuple[float, float],
+        width: float,
+        height: float,
+        style: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        body = _label_body(text, position, width, height, style)
+        response = await self._request("POST", f"/process-groups/{parent_id}/labels", json=body)
+        response.raise_for_status()
+        return response.json()["component"]
+
+    async def delete_label(self, label_id: str) -> None:
+        response = await self._with_revision(
+            f"/labels/{label_id}",
+            label_id,
+            lambda entity: self._request("DELETE", f"/labels/{label_id}", params=_delete_params(entity)),
+            missing_ok=True,
+        )
+        if response is not None and response.status_code not in (200, 202, 204, 404):
+            response.raise_for_status()
+
+    async def get_bulletins(self, *, limit: int = 200, after: int | None = None) -> List[Dict[str, object]]:
+        return _bulletin_rows(await self._get_json("/flow/bulletin-board", params=_bulletin_params(limit, after)))
+
+    async def create_input_port(
+        self,
+        parent_id: str,
+        name: str,
+        position: tuple[float, float],
+        allow_remote: bool = False,
+        comments: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        body = _port_body(name, position, allow_remote, comments)
+        response = await self._request("POST", f"/process-groups/{parent_id}/input-ports", json=body)
+        response.raise_for_status()
+        return response.json()["component"]
+
+    async def create_output_port(
+        self,
+        parent_id: str,
+        name: str,
+        position: tuple[float, float],
+        allow_remote: bool = False,
+        comments: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        body = _port_body(name, position, allow_remote, comments)
+        response = await self._request("POST", f"/process-groups/{parent_id}/output-ports", json=body)
+        response.raise_for_status()
+        return response.json()["component"]
+
+    async def _update_port_state(self, port_id: str, port_type: str, state: str) -> None:
+        path = _port_path(port_type)
+        response = await self._with_revision(
+            f"{path}/{port_id}",
+            port_id,
+            lambda entity: self._request(
+                "PUT",
+                f"{path}/{port_id}",
+                json={"revision": _revision_of(entity), "component": {"id": port_id, "state": state}},
+            ),
+        )
+        response.raise_for_status()
+
+    async def delete_port(self, port_id: str, port_type: str) -> None:
+        path = _port_path(port_type)
+        response = await self._with_revision(
+            f"{path}/{port_id}",
+            port_id,
+            lambda entity: self._request("DELETE", f"{path}/{port_id}", params=_delete_params(entity)),
+        )
+        response.raise_for_status()
+
+    async def create_connection(
+        self,
+        parent_id: str,
+        name: str,
+        source_id: str,
+        destination_id: str,
+        relationships: List[str],
+        source_type: str = "PROCESSOR",
+        destination_type: str = "PROCESSOR",
+        *,
+        source_group_id: Optional[str] = None,
+        destination_group_id: Optional[str] = None,
+        queue_settings: Optional[Mapping[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        body = _connection_body(
+            parent_id,
+            name,
+            source_id,
+            destination_id,
+            relationships,
+            source_type,
+            destination_type,
+            source_group_id,
+            destination_group_id,
+            queue_settings,
+        )
+        response = await self._request("POST", f"/process-groups/{parent_id}/connections", json=body)
+        _raise_with_body(response)
+        return response.json()["component"]
+
+    async def _resolve_controller_service_bundle(
+        self,
+        type_name: str,
+        bundle_hint: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, str]:
+        explicit = _explicit_bundle(bundle_hint)
+        if explicit:
+            self._controller_service_bundle_cache[type_name] = explicit
+            return explicit
+        if type_name in self._controller_service_bundle_cache:
+            return self._controller_service_bundle_cache[type_name]
+        await self._index_types(
+            "/flow/controller-service-types",
+            "controllerServiceTypes",
+            self._controller_service_bundle_cache,
+            type_name,
+        )
+        if type_name in self._controller_service_bundle_cache:
+            return self._controller_service_bundle_cache[type_name]
+        raise ValueError(f"Controller service type not found: {type_name}")
+
+    async def create_controller_service(
+        self,
+        parent_id: str,
+        name: str,
+        type_name: str,
+        bundle: Optional[Dict[str, str]] = None,
+        properties: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        resolved_bundle = await self._resolve_controller_service_bundle(type_name, bundle)
+        body = _controller_service_body(parent_id, name, type_name, resolved_bundle, properties)
+        response = await self._request("POST", f"/process-groups/{parent_id}/controller-services", json=body)
+        response.raise_for_status()
+        return response.json()["component"]
+
+    async def get_controller_service(self, service_id: str) -> Dict[str, Any]:
+        return await self._get_json(f"/controller-services/{service_id}")
+
+    async def _set_controller_service_state(self, service_id: str, state: str) -> None:
+        response = await self._with_revision(
+            f"/controller-services/{service_id}",
+            service_id,
+            lambda entity: self._request(
+                "PUT",
+                f"/controller-services/{service_id}/run-status",
+                json={"revision": _revision_of(entity), "state": state},
+            ),
+        )
+        response.raise_for_status()
+
+    async def enable_controller_service(self, service_id: str) -> None:
+        await self._set_controller_service_state(service_id, "ENABLED")
+
+    async def disable_controller_service(self, service_id: str) -> None:
+        await self._set_controller_service_state(service_id, "DISABLED")
+
+    async def delete_controller_service(self, service_id: str) -> None:
+        response = await self._with_revision(
+            f"/controller-services/{service_id}",
+            service_id,
+            lambda entity: self._request("DELETE", f"/controller-services/{service_id}", params=_delete_params(entity)),
+        )
+        response.raise_for_status()
+
+    async def get_controller_service_candidates(
+        self,
+        api_type: str,
+        api_bundle: Optional[Dict[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        payload = await self._get_catalog_json("/flow/controller-service-types", _candidate_params(api_type, api_bundle))
+        return payload.get("controllerServiceTypes", [])
+
+    async def get_controller_service_definition(
+        self,
+        bundle: Dict[str, str],
+        type_name: str,
+    ) -> Dict[str, Any]:
+        return await self._get_catalog_json(_definition_path("controller-service", bundle, type_name))
+
+    async def fetch_definitions(
+        self,
+        processor_types: Iterable[str],
+        controller_service_types: Iterable[str] = (),
+    ) -> Dict[str, Dict[str, Tuple[Dict[str, str], Dict[str, Any]]]]:
+        """Resolve bundles and fetch definitions for all given types concurrently.
+
+        Returns ``{"processors": {type: (bundle, definition)}, "controllerServices": {...}}``.
+        Types that cannot be resolved or fetched are left out; callers hit them again on use.
+        """
+
+        async def processor(type_name: str) -> Optional[Tuple[Dict[str, str], Dict[str, Any]]]:
+            try:
+                return await self._resolve_bundle(type_name), await self.get_processor_metadata(type_name)
+            except (ValueError, httpx.HTTPError):
+                return None
+
+        async def service(type_name: str) -> Optional[Tuple[Dict[str, str], Dict[str, Any]]]:
+            try:
+                bundle = await self._resolve_controller_service_bundle(type_name)
+                return bundle, await self.get_controller_service_definition(bundle, type_name)
+            except (ValueError, httpx.HTTPError):
+                return None
+
+        processors = list(dict.fromkeys(processor_types))
+        services = list(dict.fromkeys(controller_service_types))
+        processor_results, service_results = await asyncio.gather(
+            self.map(processor, processors), self.map(service, services)
+        )
+        return {
+            "processors": {name: found for name, found in zip(processors, processor_results) if found},
+            "controllerServices": {name: found for name, found in zip(services, service_results) if found},
+        }
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aexit__(self, exc_type, exc, tb) -> Optional[bool]:  # pragma: no cover - trivial
+        await self.aclose()
+        return None
+
+
+class AsyncBridge:
+    """Drive an :class:`AsyncNiFiClient` from synchronous code.
+
+    A private event loop runs on a daemon thread, so the async client and its
+    connection pool are reused across calls instead of being rebuilt per call.
+    """
+
+    def __init__(
+        self,
+        settings: AuthSettings,
+        token: str,
+        *,
+        max_in_flight: Optional[int] = None,
+        auth: Optional[TokenAuth] = None,
+        revisions: Optional[RevisionStore] = None,
+    ):
+        self._client = AsyncNiFiClient(settings, token, max_in_flight=max_in_flight, auth=auth, revisions=revisions)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="nifi-async-bridge", daemon=True)
+        self._thread.start()
+
+    @property
+    def client(self) -> AsyncNiFiClient:
+        return self._client
+
+    def run(self, func: Callable[[AsyncNiFiClient], Awaitable[T]]) -> T:
+        """Run ``func(client)`` on the bridge loop and block until it completes."""
+
+        async def _invoke() -> T:
+            return await func(self._client)
+
+        return asyncio.run_coroutine_threadsafe(_invoke(), self._loop).result()
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import threading
+import time
+from typing import Generator, Optional
 from urllib.parse import urljoin
 
 import httpx
@@ -9,25 +12,34 @@ import httpx
 # Allow tests to swap out the HTTP client factory without touching the module namespace
 _client_factory = httpx.Client
 
+from . import instrumentation
 from .config import AuthSettings
+from .token_cache import TokenCache, refresh_after
 
 
 class AuthenticationError(RuntimeError):
     """Raised when NiFi authentication fails."""
 
 
+def _token_url(settings: AuthSettings) -> str:
+    return f"{str(settings.base_url).rstrip('/')}/access/token"
+
+
+def _login_form(settings: AuthSettings) -> dict:
+    return {"username": settings.username, "password": settings.password}
+
+
 def obtain_access_token(settings: AuthSettings) -> str:
     """Request a bearer token from NiFi's ``/access/token`` endpoint."""
 
-    base = str(settings.base_url).rstrip("/")
-    token_url = f"{base}/access/token"
+    token_url = _token_url(settings)
     verify_flag = settings.verify_ssl
     if isinstance(verify_flag, str):
         verify_flag = verify_flag.lower() not in {"false", "0", "no", "off"}
     with _client_factory(verify=verify_flag, timeout=settings.timeout) as client:
         response = client.post(
             token_url,
-            data={"username": settings.username, "password": settings.password},
+            data=_login_form(settings),
             headers={"Content-Type": "application/x-www-form-urlencoded"},
         )
         try:
@@ -41,3 +53,79 @@ def obtain_access_token(settings: AuthSettings) -> str:
         if not token:
             raise AuthenticationError("NiFi returned an empty token response")
         return token
+
+
+def get_access_token(settings: AuthSettings, *, cache: Optional[TokenCache] = None) -> str:
+    """Return a cached token for ``settings`` when still fresh, otherwise log in and cache it."""
+
+    if cache is not None:
+        token = cache.get(settings)
+        if token:
+            return token
+    token = obtain_access_token(settings)
+    if cache is not None:
+        cache.put(settings, token)
+    return token
+
+
+class TokenAuth(httpx.Auth):
+    """Bearer authentication that renews the NiFi token without caller involvement.
+
+    The token is replaced before its JWT expiry, and a ``401`` triggers one login
+    and a retry. The login request goes through the owning client, so the same flow
+    serves both the sync and the async client. Renewed tokens are written back to
+    ``cache``.
+    """
+
+    requires_response_body = True
+
+    def __init__(self, settings: AuthSettings, token: str, *, cache: Optional[TokenCache] = None):
+        self._settings = settings
+        self._cache = cache
+        self._lock = threading.Lock()
+        self.token = token
+
+    def _can_login(self) -> bool:
+        return bool(self._settings.username and self._settings.password)
+
+    def _expiring(self) -> bool:
+        deadline = refresh_after(self.token)
+        return deadline is not None and time.time() >= deadline
+
+    def _login_request(self) -> httpx.Request:
+        return httpx.Request(
+            "POST",
+            _token_url(self._settings),
+            data=_login_form(self._settings),
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+
+    def _accept(self, response: httpx.Response, stale: str) -> bool:
+        token = response.text.strip() if response.status_code < 400 else ""
+        if not token:
+            return False
+        with self._lock:
+            if self.token == stale:
+                self.token = token
+                if self._cache is not None:
+                    self._cache.put(self._settings, token)
+        return True
+
+    def auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
+        if self._can_login() and self._expiring():
+            self._accept((yield self._login_request()), self.token)
+        stale = self.token
+        request.headers["Authorization"] = f"Bearer {stale}"
+        response = yield request
+        if response.status_code != 401 or not self._can_login():
+            return
+        # Another request may already have renewed the token; only log in if not
+        if self.token == stale and not self._accept((yield self._login_request()), stale):
+            if self._cache is not None:
+                self._cache.invalidate(self._settings)
+            # Re-send so the caller sees the original 401 rather than the login failure
+            yield request
+            return
+        request.headers["Authorization"] = f"Bearer {self.token}"
+        instrumentation.record_retry(request.method, request.url.path)
+        yield request
@@ -0,0 +1,158 @@
+"""Incremental bulletin reads with a persisted cursor.
+
+The bulletin board endpoint filters server-side with ``after=<id>``, so a
+reader that remembers the last id it saw only transfers new bulletins.
+:func:`tail_bulletins` reads once, at :data:`READ_LIMIT`. The board answers with
+the *newest* ``limit`` rows after the cursor, not the oldest, so a second request
+could never reach older ones. Bulletin ids are sequential: if the first id read is
+not the cursor plus one, the missing ids are counted as ``skipped``. They expired
+from NiFi's bulletin buffer or did not fit in the read, and the caller knows a
+burst was lost instead of silently reading past it.
+
+:func:`dedupe` folds repeated bulletins into one group per source and message
+fingerprint. The fingerprint masks UUIDs and numbers, so ``FlowFile[id=12]`` and
+``FlowFile[id=13]`` count as the same message.
+
+:class:`BulletinCursor` keeps the last seen id per NiFi base URL in
+``bulletin-cursors.json`` under the cache directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .config import AuthSettings
+
+CURSOR_FILE = "bulletin-cursors.json"
+READ_LIMIT = 1000
+
+_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+_NUMBER = re.compile(r"\d+")
+
+
+def bulletin_id(row: Dict[str, Any]) -> int:
+    try:
+        return int(row.get("id") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def latest_bulletin_id(client) -> int:
+    """Id of the newest bulletin on the board, or 0 when it is empty."""
+
+    return max((bulletin_id(row) for row in client.get_bulletins(limit=1, after=None)), default=0)
+
+
+@dataclass(slots=True)
+class TailResult:
+    """Bulletins newer than ``after``, oldest first, and where to resume next time."""
+
+    after: Optional[int]
+    cursor: int
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    skipped: int = 0
+
+
+def tail_bulletins(client, *, after: Optional[int] = None, limit: int = READ_LIMIT) -> TailResult:
+    """Read up to ``limit`` of the newest bulletins with an id above ``after``.
+
+    With ``after=None`` nothing counts as skipped; the highest id read becomes the cursor.
+    """
+
+    result = TailResult(after=after, cursor=after or 0)
+    rows = client.get_bulletins(limit=limit, after=after)
+    fresh = sorted((row for row in rows if bulletin_id(row) > result.cursor), key=bulletin_id)
+    if not fresh:
+        return result
+    if after is not None:
+        result.skipped = bulletin_id(fresh[0]) - after - 1
+    result.items = fresh
+    result.cursor = bulletin_id(fresh[-1])
+    return result
+
+
+def fingerprint(row: Dict[str, Any]) -> str:
+    """Stable key for "the same message from the same source"."""
+
+    message = _NUMBER.sub("#", _UUID.sub("<uuid>", str(row.get("message") or "")))
+    key = f"{row.get('sourceId') or row.get('sourceName') or ''}\0{row.get('level') or ''}\0{message}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+def dedupe(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One entry per fingerprint with its count, first/last id and latest message, in order of first appearance."""
+
+    groups: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        key = fingerprint(row)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = {
+                "fingerprint": key,
+                "level": row.get("level"),
+                "sourceId": row.get("sourceId"),
+                "sourceName": row.get("sourceName"),
+                "groupId": row.get("groupId"),
+                "message": row.get("message"),
+                "count": 1,
+                "firstId": bulletin_id(row),
+                "lastId": bulletin_id(row),
+                "firstTimestamp": row.get("timestamp"),
+                "lastTimestamp": row.get("timestamp"),
+            }
+            continue
+        group["count"] += 1
+        group["message"] = row.get("message")
+        group["lastId"] = bulletin_id(row)
+        group["lastTimestamp"] = row.get("timestamp")
+    return list(groups.values())
+
+
+def _cursor_key(settings: AuthSettings) -> str:
+    return hashlib.sha256(str(settings.base_url).rstrip("/").encode("utf-8")).hexdigest()
+
+
+class BulletinCursor:
+    """Last seen bulletin id per NiFi instance, kept in one JSON file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    @classmethod
+    def from_settings(cls, settings: AuthSettings) -> Optional["BulletinCursor"]:
+        if not settings.bulletin_cursor:
+            return None
+        return cls(settings.resolved_cache_dir() / CURSOR_FILE)
+
+    def _load(self) -> Dict[str, int]:
+        try:
+            with self.path.open("r", encoding="utf-8") as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, settings: AuthSettings) -> Optional[int]:
+        value = self._load().get(_cursor_key(settings))
+        return int(value) if isinstance(value, int) else None
+
+    def _save(self, entries: Dict[str, int]) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(entries), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            # Without a stored cursor the next run starts from the newest bulletins again
+            return
+
+    def put(self, settings: AuthSettings, cursor: int) -> None:
+        entries = self._load()
+        entries[_cursor_key(settings)] = int(cursor)
+        self._save(entries)
@@ -0,0 +1,115 @@
+"""On-disk cache for NiFi type listings and type definitions.
+
+Catalog responses (``/flow/processor-types``, ``/flow/controller-service-types`` and the
+``/flow/*-definition/{group}/{artifact}/{version}/{type}`` endpoints) only change when
+the server is upgraded. Entries are therefore stored per server and per NiFi build.
+The build is identified from ``/flow/about``. When it changes, entries cached for
+older builds of that server are discarded.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+from .config import AuthSettings
+
+CATALOG_FORMAT = 1
+
+ABOUT_PATH = "/flow/about"
+
+
+def _slug(text: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-._" else "_" for ch in text).strip("_") or "default"
+
+
+def _server_key(base_url: str) -> str:
+    parts = urlsplit(base_url)
+    digest = hashlib.sha1(base_url.rstrip("/").encode("utf-8")).hexdigest()[:10]
+    return f"{_slug(parts.netloc or base_url)}-{digest}"
+
+
+def _entry_key(path: str, params: Optional[Mapping[str, str]] = None) -> str:
+    if not params:
+        return path
+    query = "&".join(f"{key}={params[key]}" for key in sorted(params))
+    return f"{path}?{query}"
+
+
+def build_version(about: Mapping[str, Any]) -> str:
+    """Return a directory-safe build identifier from a ``/flow/about`` payload."""
+
+    info = about.get("about") or {}
+    parts = [str(info.get("version") or "unknown")]
+    for field in ("buildRevision", "buildTimestamp"):
+        if info.get(field):
+            parts.append(str(info[field]))
+    return _slug("-".join(parts))
+
+
+class CatalogCache:
+    """Catalog entries for one NiFi server, scoped to the build reported by ``/flow/about``."""
+
+    def __init__(self, root: Path, base_url: str):
+        self._server_dir = Path(root) / "catalog" / _server_key(base_url)
+        self._version: Optional[str] = None
+
+    @classmethod
+    def from_settings(cls, settings: AuthSettings) -> Optional["CatalogCache"]:
+        if not settings.catalog_cache:
+            return None
+        return cls(settings.resolved_cache_dir(), str(settings.base_url))
+
+    @property
+    def bound(self) -> bool:
+        return self._version is not None
+
+    @property
+    def directory(self) -> Optional[Path]:
+        return self._server_dir / self._version if self._version else None
+
+    def bind(self, about: Mapping[str, Any]) -> None:
+        """Select the build directory and drop entries cached for any other build."""
+
+        self._version = build_version(about)
+        if not self._server_dir.is_dir():
+            return
+        for child in self._server_dir.iterdir():
+            if child.is_dir() and child.name != self._version:
+                shutil.rmtree(child, ignore_errors=True)
+
+    def _file_for(self, key: str) -> Path:
+        assert self._version is not None, "bind() must be called before reading or writing entries"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self._server_dir / self._version / f"{digest}.json"
+
+    def get(self, path: str, params: Optional[Mapping[str, str]] = None) -> Optional[Dict[str, Any]]:
+        key = _entry_key(path, params)
+        try:
+            with self._file_for(key).open("r", encoding="utf-8") as fp:
+                record = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        if record.get("format") != CATALOG_FORMAT or record.get("key") != key:
+            return None
+        return record.get("data")
+
+    def put(self, path: str, data: Dict[str, Any], params: Optional[Mapping[str, str]] = None) -> None:
+        key = _entry_key(path, params)
+        target = self._file_for(key)
+        record = {"format": CATALOG_FORMAT, "key": key, "data": data}
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fp:
+                json.dump(record, fp)
+            os.replace(tmp, target)
+        except OSError:
+            # A read-only or full cache directory must never break a command
+            return
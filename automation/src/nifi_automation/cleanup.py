@@ -3,38 +3,78 @@
 from __future__ import annotations
 
 import time
-from typing import Dict, Iterable, Tuple
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 import httpx
 
-from .client import NiFiClient
-
-CLIENT_ID = "nifi-automation"
+from .app.polling import Backoff, wait_all, wait_until
+from .client import NiFiClient, _delete_params, _revision_of
 
 __all__ = [
     "stop_root_processors",
     "disable_root_controller_services",
     "purge_process_group",
     "purge_root_process_group",
+    "wait_for_services",
+    "submit_drop_request",
+    "await_drop_requests",
+    "drop_connection_queues",
 ]
 
+# 409s on disable clear once a concurrent update lands; retry quickly at first, then back off
+CONFLICT_BACKOFF = Backoff(initial=0.05, maximum=1.0)
+CONFLICT_ATTEMPTS = 6
+
 
 def stop_root_processors(client: NiFiClient, *, timeout: float = 30.0) -> None:
     """Schedule the root process group to STOPPED and wait until all processors halt."""
 
     client.schedule_process_group("root", "STOPPED")
-    deadline = time.time() + timeout
-    while True:
+
+    def probe() -> set:
         response = client._client.get("/flow/process-groups/root")
         response.raise_for_status()
         flow = response.json().get("processGroupFlow", {}).get("flow", {}) or {}
         processors = flow.get("processors") or []
-        states = {proc.get("component", {}).get("state") for proc in processors if proc.get("component")}
-        if not states or states <= {"STOPPED", "DISABLED"}:
-            return
-        if time.time() > deadline:
-            raise RuntimeError(f"Processors still active: {states}")
-        time.sleep(0.2)
+        return {proc.get("component", {}).get("state") for proc in processors if proc.get("component")}
+
+    wait_until(
+        probe,
+        until=lambda states: not states or states <= {"STOPPED", "DISABLED"},
+        timeout=timeout,
+        label="root processors stopped",
+        on_timeout=lambda states: RuntimeError(f"Processors still active: {states}"),
+    )
+
+
+def _service_state(client: NiFiClient, service_id: str) -> Optional[str]:
+    return client.get_controller_service(service_id).get("component", {}).get("state")
+
+
+def wait_for_services(
+    client: NiFiClient,
+    service_ids: Iterable[str],
+    target_state: str,
+    *,
+    timeout: float,
+    raise_on_timeout: bool = True,
+) -> Dict[str, Optional[str]]:
+    """Wait until every controller service in ``service_ids`` reports ``target_state``.
+
+    Returns the last observed state per service.
+    """
+
+    return wait_all(
+        {service_id: (lambda sid=service_id: _service_state(client, sid)) for service_id in service_ids},
+        until=lambda state: state == target_state,
+        timeout=timeout,
+        label=f"controller services {target_state}",
+        on_timeout=lambda stuck: RuntimeError(
+            "Controller services did not reach state "
+            f"{target_state}: " + ", ".join(f"{sid} (state={state})" for sid, state in stuck.items())
+        ),
+        raise_on_timeout=raise_on_timeout,
+    )
 
 
 def disable_root_controller_services(client: NiFiClient, *, timeout: float = 30.0) -> None:
@@ -46,100 +86,136 @@ def disable_root_controller_services(client: NiFiClient, *, timeout: float = 30.
     )
     response.raise_for_status()
     services = response.json().get("controllerServices") or []
+    pending = []
     for service in services:
         component = service.get("component") or {}
         service_id = component.get("id")
         if not service_id:
             continue
         # Retry disable to tolerate 409 revision/state conflicts
-        for attempt in range(6):
+        delays = CONFLICT_BACKOFF.delays()
+        for attempt in range(CONFLICT_ATTEMPTS):
             try:
                 client.disable_controller_service(service_id)
                 break
             except httpx.HTTPStatusError as exc:
-                if exc.response is not None and exc.response.status_code == 409 and attempt < 5:
-                    time.sleep(0.5)
+                if exc.response is not None and exc.response.status_code == 409 and attempt < CONFLICT_ATTEMPTS - 1:
+                    time.sleep(next(delays))
                     continue
                 raise
-        deadline = time.time() + timeout
-        while True:
-            entity = client.get_controller_service(service_id)
-            state = entity.get("component", {}).get("state")
-            if state == "DISABLED":
-                break
-            if time.time() > deadline:
-                raise RuntimeError(f"Controller service {service_id} stuck in state {state}")
-            time.sleep(0.2)
+        pending.append(service_id)
+    # Services disable concurrently on the server; wait for all of them in one loop
+    wait_for_services(client, pending, "DISABLED", timeout=timeout)
+
 
+def submit_drop_request(client: NiFiClient, connection_id: str) -> Optional[str]:
+    """Ask NiFi to drop the queue of ``connection_id``; return the drop-request id, if any."""
 
-def _drop_connection_queue(client: NiFiClient, connection_id: str, timeout: float = 60.0) -> None:
     response = client._client.post(f"/flowfile-queues/{connection_id}/drop-requests")
     if response.status_code in {404, 409}:
-        return
+        return None
     response.raise_for_status()
     payload = response.json() or {}
     drop = payload.get("dropRequest") or payload
-    drop_id = drop.get("id")
-    if not drop_id:
+    return drop.get("id")
+
+
+def _drop_finished(client: NiFiClient, connection_id: str, drop_id: str) -> bool:
+    status = client._client.get(f"/flowfile-queues/{connection_id}/drop-requests/{drop_id}")
+    if status.status_code == 404:
+        return True
+    status.raise_for_status()
+    payload: Dict[str, Any] = status.json() or {}
+    drop_status = payload.get("dropRequest") or payload
+    return bool(drop_status.get("finished") or drop_status.get("state") == "FINISHED")
+
+
+def await_drop_requests(client: NiFiClient, requests: Dict[str, str], *, timeout: float = 60.0) -> None:
+    """Wait for the drop requests (``connection_id -> drop_id``) together, then remove them."""
+
+    if not requests:
         return
+    wait_all(
+        {cid: (lambda cid=cid, did=did: _drop_finished(client, cid, did)) for cid, did in requests.items()},
+        timeout=timeout,
+        label="connection queues dropped",
+        on_timeout=lambda stuck: RuntimeError(
+            f"Timed out dropping FlowFile queue for connections {', '.join(sorted(stuck))}"
+        ),
+    )
+    for connection_id, drop_id in requests.items():
+        client._client.delete(f"/flowfile-queues/{connection_id}/drop-requests/{drop_id}").raise_for_status()
 
-    deadline = time.time() + timeout
-    while True:
-        status = client._client.get(f"/flowfile-queues/{connection_id}/drop-requests/{drop_id}")
-        if status.status_code == 404:
-            break
-        status.raise_for_status()
-        drop_status = (status.json() or {}).get("dropRequest") or {}
-        if drop_status.get("finished") or drop_status.get("state") == "FINISHED":
-            break
-        if time.time() > deadline:
-            raise RuntimeError(f"Timed out dropping FlowFile queue for connection {connection_id}")
-        time.sleep(0.5)
 
-    client._client.delete(f"/flowfile-queues/{connection_id}/drop-requests/{drop_id}").raise_for_status()
+def drop_connection_queues(client: NiFiClient, connection_ids: Iterable[str], *, timeout: float = 60.0) -> None:
+    """Drop the queues of all ``connection_ids`` and wait for the drops together."""
+
+    requests = {}
+    for connection_id in connection_ids:
+        drop_id = submit_drop_request(client, connection_id)
+        if drop_id:
+            requests[connection_id] = drop_id
+    await_drop_requests(client, requests, timeout=timeout)
 
 
 def _delete_connection(client: NiFiClient, connection_id: str) -> None:
-    entity = client._client.get(f"/connections/{connection_id}")
-    if entity.status_code == 404:
-        return
-    entity.raise_for_status()
-    revision = entity.json().get("revision") or {}
-    params = {"version": revision.get("version", 0), "clientId": CLIENT_ID}
-    client._client.delete(f"/connections/{connection_id}", params=params).raise_for_status()
+    # Revisions come from the group flow already fetched by purge_process_group
+    response = client._with_revision(
+        f"/connections/{connection_id}",
+        connection_id,
+        lambda entity: client._client.delete(f"/connections/{connection_id}", params=_delete_params(entity)),
+        missing_ok=True,
+    )
+    if response is not None:
+        response.raise_for_status()
 
 
 def _stop_processor(client: NiFiClient, processor_id: str) -> None:
-    entity = client._client.get(f"/processors/{processor_id}")
-    if entity.status_code == 404:
+    response = client._with_revision(
+        f"/processors/{processor_id}",
+        processor_id,
+        lambda entity: client._client.put(
+            f"/processors/{processor_id}",
+            json={"revision": _revision_of(entity), "component": {"id": processor_id, "state": "STOPPED"}},
+        ),
+        missing_ok=True,
+    )
+    if response is None:
         return
-    entity.raise_for_status()
-    processor = entity.json()
-    revision = processor.get("revision") or {}
-    body = {"revision": revision, "component": {"id": processor_id, "state": "STOPPED"}}
-    client._client.put(f"/processors/{processor_id}", json=body).raise_for_status()
-    deadline = time.time() + 30.0
-    while True:
-        status_resp = client._client.get(f"/processors/{processor_id}")
-        if status_resp.status_code == 404:
-            return
-        status_resp.raise_for_status()
-        state = status_resp.json().get("component", {}).get("state")
-        if state == "STOPPED":
-            return
-        if time.time() > deadline:
-            raise RuntimeError(f"Processor {processor_id} did not stop within timeout (state={state})")
-        time.sleep(0.2)
+    response.raise_for_status()
+    _wait_for_component(client, f"/processors/{processor_id}", "STOPPED", timeout=30.0, what=f"Processor {processor_id}")
+
+
+def _wait_for_component(client: NiFiClient, path: str, target_state: str, *, timeout: float, what: str) -> None:
+    """Wait until the component at ``path`` reports ``target_state``; a 404 counts as done."""
+
+    def probe() -> Optional[str]:
+        response = client._client.get(path)
+        if response.status_code == 404:
+            return target_state
+        response.raise_for_status()
+        return response.json().get("component", {}).get("state")
+
+    wait_until(
+        probe,
+        until=lambda state: state == target_state,
+        timeout=timeout,
+        label=f"{what} {target_state}",
+        on_timeout=lambda state: RuntimeError(
+            f"{what} did not reach {target_state} within timeout (state={state})"
+        ),
+    )
 
 
 def _delete_processor(client: NiFiClient, processor_id: str) -> None:
-    entity = client._client.get(f"/processors/{processor_id}")
-    if entity.status_code == 404:
-        return
-    entity.raise_for_status()
-    revision = entity.json().get("revision") or {}
-    params = {"version": revision.get("version", 0), "clientId": CLIENT_ID}
-    client._client.delete(f"/processors/{processor_id}", params=params).raise_for_status()
+    response = client._with_revision(
+        f"/processors/{processor_id}",
+        processor_id,
+        lambda entity: client._client.delete(f"/processors/{processor_id}", params=_delete_params(entity)),
+        missing_ok=True,
+    )
+    if response is not None:
+        response.raise_for_status()
 
 
 def _disable_and_delete_service(client: NiFiClient, service_id: str) -> None:
@@ -147,58 +223,31 @@ def _disable_and_delete_service(client: NiFiClient, service_id: str) -> None:
         client.disable_controller_service(service_id)
     except Exception:
         pass
-    deadline = time.time() + 60.0
-    while True:
-        entity = client.get_controller_service(service_id)
-        state = entity.get("component", {}).get("state")
-        if state == "DISABLED":
-            break
-        if time.time() > deadline:
-            raise RuntimeError(f"Controller service {service_id} did not disable within timeout (state={state})")
-        time.sleep(0.5)
+    wait_for_services(client, [service_id], "DISABLED", timeout=60.0)
 
-    revision = entity.get("revision") or {}
-    params = {"version": revision.get("version", 0), "clientId": CLIENT_ID}
-    client._client.delete(f"/controller-services/{service_id}", params=params).raise_for_status()
+    # The polling GET above refreshed the stored revision, so this is a single DELETE
+    client.delete_controller_service(service_id)
 
 
 def _disable_port(client: NiFiClient, port_id: str, port_type: str, timeout: float = 30.0) -> None:
     path = "/input-ports" if port_type == "INPUT_PORT" else "/output-ports"
     client._update_port_state(port_id, port_type, "DISABLED")
-    deadline = time.time() + timeout
-    while True:
-        entity = client._client.get(f"{path}/{port_id}")
-        if entity.status_code == 404:
-            return
-        entity.raise_for_status()
-        state = entity.json().get("component", {}).get("state")
-        if state == "DISABLED":
-            return
-        if time.time() > deadline:
-            raise RuntimeError(f"Port {port_id} did not disable within timeout (state={state})")
-        time.sleep(0.2)
+    _wait_for_component(client, f"{path}/{port_id}", "DISABLED", timeout=timeout, what=f"Port {port_id}")
 
 
 def _delete_port_with_retry(client: NiFiClient, port_id: str, port_type: str, retries: int = 5) -> None:
     path = "/input-ports" if port_type == "INPUT_PORT" else "/output-ports"
-    for attempt in range(retries):
-        entity = client._client.get(f"{path}/{port_id}")
-        if entity.status_code == 404:
-            return
-        entity.raise_for_status()
-        revision = entity.json().get("revision") or {}
-        params = {"version": revision.get("version", 0), "clientId": CLIENT_ID}
-        response = client._client.delete(f"{path}/{port_id}", params=params)
-        if response.status_code == 404:
-            return
-        try:
-            response.raise_for_status()
-            return
-        except httpx.HTTPStatusError as exc:
-            if exc.response is not None and exc.response.status_code == 409 and attempt < retries - 1:
-                time.sleep(0.5)
-                continue
-            raise
+    response = client._with_revision(
+        f"{path}/{port_id}",
+        port_id,
+        lambda entity: client._client.delete(f"{path}/{port_id}", params=_delete_params(entity)),
+        missing_ok=True,
+        attempts=retries,
+        backoff=0.5,
+    )
+    if response is None or response.status_code == 404:
+        return
+    response.raise_for_status()
 
 
 def purge_process_group(client: NiFiClient, pg_id: str, *, delete_group: bool = False) -> None:
@@ -213,12 +262,7 @@ def purge_process_group(client: NiFiClient, pg_id: str, *, delete_group: bool =
         label_id = comp.get("id")
         if label_id:
             try:
-                entity = client._client.get(f"/labels/{label_id}")
-                if entity.status_code != 404:
-                    entity.raise_for_status()
-                    revision = entity.json().get("revision") or {}
-                    params = {"version": revision.get("version", 0), "clientId": CLIENT_ID}
-                    client._client.delete(f"/labels/{label_id}", params=params).raise_for_status()
+                client.delete_label(label_id)
             except Exception:
                 pass
 
@@ -227,11 +271,11 @@ def purge_process_group(client: NiFiClient, pg_id: str, *, delete_group: bool =
         if proc_id:
             _stop_processor(client, proc_id)
 
-    for connection in flow.get("connections") or []:
-        conn_id = connection.get("component", {}).get("id")
-        if not conn_id:
-            continue
-        _drop_connection_queue(client, conn_id)
+    connection_ids = [
+        conn_id for conn_id in (c.get("component", {}).get("id") for c in flow.get("connections") or []) if conn_id
+    ]
+    drop_connection_queues(client, connection_ids)
+    for conn_id in connection_ids:
         _delete_connection(client, conn_id)
 
     services_resp = client._client.get(
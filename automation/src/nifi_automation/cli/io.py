@@ -8,7 +8,7 @@ from typing import Any
 
 from ..app.models import CommandResult, ExitCode
 
-__all__ = ["emit_result", "emit_error"]
+__all__ = ["emit_result", "emit_error", "emit_event"]
 
 
 def _print_json(payload: Any) -> None:
@@ -42,3 +42,10 @@ def emit_error(message: str, *, exit_code: ExitCode) -> int:
 
     sys.stderr.write(f"{message}\n")
     return int(exit_code)
+
+
+def emit_event(event: Any) -> None:
+    """Write one NDJSON line to stdout and flush it so consumers see it immediately."""
+
+    sys.stdout.write(json.dumps(event, sort_keys=True) + "\n")
+    sys.stdout.flush()
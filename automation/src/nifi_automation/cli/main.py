@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Callable, Dict, Optional, Tuple
 
 import click
 
-from ..app import conn_service, ctrl_service, flow_service, proc_service, port_service, layout_service, param_service, bulletin_service, describe_service, trust_service
+from ..app import conn_service, ctrl_service, flow_service, proc_service, port_service, layout_service, param_service, bulletin_service, describe_service, metrics_service, trust_service, watch_service
 from ..app.errors import AppError, BadInputError, HTTPError, TimeoutError, ValidationError
 from ..app.models import AppConfig, CommandResult, ExitCode
-from .io import emit_error, emit_result
+from ..instrumentation import profiling
+from .io import emit_error, emit_event, emit_result
 from .targets import Target, normalize_target, VALID_TARGETS
 
 __all__ = ["app", "main"]
@@ -48,12 +50,17 @@ DISPATCH_TABLE: Dict[DispatchKey, Handler] = {
     ("inspect", "params"): param_service.inspect,
     ("rotate", "params"): param_service.rotate,
     ("inspect", "bulletins"): bulletin_service.inspect,
+    ("tail", "bulletins"): bulletin_service.tail,
     ("describe", "processors"): describe_service.describe_processor,
     ("create", "trust"): trust_service.create,
     ("add", "trust"): trust_service.add,
     ("remove", "trust"): trust_service.remove,
     ("inspect", "trust"): trust_service.inspect,
     ("create", "ssl"): trust_service.create_ssl_context,
+    ("watch", "flow"): watch_service.watch_flow,
+    ("watch", "processors"): watch_service.watch_processors,
+    ("watch", "connections"): watch_service.watch_connections,
+    ("export", "metrics"): metrics_service.export_metrics,
 }
 
 FLOWFILE_COMMANDS = {
@@ -65,6 +72,12 @@ FLOWFILE_COMMANDS = {
     ("rotate", "params"),
 }
 TRUNCATE_COMMAND = ("truncate", "connections")
+# Stream NDJSON events while running instead of printing one result at the end
+WATCH_COMMANDS = {key for key in DISPATCH_TABLE if key[0] == "watch"}
+METRICS_COMMAND = ("export", "metrics")
+TAIL_COMMAND = ("tail", "bulletins")
+# Commands that record queue depth and forecast back-pressure
+FORECAST_COMMANDS = {("status", "connections"), ("inspect", "connections")}
 
 
 def _build_config(
@@ -78,6 +91,16 @@ def _build_config(
     verbose: bool,
     dry_run: bool,
     proc_type: Optional[str] = None,
+    incremental: bool = False,
+    resume: bool = False,
+    watch_interval: float = 2.0,
+    watch_max_interval: float = 30.0,
+    metrics_listen: str = "127.0.0.1:9464",
+    metrics_refresh: float = 15.0,
+    run_duration: Optional[float] = None,
+    backpressure_horizon: float = 300.0,
+    bulletin_follow: bool = False,
+    bulletin_severity: str = "INFO",
 ) -> AppConfig:
     return AppConfig(
         base_url=base_url,
@@ -88,6 +111,16 @@ def _build_config(
         output=output,
         verbose=verbose,
         dry_run=dry_run,
+        incremental=incremental,
+        resume=resume,
+        watch_interval=watch_interval,
+        watch_max_interval=watch_max_interval,
+        metrics_listen=metrics_listen,
+        metrics_refresh=metrics_refresh,
+        run_duration=run_duration,
+        backpressure_horizon=backpressure_horizon,
+        bulletin_follow=bulletin_follow,
+        bulletin_severity=bulletin_severity,
         proc_type=proc_type,
     )
 
@@ -107,6 +140,8 @@ def _dispatch(
         return handler(config=config, flowfile=flowfile)
     if key == TRUNCATE_COMMAND:
         return handler(config=config, force=force, max_messages=max_messages)
+    if key in WATCH_COMMANDS or key == TAIL_COMMAND:
+        return handler(config=config, emit=emit_event)
     return handler(config=config)
 
 
@@ -136,8 +171,11 @@ def _report_and_exit(message: str, exit_code: ExitCode) -> None:
         "  - flow         : deploy/run/purge/status/inspect the overall flow\n"
         "  - processors   : start/stop/status/inspect all processors\n"
         "  - controllers  : enable/disable/status/inspect controller services\n"
-        "  - connections  : status/inspect/truncate connection queues\n"
+        "  - connections  : status/inspect/truncate connection queues (status/inspect forecast back-pressure)\n"
         "  - ports        : start/stop/status/inspect input/output ports\n\n"
+        "  - watch        : 'watch flow|processors|connections' streams status changes as NDJSON\n\n"
+        "  - bulletins    : 'inspect bulletins' summarises recent ones; 'tail bulletins [--follow]' reads only new ones\n\n"
+        "  - metrics      : 'export metrics' serves flow status as OpenMetrics on /metrics\n\n"
         "  - layout       : validate (validate layout)\n\n"
         "Notes:\n"
         "  - 'run flow <file>' and 'deploy flow <file>' require a flow YAML path.\n"
@@ -148,8 +186,12 @@ def _report_and_exit(message: str, exit_code: ExitCode) -> None:
         "  nifi-automation status processors --output json\n"
         "  nifi-automation inspect controllers --output json\n"
         "  nifi-automation status connections --output json\n"
+        "  nifi-automation inspect connections --horizon 600 --output json\n"
         "  nifi-automation truncate connections --output json\n"
         "  nifi-automation validate layout --output json\n"
+        "  nifi-automation watch connections --interval 1 --max-interval 15\n"
+        "  nifi-automation tail bulletins --follow --severity WARN\n"
+        "  nifi-automation export metrics --listen 0.0.0.0:9464 --refresh 15\n"
         "\nDocs:\n"
         "  - docs/trust-store-ops.md (truststore tools, controller service wiring)\n"
         "  - docs/ssl-trust-helper.md (container-side trust helper script)\n"
@@ -172,6 +214,16 @@ def _report_and_exit(message: str, exit_code: ExitCode) -> None:
 )
 @click.option("--verbose", is_flag=True, help="Enable verbose logging.")
 @click.option("--dry-run", is_flag=True, help="Plan without mutating NiFi.")
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Apply only the differences from the live flow instead of purging and redeploying.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue an interrupted deploy from its journal, skipping components that already exist.",
+)
 @click.option("--proc-type", "proc_type", default=None, help="Processor type for 'describe processors'.")
 @click.option("--ts-type", "ts_type_opt", default=None, help="Truststore type for 'trust' (PKCS12|JKS|BCFKS).")
 @click.option("--ts-name", "ts_name", default=None, help="Truststore name for 'trust' commands (e.g., local-nifi).")
@@ -181,6 +233,68 @@ def _report_and_exit(message: str, exit_code: ExitCode) -> None:
 @click.option("--ts-file", "ts_file", default=None, help="Truststore file path for 'ssl create' (overrides default).")
 @click.option("--force", is_flag=True, help="Force queue truncation when truncating connections.")
 @click.option("--max", "max_messages", type=int, default=None, help="Max FlowFiles to drop when truncating.")
+@click.option(
+    "--interval",
+    "watch_interval",
+    type=click.FloatRange(min=0.05),
+    default=None,
+    help="Seconds between polls for 'watch' and 'tail bulletins --follow' (default 2); stretches while quiet.",
+)
+@click.option(
+    "--max-interval",
+    "watch_max_interval",
+    type=click.FloatRange(min=0.05),
+    default=None,
+    help="Longest poll interval 'watch' and 'tail bulletins --follow' back off to while quiet (default 30).",
+)
+@click.option(
+    "--duration",
+    "run_duration",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Stop 'watch', 'export metrics' or 'tail bulletins --follow' after this many seconds (default: until interrupted).",
+)
+@click.option(
+    "--listen",
+    "metrics_listen",
+    default=None,
+    help="HOST:PORT 'export metrics' serves /metrics on (default 127.0.0.1:9464).",
+)
+@click.option(
+    "--refresh",
+    "metrics_refresh",
+    type=click.FloatRange(min=0.1),
+    default=None,
+    help="Seconds between background refreshes from NiFi for 'export metrics' (default 15).",
+)
+@click.option(
+    "--horizon",
+    "backpressure_horizon",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Flag connections forecast to hit back-pressure within this many seconds (default 300).",
+)
+@click.option(
+    "--follow",
+    "bulletin_follow",
+    is_flag=True,
+    help="Keep polling 'tail bulletins' and stream new bulletin groups as NDJSON.",
+)
+@click.option(
+    "--severity",
+    "bulletin_severity",
+    type=click.Choice(["INFO", "WARN", "WARNING", "ERROR"], case_sensitive=False),
+    default=None,
+    help="Lowest bulletin level 'tail bulletins' reports (default INFO).",
+)
+@click.option("--profile", is_flag=True, help="Attach a per-endpoint and per-phase timing breakdown to the result.")
+@click.option(
+    "--profile-trace",
+    "profile_trace",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the profile and a per-request event trace to this JSON file (implies --profile).",
+)
 def cli_command(
     verb: str,
     target_alias: str,
@@ -193,8 +307,18 @@ def cli_command(
     output: str,
     verbose: bool,
     dry_run: bool,
+    incremental: bool,
+    resume: bool,
     force: bool,
     max_messages: Optional[int],
+    watch_interval: Optional[float],
+    watch_max_interval: Optional[float],
+    run_duration: Optional[float],
+    metrics_listen: Optional[str],
+    metrics_refresh: Optional[float],
+    backpressure_horizon: Optional[float],
+    bulletin_follow: bool,
+    bulletin_severity: Optional[str],
     proc_type: Optional[str],
     ts_name: Optional[str],
     ts_pass: Optional[str],
@@ -202,6 +326,8 @@ def cli_command(
     ts_alias: Optional[str],
     ts_type_opt: Optional[str],
     ts_file: Optional[str],
+    profile: bool,
+    profile_trace: Optional[Path],
 ) -> None:
     """Primary CLI entry point implementing the verb/target grammar."""
 
@@ -227,9 +353,28 @@ def cli_command(
             raise click.BadParameter("--dry-run is only supported for 'run flow' and 'deploy flow'.")
         if operand is not None:
             raise click.BadParameter("Unexpected positional argument provided.")
+    if incremental and key not in {("run", "flow"), ("deploy", "flow")}:
+        raise click.BadParameter("--incremental is only supported for 'run flow' and 'deploy flow'.")
+    if resume and key not in {("run", "flow"), ("deploy", "flow")}:
+        raise click.BadParameter("--resume is only supported for 'run flow' and 'deploy flow'.")
+    if resume and (incremental or dry_run):
+        raise click.BadParameter("--resume cannot be combined with --incremental or --dry-run.")
 
     if key != TRUNCATE_COMMAND and (force or max_messages is not None):
         raise click.BadParameter("--force/--max may only be used with 'truncate connections'.")
+    following = key == TAIL_COMMAND and bulletin_follow
+    if key != TAIL_COMMAND and (bulletin_follow or bulletin_severity is not None):
+        raise click.BadParameter("--follow/--severity may only be used with 'tail bulletins'.")
+    if not (key in WATCH_COMMANDS or following) and (watch_interval is not None or watch_max_interval is not None):
+        raise click.BadParameter("--interval/--max-interval may only be used with 'watch' and 'tail bulletins --follow'.")
+    if key != METRICS_COMMAND and (metrics_listen is not None or metrics_refresh is not None):
+        raise click.BadParameter("--listen/--refresh may only be used with 'export metrics'.")
+    if run_duration is not None and not (key in WATCH_COMMANDS | {METRICS_COMMAND} or following):
+        raise click.BadParameter(
+            "--duration may only be used with 'watch', 'export metrics' and 'tail bulletins --follow'."
+        )
+    if backpressure_horizon is not None and key not in FORECAST_COMMANDS:
+        raise click.BadParameter("--horizon may only be used with 'status connections' and 'inspect connections'.")
 
     config = _build_config(
         base_url=base_url,
@@ -241,6 +386,16 @@ def cli_command(
         verbose=verbose,
         dry_run=dry_run if key in FLOWFILE_COMMANDS else False,
         proc_type=proc_type,
+        incremental=incremental,
+        resume=resume,
+        watch_interval=watch_interval if watch_interval is not None else 2.0,
+        watch_max_interval=watch_max_interval if watch_max_interval is not None else 30.0,
+        metrics_listen=metrics_listen or "127.0.0.1:9464",
+        metrics_refresh=metrics_refresh if metrics_refresh is not None else 15.0,
+        run_duration=run_duration,
+        backpressure_horizon=backpressure_horizon if backpressure_horizon is not None else 300.0,
+        bulletin_follow=following,
+        bulletin_severity=(bulletin_severity or "INFO").upper(),
     )
     # Attach trust parameters for trust target
     if target.name in {"trust", "ssl"}:
@@ -270,22 +425,36 @@ def cli_command(
         if flowfile is not None:
             click.echo(f"[cli] flowfile: {flowfile}", err=True)
 
-    try:
-        result = _dispatch(
-            key,
-            handler,
-            config=config,
-            flowfile=flowfile,
-            force=force,
-            max_messages=max_messages,
-        )
-    except AppError as exc:
-        _report_and_exit(str(exc), _exit_code_for_error(exc))
-    except FileNotFoundError as exc:
-        _report_and_exit(str(exc), ExitCode.BAD_INPUT)
-    except Exception as exc:  # pragma: no cover - defensive
-        _report_and_exit(f"Unexpected error: {exc}", ExitCode.BAD_INPUT)
-
+    with ExitStack() as stack:
+        profiler = stack.enter_context(profiling()) if (profile or profile_trace) else None
+        if profiler is not None and profile_trace is not None:
+            # Written on exit, including when the command fails
+            stack.callback(profiler.write_trace, profile_trace)
+        try:
+            result = _dispatch(
+                key,
+                handler,
+                config=config,
+                flowfile=flowfile,
+                force=force,
+                max_messages=max_messages,
+            )
+        except AppError as exc:
+            _report_and_exit(str(exc), _exit_code_for_error(exc))
+        except FileNotFoundError as exc:
+            _report_and_exit(str(exc), ExitCode.BAD_INPUT)
+        except Exception as exc:  # pragma: no cover - defensive
+            _report_and_exit(f"Unexpected error: {exc}", ExitCode.BAD_INPUT)
+
+        if profiler is not None:
+            result.details["profile"] = profiler.as_dict()
+            if config.output == "text":
+                for line in profiler.summary_lines():
+                    click.echo(line, err=True)
+
+    if key in WATCH_COMMANDS or config.bulletin_follow:
+        # The events, ending with an ``end`` event, were already streamed
+        raise click.exceptions.Exit(code=int(result.exit_code))
     raise click.exceptions.Exit(code=emit_result(result, output=config.output))
 
 
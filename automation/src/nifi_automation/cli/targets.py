@@ -26,6 +26,7 @@ CANONICAL_TARGETS = {
     "ports": {"port", "ports"},
     "params": {"param", "params", "parameter", "parameters", "pc", "pcs", "contexts", "parameter-contexts"},
     "bulletins": {"bulletin", "bulletins"},
+    "metrics": {"metric", "metrics"},
     "layout": {"layout"},
     "trust": {"trust", "trust-store", "truststore"},
     "ssl": {"ssl", "ssl-context", "sslcontext"},
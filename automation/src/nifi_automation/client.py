@@ -2,33 +2,401 @@
 
 from __future__ import annotations
 
+import json
 import time
 from contextlib import AbstractContextManager
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, TypeVar
 from urllib.parse import quote
 
 import httpx
 
+from . import instrumentation
+from .auth import TokenAuth
+from .catalog_cache import ABOUT_PATH, CatalogCache
 from .config import AuthSettings
+from .revisions import RevisionStore, is_stale_revision
+from .token_cache import TokenCache
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .async_client import AsyncBridge, AsyncNiFiClient
+
+T = TypeVar("T")
+
+CLIENT_ID = "nifi-automation"
+
+
+def _verify_flag(settings: AuthSettings) -> bool:
+    verify_flag = settings.verify_ssl
+    if isinstance(verify_flag, str):
+        verify_flag = verify_flag.lower() not in {"false", "0", "no", "off"}
+    return verify_flag
+
+
+def _position(position: tuple[float, float]) -> Dict[str, float]:
+    return {"x": position[0], "y": position[1]}
+
+
+def _find_child_group(payload: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    flow = payload.get("processGroupFlow", {}).get("flow", {})
+    for item in flow.get("processGroups", []) or []:
+        component = item.get("component", {})
+        if component.get("name") == name:
+            return item
+    return None
+
+
+def _process_group_body(
+    name: str,
+    position: tuple[float, float] | None,
+    comments: str | None,
+) -> Dict[str, Any]:
+    return {
+        "revision": {"version": 0},
+        "component": {
+            "name": name,
+            **({"position": _position(position)} if position else {}),
+            **({"comments": comments} if comments else {}),
+        },
+    }
+
+
+def _index_bundles(items: List[Dict[str, Any]]) -> Dict[str, Dict[str, str]]:
+    """Map type names from a ``/flow/*-types`` listing to their bundle coordinates."""
+
+    index: Dict[str, Dict[str, str]] = {}
+    for item in items:
+        type_name = item.get("type")
+        bundle = item.get("bundle")
+        if type_name and bundle and type_name not in index:
+            index[type_name] = bundle
+    return index
+
+
+def _definition_path(kind: str, bundle: Dict[str, str], type_name: str) -> str:
+    encoded_type = quote(type_name, safe="")
+    return (
+        f"/flow/{kind}-definition/"
+        f"{bundle.get('group')}/{bundle.get('artifact')}/{bundle.get('version')}/{encoded_type}"
+    )
+
+
+def _metadata_cache_key(type_name: str, bundle: Dict[str, str]) -> str:
+    return f"{type_name}|{bundle.get('group')}|{bundle.get('artifact')}|{bundle.get('version')}"
+
+
+def _processor_body(
+    name: str,
+    type_name: str,
+    bundle: Dict[str, str],
+    position: tuple[float, float],
+    properties: Optional[Dict[str, str]],
+    scheduling_strategy: Optional[str],
+    scheduling_period: Optional[str],
+    *,
+    auto_terminate: Optional[List[str]] = None,
+    comments: Optional[str] = None,
+    concurrent_tasks: Optional[int] = None,
+    run_duration_millis: Optional[int] = None,
+    penalty_duration: Optional[str] = None,
+    yield_duration: Optional[str] = None,
+    execution_node: Optional[str] = None,
+    state: Optional[str] = None,
+) -> Dict[str, Any]:
+    config: Dict[str, Any] = {
+        "properties": properties or {},
+        "schedulingPeriod": scheduling_period or "0 sec",
+        "schedulingStrategy": scheduling_strategy or "TIMER_DRIVEN",
+    }
+    if auto_terminate:
+        config["autoTerminatedRelationships"] = sorted(auto_terminate)
+    if comments:
+        config["comments"] = comments
+    if concurrent_tasks:
+        config["concurrentlySchedulableTaskCount"] = int(concurrent_tasks)
+    if run_duration_millis is not None:
+        config["runDurationMillis"] = int(run_duration_millis)
+    if penalty_duration:
+        config["penaltyDuration"] = penalty_duration
+    if yield_duration:
+        config["yieldDuration"] = yield_duration
+    if execution_node:
+        config["executionNode"] = execution_node
+    component: Dict[str, Any] = {
+        "name": name,
+        "type": type_name,
+        "bundle": bundle,
+        "position": _position(position),
+        "config": config,
+    }
+    if state:
+        component["state"] = state.upper()
+    return {"revision": {"version": 0}, "component": component}
+
+
+def _autoterminate_body(processor_id: str, entity: Dict[str, Any], relationships: List[str]) -> Dict[str, Any]:
+    component = entity.get("component", {})
+    existing = component.get("config", {}).get("autoTerminatedRelationships") or []
+    updated = sorted(set(existing) | set(relationships))
+    return {
+        "revision": _revision_of(entity),
+        "component": {
+            "id": processor_id,
+            "config": {"autoTerminatedRelationships": updated},
+        },
+    }
+
+
+def _revision_of(entity: Dict[str, Any]) -> Dict[str, Any]:
+    return {"clientId": CLIENT_ID, "version": (entity.get("revision") or {}).get("version", 0)}
+
+
+def _delete_params(entity: Dict[str, Any], **extra: str) -> Dict[str, str]:
+    version = (entity.get("revision") or {}).get("version", 0)
+    return {"version": str(version), "clientId": CLIENT_ID, **extra}
+
+
+def _label_body(
+    text: str,
+    position: tuple[float, float],
+    width: float,
+    height: float,
+    style: Optional[Dict[str, str]],
+) -> Dict[str, Any]:
+    return {
+        "revision": {"version": 0},
+        "component": {
+            "position": _position(position),
+            "label": text,
+            "width": width,
+            "height": height,
+            **({"style": style} if style else {}),
+        },
+    }
+
+
+def _bulletin_params(limit: int, after: int | None) -> Dict[str, str]:
+    params = {"limit": str(limit)}
+    if after is not None:
+        params["after"] = str(after)
+    return params
+
+
+def _bulletin_rows(data: Dict[str, Any]) -> List[Dict[str, object]]:
+    items = data.get("bulletinBoard", {}).get("bulletins", []) or []
+    rows: List[Dict[str, object]] = []
+    for it in items:
+        b = it.get("bulletin", {})
+        rows.append(
+            {
+                "id": it.get("id"),
+                "level": b.get("level"),
+                "groupId": b.get("groupId"),
+                "sourceId": b.get("sourceId"),
+                "sourceName": b.get("sourceName"),
+                "message": b.get("message"),
+                "timestamp": b.get("timestamp"),
+            }
+        )
+    return rows
+
+
+def _port_body(
+    name: str,
+    position: tuple[float, float],
+    allow_remote: bool,
+    comments: Optional[str],
+) -> Dict[str, Any]:
+    component: Dict[str, Any] = {
+        "name": name,
+        "position": _position(position),
+    }
+    if allow_remote:
+        component["allowRemoteAccess"] = True
+    if comments:
+        component["comments"] = comments
+    return {"revision": {"version": 0}, "component": component}
+
+
+def _port_path(port_type: str) -> str:
+    return "/input-ports" if port_type == "INPUT_PORT" else "/output-ports"
+
+
+def _connection_body(
+    parent_id: str,
+    name: str,
+    source_id: str,
+    destination_id: str,
+    relationships: List[str],
+    source_type: str,
+    destination_type: str,
+    source_group_id: Optional[str],
+    destination_group_id: Optional[str],
+    queue_settings: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    component: Dict[str, Any] = {
+        "name": name,
+        "source": {
+            "id": source_id,
+            "type": source_type,
+            "groupId": source_group_id or parent_id,
+        },
+        "destination": {
+            "id": destination_id,
+            "type": destination_type,
+            "groupId": destination_group_id or parent_id,
+        },
+        "flowFileExpiration": "0 sec",
+        "backPressureObjectThreshold": 10000,
+        "backPressureDataSizeThreshold": "1 GB",
+        "loadBalanceStrategy": "DO_NOT_LOAD_BALANCE",
+        "loadBalancePartitionAttribute": "",
+        "loadBalanceCompression": "DO_NOT_COMPRESS",
+        "bendPoints": [],
+    }
+    # Per-connection back-pressure, expiration, load balancing and prioritizers
+    component.update(queue_settings or {})
+    if relationships:
+        component["selectedRelationships"] = relationships
+    return {"revision": {"version": 0}, "component": component}
+
+
+def _raise_with_body(response: httpx.Response) -> None:
+    try:
+        response.raise_for_status()
+    except httpx.HTTPStatusError as exc:
+        detail = exc.response.text if exc.response is not None else ""
+        raise httpx.HTTPStatusError(
+            f"{exc}\nResponse body: {detail}", request=exc.request, response=exc.response
+        ) from exc
+
+
+def _explicit_bundle(bundle_hint: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+    if not bundle_hint:
+        return None
+    bundle = {
+        "group": bundle_hint.get("group"),
+        "artifact": bundle_hint.get("artifact"),
+        "version": bundle_hint.get("version"),
+    }
+    return bundle if all(bundle.values()) else None
+
+
+def _controller_service_body(
+    parent_id: str,
+    name: str,
+    type_name: str,
+    bundle: Dict[str, str],
+    properties: Optional[Dict[str, str]],
+) -> Dict[str, Any]:
+    return {
+        "revision": {"version": 0},
+        "component": {
+            "name": name,
+            "type": type_name,
+            "bundle": bundle,
+            "parentGroupId": parent_id,
+            "properties": properties or {},
+        },
+    }
+
+
+def _candidate_params(api_type: str, api_bundle: Optional[Dict[str, str]]) -> Dict[str, str]:
+    params: Dict[str, str] = {"serviceType": api_type}
+    if api_bundle:
+        if api_bundle.get("group"):
+            params["serviceBundleGroup"] = api_bundle["group"]
+        if api_bundle.get("artifact"):
+            params["serviceBundleArtifact"] = api_bundle["artifact"]
+        if api_bundle.get("version"):
+            params["serviceBundleVersion"] = api_bundle["version"]
+    return params
+
 
 
 class NiFiClient(AbstractContextManager["NiFiClient"]):
     """Context manager wrapper around ``httpx.Client`` with NiFi helpers."""
 
     def __init__(self, settings: AuthSettings, token: str):
-        headers = {"Authorization": f"Bearer {token}"}
-        verify_flag = settings.verify_ssl
-        if isinstance(verify_flag, str):
-            verify_flag = verify_flag.lower() not in {"false", "0", "no", "off"}
+        self._settings = settings
+        self._auth = TokenAuth(settings, token, cache=TokenCache.from_settings(settings))
+        self.revisions = RevisionStore()
         self._client = httpx.Client(
             base_url=str(settings.base_url),
-            verify=verify_flag,
+            verify=_verify_flag(settings),
             timeout=settings.timeout,
-            headers=headers,
+            auth=self._auth,
+            event_hooks={"response": [self._observe_response]},
         )
         self._bundle_cache: Dict[str, Dict[str, str]] = {}
         self._processor_metadata_cache: Dict[str, Dict[str, Any]] = {}
         self._controller_service_bundle_cache: Dict[str, Dict[str, str]] = {}
+        self._controller_service_definition_cache: Dict[str, Dict[str, Any]] = {}
+        self._async_bridge: Optional["AsyncBridge"] = None
+        self._catalog = CatalogCache.from_settings(settings)
+        self._catalog_live: set[str] = set()
+
+    def _observe_response(self, response: httpx.Response) -> None:
+        # Record revisions from every entity NiFi returns, including raw ``_client`` calls
+        response.read()
+        self.revisions.observe_response(response)
+        instrumentation.record_response(response)
+
+    def _with_revision(
+        self,
+        path: str,
+        component_id: str,
+        send: Callable[[Dict[str, Any]], httpx.Response],
+        *,
+        missing_ok: bool = False,
+        attempts: int = 5,
+        backoff: float = 0.2,
+    ) -> Optional[httpx.Response]:
+        """Call ``send(entity)`` using the stored entity, fetching it only when unknown.
+
+        A stale revision (NiFi's ``400`` "not the most up-to-date revision", or a
+        ``409``) drops the entry and refetches the entity before retrying. Returns ``None`` if the component is gone
+        and ``missing_ok`` is set.
+        """
+
+        response: Optional[httpx.Response] = None
+        for attempt in range(attempts):
+            entity = self.revisions.entity(component_id)
+            if entity is None:
+                current = self._client.get(path)
+                if current.status_code == 404 and missing_ok:
+                    return None
+                current.raise_for_status()
+                entity = current.json() or {}
+            response = send(entity)
+            if not is_stale_revision(response):
+                return response
+            self.revisions.forget(component_id)
+            instrumentation.record_retry(response.request.method, response.request.url.path)
+            if attempt:
+                time.sleep(backoff)
+        return response
+
+    @property
+    def settings(self) -> AuthSettings:
+        return self._settings
+
+    @property
+    def token(self) -> str:
+        """Current bearer token; renewed in place when NiFi rejects or expires it."""
+
+        return self._auth.token
+
+    def run_async(self, func: Callable[["AsyncNiFiClient"], Awaitable[T]]) -> T:
+        """Run ``func(async_client)`` on a shared :class:`AsyncNiFiClient` and return its result.
+
+        The async session is opened on first use with this client's settings and token.
+        """
+
+        if self._async_bridge is None:
+            from .async_client import AsyncBridge
+
+            self._async_bridge = AsyncBridge(self._settings, self.token, auth=self._auth, revisions=self.revisions)
+        return self._async_bridge.run(func)
 
     def get_root_flow(self) -> Dict[str, Any]:
         response = self._client.get("/flow/process-groups/root")
@@ -38,12 +406,7 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
     def find_child_process_group_by_name(self, parent_id: str, name: str) -> Optional[Dict[str, Any]]:
         response = self._client.get(f"/flow/process-groups/{parent_id}")
         response.raise_for_status()
-        flow = response.json().get("processGroupFlow", {}).get("flow", {})
-        for item in flow.get("processGroups", []) or []:
-            component = item.get("component", {})
-            if component.get("name") == name:
-                return item
-        return None
+        return _find_child_group(response.json(), name)
 
     def get_process_group(self, pg_id: str) -> Dict[str, Any]:
         response = self._client.get(f"/process-groups/{pg_id}")
@@ -58,20 +421,40 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
         *,
         comments: str | None = None,
     ) -> Dict[str, Any]:
-        body = {
-            "revision": {"version": 0},
-            "component": {
-                "name": name,
-                **({"position": {"x": position[0], "y": position[1]}} if position else {}),
-                **({"comments": comments} if comments else {}),
-            },
-        }
+        body = _process_group_body(name, position, comments)
         response = self._client.post(f"/process-groups/{parent_id}/process-groups", json=body)
         response.raise_for_status()
         return response.json()["component"]
 
+    def get_process_group_flow(self, pg_id: str) -> Dict[str, Any]:
+        response = self._client.get(f"/flow/process-groups/{pg_id}")
+        response.raise_for_status()
+        return response.json().get("processGroupFlow", {}).get("flow", {}) or {}
+
+    def upload_process_group(
+        self,
+        parent_id: str,
+        name: str,
+        snapshot: Dict[str, Any],
+        position: tuple[float, float] | None,
+    ) -> Dict[str, Any]:
+        """Create a process group tree from a versioned flow snapshot in a single request."""
+
+        x, y = position or (0.0, 0.0)
+        data = {
+            "groupName": name,
+            "positionX": str(float(x)),
+            "positionY": str(float(y)),
+            "clientId": CLIENT_ID,
+            "disconnectedNodeAcknowledged": "false",
+        }
+        files = {"file": ("flow.json", json.dumps(snapshot).encode("utf-8"), "application/json")}
+        response = self._client.post(f"/process-groups/{parent_id}/process-groups/upload", data=data, files=files)
+        response.raise_for_status()
+        return response.json()["component"]
+
     def delete_process_group(self, pg_id: str, version: int) -> None:
-        params = {"version": str(version), "clientId": "nifi-automation", "recursive": "true"}
+        params = {"version": str(version), "clientId": CLIENT_ID, "recursive": "true"}
         response = self._client.delete(f"/process-groups/{pg_id}", params=params)
         response.raise_for_status()
 
@@ -81,53 +464,108 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
             self._client.put(f"/flow/process-groups/{pg_id}", json={"id": pg_id, "state": "STOPPED"}).raise_for_status()
         except httpx.HTTPStatusError:
             pass
-        for _ in range(5):
-            entity = self.get_process_group(pg_id)
-            revision = entity.get("revision", {})
-            version = revision.get("version")
-            if version is None:
-                raise RuntimeError(f"Unable to determine revision for process group {pg_id}")
+        response = self._with_revision(
+            f"/process-groups/{pg_id}",
+            pg_id,
+            lambda entity: self._client.delete(f"/process-groups/{pg_id}", params=_delete_params(entity, recursive="true")),
+            attempts=6,
+            backoff=0.5,
+        )
+        response.raise_for_status()
+
+    def _get_catalog_json(
+        self,
+        path: str,
+        params: Optional[Dict[str, str]] = None,
+        *,
+        refresh: bool = False,
+    ) -> Dict[str, Any]:
+        """GET a type listing or definition, served from the on-disk catalog when possible."""
+
+        catalog = self._catalog
+        if catalog is not None and not catalog.bound:
             try:
-                self.delete_process_group(pg_id, version)
-                return
-            except httpx.HTTPStatusError as exc:
-                if exc.response.status_code != 409:
-                    raise
-                time.sleep(0.5)
-        # Final attempt, let exception propagate if it still fails
-        entity = self.get_process_group(pg_id)
-        revision = entity.get("revision", {})
-        version = revision.get("version")
-        self.delete_process_group(pg_id, version)
+                about = self._client.get(ABOUT_PATH)
+                about.raise_for_status()
+                catalog.bind(about.json() or {})
+            except httpx.HTTPError:
+                # Without a server build to key on, cached entries cannot be trusted
+                catalog = self._catalog = None
+        if catalog is not None and not refresh:
+            cached = catalog.get(path, params)
+            if cached is not None:
+                return cached
+        response = self._client.get(path, params=params) if params else self._client.get(path)
+        response.raise_for_status()
+        data = response.json() or {}
+        self._catalog_live.add(path)
+        if catalog is not None:
+            catalog.put(path, data, params)
+        return data
+
+    def _index_types(self, path: str, key: str, cache: Dict[str, Dict[str, str]], type_name: str) -> None:
+        for known, bundle in _index_bundles(self._get_catalog_json(path).get(key, [])).items():
+            cache.setdefault(known, bundle)
+        if type_name not in cache and path not in self._catalog_live:
+            # The cached listing may predate a NAR added without a version change
+            for known, bundle in _index_bundles(self._get_catalog_json(path, refresh=True).get(key, [])).items():
+                cache.setdefault(known, bundle)
 
     def _resolve_bundle(self, type_name: str) -> Dict[str, str]:
         if type_name in self._bundle_cache:
             return self._bundle_cache[type_name]
-        response = self._client.get("/flow/processor-types")
-        response.raise_for_status()
-        processor_types = response.json().get("processorTypes", [])
-        for item in processor_types:
-            if item.get("type") == type_name:
-                bundle = item.get("bundle")
-                if not bundle:
-                    break
-                self._bundle_cache[type_name] = bundle
-                return bundle
+        self._index_types("/flow/processor-types", "processorTypes", self._bundle_cache, type_name)
+        if type_name in self._bundle_cache:
+            return self._bundle_cache[type_name]
         raise ValueError(f"Processor type not found: {type_name}")
 
+    def prefetch_definitions(
+        self,
+        processor_types: Iterable[str],
+        controller_service_types: Iterable[str] = (),
+    ) -> int:
+        """Fetch the definitions of all uncached types in one concurrent burst.
+
+        Later ``get_processor_metadata`` and ``get_controller_service_definition`` calls
+        are then served from memory. Returns the number of definitions fetched.
+        """
+
+        processors = [
+            name
+            for name in dict.fromkeys(processor_types)
+            if name
+            and not (
+                name in self._bundle_cache
+                and _metadata_cache_key(name, self._bundle_cache[name]) in self._processor_metadata_cache
+            )
+        ]
+        services = [
+            name
+            for name in dict.fromkeys(controller_service_types)
+            if name
+            and not (
+                name in self._controller_service_bundle_cache
+                and _metadata_cache_key(name, self._controller_service_bundle_cache[name])
+                in self._controller_service_definition_cache
+            )
+        ]
+        if not processors and not services:
+            return 0
+        fetched = self.run_async(lambda aclient: aclient.fetch_definitions(processors, services))
+        for name, (bundle, definition) in fetched["processors"].items():
+            self._bundle_cache.setdefault(name, bundle)
+            self._processor_metadata_cache[_metadata_cache_key(name, bundle)] = definition
+        for name, (bundle, definition) in fetched["controllerServices"].items():
+            self._controller_service_bundle_cache.setdefault(name, bundle)
+            self._controller_service_definition_cache[_metadata_cache_key(name, bundle)] = definition
+        return len(fetched["processors"]) + len(fetched["controllerServices"])
+
     def get_processor_metadata(self, type_name: str) -> Dict[str, Any]:
         bundle = self._resolve_bundle(type_name)
-        bundle_group = bundle.get("group")
-        bundle_artifact = bundle.get("artifact")
-        bundle_version = bundle.get("version")
-        cache_key = f"{type_name}|{bundle_group}|{bundle_artifact}|{bundle_version}"
+        cache_key = _metadata_cache_key(type_name, bundle)
         if cache_key in self._processor_metadata_cache:
             return self._processor_metadata_cache[cache_key]
-        encoded_type = quote(type_name, safe="")
-        path = f"/flow/processor-definition/{bundle_group}/{bundle_artifact}/{bundle_version}/{encoded_type}"
-        response = self._client.get(path)
-        response.raise_for_status()
-        data = response.json()
+        data = self._get_catalog_json(_definition_path("processor", bundle, type_name))
         self._processor_metadata_cache[cache_key] = data
         return data
 
@@ -141,23 +579,35 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
         *,
         scheduling_strategy: Optional[str] = None,
         scheduling_period: Optional[str] = None,
+        auto_terminate: Optional[List[str]] = None,
+        comments: Optional[str] = None,
+        concurrent_tasks: Optional[int] = None,
+        run_duration_millis: Optional[int] = None,
+        penalty_duration: Optional[str] = None,
+        yield_duration: Optional[str] = None,
+        execution_node: Optional[str] = None,
+        state: Optional[str] = None,
     ) -> Dict[str, Any]:
+        """Create a processor with its configuration, auto-termination and initial state in one request."""
+
         bundle = self._resolve_bundle(type_name)
-        config = {
-            "properties": properties or {},
-            "schedulingPeriod": scheduling_period or "0 sec",
-            "schedulingStrategy": scheduling_strategy or "TIMER_DRIVEN",
-        }
-        body = {
-            "revision": {"version": 0},
-            "component": {
-                "name": name,
-                "type": type_name,
-                "bundle": bundle,
-                "position": {"x": position[0], "y": position[1]},
-                "config": config,
-            },
-        }
+        body = _processor_body(
+            name,
+            type_name,
+            bundle,
+            position,
+            properties,
+            scheduling_strategy,
+            scheduling_period,
+            auto_terminate=auto_terminate,
+            comments=comments,
+            concurrent_tasks=concurrent_tasks,
+            run_duration_millis=run_duration_millis,
+            penalty_duration=penalty_duration,
+            yield_duration=yield_duration,
+            execution_node=execution_node,
+            state=state,
+        )
         # NiFi can return a transient 404 for a just-created child PG; retry briefly
         for attempt in range(10):
             response = self._client.post(f"/process-groups/{parent_id}/processors", json=body)
@@ -178,26 +628,34 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
                         )
                     except Exception:
                         pass
+                    instrumentation.record_retry("POST", f"/process-groups/{parent_id}/processors")
                     time.sleep(0.2)
                     continue
                 raise
 
     def set_processor_state(self, processor_id: str, state: str) -> None:
-        for attempt in range(5):
-            entity_resp = self._client.get(f"/processors/{processor_id}")
-            entity_resp.raise_for_status()
-            entity = entity_resp.json() or {}
-            revision = entity.get("revision") or {}
-            component = {"id": processor_id, "state": state}
-            body = {"revision": revision, "component": component}
-            response = self._client.put(f"/processors/{processor_id}", json=body)
-            try:
-                response.raise_for_status()
-                return
-            except httpx.HTTPStatusError as exc:  # pragma: no cover - retry loop
-                if exc.response is None or exc.response.status_code != 409 or attempt == 4:
-                    raise
-                time.sleep(0.2)
+        response = self._with_revision(
+            f"/processors/{processor_id}",
+            processor_id,
+            lambda entity: self._client.put(
+                f"/processors/{processor_id}",
+                json={"revision": _revision_of(entity), "component": {"id": processor_id, "state": state}},
+            ),
+        )
+        response.raise_for_status()
+
+    def set_processor_run_status(self, processor_id: str, state: str) -> None:
+        """Change run status via ``/processors/{id}/run-status`` (supports ``RUN_ONCE``)."""
+
+        response = self._with_revision(
+            f"/processors/{processor_id}",
+            processor_id,
+            lambda entity: self._client.put(
+                f"/processors/{processor_id}/run-status",
+                json={"revision": _revision_of(entity), "state": state},
+            ),
+        )
+        response.raise_for_status()
 
     def schedule_process_group(self, process_group_id: str, state: str) -> None:
         for attempt in range(5):
@@ -211,24 +669,52 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
             except httpx.HTTPStatusError as exc:  # pragma: no cover - retry loop
                 if exc.response is None or exc.response.status_code != 409 or attempt == 4:
                     raise
+                instrumentation.record_retry("PUT", f"/flow/process-groups/{process_group_id}")
                 time.sleep(0.2)
 
     def update_processor_autoterminate(self, processor_id: str, relationships: List[str]) -> None:
-        entity = self._client.get(f"/processors/{processor_id}").json()
-        revision = entity.get("revision", {})
-        component = entity.get("component", {})
-        existing = component.get("config", {}).get("autoTerminatedRelationships") or []
-        updated = sorted(set(existing) | set(relationships))
-        body = {
-            "revision": revision,
-            "component": {
-                "id": processor_id,
-                "config": {"autoTerminatedRelationships": updated},
-            },
-        }
-        response = self._client.put(f"/processors/{processor_id}", json=body)
+        # The stored entity (e.g. from the create response) supplies the existing relationships
+        response = self._with_revision(
+            f"/processors/{processor_id}",
+            processor_id,
+            lambda entity: self._client.put(
+                f"/processors/{processor_id}", json=_autoterminate_body(processor_id, entity, relationships)
+            ),
+        )
         response.raise_for_status()
 
+    def update_processor_config(self, processor_id: str, config: Dict[str, Any]) -> None:
+        """Apply a partial ``component.config`` update; ``None`` property values reset to the default."""
+
+        response = self._with_revision(
+            f"/processors/{processor_id}",
+            processor_id,
+            lambda entity: self._client.put(
+                f"/processors/{processor_id}",
+                json={"revision": _revision_of(entity), "component": {"id": processor_id, "config": config}},
+            ),
+        )
+        _raise_with_body(response)
+
+    def update_connection_relationships(self, connection_id: str, relationships: List[str]) -> None:
+        self.update_connection(connection_id, {"selectedRelationships": list(relationships)})
+
+    def update_connection(self, connection_id: str, fields: Mapping[str, Any]) -> None:
+        """Apply ``ConnectionDTO`` fields (relationships or queue settings) to a connection."""
+
+        response = self._with_revision(
+            f"/connections/{connection_id}",
+            connection_id,
+            lambda entity: self._client.put(
+                f"/connections/{connection_id}",
+                json={
+                    "revision": _revision_of(entity),
+                    "component": {**fields, "id": connection_id},
+                },
+            ),
+        )
+        _raise_with_body(response)
+
     def create_label(
         self,
         parent_id: str,
@@ -238,54 +724,25 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
         height: float,
         style: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
-        body = {
-            "revision": {"version": 0},
-            "component": {
-                "position": {"x": position[0], "y": position[1]},
-                "label": text,
-                "width": width,
-                "height": height,
-                **({"style": style} if style else {}),
-            },
-        }
+        body = _label_body(text, position, width, height, style)
         resp = self._client.post(f"/process-groups/{parent_id}/labels", json=body)
         resp.raise_for_status()
         return resp.json()["component"]
 
     def delete_label(self, label_id: str) -> None:
-        entity = self._client.get(f"/labels/{label_id}")
-        if entity.status_code == 404:
-            return
-        entity.raise_for_status()
-        revision = entity.json().get("revision") or {}
-        params = {"version": revision.get("version", 0), "clientId": "nifi-automation"}
-        resp = self._client.delete(f"/labels/{label_id}", params=params)
-        if resp.status_code not in (200, 202, 204, 404):
+        resp = self._with_revision(
+            f"/labels/{label_id}",
+            label_id,
+            lambda entity: self._client.delete(f"/labels/{label_id}", params=_delete_params(entity)),
+            missing_ok=True,
+        )
+        if resp is not None and resp.status_code not in (200, 202, 204, 404):
             resp.raise_for_status()
 
     def get_bulletins(self, *, limit: int = 200, after: int | None = None) -> List[Dict[str, object]]:
-        params = {"limit": str(limit)}
-        if after is not None:
-            params["after"] = str(after)
-        resp = self._client.get("/flow/bulletin-board", params=params)
+        resp = self._client.get("/flow/bulletin-board", params=_bulletin_params(limit, after))
         resp.raise_for_status()
-        data = resp.json() or {}
-        items = data.get("bulletinBoard", {}).get("bulletins", []) or []
-        rows: List[Dict[str, object]] = []
-        for it in items:
-            b = it.get("bulletin", {})
-            rows.append(
-                {
-                    "id": it.get("id"),
-                    "level": b.get("level"),
-                    "groupId": b.get("groupId"),
-                    "sourceId": b.get("sourceId"),
-                    "sourceName": b.get("sourceName"),
-                    "message": b.get("message"),
-                    "timestamp": b.get("timestamp"),
-                }
-            )
-        return rows
+        return _bulletin_rows(resp.json() or {})
 
     def create_input_port(
         self,
@@ -295,15 +752,7 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
         allow_remote: bool = False,
         comments: Optional[str] = None,
     ) -> Dict[str, Any]:
-        component = {
-            "name": name,
-            "position": {"x": position[0], "y": position[1]},
-        }
-        if allow_remote:
-            component["allowRemoteAccess"] = True
-        if comments:
-            component["comments"] = comments
-        body = {"revision": {"version": 0}, "component": component}
+        body = _port_body(name, position, allow_remote, comments)
         response = self._client.post(f"/process-groups/{parent_id}/input-ports", json=body)
         response.raise_for_status()
         return response.json()["component"]
@@ -316,32 +765,29 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
         allow_remote: bool = False,
         comments: Optional[str] = None,
     ) -> Dict[str, Any]:
-        component = {
-            "name": name,
-            "position": {"x": position[0], "y": position[1]},
-        }
-        if allow_remote:
-            component["allowRemoteAccess"] = True
-        if comments:
-            component["comments"] = comments
-        body = {"revision": {"version": 0}, "component": component}
+        body = _port_body(name, position, allow_remote, comments)
         response = self._client.post(f"/process-groups/{parent_id}/output-ports", json=body)
         response.raise_for_status()
         return response.json()["component"]
 
     def _update_port_state(self, port_id: str, port_type: str, state: str) -> None:
-        path = "/input-ports" if port_type == "INPUT_PORT" else "/output-ports"
-        entity = self._client.get(f"{path}/{port_id}").json()
-        revision = entity.get("revision", {})
-        body = {"revision": revision, "component": {"id": port_id, "state": state}}
-        self._client.put(f"{path}/{port_id}", json=body).raise_for_status()
+        path = _port_path(port_type)
+        self._with_revision(
+            f"{path}/{port_id}",
+            port_id,
+            lambda entity: self._client.put(
+                f"{path}/{port_id}",
+                json={"revision": _revision_of(entity), "component": {"id": port_id, "state": state}},
+            ),
+        ).raise_for_status()
 
     def delete_port(self, port_id: str, port_type: str) -> None:
-        path = "/input-ports" if port_type == "INPUT_PORT" else "/output-ports"
-        entity = self._client.get(f"{path}/{port_id}").json()
-        revision = entity.get("revision", {})
-        params = {"version": revision.get("version", 0), "clientId": "nifi-automation"}
-        self._client.delete(f"{path}/{port_id}", params=params).raise_for_status()
+        path = _port_path(port_type)
+        self._with_revision(
+            f"{path}/{port_id}",
+            port_id,
+            lambda entity: self._client.delete(f"{path}/{port_id}", params=_delete_params(entity)),
+        ).raise_for_status()
 
     def create_connection(
         self,
@@ -355,38 +801,22 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
         *,
         source_group_id: Optional[str] = None,
         destination_group_id: Optional[str] = None,
+        queue_settings: Optional[Mapping[str, Any]] = None,
     ) -> Dict[str, Any]:
-        component = {
-            "name": name,
-            "source": {
-                "id": source_id,
-                "type": source_type,
-                "groupId": source_group_id or parent_id,
-            },
-            "destination": {
-                "id": destination_id,
-                "type": destination_type,
-                "groupId": destination_group_id or parent_id,
-            },
-            "flowFileExpiration": "0 sec",
-            "backPressureObjectThreshold": 10000,
-            "backPressureDataSizeThreshold": "1 GB",
-            "loadBalanceStrategy": "DO_NOT_LOAD_BALANCE",
-            "loadBalancePartitionAttribute": "",
-            "loadBalanceCompression": "DO_NOT_COMPRESS",
-            "bendPoints": [],
-        }
-        if relationships:
-            component["selectedRelationships"] = relationships
-        body = {"revision": {"version": 0}, "component": component}
+        body = _connection_body(
+            parent_id,
+            name,
+            source_id,
+            destination_id,
+            relationships,
+            source_type,
+            destination_type,
+            source_group_id,
+            destination_group_id,
+            queue_settings,
+        )
         response = self._client.post(f"/process-groups/{parent_id}/connections", json=body)
-        try:
-            response.raise_for_status()
-        except httpx.HTTPStatusError as exc:  # type: ignore[name-defined]
-            detail = exc.response.text if exc.response is not None else ""
-            raise httpx.HTTPStatusError(
-                f"{exc}\nResponse body: {detail}", request=exc.request, response=exc.response
-            ) from exc
+        _raise_with_body(response)
         return response.json()["component"]
 
     def _resolve_controller_service_bundle(
@@ -394,26 +824,20 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
         type_name: str,
         bundle_hint: Optional[Dict[str, str]] = None,
     ) -> Dict[str, str]:
-        if bundle_hint:
-            bundle = {
-                "group": bundle_hint.get("group"),
-                "artifact": bundle_hint.get("artifact"),
-                "version": bundle_hint.get("version"),
-            }
-            if all(bundle.values()):
-                self._controller_service_bundle_cache[type_name] = bundle
-                return bundle
+        explicit = _explicit_bundle(bundle_hint)
+        if explicit:
+            self._controller_service_bundle_cache[type_name] = explicit
+            return explicit
+        if type_name in self._controller_service_bundle_cache:
+            return self._controller_service_bundle_cache[type_name]
+        self._index_types(
+            "/flow/controller-service-types",
+            "controllerServiceTypes",
+            self._controller_service_bundle_cache,
+            type_name,
+        )
         if type_name in self._controller_service_bundle_cache:
             return self._controller_service_bundle_cache[type_name]
-        response = self._client.get("/flow/controller-service-types")
-        response.raise_for_status()
-        service_types = response.json().get("controllerServiceTypes", [])
-        for item in service_types:
-            if item.get("type") == type_name:
-                bundle = item.get("bundle")
-                if bundle:
-                    self._controller_service_bundle_cache[type_name] = bundle
-                    return bundle
         raise ValueError(f"Controller service type not found: {type_name}")
 
     def create_controller_service(
@@ -425,16 +849,7 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
         properties: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
         resolved_bundle = self._resolve_controller_service_bundle(type_name, bundle)
-        body = {
-            "revision": {"version": 0},
-            "component": {
-                "name": name,
-                "type": type_name,
-                "bundle": resolved_bundle,
-                "parentGroupId": parent_id,
-                "properties": properties or {},
-            },
-        }
+        body = _controller_service_body(parent_id, name, type_name, resolved_bundle, properties)
         response = self._client.post(f"/process-groups/{parent_id}/controller-services", json=body)
         response.raise_for_status()
         return response.json()["component"]
@@ -444,32 +859,29 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
         response.raise_for_status()
         return response.json()
 
-    def enable_controller_service(self, service_id: str) -> None:
-        entity = self.get_controller_service(service_id)
-        revision = entity.get("revision") or {}
-        body = {
-            "revision": revision,
-            "state": "ENABLED",
-        }
-        response = self._client.put(f"/controller-services/{service_id}/run-status", json=body)
+    def _set_controller_service_state(self, service_id: str, state: str) -> None:
+        response = self._with_revision(
+            f"/controller-services/{service_id}",
+            service_id,
+            lambda entity: self._client.put(
+                f"/controller-services/{service_id}/run-status",
+                json={"revision": _revision_of(entity), "state": state},
+            ),
+        )
         response.raise_for_status()
 
+    def enable_controller_service(self, service_id: str) -> None:
+        self._set_controller_service_state(service_id, "ENABLED")
+
     def disable_controller_service(self, service_id: str) -> None:
-        entity = self.get_controller_service(service_id)
-        revision = entity.get("revision") or {}
-        body = {
-            "revision": revision,
-            "state": "DISABLED",
-        }
-        response = self._client.put(f"/controller-services/{service_id}/run-status", json=body)
-        response.raise_for_status()
+        self._set_controller_service_state(service_id, "DISABLED")
 
     def delete_controller_service(self, service_id: str) -> None:
-        entity = self.get_controller_service(service_id)
-        revision = entity.get("revision") or {}
-        version = revision.get("version")
-        params = {"version": str(version), "clientId": "nifi-automation"}
-        response = self._client.delete(f"/controller-services/{service_id}", params=params)
+        response = self._with_revision(
+            f"/controller-services/{service_id}",
+            service_id,
+            lambda entity: self._client.delete(f"/controller-services/{service_id}", params=_delete_params(entity)),
+        )
         response.raise_for_status()
 
     def get_controller_service_candidates(
@@ -477,33 +889,25 @@ class NiFiClient(AbstractContextManager["NiFiClient"]):
         api_type: str,
         api_bundle: Optional[Dict[str, str]] = None,
     ) -> List[Dict[str, Any]]:
-        params: Dict[str, str] = {"serviceType": api_type}
-        if api_bundle:
-            if api_bundle.get("group"):
-                params["serviceBundleGroup"] = api_bundle["group"]
-            if api_bundle.get("artifact"):
-                params["serviceBundleArtifact"] = api_bundle["artifact"]
-            if api_bundle.get("version"):
-                params["serviceBundleVersion"] = api_bundle["version"]
-        response = self._client.get("/flow/controller-service-types", params=params)
-        response.raise_for_status()
-        return response.json().get("controllerServiceTypes", [])
+        params = _candidate_params(api_type, api_bundle)
+        return self._get_catalog_json("/flow/controller-service-types", params).get("controllerServiceTypes", [])
 
     def get_controller_service_definition(
         self,
         bundle: Dict[str, str],
         type_name: str,
     ) -> Dict[str, Any]:
-        group = bundle.get("group")
-        artifact = bundle.get("artifact")
-        version = bundle.get("version")
-        encoded_type = quote(type_name, safe="")
-        path = f"/flow/controller-service-definition/{group}/{artifact}/{version}/{encoded_type}"
-        response = self._client.get(path)
-        response.raise_for_status()
-        return response.json()
+        cache_key = _metadata_cache_key(type_name, bundle)
+        if cache_key not in self._controller_service_definition_cache:
+            self._controller_service_definition_cache[cache_key] = self._get_catalog_json(
+                _definition_path("controller-service", bundle, type_name)
+            )
+        return self._controller_service_definition_cache[cache_key]
 
     def close(self) -> None:
+        if self._async_bridge is not None:
+            self._async_bridge.close()
+            self._async_bridge = None
         self._client.close()
 
     def __exit__(self, exc_type, exc, tb) -> Optional[bool]:  # pragma: no cover - trivial
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 import socket
 from typing import Any, Dict, Optional
@@ -13,6 +14,13 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 _ENV_PATH = Path(__file__).resolve().parents[3] / ".env"
 
 
+def default_cache_dir() -> Path:
+    """Return the per-user cache directory (``$XDG_CACHE_HOME/nifi-automation``)."""
+
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "nifi-automation"
+
+
 class AuthSettings(BaseSettings):
     """Authentication and HTTP client settings.
 
@@ -34,6 +42,24 @@ class AuthSettings(BaseSettings):
     password: str
     verify_ssl: bool = True
     timeout: float = 10.0
+    # Upper bound on concurrent requests issued by the async client
+    max_in_flight: int = 8
+    # Local cache for catalog metadata; defaults to default_cache_dir()
+    cache_dir: Optional[Path] = None
+    catalog_cache: bool = True
+    # Reuse parsed flow specs across invocations, keyed by content hash (JSON under cache_dir)
+    spec_cache: bool = True
+    # Reuse access tokens across invocations (owner-only file under cache_dir)
+    token_cache: bool = True
+    # Journal finished deploy operations under cache_dir so ``deploy flow --resume`` can continue
+    deploy_journal: bool = True
+    # Keep queue-depth samples under cache_dir so connection status can forecast back-pressure
+    queue_history: bool = True
+    # Remember the last bulletin id read by ``tail bulletins`` so the next run only fetches newer ones
+    bulletin_cursor: bool = True
+
+    def resolved_cache_dir(self) -> Path:
+        return Path(self.cache_dir).expanduser() if self.cache_dir else default_cache_dir()
 
     def merged(self, **overrides: Any) -> "AuthSettings":
         """Return a copy with overrides applied, ignoring ``None`` values."""
@@ -4,12 +4,11 @@ from __future__ import annotations
 
 import json
 import os
-import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
-from urllib.parse import quote
 
+from .app.polling import wait_until
 from .client import NiFiClient
 
 
@@ -80,25 +79,11 @@ def _save_manifest_entries(entries: List[ControllerServiceEntry]) -> None:
 
 
 def _fetch_service_descriptors(client: NiFiClient, entry: ControllerServiceEntry) -> Dict[str, Any]:
-    bundle = entry.bundle
-    if not bundle:
-        response = client._client.get("/flow/controller-service-types")
-        response.raise_for_status()
-        for item in response.json().get("controllerServiceTypes", []):
-            if item.get("type") == entry.type:
-                bundle = item.get("bundle")
-                break
-    if not bundle:
+    try:
+        bundle = client._resolve_controller_service_bundle(entry.type, entry.bundle)
+    except ValueError:
         return {}
-
-    encoded_type = quote(entry.type, safe="")
-    path = (
-        f"/flow/controller-service-definition/"
-        f"{bundle.get('group')}/{bundle.get('artifact')}/{bundle.get('version')}/{encoded_type}"
-    )
-    response = client._client.get(path)
-    response.raise_for_status()
-    definition = response.json() or {}
+    definition = client.get_controller_service_definition(bundle, entry.type)
     return definition.get("propertyDescriptors") or {}
 
 
@@ -160,6 +145,29 @@ def _normalise_properties(
     return normalised
 
 
+def _root_services_by_name(client: NiFiClient) -> Dict[str, str]:
+    response = client._client.get(
+        "/flow/process-groups/root/controller-services",
+        params={"includeInherited": "false"},
+    )
+    response.raise_for_status()
+    existing = response.json().get("controllerServices") or []
+    return {
+        (svc.get("component", {}) or {}).get("name"): (svc.get("component", {}) or {}).get("id")
+        for svc in existing
+    }
+
+
+def lookup_root_controller_services(client: NiFiClient) -> Dict[str, str]:
+    """Map manifest keys to the root controller services that already exist, creating nothing."""
+
+    entries = _load_manifest_entries()
+    if not entries:
+        return {}
+    existing_by_name = _root_services_by_name(client)
+    return {entry.key: existing_by_name[entry.name] for entry in entries if existing_by_name.get(entry.name)}
+
+
 def ensure_root_controller_services(client: NiFiClient) -> Dict[str, str]:
     """Ensure all manifest controller services exist at the NiFi root PG.
 
@@ -170,16 +178,9 @@ def ensure_root_controller_services(client: NiFiClient) -> Dict[str, str]:
     if not entries:
         return {}
 
-    response = client._client.get(
-        "/flow/process-groups/root/controller-services",
-        params={"includeInherited": "false"},
-    )
-    response.raise_for_status()
-    existing = response.json().get("controllerServices") or []
-    existing_by_name = {
-        (svc.get("component", {}) or {}).get("name"): (svc.get("component", {}) or {}).get("id")
-        for svc in existing
-    }
+    existing_by_name = _root_services_by_name(client)
+    # Definitions of the services to create, fetched in one concurrent burst
+    client.prefetch_definitions((), [entry.type for entry in entries if entry.name not in existing_by_name])
 
     key_to_id: Dict[str, str] = {}
     manifest_updated = False
@@ -238,27 +239,27 @@ def clear_manifest_service_ids() -> None:
         _save_manifest_entries(entries)
 
 
+def _service_state(client: NiFiClient, service_id: str) -> str:
+    return client.get_controller_service(service_id)["component"].get("state")
+
+
 def _wait_for_state(client: NiFiClient, service_id: str, expected_state: str, timeout: float = 30.0) -> None:
-    deadline = time.time() + timeout
-    while True:
-        entity = client.get_controller_service(service_id)
-        state = entity["component"].get("state")
-        if state == expected_state:
-            return
-        if time.time() > deadline:
-            raise RuntimeError(
-                f"Controller service {service_id} did not reach state {expected_state}; current state {state}"
-            )
-        time.sleep(0.2)
+    wait_until(
+        lambda: _service_state(client, service_id),
+        until=lambda state: state == expected_state,
+        timeout=timeout,
+        label=f"controller service {expected_state}",
+        on_timeout=lambda state: RuntimeError(
+            f"Controller service {service_id} did not reach state {expected_state}; current state {state}"
+        ),
+    )
 
 
 def _wait_for_stable_state(client: NiFiClient, service_id: str, timeout: float = 30.0) -> str:
-    deadline = time.time() + timeout
-    while True:
-        entity = client.get_controller_service(service_id)
-        state = entity["component"].get("state")
-        if state not in {"ENABLING", "DISABLING"}:
-            return state
-        if time.time() > deadline:
-            return state
-        time.sleep(0.2)
+    return wait_until(
+        lambda: _service_state(client, service_id),
+        until=lambda state: state not in {"ENABLING", "DISABLING"},
+        timeout=timeout,
+        label="controller service stable",
+        raise_on_timeout=False,
+    )
@@ -0,0 +1,242 @@
+"""Request and wall-time estimates for deploying a flow specification.
+
+``deploy flow --dry-run`` and ``run flow --dry-run`` compile the deployment exactly as
+a real deploy would (:meth:`FlowDeployer.compile` only reads from NiFi). They then
+price each phase:
+
+- ``prepare``: definition and bundle lookups, counted while compiling.
+- ``create``: one entry per planned operation, from :data:`OPERATION_REQUESTS`.
+  Wall time comes from replaying the task graph on ``max_workers`` workers.
+- ``autoterminate``: always zero, because relationships are set in the creation request.
+- ``state``: processors with an initial state on the per-component path. This is an
+  upper bound: NiFi releases that honour the state in the creation request need none.
+- ``labels``: one listing of the root canvas plus one request per group label.
+- ``validate``: the post-deploy tree walk (one request per process group) and, for
+  ``deploy flow``, the controller service listing.
+- ``start`` (``run flow`` only): a lower bound, because the number of status polls
+  depends on how fast NiFi settles.
+
+Request latency is the median of a few ``GET /flow/about`` probes. The same spec is
+also priced under the other deploy strategies (upload vs. per component, concurrent
+vs. sequential) so they can be compared before a change window. Purging and
+controller service provisioning depend on the live instance and are not priced.
+"""
+
+from __future__ import annotations
+
+import math
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .catalog_cache import ABOUT_PATH
+from .client import NiFiClient
+from .flow_builder import FlowDeployer, FlowSpec, ProcessGroupSpec
+from .instrumentation import counting_requests
+from .taskgraph import TaskGraph
+
+# REST calls issued by each FlowDeployer operation, keyed by the method the task runs
+OPERATION_REQUESTS: Dict[str, int] = {
+    "_create_port": 1,  # POST input/output port
+    "_create_processor": 1,  # POST processor, configured in the same request
+    "_create_connection": 1,  # POST connection
+    "_create_child_group": 3,  # GET parent flow for an existing child, POST group, GET group
+    "_upload_child_group": 3,  # GET parent flow, POST upload, GET uploaded flow for port ids
+    "_uploaded_port": 0,  # reads the upload result
+}
+
+_HTTP_LISTENER = "org.apache.nifi.processors.standard.HandleHttpRequest"
+
+
+@dataclass
+class PhaseEstimate:
+    name: str
+    requests: int
+    seconds: float
+    # False when the request count is a bound rather than a prediction
+    exact: bool = True
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "seconds": round(self.seconds, 3), "exact": self.exact}
+
+
+@dataclass
+class DeployEstimate:
+    """Predicted cost of one deploy strategy."""
+
+    strategy: str
+    max_workers: int
+    latency: float
+    phases: List[PhaseEstimate] = field(default_factory=list)
+
+    @property
+    def requests(self) -> int:
+        return sum(phase.requests for phase in self.phases)
+
+    @property
+    def seconds(self) -> float:
+        return sum(phase.seconds for phase in self.phases)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "max_workers": self.max_workers,
+            "latency_ms": round(self.latency * 1000.0, 3),
+            "requests": self.requests,
+            "seconds": round(self.seconds, 3),
+            "phases": {phase.name: phase.as_dict() for phase in self.phases},
+        }
+
+
+@dataclass
+class CostReport:
+    """The estimate for the strategy a deploy would use, followed by the alternatives."""
+
+    estimates: List[DeployEstimate]
+
+    @property
+    def primary(self) -> DeployEstimate:
+        return self.estimates[0]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            **self.primary.as_dict(),
+            "strategies": [
+                {key: value for key, value in estimate.as_dict().items() if key != "phases"}
+                for estimate in self.estimates
+            ],
+        }
+
+
+def probe_latency(client: NiFiClient, samples: int = 3) -> float:
+    """Median round trip of ``GET /flow/about``, in seconds."""
+
+    timings = []
+    for _ in range(max(1, samples)):
+        began = time.perf_counter()
+        response = client._client.get(ABOUT_PATH)
+        response.raise_for_status()
+        timings.append(time.perf_counter() - began)
+    return statistics.median(timings)
+
+
+def _operation(graph: TaskGraph, key: str) -> Tuple[str, Any]:
+    action = graph.action(key)
+    func = getattr(action, "func", action)
+    return getattr(func, "__name__", ""), action
+
+
+def _schedule_seconds(graph: TaskGraph, cost: Mapping[str, float], max_workers: int) -> float:
+    # List scheduling in insertion order: each task starts once a worker is free and its dependencies finished
+    workers = [0.0] * max(1, max_workers)
+    finished: Dict[str, float] = {}
+    for key in graph:
+        ready = max((finished[dep] for dep in graph.dependencies(key)), default=0.0)
+        slot = min(range(len(workers)), key=workers.__getitem__)
+        start = max(workers[slot], ready)
+        finished[key] = workers[slot] = start + cost[key]
+    return max(finished.values(), default=0.0)
+
+
+def _groups_by_depth(group: ProcessGroupSpec) -> List[int]:
+    widths: List[int] = []
+    level = [group]
+    while level:
+        widths.append(len(level))
+        level = [child for current in level for child in current.child_groups]
+    return widths
+
+
+def _create_phases(
+    graph: TaskGraph, latency: float, max_workers: int
+) -> Tuple[PhaseEstimate, PhaseEstimate]:
+    cost: Dict[str, float] = {}
+    requests = 0
+    with_state = 0
+    for key in graph:
+        name, action = _operation(graph, key)
+        calls = OPERATION_REQUESTS.get(name, 1)
+        if name == "_create_processor" and action.args[-1].spec.state:
+            with_state += 1
+        cost[key] = calls * latency
+        requests += calls
+    create = PhaseEstimate("create", requests, _schedule_seconds(graph, cost, max_workers))
+    state = PhaseEstimate("state", with_state, math.ceil(with_state / max_workers) * latency, exact=False)
+    return create, state
+
+
+def _start_phase(spec: FlowSpec, services: Iterable[str], latency: float) -> PhaseEstimate:
+    tools = [child for child in spec.root_group.child_groups if child.name.startswith("Tools_")]
+    listeners = sum(1 for group in tools for proc in group.processors if proc.type == _HTTP_LISTENER)
+    requests = (
+        1  # bulletin baseline
+        + 1 + 2 * len(set(services))  # list services, enable each, poll each at least once
+        + 2 * (1 + len(tools) + listeners)  # Tools_* HTTP listeners stopped before and after starting
+        + 2  # schedule root RUNNING, one status poll
+        + 2 * 2  # settle before enabling and after starting: status plus controller listing
+        + 3  # final status, controllers and bulletins
+    )
+    return PhaseEstimate("start", requests, requests * latency, exact=False)
+
+
+def _estimate(
+    deployer: FlowDeployer,
+    graph: TaskGraph,
+    strategy: str,
+    latency: float,
+    prepare: PhaseEstimate,
+    start: bool,
+) -> DeployEstimate:
+    create, state = _create_phases(graph, latency, deployer.max_workers)
+    labels = len(deployer._group_labels(deployer.spec.root_group))
+    label_requests = 1 + labels if labels else 0
+    widths = _groups_by_depth(deployer.spec.root_group)
+    in_flight = max(1, int(deployer.client.settings.max_in_flight))
+    validate_requests = sum(widths) + (0 if start else 1)
+    validate_seconds = sum(math.ceil(width / in_flight) for width in widths) * latency + (0 if start else latency)
+    phases = [
+        prepare,
+        create,
+        PhaseEstimate("autoterminate", 0, 0.0),
+        state,
+        PhaseEstimate("labels", label_requests, label_requests * latency),
+        PhaseEstimate("validate", validate_requests, validate_seconds),
+    ]
+    if start:
+        phases.append(_start_phase(deployer.spec, deployer.controller_service_map.values(), latency))
+    return DeployEstimate(strategy, deployer.max_workers, latency, phases)
+
+
+def estimate_deploy(
+    client: NiFiClient,
+    spec: FlowSpec,
+    *,
+    controller_service_map: Optional[Mapping[str, str]] = None,
+    latency: Optional[float] = None,
+    start: bool = False,
+) -> CostReport:
+    """Price a deploy of ``spec`` without writing to NiFi.
+
+    The first estimate is the strategy ``deploy flow`` uses (versioned flow uploads with
+    ``max_in_flight`` workers). It is followed by per-component creation with the same
+    concurrency and one operation at a time. ``latency`` overrides the probe. ``start``
+    adds the phases ``run flow`` runs after deploying.
+    """
+
+    latency = probe_latency(client) if latency is None else latency
+    estimates = []
+    prepare: Optional[PhaseEstimate] = None
+    strategies = (("upload", True, None), ("per-component", False, None), ("per-component", False, 1))
+    for strategy, upload, workers in strategies:
+        deployer = FlowDeployer(
+            client, spec, controller_service_map=controller_service_map, max_workers=workers, upload=upload
+        )
+        began = time.perf_counter()
+        with counting_requests() as counts:
+            graph = deployer.compile()
+        if prepare is None:
+            # Later compiles are served from the definitions the first one fetched
+            prepare = PhaseEstimate("prepare", sum(counts.values()), time.perf_counter() - began)
+        estimates.append(_estimate(deployer, graph, strategy, latency, prepare, start))
+    return CostReport(estimates)
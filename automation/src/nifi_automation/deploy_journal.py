@@ -0,0 +1,124 @@
+"""Checkpoint journal for resumable deployments.
+
+``FlowDeployer`` plans a deployment as a :class:`~nifi_automation.taskgraph.TaskGraph`
+whose task names are derived from the spec (group path plus component key). With a
+journal attached, the result of every finished task is appended to a JSON Lines
+file under ``<cache_dir>/journals``. That result is the NiFi id the task created,
+plus its revision version. A deploy that dies halfway leaves the journal behind.
+``deploy flow --resume`` reloads it, keeps the entries whose components still
+exist and only runs the remaining tasks. The journal is removed once a deploy
+completes.
+
+The first line records the spec digest. Resuming against an edited spec is
+refused, because task names would no longer describe the same components.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from .config import AuthSettings
+from .flow_builder import FlowDeploymentError
+
+JOURNAL_FORMAT = 1
+
+
+def result_ids(result: Any) -> List[str]:
+    """NiFi component ids held by a deploy task result.
+
+    Groups return their id, processors and ports an ``(id, group id)`` pair,
+    connections their component and uploads ``{"id", "ports"}``.
+    """
+
+    if isinstance(result, str):
+        return [result]
+    if isinstance(result, (list, tuple)) and result:
+        return [str(result[0])]
+    if isinstance(result, Mapping) and result.get("id"):
+        ports = result.get("ports") or {}
+        return [str(result["id"]), *(str(port[0]) for port in ports.values())]
+    return []
+
+
+def _stored(result: Any) -> Any:
+    # Connection components are large and nothing reads more than their id
+    if isinstance(result, Mapping):
+        stored = {"id": result.get("id")}
+        if "ports" in result:
+            stored["ports"] = result["ports"]
+        return stored
+    return result
+
+
+class DeployJournal:
+    """Append-only record of the finished tasks of one flow deployment."""
+
+    def __init__(self, path: Path, *, spec_digest: str):
+        self.path = Path(path)
+        self.spec_digest = spec_digest
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_flow(cls, settings: AuthSettings, spec_path: Path, spec_digest: str) -> "DeployJournal":
+        """Journal for deploying ``spec_path`` to ``settings.base_url``."""
+
+        target = f"{settings.base_url}\0{Path(spec_path).resolve()}"
+        name = hashlib.sha256(target.encode("utf-8")).hexdigest()[:24]
+        return cls(settings.resolved_cache_dir() / "journals" / f"{name}.jsonl", spec_digest=spec_digest)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def start(self) -> None:
+        """Begin a new journal, discarding any previous one."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        header = {"format": JOURNAL_FORMAT, "spec": self.spec_digest}
+        with self._lock:
+            self.path.write_text(json.dumps(header) + "\n", encoding="utf-8")
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Return ``{task: {"result", "revisions"}}`` from the journal, newest entry per task.
+
+        Raises ``FlowDeploymentError`` when there is no journal or it was written for another spec.
+        """
+
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            raise FlowDeploymentError("No deploy journal to resume; run the deploy without --resume") from None
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}
+        if header.get("format") != JOURNAL_FORMAT or header.get("spec") != self.spec_digest:
+            raise FlowDeploymentError(
+                "The deploy journal was written for a different flow specification; run the deploy without --resume"
+            )
+        entries: Dict[str, Dict[str, Any]] = {}
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A deploy killed mid-write leaves a truncated last line
+                continue
+            entries[entry["task"]] = {"result": entry.get("result"), "revisions": entry.get("revisions") or {}}
+        return entries
+
+    def record(self, task: str, result: Any, revisions: Optional[Mapping[str, Any]] = None) -> None:
+        """Append the result of a finished task; flushed so it survives the process dying."""
+
+        line = json.dumps({"task": task, "result": _stored(result), "revisions": dict(revisions or {})})
+        with self._lock, self.path.open("a", encoding="utf-8") as fp:
+            fp.write(line + "\n")
+            fp.flush()
+
+    def finish(self) -> None:
+        """Remove the journal after a completed deploy."""
+
+        with self._lock:
+            self.path.unlink(missing_ok=True)
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, Iterator, List, Tuple
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from .client import NiFiClient
 
 
-def _walk_process_groups(client: NiFiClient) -> Iterator[Tuple[List[str], Dict[str, object]]]:
+def _walk_tree(client: NiFiClient) -> Iterator[Tuple[str, List[str], Dict[str, object]]]:
     stack: List[Tuple[str, List[str]]] = []
     root_entity = client._client.get("/flow/process-groups/root")
     root_entity.raise_for_status()
@@ -18,16 +19,20 @@ def _walk_process_groups(client: NiFiClient) -> Iterator[Tuple[List[str], Dict[s
         .get("breadcrumb", {})
         .get("name", "root")
     )
+    # The root payload is reused rather than fetched a second time
+    pending: Dict[str, Dict[str, object]] = {"root": root_json or {}}
     stack.append(("root", [root_name]))
 
     while stack:
         pg_id, path = stack.pop()
-        entity = client._client.get(f"/flow/process-groups/{pg_id}")
-        entity.raise_for_status()
-        data = entity.json() or {}
+        data = pending.pop(pg_id, None)
+        if data is None:
+            entity = client._client.get(f"/flow/process-groups/{pg_id}")
+            entity.raise_for_status()
+            data = entity.json() or {}
         flow = data.get("processGroupFlow", {}).get("flow", {}) or {}
 
-        yield path, flow
+        yield pg_id, path, flow
 
         for child in flow.get("processGroups") or []:
             component = child.get("component", {})
@@ -37,6 +42,181 @@ def _walk_process_groups(client: NiFiClient) -> Iterator[Tuple[List[str], Dict[s
                 stack.append((child_id, path + [child_name]))
 
 
+def _walk_process_groups(client: NiFiClient) -> Iterator[Tuple[List[str], Dict[str, object]]]:
+    for _, path, flow in _walk_tree(client):
+        yield path, flow
+
+
+class FlowSnapshot:
+    """Process-group tree fetched once and shared by every collector in a command.
+
+    Collectors that accept ``snapshot=`` read from it instead of walking NiFi again,
+    so building a status or inspect report costs a single tree walk.
+    """
+
+    def __init__(self, groups: Iterable[Tuple[str, List[str], Dict[str, object]]]):
+        self.groups: List[Tuple[str, List[str], Dict[str, object]]] = list(groups)
+        self.captured_at = time.time()
+        self._flows: Dict[str, Dict[str, object]] = {pg_id: flow for pg_id, _, flow in self.groups}
+
+    @classmethod
+    def capture(cls, client: NiFiClient) -> "FlowSnapshot":
+        """Walk the tree under root, fetching sibling groups concurrently when possible.
+
+        Clients exposing ``run_async`` fan out through :class:`AsyncNiFiClient`; any
+        other client falls back to the sequential walk.
+        """
+
+        run_async = getattr(client, "run_async", None)
+        if callable(run_async):
+            return cls(run_async(lambda aclient: aclient.walk_tree()))
+        return cls(_walk_tree(client))
+
+    def walk(self) -> Iterator[Tuple[List[str], Dict[str, object]]]:
+        """Yield ``(path, flow)`` pairs in the same shape as ``_walk_process_groups``."""
+
+        for _, path, flow in self.groups:
+            yield path, flow
+
+    def flow_for(self, pg_id: str) -> Optional[Dict[str, object]]:
+        return self._flows.get(pg_id)
+
+    def find_child(self, parent_id: str, name: str) -> Optional[Dict[str, object]]:
+        for child in (self.flow_for(parent_id) or {}).get("processGroups") or []:
+            if child.get("component", {}).get("name") == name:
+                return child
+        return None
+
+
+# Map status ``runStatus`` values onto the (state, validationStatus) pair a flow fetch reports
+_RUN_STATUS: Dict[str, Tuple[str, Optional[str]]] = {
+    "Running": ("RUNNING", "VALID"),
+    "Stopped": ("STOPPED", "VALID"),
+    "Invalid": ("STOPPED", "INVALID"),
+    "Validating": ("STOPPED", "VALIDATING"),
+    "Disabled": ("DISABLED", None),
+}
+
+_VALIDATED_KINDS = ("processors", "inputPorts", "outputPorts")
+
+
+def _status_component(snapshot: Dict[str, object]) -> Dict[str, object]:
+    run_status = str(snapshot.get("runStatus", "UNKNOWN"))
+    state, validation = _RUN_STATUS.get(run_status, (run_status.upper(), None))
+    return {
+        "id": snapshot.get("id"),
+        "name": snapshot.get("name"),
+        "type": snapshot.get("type"),
+        "state": state,
+        "validationStatus": validation,
+        "validationErrors": [],
+    }
+
+
+def _status_flow(group: Dict[str, object]) -> Dict[str, object]:
+    """Shape one group status snapshot like the ``flow`` of ``/flow/process-groups/{id}``."""
+
+    def _entities(key: str, inner: str) -> List[Dict[str, object]]:
+        return [
+            {"component": _status_component(item.get(inner) or {}), "bulletins": []}
+            for item in group.get(key) or []
+        ]
+
+    connections = []
+    for item in group.get("connectionStatusSnapshots") or []:
+        snap = item.get("connectionStatusSnapshot") or {}
+        connections.append(
+            {"component": {"id": snap.get("id"), "name": snap.get("name")}, "status": {"aggregateSnapshot": snap}}
+        )
+    children = []
+    for item in group.get("processGroupStatusSnapshots") or []:
+        child = item.get("processGroupStatusSnapshot") or {}
+        children.append({"component": {"id": child.get("id"), "name": child.get("name")}})
+    return {
+        "processors": _entities("processorStatusSnapshots", "processorStatusSnapshot"),
+        "inputPorts": _entities("inputPortStatusSnapshots", "portStatusSnapshot"),
+        "outputPorts": _entities("outputPortStatusSnapshots", "portStatusSnapshot"),
+        "connections": connections,
+        "processGroups": children,
+    }
+
+
+def _status_tree(root: Dict[str, object]) -> Iterator[Tuple[str, List[str], Dict[str, object]]]:
+    level = [("root", [str(root.get("name") or "root")], root)]
+    while level:
+        next_level = []
+        for pg_id, path, group in level:
+            yield pg_id, path, _status_flow(group)
+            for item in group.get("processGroupStatusSnapshots") or []:
+                child = item.get("processGroupStatusSnapshot") or {}
+                child_id = child.get("id")
+                if child_id:
+                    next_level.append((child_id, path + [str(child.get("name", child_id))], child))
+        level = next_level
+
+
+def _fetch_group_flows(client: NiFiClient, pg_ids: List[str]) -> List[Dict[str, object]]:
+    run_async = getattr(client, "run_async", None)
+    if callable(run_async):
+        return run_async(lambda aclient: aclient.map(aclient.get_process_group_flow, pg_ids))
+    flows: List[Dict[str, object]] = []
+    for pg_id in pg_ids:
+        response = client._client.get(f"/flow/process-groups/{pg_id}")
+        response.raise_for_status()
+        flows.append((response.json() or {}).get("processGroupFlow", {}).get("flow", {}) or {})
+    return flows
+
+
+class StatusSnapshot(FlowSnapshot):
+    """Snapshot built from one ``/flow/process-groups/root/status?recursive=true`` call.
+
+    Components carry run state and queue counters only. Groups holding invalid
+    processors or ports are fetched again to fill in validation errors and bulletins.
+    Use :class:`FlowSnapshot` when positions or group-level bulletins are needed.
+    """
+
+    @classmethod
+    def capture(cls, client: NiFiClient, *, validation_details: bool = True) -> "StatusSnapshot":
+        response = client._client.get("/flow/process-groups/root/status", params={"recursive": "true"})
+        response.raise_for_status()
+        root = (response.json() or {}).get("processGroupStatus", {}).get("aggregateSnapshot", {}) or {}
+        snapshot = cls(_status_tree(root))
+        if validation_details:
+            snapshot.fill_validation_details(client)
+        return snapshot
+
+    def fill_validation_details(self, client: NiFiClient) -> None:
+        """Fetch the groups holding invalid components and copy in their validation errors and bulletins."""
+
+        invalid: Dict[str, List[Dict[str, object]]] = {}
+        for pg_id, _, flow in self.groups:
+            for kind in _VALIDATED_KINDS:
+                for entity in flow.get(kind) or []:
+                    if entity["component"].get("validationStatus") == "INVALID":
+                        invalid.setdefault(pg_id, []).append(entity)
+        if not invalid:
+            return
+        pg_ids = list(invalid)
+        detailed: Dict[str, Dict[str, object]] = {}
+        for flow in _fetch_group_flows(client, pg_ids):
+            for kind in _VALIDATED_KINDS:
+                for entity in flow.get(kind) or []:
+                    detailed[entity.get("component", {}).get("id")] = entity
+        for entities in invalid.values():
+            for entity in entities:
+                source = detailed.get(entity["component"].get("id"))
+                if source is None:
+                    continue
+                entity["component"]["validationErrors"] = source.get("component", {}).get("validationErrors") or []
+                entity["bulletins"] = source.get("bulletins") or []
+
+
+def _groups(
+    client: NiFiClient, snapshot: Optional[FlowSnapshot]
+) -> Iterable[Tuple[List[str], Dict[str, object]]]:
+    return (snapshot or FlowSnapshot.capture(client)).walk()
+
+
 def _collect_invalid_components(
     elements: Iterable[Dict[str, object]],
     path: List[str],
@@ -64,30 +244,30 @@ def _collect_invalid_components(
     return invalid
 
 
-def collect_invalid_processors(client: NiFiClient) -> List[Dict[str, object]]:
+def collect_invalid_processors(client: NiFiClient, *, snapshot: Optional[FlowSnapshot] = None) -> List[Dict[str, object]]:
     """Return metadata for processors that NiFi reports as invalid."""
 
     invalid: List[Dict[str, object]] = []
-    for path, flow in _walk_process_groups(client):
+    for path, flow in _groups(client, snapshot):
         invalid.extend(_collect_invalid_components(flow.get("processors") or [], path))
     return invalid
 
 
-def collect_invalid_ports(client: NiFiClient) -> List[Dict[str, object]]:
+def collect_invalid_ports(client: NiFiClient, *, snapshot: Optional[FlowSnapshot] = None) -> List[Dict[str, object]]:
     """Return metadata for input/output ports that NiFi reports as invalid."""
 
     invalid: List[Dict[str, object]] = []
-    for path, flow in _walk_process_groups(client):
+    for path, flow in _groups(client, snapshot):
         invalid.extend(_collect_invalid_components(flow.get("inputPorts") or [], path))
         invalid.extend(_collect_invalid_components(flow.get("outputPorts") or [], path))
     return invalid
 
 
-def count_processor_states(client: NiFiClient) -> Dict[str, int]:
+def count_processor_states(client: NiFiClient, *, snapshot: Optional[FlowSnapshot] = None) -> Dict[str, int]:
     """Return counts of processors grouped by their run state."""
 
     counts: Dict[str, int] = {}
-    for _, flow in _walk_process_groups(client):
+    for _, flow in _groups(client, snapshot):
         for processor in flow.get("processors") or []:
             component = processor.get("component") or {}
             state = component.get("state") or "UNKNOWN"
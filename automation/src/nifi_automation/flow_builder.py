@@ -3,11 +3,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import partial
 import math
+import re
+import threading
 import time
 from pathlib import Path
 import time
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+import httpx
 import yaml
 
 try:
@@ -15,8 +19,18 @@ try:
 except ModuleNotFoundError:  # pragma: no cover - optional dependency
     yaml = None
 
+# libyaml's C loader parses large specs several times faster when it is available
+_YAML_LOADER = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+FLOW_DEFAULTS_PATH = Path(__file__).resolve().parents[2] / "config" / "flow-defaults.yaml"
+
+from .app.polling import wait_until
 from .client import NiFiClient
-from .diagnostics import count_processor_states
+from .diagnostics import FlowSnapshot, StatusSnapshot, count_processor_states
+from .layered_layout import GROUP_SIZE, PORT_SIZE, PROCESSOR_SIZE, layered_positions
+from .taskgraph import TaskGraph
+
+if TYPE_CHECKING:
+    from .deploy_journal import DeployJournal
 
 
 @dataclass
@@ -31,6 +45,11 @@ class ProcessorSpec:
     scheduling_period: Optional[str] = None
     explicit_position: bool = False
     state: Optional[str] = None
+    concurrent_tasks: Optional[int] = None
+    run_duration_millis: Optional[int] = None
+    penalty_duration: Optional[str] = None
+    yield_duration: Optional[str] = None
+    execution_node: Optional[str] = None
 
 
 @dataclass
@@ -39,6 +58,26 @@ class ConnectionSpec:
     source: str
     destination: str
     relationships: List[str]
+    back_pressure_object_threshold: int = 10000
+    back_pressure_data_size_threshold: str = "1 GB"
+    flowfile_expiration: str = "0 sec"
+    load_balance_strategy: str = "DO_NOT_LOAD_BALANCE"
+    partitioning_attribute: str = ""
+    load_balance_compression: str = "DO_NOT_COMPRESS"
+    prioritizers: List[str] = field(default_factory=list)
+
+    def queue_settings(self) -> Dict[str, Any]:
+        """Queue settings as ``ConnectionDTO`` fields."""
+
+        return {
+            "backPressureObjectThreshold": self.back_pressure_object_threshold,
+            "backPressureDataSizeThreshold": self.back_pressure_data_size_threshold,
+            "flowFileExpiration": self.flowfile_expiration,
+            "loadBalanceStrategy": self.load_balance_strategy,
+            "loadBalancePartitionAttribute": self.partitioning_attribute,
+            "loadBalanceCompression": self.load_balance_compression,
+            "prioritizers": list(self.prioritizers),
+        }
 
 
 @dataclass
@@ -95,24 +134,168 @@ class PreparedProcessor:
 class FlowDeploymentError(RuntimeError):
     """Raised when a flow specification cannot be deployed."""
 
-_DEFAULT_SCHEDULING_BY_TYPE: Dict[str, str] = {}
+_PROCESSOR_DEFAULTS_BY_TYPE: Optional[Dict[str, Dict[str, Any]]] = None
 
-def _load_defaults() -> None:
-    global _DEFAULT_SCHEDULING_BY_TYPE
-    if _DEFAULT_SCHEDULING_BY_TYPE:
-        return
+
+def _read_flow_defaults() -> Mapping[str, Any]:
     try:
-        defaults_path = Path(__file__).resolve().parents[2] / "config" / "flow-defaults.yaml"
-        if defaults_path.exists():
-            data = yaml.safe_load(defaults_path.read_text()) or {}
-            for entry in data.get("processor_defaults", []) or []:
-                ptype = entry.get("type")
-                sched = entry.get("scheduling_period")
-                if ptype and sched:
-                    _DEFAULT_SCHEDULING_BY_TYPE[str(ptype)] = str(sched)
+        if FLOW_DEFAULTS_PATH.exists():
+            return yaml.load(FLOW_DEFAULTS_PATH.read_text(), Loader=_YAML_LOADER) or {}
     except Exception:
         # Defaults are optional; ignore load errors
-        _DEFAULT_SCHEDULING_BY_TYPE = {}
+        pass
+    return {}
+
+
+def _load_defaults() -> Dict[str, Dict[str, Any]]:
+    """Return ``{processor type: {ProcessorSpec field: value}}`` from ``processor_defaults``."""
+
+    global _PROCESSOR_DEFAULTS_BY_TYPE
+    if _PROCESSOR_DEFAULTS_BY_TYPE is not None:
+        return _PROCESSOR_DEFAULTS_BY_TYPE
+    defaults: Dict[str, Dict[str, Any]] = {}
+    for entry in _read_flow_defaults().get("processor_defaults", []) or []:
+        if not isinstance(entry, Mapping) or not entry.get("type"):
+            continue
+        ptype = str(entry["type"])
+        settings = _processor_settings(entry, f"flow-defaults.yaml processor_defaults for '{ptype}'")
+        if entry.get("scheduling_period"):
+            settings["scheduling_period"] = str(entry["scheduling_period"])
+        defaults.setdefault(ptype, {}).update(settings)
+    _PROCESSOR_DEFAULTS_BY_TYPE = defaults
+    return defaults
+
+
+# Queue settings a connection entry may set, with the camelCase spelling NiFi uses
+_CONNECTION_SETTING_ALIASES: Dict[str, str] = {
+    "back_pressure_object_threshold": "backPressureObjectThreshold",
+    "back_pressure_data_size_threshold": "backPressureDataSizeThreshold",
+    "flowfile_expiration": "flowFileExpiration",
+    "load_balance_strategy": "loadBalanceStrategy",
+    "partitioning_attribute": "partitioningAttribute",
+    "load_balance_compression": "loadBalanceCompression",
+    "prioritizers": "prioritizers",
+}
+_LOAD_BALANCE_STRATEGIES = {
+    "DO_NOT_LOAD_BALANCE",
+    "PARTITION_BY_ATTRIBUTE",
+    "ROUND_ROBIN",
+    "SINGLE_NODE",
+}
+_LOAD_BALANCE_COMPRESSIONS = {"DO_NOT_COMPRESS", "COMPRESS_ATTRIBUTES_ONLY", "COMPRESS_ATTRIBUTES_AND_CONTENT"}
+_PRIORITIZER_PACKAGE = "org.apache.nifi.prioritizer."
+_DATA_SIZE = re.compile(r"^\d+(\.\d+)?\s*(B|KB|MB|GB|TB)$", re.IGNORECASE)
+_TIME_PERIOD = re.compile(
+    r"^\d+(\.\d+)?\s*(ns|nanos?|nanoseconds?|ms|millis?|milliseconds?|s|secs?|seconds?"
+    r"|m|mins?|minutes?|h|hrs?|hours?|d|days?|w|wks?|weeks?)$",
+    re.IGNORECASE,
+)
+
+_connection_defaults: Optional[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]] = None
+
+
+def _connection_settings(raw: Mapping[str, Any], where: str) -> Dict[str, Any]:
+    """Validate the queue settings present in ``raw`` and return them by ``ConnectionSpec`` field."""
+
+    settings: Dict[str, Any] = {}
+    for field_name, alias in _CONNECTION_SETTING_ALIASES.items():
+        value = raw.get(field_name, raw.get(alias))
+        if value is None:
+            continue
+        if field_name == "back_pressure_object_threshold":
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                raise FlowDeploymentError(f"{where}: back_pressure_object_threshold must be a non-negative integer")
+        elif field_name == "back_pressure_data_size_threshold":
+            value = str(value).strip()
+            if not _DATA_SIZE.match(value):
+                raise FlowDeploymentError(
+                    f"{where}: back_pressure_data_size_threshold '{value}' is not a data size such as '1 GB'"
+                )
+        elif field_name == "flowfile_expiration":
+            value = str(value).strip()
+            if not _TIME_PERIOD.match(value):
+                raise FlowDeploymentError(f"{where}: flowfile_expiration '{value}' is not a time period such as '5 min'")
+        elif field_name == "load_balance_strategy":
+            value = str(value).upper()
+            if value not in _LOAD_BALANCE_STRATEGIES:
+                raise FlowDeploymentError(
+                    f"{where}: load_balance_strategy must be one of {', '.join(sorted(_LOAD_BALANCE_STRATEGIES))}"
+                )
+        elif field_name == "load_balance_compression":
+            value = str(value).upper()
+            if value not in _LOAD_BALANCE_COMPRESSIONS:
+                raise FlowDeploymentError(
+                    f"{where}: load_balance_compression must be one of {', '.join(sorted(_LOAD_BALANCE_COMPRESSIONS))}"
+                )
+        elif field_name == "partitioning_attribute":
+            value = str(value)
+        elif field_name == "prioritizers":
+            if not isinstance(value, (list, tuple)):
+                raise FlowDeploymentError(f"{where}: prioritizers must be a list")
+            # Built-in prioritizers may be given by their simple class name
+            value = [str(item) if "." in str(item) else _PRIORITIZER_PACKAGE + str(item) for item in value]
+            if len(set(value)) != len(value):
+                raise FlowDeploymentError(f"{where}: prioritizers must not repeat")
+        settings[field_name] = value
+    return settings
+
+
+# Performance settings a processor entry (or a processor_defaults entry) may set
+_PROCESSOR_SETTING_ALIASES: Dict[str, str] = {
+    "concurrent_tasks": "concurrentlySchedulableTaskCount",
+    "run_duration_millis": "runDurationMillis",
+    "penalty_duration": "penaltyDuration",
+    "yield_duration": "yieldDuration",
+    "execution_node": "executionNode",
+}
+_EXECUTION_NODES = {"ALL", "PRIMARY"}
+
+
+def _processor_settings(raw: Mapping[str, Any], where: str) -> Dict[str, Any]:
+    """Validate the performance settings present in ``raw`` and return them by ``ProcessorSpec`` field."""
+
+    settings: Dict[str, Any] = {}
+    for field_name, alias in _PROCESSOR_SETTING_ALIASES.items():
+        value = raw.get(field_name, raw.get(alias))
+        if value is None:
+            continue
+        if field_name in ("concurrent_tasks", "run_duration_millis"):
+            minimum = 1 if field_name == "concurrent_tasks" else 0
+            if isinstance(value, str) and value.strip().isdigit():
+                value = int(value)
+            if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+                kind = "a positive" if minimum else "a non-negative"
+                raise FlowDeploymentError(f"{where}: {field_name} must be {kind} integer, got {value!r}")
+        elif field_name == "execution_node":
+            value = str(value).upper()
+            if value not in _EXECUTION_NODES:
+                raise FlowDeploymentError(f"{where}: execution_node must be ALL or PRIMARY")
+        else:
+            value = str(value).strip()
+            if not _TIME_PERIOD.match(value):
+                raise FlowDeploymentError(f"{where}: {field_name} '{value}' is not a time period such as '30 sec'")
+        settings[field_name] = value
+    return settings
+
+
+def _load_connection_defaults() -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """Return ``(global, {group name: settings})`` from ``connection_defaults`` in flow-defaults.yaml."""
+
+    global _connection_defaults
+    if _connection_defaults is not None:
+        return _connection_defaults
+    raw = _read_flow_defaults().get("connection_defaults") or {}
+    if not isinstance(raw, Mapping):
+        raise FlowDeploymentError("flow-defaults.yaml: connection_defaults must be a mapping")
+    groups: Dict[str, Dict[str, Any]] = {}
+    for group_name, group_raw in (raw.get("groups") or {}).items():
+        if not isinstance(group_raw, Mapping):
+            raise FlowDeploymentError(f"flow-defaults.yaml: connection_defaults for group '{group_name}' must be a mapping")
+        groups[str(group_name)] = _connection_settings(
+            group_raw, f"flow-defaults.yaml connection_defaults for group '{group_name}'"
+        )
+    _connection_defaults = (_connection_settings(raw, "flow-defaults.yaml connection_defaults"), groups)
+    return _connection_defaults
 
 def _ensure_position(raw: Optional[Iterable[float]]) -> Optional[Tuple[float, float]]:
     if raw is None:
@@ -311,10 +494,15 @@ def _parse_process_group(
     *,
     index: int = 0,
     child_columns: Optional[Dict[str, int]] = None,
+    connection_defaults: Optional[Mapping[str, Any]] = None,
 ) -> ProcessGroupSpec:
     name = data.get("name")
     if not name:
         raise FlowDeploymentError("process_group entries must include 'name'")
+    # Queue settings resolve item > enclosing groups (innermost first) > global defaults
+    if connection_defaults is None:
+        connection_defaults, _ = _load_connection_defaults()
+    connection_defaults = {**connection_defaults, **_load_connection_defaults()[1].get(name, {})}
     position_raw = data.get("position")
     position = _ensure_position(position_raw)
     comments = data.get("description") or data.get("comments")
@@ -348,6 +536,7 @@ def _parse_process_group(
             else None,
             explicit_position=bool(item.get("position")),
             state=(item.get("state") or item.get("status") or None),
+            **_processor_settings(item, f"Processor '{key}' in group '{name}'"),
         )
         if not proc.type:
             raise FlowDeploymentError(f"Processor '{key}' in group '{name}' missing 'type'")
@@ -401,7 +590,9 @@ def _parse_process_group(
     for child_idx, child in enumerate(data.get("process_groups") or []):
         if not isinstance(child, Mapping):
             raise FlowDeploymentError("process_groups entries must be mappings")
-        child_groups.append(_parse_process_group(child, index=child_idx))
+        child_groups.append(
+            _parse_process_group(child, index=child_idx, connection_defaults=connection_defaults)
+        )
 
     # Only the root call receives child_columns for group-aware layout
     _layout_child_groups(child_groups, child_columns=child_columns)
@@ -430,12 +621,22 @@ def _parse_process_group(
             relationships = ["success"]
         else:
             relationships = list(raw_relationships)
+        conn_name = item.get("name", f"{source}-to-{destination}")
+        queue = {
+            **connection_defaults,
+            **_connection_settings(item, f"Connection '{conn_name}' in group '{name}'"),
+        }
+        if queue.get("load_balance_strategy") == "PARTITION_BY_ATTRIBUTE" and not queue.get("partitioning_attribute"):
+            raise FlowDeploymentError(
+                f"Connection '{conn_name}' in group '{name}': PARTITION_BY_ATTRIBUTE requires partitioning_attribute"
+            )
         connections.append(
             ConnectionSpec(
-                name=item.get("name", f"{source}-to-{destination}"),
+                name=conn_name,
                 source=source,
                 destination=destination,
                 relationships=list(relationships),
+                **queue,
             )
         )
 
@@ -456,7 +657,7 @@ def _parse_process_group(
 def load_flow_spec(path: Path) -> FlowSpec:
     if yaml is None:
         raise FlowDeploymentError("PyYAML is required to load flow specifications")
-    data = yaml.safe_load(path.read_text())
+    data = yaml.load(path.read_text(), Loader=_YAML_LOADER)
     if not isinstance(data, Mapping):
         raise FlowDeploymentError("Flow specification must be a mapping")
 
@@ -584,229 +785,103 @@ def _layout_child_groups(groups: List[ProcessGroupSpec], child_columns: Optional
 def _layout_group_components(group: ProcessGroupSpec) -> None:
     """Compute default positions for processors and ports that did not specify one.
 
-    Heuristics:
-    - Identify branching "router" processors (>=2 outgoing connections) and place them centered.
-    - Place their immediate sink processors in a vertical stack to the right, aligning with the router.
-    - Place a single predecessor (if any) immediately to the left of the router.
-    - Place remaining processors using a left-to-right chain when possible; otherwise a compact grid.
-    - Input ports along a left gutter; output ports along a right gutter.
+    Unplaced processors and ports are laid out with :func:`layered_positions`, left to right
+    along their connections: input ports in the first column, output ports in the last.
+    Child groups take part as virtual nodes so processors feeding a child stay left of the
+    processors it feeds. Child groups and components that already have a position are
+    obstacles, so generated positions never overlap anything in the group.
     """
-    spacing_x = 480.0
-    spacing_y = 240.0
-
-    # Build processor maps and adjacency limited to processors in this group
-    proc_map: Dict[str, ProcessorSpec] = {p.key: p for p in group.processors}
-    out_edges: Dict[str, List[str]] = {k: [] for k in proc_map}
-    in_edges: Dict[str, List[str]] = {k: [] for k in proc_map}
-    # Map child ports to their owning child group for cross-PG placement hints
-    child_port_to_group: Dict[str, ProcessGroupSpec] = {}
+
+    unplaced_processors = [p for p in group.processors if p.position is None and not p.explicit_position]
+    unplaced_inputs = [p for p in group.input_ports if p.position is None and not p.explicit_position]
+    unplaced_outputs = [p for p in group.output_ports if p.position is None and not p.explicit_position]
+    if not (unplaced_processors or unplaced_inputs or unplaced_outputs):
+        return
+
+    sizes: Dict[str, Tuple[float, float]] = {}
+    for port in [*unplaced_inputs, *unplaced_outputs]:
+        sizes[port.key] = PORT_SIZE
+    nodes = [p.key for p in unplaced_inputs] + [p.key for p in unplaced_processors] + [p.key for p in unplaced_outputs]
+
+    obstacles: List[Tuple[float, float, float, float]] = []
+    for items, size in ((group.processors, PROCESSOR_SIZE), (group.input_ports, PORT_SIZE), (group.output_ports, PORT_SIZE)):
+        for item in items:
+            if item.position is not None:
+                obstacles.append((item.position[0], item.position[1], *size))
+
+    # Connections to a child's ports run through a virtual node standing in for the child
+    endpoint: Dict[str, str] = {key: key for key in nodes}
+    virtual: List[str] = []
     for child in group.child_groups:
-        for ip in child.input_ports:
-            child_port_to_group[ip.key] = child
-        for op in child.output_ports:
-            child_port_to_group[op.key] = child
-    # Track already-placed processors
-    placed: Dict[str, Tuple[float, float]] = {}
-
-    def place(key: str, x: float, y: float) -> None:
-        spec = proc_map.get(key)
-        if spec is None or spec.explicit_position:
-            return
-        if spec.position is None:
-            spec.position = (x, y)
-            placed[key] = spec.position
-
-    for conn in group.connections:
-        if conn.source in proc_map and conn.destination in proc_map:
-            out_edges.setdefault(conn.source, []).append(conn.destination)
-            in_edges.setdefault(conn.destination, []).append(conn.source)
-
-    # Place processors relative to child groups when connected via child ports
-    #  - Proc -> child input port: place proc to the left of the child group
-    #  - Child output port -> Proc: place proc to the right of the child group
-    # Stack multiple placements vertically to avoid overlap
-    child_right_counts: Dict[str, int] = {}
-    child_left_counts: Dict[str, int] = {}
-    for conn in group.connections:
-        # Proc -> child input
-        if conn.destination in child_port_to_group and conn.source in proc_map:
-            child = child_port_to_group[conn.destination]
-            child_pos = child.position or (0.0, 0.0)
-            cnt = child_left_counts.get(child.name, 0)
-            y = child_pos[1] + (cnt - 0) * spacing_y
-            place(conn.source, child_pos[0] - spacing_x, y)
-            child_left_counts[child.name] = cnt + 1
-        # child output -> Proc
-        if conn.source in child_port_to_group and conn.destination in proc_map:
-            child = child_port_to_group[conn.source]
-            child_pos = child.position or (0.0, 0.0)
-            cnt = child_right_counts.get(child.name, 0)
-            y = child_pos[1] + (cnt - 0) * spacing_y
-            place(conn.destination, child_pos[0] + spacing_x, y)
-            child_right_counts[child.name] = cnt + 1
-
-    # Identify routers (out-degree >= 2)
-    routers: List[str] = [k for k, outs in out_edges.items() if len(outs) >= 2]
-    base_col = 0
-    for r_idx, router in enumerate(routers):
-        base_x = base_col * (spacing_x * 3)
-        base_col += 1
-        place(router, base_x, 0.0)
-        # Single predecessor to the left (common for Generate/Update -> Router)
-        preds = in_edges.get(router, [])
-        if len(preds) == 1 and preds[0] in proc_map:
-            place(preds[0], base_x - spacing_x, 0.0)
-        # Sinks: vertical stack to the right
-        sinks = sorted(out_edges.get(router, []))
-        n = len(sinks)
-        for i, sink in enumerate(sinks):
-            y_offset = (i - (n - 1) / 2.0) * (spacing_y * 2.0)
-            place(sink, base_x + spacing_x, y_offset)
-
-    # Chain placement for remaining processors not yet placed
-    # First, place children to the right of any placed parent to enforce left->right flow
-    changed = True
-    while changed:
-        changed = False
-        for key, spec in proc_map.items():
-            if spec.explicit_position or spec.position is not None:
-                continue
-            parents = in_edges.get(key, [])
-            parent_positions = [placed[p] for p in parents if p in placed]
-            if parent_positions:
-                # Align with first placed parent
-                px, py = parent_positions[0]
-                place(key, px + spacing_x, py)
-                changed = True
-
-    # Then, place nodes that feed into already-placed nodes to the left, preserving y when possible
-    changed = True
-    while changed:
-        changed = False
-        for key, spec in proc_map.items():
-            if spec.explicit_position or spec.position is not None:
-                continue
-            # If any child is placed, place this to the left
-            children = out_edges.get(key, [])
-            child_positions = [placed[c] for c in children if c in placed]
-            if child_positions:
-                min_x = min(x for x, _ in child_positions)
-                y = child_positions[0][1]
-                place(key, min_x - spacing_x, y)
-                changed = True
-
-    # Fallback: layer remaining processors left-to-right based on graph distances
-    remaining = [p for p in group.processors if p.position is None or (p.explicit_position is False and p.position is None)]
-    if remaining:
-        # Initialize columns with 0 for sources (no in-edges), else None
-        keys = [p.key for p in remaining]
-        in_deg = {k: len(in_edges.get(k, [])) for k in keys}
-        col: Dict[str, int] = {k: 0 for k in keys}
-        # Kahn-style layering using queue of sources; promote children to at least parent+1
-        from collections import deque
-        q = deque([k for k in keys if in_deg.get(k, 0) == 0])
-        visited = set()
-        while q:
-            u = q.popleft()
-            visited.add(u)
-            for v in out_edges.get(u, []):
-                if v not in col:
-                    continue
-                col[v] = max(col.get(v, 0), col.get(u, 0) + 1)
-                in_deg[v] = max(0, in_deg.get(v, 0) - 1)
-                if in_deg[v] == 0 and v not in visited:
-                    q.append(v)
-        # Assign rows within each column
-        columns: Dict[int, List[str]] = {}
-        for k in keys:
-            c = col.get(k, 0)
-            columns.setdefault(c, []).append(k)
-        for c, names in columns.items():
-            for r, k in enumerate(names):
-                place(k, c * spacing_x, r * spacing_y)
-
-    # Layout ports near connected processors with increased spacing, snapping to processor "swim lanes" (row Y values)
-    # Compute processor spread
-    placed_positions = [p.position for p in group.processors if p.position is not None]
-    if placed_positions:
-        min_x = min(x for x, _ in placed_positions)
-        max_x = max(x for x, _ in placed_positions)
-    else:
-        min_x = 0.0
-        max_x = 0.0
-
-    left_x = min_x - (spacing_x * 0.8)
-    right_x = max_x + (spacing_x * 0.8)
-
-    # Map connections to ports
-    input_port_ids = {p.key for p in group.input_ports}
-    output_port_ids = {p.key for p in group.output_ports}
-
-    port_in_targets: Dict[str, List[Tuple[float, float]]] = {}
-    port_out_sources: Dict[str, List[Tuple[float, float]]] = {}
-    for conn in group.connections:
-        # Input port -> Processor
-        if conn.source in input_port_ids and conn.destination in placed:
-            port_in_targets.setdefault(conn.source, []).append(placed[conn.destination])
-        # Processor -> Output port
-        if conn.destination in output_port_ids and conn.source in placed:
-            port_out_sources.setdefault(conn.destination, []).append(placed[conn.source])
-
-    # Build swim lanes from processor Y positions
-    lane_step = spacing_y
-    lanes: List[float] = []
-    if placed_positions:
-        lanes = sorted({round(y / lane_step) * lane_step for _, y in placed_positions})
-
-    # Place input ports snapped to nearest lane; vertically stagger if multiple share a lane
-    in_lane_counts: Dict[float, int] = {}
-    in_free_row = 0
-    for port in group.input_ports:
-        if port.explicit_position:
-            continue
-        if port.position is None:
-            targets = port_in_targets.get(port.key) or []
-            if targets:
-                base_y = sum(y for _, y in targets) / len(targets)
-                if lanes:
-                    lane = min(lanes, key=lambda ly: abs(ly - base_y))
-                else:
-                    lane = round(base_y / lane_step) * lane_step
-                offset_idx = in_lane_counts.get(lane, 0)
-                x = left_x
-                # vertical spacing between ports on same lane
-                y = lane + offset_idx * (spacing_y * 0.6)
-                in_lane_counts[lane] = offset_idx + 1
-            else:
-                # No targets known: place on next free lane below
-                y = in_free_row * lane_step
-                in_free_row += 1
-                x = left_x
-            port.position = (x, y)
-
-    # Place output ports snapped to nearest lane; vertically stagger if multiple share a lane
-    out_lane_counts: Dict[float, int] = {}
-    out_free_row = 0
-    for port in group.output_ports:
-        if port.explicit_position:
-            continue
-        if port.position is None:
-            sources = port_out_sources.get(port.key) or []
-            if sources:
-                base_y = sum(y for _, y in sources) / len(sources)
-                if lanes:
-                    lane = min(lanes, key=lambda ly: abs(ly - base_y))
-                else:
-                    lane = round(base_y / lane_step) * lane_step
-                offset_idx = out_lane_counts.get(lane, 0)
-                x = right_x
-                y = lane + offset_idx * (spacing_y * 0.6)
-                out_lane_counts[lane] = offset_idx + 1
-            else:
-                y = out_free_row * lane_step
-                out_free_row += 1
-                x = right_x
-            port.position = (x, y)
+        node = f"group:{child.name}"
+        virtual.append(node)
+        for port in [*child.input_ports, *child.output_ports]:
+            endpoint.setdefault(port.key, node)
+        if child.position is not None:
+            obstacles.append((child.position[0], child.position[1], *GROUP_SIZE))
+
+    edges = [
+        (endpoint[conn.source], endpoint[conn.destination])
+        for conn in group.connections
+        if conn.source in endpoint and conn.destination in endpoint
+    ]
+    positions = layered_positions(
+        [*nodes, *virtual],
+        edges,
+        sizes=sizes,
+        virtual=virtual,
+        last_layer=[p.key for p in unplaced_outputs],
+        obstacles=obstacles,
+    )
+    for item in [*unplaced_inputs, *unplaced_processors, *unplaced_outputs]:
+        item.position = positions[item.key]
+
+
+def _processor_types(group: ProcessGroupSpec) -> List[str]:
+    """Distinct processor types in ``group`` and its descendants, in spec order."""
+
+    types: Dict[str, None] = {}
+    pending = [group]
+    while pending:
+        current = pending.pop(0)
+        types.update(dict.fromkeys(proc.type for proc in current.processors))
+        pending.extend(current.child_groups)
+    return list(types)
+
+
+def _uploaded_port(results: Mapping[str, Any], upload_task: str, key: str) -> Tuple[str, str]:
+    return results[upload_task]["ports"][key]
+
+
+# Flow lists a resumed deploy may adopt live components from
+_ADOPTABLE_KINDS = ("processGroups", "processors", "inputPorts", "outputPorts", "connections")
+_PORT_KINDS = {"create_input_port": "inputPorts", "create_output_port": "outputPorts"}
+
+
+def _adoption_name(kind: str, component: Mapping[str, Any]) -> str:
+    if kind == "connections":
+        # Connection names are optional; the endpoints identify them
+        source = (component.get("source") or {}).get("id")
+        destination = (component.get("destination") or {}).get("id")
+        return f"{source}>{destination}>{component.get('name') or ''}"
+    return str(component.get("name") or "")
+
+
+def _uploadable(child: ProcessGroupSpec, parent_connections: Iterable[ConnectionSpec]) -> bool:
+    """True when the parent only connects to ``child``'s own ports, the ids an upload reports back."""
+
+    inner: Set[str] = set()
+    pending = [child]
+    while pending:
+        group = pending.pop()
+        inner.update(proc.key for proc in group.processors)
+        if group is not child:
+            inner.update(port.key for port in [*group.input_ports, *group.output_ports])
+        pending.extend(group.child_groups)
+    direct = {port.key for port in [*child.input_ports, *child.output_ports]}
+    return not any(
+        key in inner and key not in direct for conn in parent_connections for key in (conn.source, conn.destination)
+    )
 
 
 class FlowDeployer:
@@ -817,10 +892,27 @@ class FlowDeployer:
         client: NiFiClient,
         spec: FlowSpec,
         controller_service_map: Optional[Mapping[str, str]] = None,
+        *,
+        max_workers: Optional[int] = None,
+        upload: bool = True,
+        journal: Optional["DeployJournal"] = None,
+        resume: bool = False,
     ):
         self.client = client
         self.spec = spec
         self.controller_service_map = dict(controller_service_map or {})
+        # Concurrent REST calls while deploying; 1 runs the operations one at a time
+        self.max_workers = max(1, int(max_workers or client.settings.max_in_flight))
+        # Create child groups with one versioned-flow upload each instead of per component
+        self.upload = upload
+        # Checkpoint of finished operations; with ``resume`` its live entries are skipped
+        self.journal = journal
+        self.resume = resume
+        # Operations a resumed deploy found already done
+        self.skipped = 0
+        # (group id, flow list, name) -> live ids a resumed deploy may reuse instead of creating
+        self._adoptable: Dict[Tuple[str, str, str], List[str]] = {}
+        self._adopt_lock = threading.Lock()
 
     def deploy(self) -> str:
         """Create the process group and all processors/connections. Returns the new PG ID."""
@@ -828,15 +920,101 @@ class FlowDeployer:
         root_pg_id = "root"
         root_group = self.spec.root_group
 
-        self._deploy_group_contents(root_pg_id, root_group)
+        graph = self.compile(root_pg_id)
+        if self.resume:
+            self.skipped = self.restore(graph)
+        elif self.journal is not None:
+            self.journal.start()
+        graph.run(max_workers=self.max_workers, on_result=self._checkpoint if self.journal else None)
         # Create group labels on the root canvas to wrap columns (best-effort)
         try:
             self._create_group_labels(root_pg_id, root_group)
         except Exception:
             pass
 
+        if self.journal is not None:
+            self.journal.finish()
         return root_pg_id
 
+    def restore(self, graph: TaskGraph, snapshot: Optional[FlowSnapshot] = None) -> int:
+        """Seed ``graph`` with the journaled results whose components still exist.
+
+        The live tree is walked once. Journal entries pointing at deleted components
+        are run again. Components that exist but were never journaled, for example
+        because the deploy died before NiFi's response arrived, are adopted by name
+        instead of created twice. Returns the number of operations skipped.
+        """
+
+        if self.journal is None:
+            raise FlowDeploymentError("Resuming a deploy requires a deploy journal")
+        from .deploy_journal import result_ids  # local import to avoid cycle
+
+        entries = self.journal.load()
+        snapshot = snapshot or FlowSnapshot.capture(self.client)
+        live: Set[str] = set()
+        adoptable: Dict[Tuple[str, str, str], List[str]] = {}
+        for pg_id, _, flow in snapshot.groups:
+            for kind in _ADOPTABLE_KINDS:
+                for entity in flow.get(kind) or []:
+                    component = entity.get("component") or {}
+                    if component.get("id"):
+                        live.add(component["id"])
+                        adoptable.setdefault((pg_id, kind, _adoption_name(kind, component)), []).append(component["id"])
+
+        skipped = 0
+        claimed: Set[str] = set()
+        for task, entry in entries.items():
+            ids = result_ids(entry["result"])
+            if task in graph and ids and all(component_id in live for component_id in ids):
+                graph.results[task] = entry["result"]
+                claimed.update(ids)
+                skipped += 1
+        self._adoptable = {
+            key: [component_id for component_id in ids if component_id not in claimed]
+            for key, ids in adoptable.items()
+        }
+        return skipped
+
+    def _checkpoint(self, task: str, result: Any) -> None:
+        from .deploy_journal import result_ids  # local import to avoid cycle
+
+        revisions = {}
+        for component_id in result_ids(result):
+            revision = self.client.revisions.revision(component_id)
+            if revision is not None:
+                revisions[component_id] = revision.get("version")
+        self.journal.record(task, result, revisions)
+
+    def _adopt(self, parent_pg_id: str, kind: str, name: str) -> Optional[str]:
+        if not self._adoptable:
+            return None
+        with self._adopt_lock:
+            ids = self._adoptable.get((parent_pg_id, kind, name))
+            return ids.pop(0) if ids else None
+
+    def compile(self, root_pg_id: str = "root") -> TaskGraph:
+        """Plan the deployment as a graph of REST operations without calling any write endpoint.
+
+        Processor definitions are fetched and properties validated here, so spec errors
+        surface before anything is created. Ports, processors and child groups depend on
+        their parent group; connections depend on their group and both endpoints. With
+        ``upload`` enabled each child group of the root is a single upload task.
+        """
+
+        self.prefetch()
+        graph = TaskGraph()
+        self._plan_group(graph, None, lambda: root_pg_id, self.spec.root_group, "root")
+        return graph
+
+    def prefetch(self) -> int:
+        """Fetch the definition of every processor type in the spec tree concurrently.
+
+        Preparation then reads definitions from the client cache instead of one serial
+        miss per type. Returns the number of definitions fetched.
+        """
+
+        return self.client.prefetch_definitions(_processor_types(self.spec.root_group))
+
     def _delete_existing(self, pg_entity: Dict[str, object]) -> None:
         component = pg_entity.get("component", {})
         revision = pg_entity.get("revision", {})
@@ -852,12 +1030,17 @@ class FlowDeployer:
         if version is None:
             raise FlowDeploymentError("Unable to determine revision for existing process group")
         self.client.delete_process_group(pg_id, version)
+        if self._adoptable:
+            with self._adopt_lock:
+                for ids in self._adoptable.values():
+                    if pg_id in ids:
+                        ids.remove(pg_id)
 
     def _prepare_processors(
         self,
         group_spec: ProcessGroupSpec,
     ) -> List[PreparedProcessor]:
-        _load_defaults()
+        defaults_by_type = _load_defaults()
         metadata_by_key: Dict[str, Dict[str, Any]] = {}
         for proc in group_spec.processors:
             metadata_by_key[proc.key] = self.client.get_processor_metadata(proc.type)
@@ -866,12 +1049,16 @@ class FlowDeployer:
 
         prepared: List[PreparedProcessor] = []
         for proc in group_spec.processors:
-            # Apply scheduling defaults by processor type when not explicitly provided
-            if not proc.scheduling_period:
-                default_sched = _DEFAULT_SCHEDULING_BY_TYPE.get(proc.type)
-                if default_sched:
-                    proc.scheduling_period = default_sched
+            # Apply scheduling and performance defaults by processor type when not explicitly provided
+            for field_name, value in defaults_by_type.get(proc.type, {}).items():
+                if getattr(proc, field_name) is None:
+                    setattr(proc, field_name, value)
             metadata = metadata_by_key[proc.key]
+            # NiFi ignores a run duration on processors that cannot batch sessions
+            if proc.run_duration_millis and metadata.get("supportsBatching") is False:
+                raise FlowDeploymentError(
+                    f"Processor '{proc.name}' ({proc.type}) does not support batching; remove run_duration_millis"
+                )
             descriptors = metadata.get("propertyDescriptors") or {}
             normalized = validate_and_normalize_properties(
                 processor_name=proc.name,
@@ -942,105 +1129,297 @@ class FlowDeployer:
                 if value in controller_service_id_map:
                     prepared.properties[prop] = controller_service_id_map[value]
 
-    def _deploy_group_contents(
-        self, parent_pg_id: str, group_spec: ProcessGroupSpec
+    def _plan_group(
+        self,
+        graph: TaskGraph,
+        group_task: Optional[str],
+        group_id: Callable[[], str],
+        group_spec: ProcessGroupSpec,
+        path: str,
     ) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
-        # Compute default layout for components without explicit positions
-        _layout_group_components(group_spec)
-        input_port_id_map: Dict[str, Tuple[str, str]] = {}
+        """Add tasks for ``group_spec``; returns spec key -> task key for processors, input and output ports."""
+
+        input_port_tasks: Dict[str, str] = {}
         for port in group_spec.input_ports:
-            created = self.client.create_input_port(
-                parent_id=parent_pg_id,
-                name=port.name,
-                position=port.position,
-                allow_remote=port.allow_remote,
-                comments=port.comments,
+            input_port_tasks[port.key] = graph.add(
+                f"{path}/input-port:{port.key}",
+                partial(self._create_port, self.client.create_input_port, group_id, port),
+                [group_task],
             )
-            input_port_id_map[port.key] = (created["id"], parent_pg_id)
 
-        output_port_id_map: Dict[str, Tuple[str, str]] = {}
+        output_port_tasks: Dict[str, str] = {}
         for port in group_spec.output_ports:
-            created = self.client.create_output_port(
-                parent_id=parent_pg_id,
-                name=port.name,
-                position=port.position,
-                allow_remote=port.allow_remote,
-                comments=port.comments,
+            output_port_tasks[port.key] = graph.add(
+                f"{path}/output-port:{port.key}",
+                partial(self._create_port, self.client.create_output_port, group_id, port),
+                [group_task],
             )
-            output_port_id_map[port.key] = (created["id"], parent_pg_id)
-
-        prepared_processors = self._prepare_processors(group_spec)
-        self._apply_controller_service_mappings(prepared_processors, self.controller_service_map)
 
-        processor_id_map: Dict[str, Tuple[str, str]] = {}
+        prepared_processors = self._prepare_group(group_spec)
+        processor_tasks: Dict[str, str] = {}
         for prepared in prepared_processors:
-            spec = prepared.spec
-            created = self.client.create_processor(
-                parent_id=parent_pg_id,
-                name=spec.name,
-                type_name=spec.type,
-                position=spec.position,
-                properties=prepared.properties,
-                scheduling_strategy=spec.scheduling_strategy,
-                scheduling_period=spec.scheduling_period,
+            processor_tasks[prepared.spec.key] = graph.add(
+                f"{path}/processor:{prepared.spec.key}",
+                partial(self._create_processor, group_id, prepared),
+                [group_task],
             )
-            processor_id_map[spec.key] = (created["id"], parent_pg_id)
-            if prepared.auto_terminate:
-                self.client.update_processor_autoterminate(created["id"], prepared.auto_terminate)
-            if spec.state:
-                try:
-                    self.client.set_processor_state(created["id"], spec.state)
-                except Exception:
-                    pass
-
-        for child in group_spec.child_groups:
-            existing_child = self.client.find_child_process_group_by_name(parent_pg_id, child.name)
-            if existing_child:
-                self._delete_existing(existing_child)
-            child_entity = self.client.create_process_group(
-                parent_id=parent_pg_id,
-                name=child.name,
-                position=child.position,
-                comments=child.comments,
+
+        for index, child in enumerate(group_spec.child_groups):
+            child_proc, child_in, child_out = self._plan_child_group(
+                graph, group_task, group_id, child, f"{path}/group[{index}]:{child.name}", group_spec.connections
             )
-            child_id = child_entity["id"]
-            # Ensure the child group is addressable before creating processors (avoid rare 404s)
-            for _ in range(10):
-                try:
-                    _ = self.client.get_process_group(child_id)
-                    break
-                except Exception:
-                    time.sleep(0.1)
-            child_proc_map, child_in_map, child_out_map = self._deploy_group_contents(child_id, child)
-            processor_id_map.update(child_proc_map)
-            input_port_id_map.update(child_in_map)
-            output_port_id_map.update(child_out_map)
-
-        for conn in group_spec.connections:
-            source_id, source_type, source_group = self._resolve_component_id(
-                conn.source, processor_id_map, input_port_id_map, output_port_id_map
+            processor_tasks.update(child_proc)
+            input_port_tasks.update(child_in)
+            output_port_tasks.update(child_out)
+
+        for index, conn in enumerate(group_spec.connections):
+            source_task, source_type = self._resolve_component_task(
+                conn.source, processor_tasks, input_port_tasks, output_port_tasks
             )
-            destination_id, destination_type, destination_group = self._resolve_component_id(
-                conn.destination, processor_id_map, input_port_id_map, output_port_id_map
+            destination_task, destination_type = self._resolve_component_task(
+                conn.destination, processor_tasks, input_port_tasks, output_port_tasks
             )
-            # Only processors have selectable relationships; for ports NiFi rejects them.
-            rels = conn.relationships if source_type == "PROCESSOR" else []
-            self.client.create_connection(
-                parent_id=parent_pg_id,
-                name=conn.name,
-                source_id=source_id,
-                destination_id=destination_id,
-                relationships=rels,
-                source_type=source_type,
-                destination_type=destination_type,
-                source_group_id=source_group,
-                destination_group_id=destination_group,
+            graph.add(
+                f"{path}/connection[{index}]:{conn.name}",
+                partial(
+                    self._create_connection,
+                    graph.results,
+                    group_id,
+                    conn,
+                    (source_task, source_type),
+                    (destination_task, destination_type),
+                ),
+                [group_task, source_task, destination_task],
             )
 
-        return processor_id_map, input_port_id_map, output_port_id_map
+        return processor_tasks, input_port_tasks, output_port_tasks
 
-    def _create_group_labels(self, parent_pg_id: str, root_group: ProcessGroupSpec) -> None:
-        # Compute bounding boxes per group name from child positions, then create NiFi labels
+    def _prepare_group(self, group_spec: ProcessGroupSpec) -> List[PreparedProcessor]:
+        # Compute default layout for components without explicit positions
+        _layout_group_components(group_spec)
+        prepared_processors = self._prepare_processors(group_spec)
+        self._apply_controller_service_mappings(prepared_processors, self.controller_service_map)
+        return prepared_processors
+
+    def _plan_child_group(
+        self,
+        graph: TaskGraph,
+        group_task: Optional[str],
+        group_id: Callable[[], str],
+        child: ProcessGroupSpec,
+        task_key: str,
+        parent_connections: Iterable[ConnectionSpec],
+    ) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
+        """Add tasks creating ``child`` in the group; returns task maps like :meth:`_plan_group`.
+
+        An uploadable child is one task, plus one task per direct port reading its uploaded id.
+        Children whose inner components are wired from the parent are planned component by component.
+        """
+
+        if not (self.upload and _uploadable(child, parent_connections)):
+            child_task = graph.add(task_key, partial(self._create_child_group, group_id, child), [group_task])
+            return self._plan_group(graph, child_task, partial(graph.results.__getitem__, child_task), child, child_task)
+
+        # Compiled now so property errors still surface before any write
+        from .versioned_flow import flow_snapshot  # local import to avoid cycle
+
+        sensitive: Dict[Tuple[str, ...], Dict[str, Dict[str, str]]] = {}
+        snapshot = flow_snapshot(
+            child,
+            prepare=self._prepare_group,
+            bundle_for=self.client._resolve_bundle,
+            controller_services={service_id: key for key, service_id in self.controller_service_map.items()},
+            sensitive=sensitive,
+        )
+        upload_task = graph.add(
+            task_key, partial(self._upload_child_group, group_id, child, snapshot, sensitive, task_key), [group_task]
+        )
+        port_tasks: Tuple[Dict[str, str], Dict[str, str]] = ({}, {})
+        for tasks, kind, ports in zip(port_tasks, ("input-port", "output-port"), (child.input_ports, child.output_ports)):
+            for port in ports:
+                tasks[port.key] = graph.add(
+                    f"{task_key}/{kind}:{port.key}",
+                    partial(_uploaded_port, graph.results, upload_task, port.key),
+                    [upload_task],
+                )
+        return {}, port_tasks[0], port_tasks[1]
+
+    def _upload_child_group(
+        self,
+        group_id: Callable[[], str],
+        child: ProcessGroupSpec,
+        snapshot: Dict[str, Any],
+        sensitive: Mapping[Tuple[str, ...], Mapping[str, Dict[str, str]]],
+        task_key: str,
+    ) -> Dict[str, Any]:
+        parent_pg_id = group_id()
+        existing_child = self.client.find_child_process_group_by_name(parent_pg_id, child.name)
+        if existing_child:
+            self._delete_existing(existing_child)
+        try:
+            child_id = self.client.upload_process_group(parent_pg_id, child.name, snapshot, child.position)["id"]
+        except httpx.HTTPStatusError as exc:
+            # No upload endpoint (older NiFi) or a rejected snapshot: nothing was created,
+            # so fall back to creating the group component by component.
+            if exc.response.status_code >= 500:
+                raise
+            if exc.response.status_code in (404, 405):
+                self.upload = False
+            return self._deploy_child_group(parent_pg_id, child, task_key)
+        flow = self.client.get_process_group_flow(child_id)
+        if sensitive:
+            self._apply_sensitive_properties(child, flow, sensitive)
+        keys = {port.name: port.key for port in [*child.input_ports, *child.output_ports]}
+        ports: Dict[str, Tuple[str, str]] = {}
+        for entity in [*(flow.get("inputPorts") or []), *(flow.get("outputPorts") or [])]:
+            component = entity.get("component") or {}
+            if component.get("name") in keys:
+                ports[keys[component["name"]]] = (component["id"], child_id)
+        return {"id": child_id, "ports": ports}
+
+    def _apply_sensitive_properties(
+        self,
+        child: ProcessGroupSpec,
+        flow: Mapping[str, Any],
+        sensitive: Mapping[Tuple[str, ...], Mapping[str, Dict[str, str]]],
+        names: Tuple[str, ...] = (),
+    ) -> None:
+        """Set the sensitive literals NiFi dropped from the uploaded snapshot, walking groups by name."""
+
+        pending = dict(sensitive.get(names) or {})
+        for entity in flow.get("processors") or []:
+            component = entity.get("component") or {}
+            values = pending.pop(component.get("name"), None)
+            if values:
+                self.client.update_processor_config(component["id"], {"properties": values})
+        if pending:
+            raise FlowDeploymentError(
+                f"Uploaded group '{'/'.join((child.name, *names))}' has no processors named {sorted(pending)}"
+            )
+        for entity in flow.get("processGroups") or []:
+            component = entity.get("component") or {}
+            path = (*names, component.get("name"))
+            if any(key[: len(path)] == path for key in sensitive):
+                nested = self.client.get_process_group_flow(component["id"])
+                self._apply_sensitive_properties(child, nested, sensitive, path)
+
+    def _deploy_child_group(self, parent_pg_id: str, child: ProcessGroupSpec, task_key: str) -> Dict[str, Any]:
+        graph = TaskGraph()
+        child_task = graph.add(task_key, partial(self._create_child_group, lambda: parent_pg_id, child))
+        _, input_tasks, output_tasks = self._plan_group(
+            graph, child_task, partial(graph.results.__getitem__, child_task), child, child_task
+        )
+        graph.run(max_workers=self.max_workers)
+        direct = {port.key for port in [*child.input_ports, *child.output_ports]}
+        ports = {key: graph.results[task] for key, task in {**input_tasks, **output_tasks}.items() if key in direct}
+        return {"id": graph.results[child_task], "ports": ports}
+
+    def _create_port(
+        self, create: Callable[..., Dict[str, Any]], group_id: Callable[[], str], port: PortSpec
+    ) -> Tuple[str, str]:
+        parent_pg_id = group_id()
+        adopted = self._adopt(parent_pg_id, _PORT_KINDS.get(getattr(create, "__name__", ""), ""), port.name)
+        if adopted:
+            return adopted, parent_pg_id
+        created = create(
+            parent_id=parent_pg_id,
+            name=port.name,
+            position=port.position,
+            allow_remote=port.allow_remote,
+            comments=port.comments,
+        )
+        return created["id"], parent_pg_id
+
+    def _create_processor(self, group_id: Callable[[], str], prepared: PreparedProcessor) -> Tuple[str, str]:
+        parent_pg_id = group_id()
+        spec = prepared.spec
+        # Processors are created fully configured, so an adopted one needs no further calls
+        adopted = self._adopt(parent_pg_id, "processors", spec.name)
+        if adopted:
+            return adopted, parent_pg_id
+        created = self.client.create_processor(
+            parent_id=parent_pg_id,
+            name=spec.name,
+            type_name=spec.type,
+            position=spec.position,
+            properties=prepared.properties,
+            scheduling_strategy=spec.scheduling_strategy,
+            scheduling_period=spec.scheduling_period,
+            auto_terminate=prepared.auto_terminate,
+            comments=spec.comments,
+            concurrent_tasks=spec.concurrent_tasks,
+            run_duration_millis=spec.run_duration_millis,
+            penalty_duration=spec.penalty_duration,
+            yield_duration=spec.yield_duration,
+            execution_node=spec.execution_node,
+            state=spec.state,
+        )
+        # NiFi releases that ignore the state in a creation body need the separate transition
+        if spec.state and (created.get("state") or "").upper() != spec.state.upper():
+            try:
+                self.client.set_processor_state(created["id"], spec.state)
+            except Exception:
+                pass
+        return created["id"], parent_pg_id
+
+    def _create_child_group(self, group_id: Callable[[], str], child: ProcessGroupSpec) -> str:
+        parent_pg_id = group_id()
+        adopted = self._adopt(parent_pg_id, "processGroups", child.name)
+        if adopted:
+            return adopted
+        existing_child = self.client.find_child_process_group_by_name(parent_pg_id, child.name)
+        if existing_child:
+            self._delete_existing(existing_child)
+        child_entity = self.client.create_process_group(
+            parent_id=parent_pg_id,
+            name=child.name,
+            position=child.position,
+            comments=child.comments,
+        )
+        child_id = child_entity["id"]
+        # Ensure the child group is addressable before creating processors (avoid rare 404s)
+        for _ in range(10):
+            try:
+                _ = self.client.get_process_group(child_id)
+                break
+            except Exception:
+                time.sleep(0.1)
+        return child_id
+
+    def _create_connection(
+        self,
+        results: Mapping[str, Any],
+        group_id: Callable[[], str],
+        conn: ConnectionSpec,
+        source: Tuple[str, str],
+        destination: Tuple[str, str],
+    ) -> Dict[str, Any]:
+        (source_task, source_type), (destination_task, destination_type) = source, destination
+        source_id, source_group = results[source_task]
+        destination_id, destination_group = results[destination_task]
+        # Only processors have selectable relationships; for ports NiFi rejects them.
+        rels = conn.relationships if source_type == "PROCESSOR" else []
+        parent_pg_id = group_id()
+        adopted = self._adopt(parent_pg_id, "connections", f"{source_id}>{destination_id}>{conn.name or ''}")
+        if adopted:
+            return {"id": adopted}
+        return self.client.create_connection(
+            parent_id=parent_pg_id,
+            name=conn.name,
+            source_id=source_id,
+            destination_id=destination_id,
+            relationships=rels,
+            source_type=source_type,
+            destination_type=destination_type,
+            source_group_id=source_group,
+            destination_group_id=destination_group,
+            queue_settings=conn.queue_settings(),
+        )
+
+    def _group_labels(self, root_group: ProcessGroupSpec) -> List[Tuple[str, Tuple[float, float], float, float, str]]:
+        """Return ``(text, position, width, height, color)`` for each root canvas group label."""
+
+        # Compute bounding boxes per group name from child positions
         membership = self.spec.root_child_membership or {}
         descriptions = self.spec.root_group_descriptions or {}
         columns = self.spec.root_child_columns or {}
@@ -1098,19 +1477,10 @@ class FlowDeployer:
             if rows > rows_max:
                 rows_max = rows
         if global_min_y is None:
-            return
-
-        # Second pass: create labels with uniform bottom alignment
-        # Pre-fetch existing labels to avoid duplicates (match on text)
-        existing = {}
-        try:
-            flow = self.client._client.get(f"/flow/process-groups/{parent_pg_id}").json().get("processGroupFlow", {}).get("flow", {})
-            for lab in flow.get("labels") or []:
-                comp = lab.get("component", {})
-                existing[comp.get("label")] = comp.get("id")
-        except Exception:
-            pass
+            return []
 
+        # Second pass: labels with uniform bottom alignment
+        labels: List[Tuple[str, Tuple[float, float], float, float, str]] = []
         for gname, min_x, min_y, lanes, rows in group_bounds:
             # Top aligned to global top with top_pad for name/desc; left with 25% padding
             x = min_x - (spacing_x * 0.25)
@@ -1122,6 +1492,24 @@ class FlowDeployer:
             text = gname if not desc else f"{gname}\n{desc}"
             color = colors[color_idx % len(colors)]
             color_idx += 1
+            labels.append((text, (x, y), width, height, color))
+        return labels
+
+    def _create_group_labels(self, parent_pg_id: str, root_group: ProcessGroupSpec) -> None:
+        labels = self._group_labels(root_group)
+        if not labels:
+            return
+        # Pre-fetch existing labels to avoid duplicates (match on text)
+        existing = {}
+        try:
+            flow = self.client._client.get(f"/flow/process-groups/{parent_pg_id}").json().get("processGroupFlow", {}).get("flow", {})
+            for lab in flow.get("labels") or []:
+                comp = lab.get("component", {})
+                existing[comp.get("label")] = comp.get("id")
+        except Exception:
+            pass
+
+        for text, (x, y), width, height, color in labels:
             try:
                 # Remove existing label with identical text to avoid duplicates
                 old_id = existing.get(text)
@@ -1141,22 +1529,19 @@ class FlowDeployer:
             except Exception:
                 continue
 
-    def _resolve_component_id(
+    def _resolve_component_task(
         self,
         key: str,
-        processor_map: Mapping[str, Tuple[str, str]],
-        input_port_map: Mapping[str, Tuple[str, str]],
-        output_port_map: Mapping[str, Tuple[str, str]],
-    ) -> Tuple[str, str, str]:
-        if key in processor_map:
-            component_id, group_id = processor_map[key]
-            return component_id, "PROCESSOR", group_id
-        if key in input_port_map:
-            component_id, group_id = input_port_map[key]
-            return component_id, "INPUT_PORT", group_id
-        if key in output_port_map:
-            component_id, group_id = output_port_map[key]
-            return component_id, "OUTPUT_PORT", group_id
+        processor_tasks: Mapping[str, str],
+        input_port_tasks: Mapping[str, str],
+        output_port_tasks: Mapping[str, str],
+    ) -> Tuple[str, str]:
+        if key in processor_tasks:
+            return processor_tasks[key], "PROCESSOR"
+        if key in input_port_tasks:
+            return input_port_tasks[key], "INPUT_PORT"
+        if key in output_port_tasks:
+            return output_port_tasks[key], "OUTPUT_PORT"
         raise FlowDeploymentError(f"Connection references unknown component '{key}'")
 
 
@@ -1175,13 +1560,10 @@ def start_processors(client: NiFiClient, root_pg_id: str = "root", timeout: floa
 
     client.schedule_process_group(root_pg_id, "RUNNING")
 
-    deadline = time.time() + timeout
-    while True:
-        counts = count_processor_states(client)
-        stopped = counts.get("STOPPED", 0)
-        starting = counts.get("STARTING", 0)
-        if stopped == 0 and starting == 0:
-            return
-        if time.time() > deadline:
-            raise FlowDeploymentError(f"Processors failed to reach RUNNING state: {counts}")
-        time.sleep(0.5)
+    wait_until(
+        lambda: count_processor_states(client, snapshot=StatusSnapshot.capture(client, validation_details=False)),
+        until=lambda counts: counts.get("STOPPED", 0) == 0 and counts.get("STARTING", 0) == 0,
+        timeout=timeout,
+        label="processors running",
+        on_timeout=lambda counts: FlowDeploymentError(f"Processors failed to reach RUNNING state: {counts}"),
+    )
@@ -2,10 +2,9 @@
 
 from __future__ import annotations
 
-import time
 from typing import Dict, Iterable, Optional
 
-from ..cleanup import stop_root_processors
+from ..cleanup import stop_root_processors, wait_for_services
 from ..flow_builder import start_processors
 from .nifi_client import NiFiClient
 
@@ -17,9 +16,6 @@ __all__ = [
     "stop_tools_http_listeners",
 ]
 
-POLL_INTERVAL = 0.5
-
-
 def _list_root_controller_services(client: NiFiClient, *, include_inherited: bool = True) -> Iterable[Dict[str, object]]:
     response = client._client.get(
         "/flow/process-groups/root/controller-services",
@@ -29,29 +25,12 @@ def _list_root_controller_services(client: NiFiClient, *, include_inherited: boo
     return response.json().get("controllerServices") or []
 
 
-def _wait_for_controller_state(
-    client: NiFiClient,
-    service_id: str,
-    target_state: str,
-    *,
-    timeout: float = 60.0,
-) -> None:
-    deadline = time.time() + timeout
-    while True:
-        entity = client.get_controller_service(service_id)
-        state = entity.get("component", {}).get("state")
-        if state == target_state:
-            return
-        if time.time() > deadline:
-            raise RuntimeError(f"Controller service {service_id} did not reach state {target_state} (state={state})")
-        time.sleep(POLL_INTERVAL)
-
-
 def enable_all_controllers(client: NiFiClient, *, timeout: float = 60.0) -> Dict[str, object]:
     """Enable every controller service defined at the root process group."""
 
     services = list(_list_root_controller_services(client))
     enabled: Dict[str, object] = {"count": 0, "services": []}
+    requested = []
     for service in services:
         component = service.get("component") or {}
         service_id = component.get("id")
@@ -66,12 +45,16 @@ def enable_all_controllers(client: NiFiClient, *, timeout: float = 60.0) -> Dict
             continue
         try:
             client.enable_controller_service(service_id)
-            _wait_for_controller_state(client, service_id, "ENABLED", timeout=timeout)
-            enabled["count"] += 1
-            enabled["services"].append(service_id)
         except Exception:
             # Non-fatal: leave service as-is (likely invalid until truststore/params are set)
             continue
+        requested.append(service_id)
+    # Services that never reach ENABLED are left as-is rather than failing the command
+    states = wait_for_services(client, requested, "ENABLED", timeout=timeout, raise_on_timeout=False)
+    for service_id in requested:
+        if states.get(service_id) == "ENABLED":
+            enabled["count"] += 1
+            enabled["services"].append(service_id)
     return enabled
 
 
@@ -89,9 +72,9 @@ def disable_all_controllers(client: NiFiClient, *, timeout: float = 60.0) -> Dic
         if state == "DISABLED":
             continue
         client.disable_controller_service(service_id)
-        _wait_for_controller_state(client, service_id, "DISABLED", timeout=timeout)
         disabled["count"] += 1
         disabled["services"].append(service_id)
+    wait_for_services(client, disabled["services"], "DISABLED", timeout=timeout)
     return disabled
 
 
@@ -137,9 +120,7 @@ def stop_tools_http_listeners(client: NiFiClient) -> Dict[str, object]:
                     if not pid:
                         continue
                     try:
-                        ent = client._client.get(f"/processors/{pid}").json()
-                        rev = ent.get("revision", {})
-                        client._client.put(f"/processors/{pid}/run-status", json={"revision": rev, "state": "STOPPED"}).raise_for_status()
+                        client.set_processor_run_status(pid, "STOPPED")
                         stopped["count"] += 1
                         stopped["processors"].append(pid)
                     except Exception:
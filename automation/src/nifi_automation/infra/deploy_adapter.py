@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from ..controller_registry import ensure_root_controller_services
-from ..flow_builder import FlowSpec, deploy_flow_from_file, load_flow_spec
+from ..controller_registry import ensure_root_controller_services, lookup_root_controller_services
+from ..deploy_cost import estimate_deploy
+from ..deploy_journal import DeployJournal
+from ..flow_builder import FlowDeployer, FlowDeploymentError, FlowSpec
+from ..flow_diff import IncrementalDeployer
+from ..spec_cache import load_flow_spec_cached, spec_digest
 from .nifi_client import NiFiClient
 
 
@@ -40,16 +44,8 @@ def _summarize_flow_spec(spec: FlowSpec) -> Dict[str, Any]:
     }
 
 
-def deploy_flow(client: NiFiClient, spec_path: Path, *, dry_run: bool = False) -> Dict[str, Any]:
-    """Deploy the flow defined at *spec_path* and return deployment metadata."""
-
-    resolved = spec_path if spec_path.is_absolute() else spec_path.resolve()
-    spec = load_flow_spec(resolved)
-
-    if dry_run:
-        return {"dry_run": True, "summary": _summarize_flow_spec(spec)}
-
-    service_map = ensure_root_controller_services(client)
+def _controller_service_map(client: NiFiClient, *, create: bool = True) -> Dict[str, str]:
+    service_map = ensure_root_controller_services(client) if create else lookup_root_controller_services(client)
     # Opportunistically map a pre-existing StandardSSLContextService named 'Workflow SSL'
     # to the alias key used in flow specs ('ssl-context'). This lets flows reference
     # an SSL Context Service created outside the manifest (e.g., by the trust CLI).
@@ -70,13 +66,69 @@ def deploy_flow(client: NiFiClient, spec_path: Path, *, dry_run: bool = False) -
     except Exception:
         # Non-fatal; flows that reference 'ssl-context' will fail if the service is absent.
         pass
-    process_group_id = deploy_flow_from_file(
-        client,
-        resolved,
-        controller_service_map=service_map,
-    )
-    return {
+    return service_map
+
+
+def _journal(client: NiFiClient, spec_path: Path) -> Optional[DeployJournal]:
+    settings = getattr(client, "settings", None)
+    if settings is None or not getattr(settings, "deploy_journal", False):
+        return None
+    return DeployJournal.for_flow(settings, spec_path, spec_digest(spec_path))
+
+
+def deploy_flow(
+    client: NiFiClient,
+    spec_path: Path,
+    *,
+    dry_run: bool = False,
+    incremental: bool = False,
+    resume: bool = False,
+    start: bool = False,
+) -> Dict[str, Any]:
+    """Deploy the flow defined at *spec_path* and return deployment metadata.
+
+    With ``incremental`` the live flow is diffed against the spec and only the changes
+    are applied; combined with ``dry_run`` the diff is returned without applying it.
+    With ``resume`` an interrupted deploy is continued from its journal: operations
+    whose components still exist are skipped. A full ``dry_run`` adds the predicted
+    request count and wall time per phase under ``summary["cost"]``; ``start`` includes
+    the phases ``run flow`` runs after deploying.
+    """
+
+    resolved = spec_path if spec_path.is_absolute() else spec_path.resolve()
+    spec = load_flow_spec_cached(resolved, settings=getattr(client, "settings", None))
+
+    if dry_run and not incremental:
+        summary = _summarize_flow_spec(spec)
+        service_map = _controller_service_map(client, create=False)
+        summary["cost"] = estimate_deploy(client, spec, controller_service_map=service_map, start=start).as_dict()
+        return {"dry_run": True, "summary": summary}
+
+    if incremental:
+        # A dry run only looks up existing controller services
+        service_map = _controller_service_map(client, create=not dry_run)
+        deployer = IncrementalDeployer(client, spec, controller_service_map=service_map)
+        diff = deployer.diff()
+        if dry_run:
+            return {"dry_run": True, "summary": {**_summarize_flow_spec(spec), "diff": diff.as_dict()}}
+        return {
+            "dry_run": False,
+            "process_group_id": "root",
+            "controller_services": service_map,
+            "changes": deployer.apply(diff),
+        }
+
+    journal = _journal(client, resolved)
+    if resume and journal is None:
+        raise FlowDeploymentError("Resuming requires the deploy journal (NIFI_DEPLOY_JOURNAL is disabled)")
+    service_map = _controller_service_map(client)
+    deployer = FlowDeployer(client, spec, controller_service_map=service_map, journal=journal, resume=resume)
+    process_group_id = deployer.deploy()
+    result = {
         "dry_run": False,
         "process_group_id": process_group_id,
         "controller_services": service_map,
     }
+    if resume:
+        result["skipped_operations"] = deployer.skipped
+    return result
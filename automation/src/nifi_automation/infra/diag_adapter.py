@@ -2,17 +2,19 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple, Mapping, Set
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Mapping, Set
 
-from ..diagnostics import _walk_process_groups, collect_invalid_ports, collect_invalid_processors
+from ..diagnostics import FlowSnapshot, _groups, collect_invalid_ports, collect_invalid_processors
 from .status_adapter import fetch_connections, fetch_processors
 from .nifi_client import NiFiClient
-from ..flow_builder import FlowSpec, load_flow_spec
+from ..flow_builder import FlowSpec
+from ..spec_cache import load_flow_spec_cached
 
 
-def _collect_flow_bulletins(client: NiFiClient) -> list[dict[str, Any]]:
+def _collect_flow_bulletins(client: NiFiClient, snapshot: Optional[FlowSnapshot] = None) -> list[dict[str, Any]]:
     bulletins: list[dict[str, Any]] = []
-    for path, flow in _walk_process_groups(client):
+    for path, flow in _groups(client, snapshot):
         for b in flow.get("bulletins") or []:
             item = dict(b)
             item["path"] = "/".join(path)
@@ -20,9 +22,9 @@ def _collect_flow_bulletins(client: NiFiClient) -> list[dict[str, Any]]:
     return bulletins
 
 
-def _collect_processor_bulletins(client: NiFiClient) -> list[dict[str, Any]]:
+def _collect_processor_bulletins(client: NiFiClient, snapshot: Optional[FlowSnapshot] = None) -> list[dict[str, Any]]:
     bulletins: list[dict[str, Any]] = []
-    for proc in fetch_processors(client).get("items", []):
+    for proc in fetch_processors(client, snapshot=snapshot).get("items", []):
         for b in proc.get("bulletins") or []:
             item = dict(b)
             item.setdefault("path", proc.get("path"))
@@ -31,14 +33,18 @@ def _collect_processor_bulletins(client: NiFiClient) -> list[dict[str, Any]]:
     return bulletins
 
 
-def gather_validation_details(client: NiFiClient) -> Dict[str, Any]:
-    """Return invalid component metadata plus bulletins and queue snapshots."""
+def gather_validation_details(client: NiFiClient, *, snapshot: Optional[FlowSnapshot] = None) -> Dict[str, Any]:
+    """Return invalid component metadata plus bulletins and queue snapshots.
 
-    invalid_processors = collect_invalid_processors(client)
-    invalid_ports = collect_invalid_ports(client)
-    processor_bulletins = _collect_processor_bulletins(client)
-    flow_bulletins = _collect_flow_bulletins(client)
-    connections = fetch_connections(client).get("items", [])
+    Every section is built from one :class:`FlowSnapshot`, captured here unless supplied.
+    """
+
+    snapshot = snapshot or FlowSnapshot.capture(client)
+    invalid_processors = collect_invalid_processors(client, snapshot=snapshot)
+    invalid_ports = collect_invalid_ports(client, snapshot=snapshot)
+    processor_bulletins = _collect_processor_bulletins(client, snapshot)
+    flow_bulletins = _collect_flow_bulletins(client, snapshot)
+    connections = fetch_connections(client, snapshot=snapshot).get("items", [])
     queued = [c for c in connections if int(c.get("queuedCount", 0)) or float(c.get("percentUseCount", 0.0))]
 
     return {
@@ -60,7 +66,11 @@ def gather_validation_details(client: NiFiClient) -> Dict[str, Any]:
 
 # ----- Topology validation against a FlowSpec -----
 
-def _get_pg_flow(client: NiFiClient, pg_id: str) -> Dict[str, Any]:
+def _get_pg_flow(client: NiFiClient, pg_id: str, snapshot: Optional[FlowSnapshot] = None) -> Dict[str, Any]:
+    if snapshot is not None:
+        flow = snapshot.flow_for(pg_id)
+        if flow is not None:
+            return flow
     return client._client.get(f"/flow/process-groups/{pg_id}").json().get("processGroupFlow", {}).get("flow", {})
 
 
@@ -86,10 +96,18 @@ def _expected_counts(group) -> Dict[str, int]:
 
 
 def _validate_group_recursive(
-    client: NiFiClient, parent_pg_id: str, group, path: Tuple[str, ...], issues: List[Dict[str, Any]]
+    client: NiFiClient,
+    parent_pg_id: str,
+    group,
+    path: Tuple[str, ...],
+    issues: List[Dict[str, Any]],
+    snapshot: Optional[FlowSnapshot] = None,
 ) -> None:
     # Locate child PG by name under the parent
-    child = client.find_child_process_group_by_name(parent_pg_id, group.name)
+    if snapshot is not None:
+        child = snapshot.find_child(parent_pg_id, group.name)
+    else:
+        child = client.find_child_process_group_by_name(parent_pg_id, group.name)
     if child is None:
         issues.append(
             {
@@ -100,7 +118,7 @@ def _validate_group_recursive(
         )
         return
     child_id = child.get("component", {}).get("id") or child.get("id")
-    flow = _get_pg_flow(client, child_id)
+    flow = _get_pg_flow(client, child_id, snapshot)
     counts_actual = {
         "processors": len(flow.get("processors") or []),
         "connections": len(flow.get("connections") or []),
@@ -219,7 +237,7 @@ def _validate_group_recursive(
         c_id = child_comp.get("id")
         if not c_id:
             continue
-        child_flow = _get_pg_flow(client, c_id)
+        child_flow = _get_pg_flow(client, c_id, snapshot)
         for item in (child_flow.get("inputPorts") or []):
             comp = item.get("component") or {}
             id_to_name[comp.get("id", "")] = comp.get("name", "")
@@ -259,25 +277,30 @@ def _validate_group_recursive(
 
     # Recurse into children
     for child_spec in group.child_groups:
-        _validate_group_recursive(client, child_id, child_spec, path + (group.name,), issues)
+        _validate_group_recursive(client, child_id, child_spec, path + (group.name,), issues, snapshot)
 
 
-def validate_topology_against_spec(client: NiFiClient, spec: FlowSpec) -> Dict[str, Any]:
+def validate_topology_against_spec(
+    client: NiFiClient, spec: FlowSpec, *, snapshot: Optional[FlowSnapshot] = None
+) -> Dict[str, Any]:
     """Compare deployed NiFi topology under root against the provided spec.
 
+    When ``snapshot`` is given, group lookups read from it instead of querying NiFi.
     Returns a payload with an 'issues' list and a boolean 'ok'.
     """
     issues: List[Dict[str, Any]] = []
     root_id = "root"
     # Validate each top-level child group declared in the spec
     for child in spec.root_group.child_groups:
-        _validate_group_recursive(client, root_id, child, (spec.root_group.name,), issues)
+        _validate_group_recursive(client, root_id, child, (spec.root_group.name,), issues, snapshot)
 
     # Mark ok=true only when no issues were found
     return {"ok": len(issues) == 0, "issues": issues}
 
 
-def validate_deployed_topology(client: NiFiClient, spec_path) -> Dict[str, Any]:
+def validate_deployed_topology(
+    client: NiFiClient, spec_path, *, snapshot: Optional[FlowSnapshot] = None
+) -> Dict[str, Any]:
     """Load spec at spec_path and validate deployed topology against it."""
-    spec = load_flow_spec(spec_path)
-    return validate_topology_against_spec(client, spec)
+    spec = load_flow_spec_cached(Path(spec_path), settings=getattr(client, "settings", None))
+    return validate_topology_against_spec(client, spec, snapshot=snapshot)
@@ -13,9 +13,9 @@ All thresholds are configurable and meant to be conservative defaults.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
-from ..diagnostics import _walk_process_groups
+from ..diagnostics import FlowSnapshot, _walk_process_groups
 from .nifi_client import NiFiClient
 
 
@@ -60,6 +60,7 @@ def _iter_processor_connections(flow: Mapping[str, Any]) -> Iterator[Tuple[str,
 def check_layout(
     client: NiFiClient,
     *,
+    snapshot: Optional[FlowSnapshot] = None,
     min_dx: float = 50.0,
     vertical_tolerance: float = 15.0,
     min_dsep: float = 40.0,
@@ -74,7 +75,8 @@ def check_layout(
     overlaps: List[Mapping[str, Any]] = []
     lr_violations: List[Mapping[str, Any]] = []
 
-    for path, flow in _walk_process_groups(client):
+    groups = snapshot.walk() if snapshot is not None else _walk_process_groups(client)
+    for path, flow in groups:
         path_str = "/".join(path)
         positions_all = _extract_component_positions(flow)
         # Filter just processors for directional checks
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Optional
 
+from ..async_client import AsyncNiFiClient as _AsyncNiFiClient
 from ..client import NiFiClient as _NiFiClient
 from ..config import AuthSettings
 
@@ -14,3 +15,23 @@ class NiFiClient(_NiFiClient):  # pragma: no cover - placeholder subclass
     @classmethod
     def from_settings(cls, settings: AuthSettings, token: str) -> "NiFiClient":
         return cls(settings, token)
+
+
+class AsyncNiFiClient(_AsyncNiFiClient):
+    """Async client shim; shares settings and token with an open :class:`NiFiClient`."""
+
+    @classmethod
+    def from_settings(
+        cls, settings: AuthSettings, token: str, *, max_in_flight: Optional[int] = None
+    ) -> "AsyncNiFiClient":
+        return cls(settings, token, max_in_flight=max_in_flight)
+
+    @classmethod
+    def from_client(cls, client: _NiFiClient, *, max_in_flight: Optional[int] = None) -> "AsyncNiFiClient":
+        return cls(
+            client.settings,
+            client.token,
+            max_in_flight=max_in_flight,
+            auth=client._auth,
+            revisions=client.revisions,
+        )
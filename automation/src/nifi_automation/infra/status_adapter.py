@@ -2,26 +2,51 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from ..diagnostics import _walk_process_groups
-from .nifi_client import NiFiClient
+from ..diagnostics import FlowSnapshot, StatusSnapshot, _groups
+from .nifi_client import AsyncNiFiClient, NiFiClient
 
 __all__ = [
+    "capture_snapshot",
+    "capture_status",
     "fetch_processors",
     "fetch_controllers",
     "fetch_connections",
     "fetch_ports",
+    "fetch_processors_async",
+    "fetch_controllers_async",
+    "fetch_connections_async",
+    "fetch_ports_async",
 ]
 
+GroupWalk = Iterable[Tuple[List[str], Dict[str, Any]]]
+
+
+def capture_snapshot(client: NiFiClient) -> FlowSnapshot:
+    """Walk the process-group tree once; pass the result as ``snapshot=`` to the fetchers."""
+
+    return FlowSnapshot.capture(client)
+
+
+def capture_status(client: NiFiClient) -> StatusSnapshot:
+    """Fetch run state and queue counters for the whole tree in one recursive status call.
+
+    The result can be passed as ``snapshot=`` to the processor, connection and port
+    fetchers. Positions and group bulletins are not included; use
+    :func:`capture_snapshot` for layout or diagnostics.
+    """
+
+    return StatusSnapshot.capture(client)
+
 
 def _path_to_string(path: Iterable[str]) -> str:
     return "/".join(path)
 
 
-def fetch_processors(client: NiFiClient) -> Dict[str, Any]:
+def _processor_items(groups: GroupWalk) -> List[Dict[str, Any]]:
     items: List[Dict[str, Any]] = []
-    for path, flow in _walk_process_groups(client):
+    for path, flow in groups:
         for entity in flow.get("processors") or []:
             component = entity.get("component", {})
             items.append(
@@ -35,16 +60,19 @@ def fetch_processors(client: NiFiClient) -> Dict[str, Any]:
                     "bulletins": entity.get("bulletins") or [],
                 }
             )
-    return {"items": items}
+    return items
 
 
-def fetch_controllers(client: NiFiClient) -> Dict[str, Any]:
-    response = client._client.get(
-        "/flow/process-groups/root/controller-services",
-        params={"includeInherited": "true"},
-    )
-    response.raise_for_status()
-    services = response.json().get("controllerServices") or []
+def fetch_processors(client: NiFiClient, *, snapshot: Optional[FlowSnapshot] = None) -> Dict[str, Any]:
+    return {"items": _processor_items(_groups(client, snapshot))}
+
+
+async def fetch_processors_async(client: AsyncNiFiClient) -> Dict[str, Any]:
+    return {"items": _processor_items(await client.walk_process_groups())}
+
+
+def _controller_items(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    services = payload.get("controllerServices") or []
     items: List[Dict[str, Any]] = []
     for service in services:
         component = service.get("component", {})
@@ -59,7 +87,24 @@ def fetch_controllers(client: NiFiClient) -> Dict[str, Any]:
                 "validationErrors": component.get("validationErrors") or [],
             }
         )
-    return {"items": items}
+    return items
+
+
+def fetch_controllers(client: NiFiClient) -> Dict[str, Any]:
+    response = client._client.get(
+        "/flow/process-groups/root/controller-services",
+        params={"includeInherited": "true"},
+    )
+    response.raise_for_status()
+    return {"items": _controller_items(response.json())}
+
+
+async def fetch_controllers_async(client: AsyncNiFiClient) -> Dict[str, Any]:
+    payload = await client._get_json(
+        "/flow/process-groups/root/controller-services",
+        params={"includeInherited": "true"},
+    )
+    return {"items": _controller_items(payload)}
 
 
 def _parse_int(value: Any) -> int:
@@ -76,9 +121,9 @@ def _parse_float(value: Any) -> float:
         return 0.0
 
 
-def fetch_connections(client: NiFiClient) -> Dict[str, Any]:
+def _connection_items(groups: GroupWalk) -> List[Dict[str, Any]]:
     items: List[Dict[str, Any]] = []
-    for path, flow in _walk_process_groups(client):
+    for path, flow in groups:
         for entity in flow.get("connections") or []:
             component = entity.get("component", {})
             snapshot = (entity.get("status") or {}).get("aggregateSnapshot") or {}
@@ -95,14 +140,20 @@ def fetch_connections(client: NiFiClient) -> Dict[str, Any]:
                     "backpressureDataSizeThreshold": snapshot.get("backPressureDataSizeThreshold"),
                 }
             )
-    return {"items": items}
+    return items
 
 
-def fetch_ports(client: NiFiClient) -> Dict[str, Any]:
-    """Return combined input/output ports with their run state."""
+def fetch_connections(client: NiFiClient, *, snapshot: Optional[FlowSnapshot] = None) -> Dict[str, Any]:
+    return {"items": _connection_items(_groups(client, snapshot))}
+
+
+async def fetch_connections_async(client: AsyncNiFiClient) -> Dict[str, Any]:
+    return {"items": _connection_items(await client.walk_process_groups())}
 
+
+def _port_items(groups: GroupWalk) -> List[Dict[str, Any]]:
     items: List[Dict[str, Any]] = []
-    for path, flow in _walk_process_groups(client):
+    for path, flow in groups:
         for entity in flow.get("inputPorts") or []:
             comp = entity.get("component", {})
             items.append(
@@ -129,4 +180,14 @@ def fetch_ports(client: NiFiClient) -> Dict[str, Any]:
                     "validationErrors": comp.get("validationErrors") or [],
                 }
             )
-    return {"items": items}
+    return items
+
+
+def fetch_ports(client: NiFiClient, *, snapshot: Optional[FlowSnapshot] = None) -> Dict[str, Any]:
+    """Return combined input/output ports with their run state."""
+
+    return {"items": _port_items(_groups(client, snapshot))}
+
+
+async def fetch_ports_async(client: AsyncNiFiClient) -> Dict[str, Any]:
+    return {"items": _port_items(await client.walk_process_groups())}
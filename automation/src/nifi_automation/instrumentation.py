@@ -0,0 +1,273 @@
+"""Request and phase instrumentation for profiling CLI commands.
+
+While :func:`profiling` is active, every response seen by ``NiFiClient`` and
+``AsyncNiFiClient`` is recorded against its endpoint template, where component
+ids are collapsed to ``{id}``. Each template tracks request counts, a latency
+histogram, bytes received, retries and ``409`` conflicts. Services wrap their
+stages in :func:`phase`, and waits from :mod:`nifi_automation.app.polling` are
+collected as well. Outside :func:`profiling` every hook is a no-op.
+:func:`counting_requests` counts responses per endpoint for a block, with or
+without an active profiler.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from .app.polling import WaitReport, collect_waits
+
+# Upper bounds in milliseconds; the last bucket catches everything slower
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+_API_PREFIX = re.compile(r"^.*?/nifi-api(?=/|$)")
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+)$")
+_DEFINITION = re.compile(r"^(/flow/(?:processor|controller-service)-definition)/.+$")
+
+
+def endpoint_template(path: str) -> str:
+    """Collapse ids in a NiFi API path: ``/processors/<uuid>/run-status`` -> ``/processors/{id}/run-status``."""
+
+    path = _API_PREFIX.sub("", path) or "/"
+    definition = _DEFINITION.match(path)
+    if definition:
+        return f"{definition.group(1)}/{{bundle}}/{{type}}"
+    segments = ["{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")]
+    return "/".join(segments)
+
+
+def _bucket_label(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else f"{bound:g}"
+
+
+@dataclass
+class EndpointStats:
+    """Aggregates for one ``METHOD /template`` pair."""
+
+    count: int = 0
+    errors: int = 0
+    conflicts: int = 0
+    retries: int = 0
+    bytes_received: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS_MS))
+
+    def observe(self, status: int, seconds: float, nbytes: int) -> None:
+        self.count += 1
+        if status >= 400:
+            self.errors += 1
+        if status == 409:
+            self.conflicts += 1
+        self.bytes_received += nbytes
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        millis = seconds * 1000.0
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if millis <= bound:
+                self.buckets[index] += 1
+                break
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "conflicts": self.conflicts,
+            "retries": self.retries,
+            "bytes": self.bytes_received,
+            "total_ms": round(self.total_seconds * 1000.0, 2),
+            "mean_ms": round(self.total_seconds * 1000.0 / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_seconds * 1000.0, 2),
+            "histogram_ms": {
+                _bucket_label(bound): hits for bound, hits in zip(LATENCY_BUCKETS_MS, self.buckets) if hits
+            },
+        }
+
+
+class Profiler:
+    """Thread-safe collector for one command; the async bridge records from its own thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self.started_at = time.time()
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.waits: List[WaitReport] = []
+        self.events: List[Dict[str, Any]] = []
+
+    def _offset(self) -> float:
+        return round(time.perf_counter() - self._origin, 6)
+
+    def _stats(self, method: str, path: str) -> EndpointStats:
+        key = f"{method.upper()} {endpoint_template(path)}"
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints[key] = EndpointStats()
+        return stats
+
+    def record_response(self, response: httpx.Response) -> None:
+        request = response.request
+        try:
+            seconds = response.elapsed.total_seconds()
+        except RuntimeError:
+            # ``elapsed`` is only set once the body has been read
+            seconds = 0.0
+        nbytes = response.num_bytes_downloaded
+        with self._lock:
+            stats = self._stats(request.method, request.url.path)
+            stats.observe(response.status_code, seconds, nbytes)
+            self.events.append(
+                {
+                    "t": self._offset(),
+                    "kind": "request",
+                    "method": request.method,
+                    "endpoint": endpoint_template(request.url.path),
+                    "status": response.status_code,
+                    "ms": round(seconds * 1000.0, 3),
+                    "bytes": nbytes,
+                }
+            )
+
+    def record_retry(self, method: str, path: str) -> None:
+        with self._lock:
+            self._stats(method, path).retries += 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = self._offset()
+        try:
+            yield
+        finally:
+            end = self._offset()
+            with self._lock:
+                entry = self.phases.setdefault(name, {"seconds": 0.0, "count": 0})
+                entry["seconds"] += end - start
+                entry["count"] += 1
+                self.events.append({"t": start, "kind": "phase", "name": name, "ms": round((end - start) * 1000.0, 3)})
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Timing breakdown suitable for ``CommandResult.details["profile"]``."""
+
+        with self._lock:
+            endpoints = sorted(self.endpoints.items(), key=lambda item: item[1].total_seconds, reverse=True)
+            requests = sum(stats.count for _, stats in endpoints)
+            return {
+                "total_ms": round(self._offset() * 1000.0, 2),
+                "requests": requests,
+                "bytes": sum(stats.bytes_received for _, stats in endpoints),
+                "retries": sum(stats.retries for _, stats in endpoints),
+                "conflicts": sum(stats.conflicts for _, stats in endpoints),
+                "phases": {
+                    name: {"ms": round(entry["seconds"] * 1000.0, 2), "count": int(entry["count"])}
+                    for name, entry in self.phases.items()
+                },
+                "endpoints": {key: stats.as_dict() for key, stats in endpoints},
+                "waits": [report.as_dict() for report in self.waits],
+            }
+
+    def summary_lines(self, *, top: int = 10) -> List[str]:
+        """Short human-readable breakdown for text output."""
+
+        profile = self.as_dict()
+        lines = [
+            f"[profile] total {profile['total_ms']:.0f} ms, {profile['requests']} requests, "
+            f"{profile['bytes']} bytes, {profile['retries']} retries, {profile['conflicts']} conflicts"
+        ]
+        for name, entry in profile["phases"].items():
+            lines.append(f"[profile] phase {name:<10} {entry['ms']:>10.1f} ms")
+        for key, stats in list(profile["endpoints"].items())[:top]:
+            lines.append(
+                f"[profile] {stats['count']:>5} x {key:<60} total {stats['total_ms']:>9.1f} ms  max {stats['max_ms']:>8.1f} ms"
+            )
+        return lines
+
+    def write_trace(self, path: Path) -> None:
+        """Write the summary plus the per-request and per-phase event log as JSON."""
+
+        payload = {"started_at": self.started_at, "profile": self.as_dict()}
+        with self._lock:
+            payload["events"] = sorted(self.events, key=lambda event: event["t"])
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("w", encoding="utf-8") as fp:
+            json.dump(payload, fp, indent=2)
+            fp.write("\n")
+
+
+# One command runs per process, so a module-level slot is visible to the async bridge thread too
+_active: Optional[Profiler] = None
+_counters: List[Dict[str, int]] = []
+_counters_lock = threading.Lock()
+
+
+def current_profiler() -> Optional[Profiler]:
+    return _active
+
+
+@contextmanager
+def profiling() -> Iterator[Profiler]:
+    """Record requests, phases and waits for the duration of the block."""
+
+    global _active
+    previous = _active
+    profiler = Profiler()
+    _active = profiler
+    try:
+        with collect_waits() as waits:
+            profiler.waits = waits
+            yield profiler
+    finally:
+        _active = previous
+
+
+@contextmanager
+def counting_requests() -> Iterator[Dict[str, int]]:
+    """Count responses per ``METHOD /template`` while the block runs; blocks may nest."""
+
+    counts: Dict[str, int] = {}
+    with _counters_lock:
+        _counters.append(counts)
+    try:
+        yield counts
+    finally:
+        with _counters_lock:
+            # By identity: two blocks may hold equal counts
+            _counters[:] = [item for item in _counters if item is not counts]
+
+
+def record_response(response: httpx.Response) -> None:
+    profiler = _active
+    if profiler is not None:
+        profiler.record_response(response)
+    if _counters:
+        key = f"{response.request.method.upper()} {endpoint_template(response.request.url.path)}"
+        with _counters_lock:
+            for counts in _counters:
+                counts[key] = counts.get(key, 0) + 1
+
+
+def record_retry(method: str, path: str) -> None:
+    profiler = _active
+    if profiler is not None:
+        profiler.record_retry(method, path)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a named stage of a command; a no-op unless profiling."""
+
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    with profiler.phase(name):
+        yield
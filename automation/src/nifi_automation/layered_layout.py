@@ -0,0 +1,227 @@
+"""Layered (Sugiyama-style) placement of the components of one process group.
+
+:func:`layered_positions` assigns canvas coordinates to a directed graph in four
+passes:
+
+1. Cycle breaking: edges that close a cycle in a depth-first search are reversed.
+2. Layering: each node goes one layer right of its furthest predecessor
+   (longest path). Sinks marked ``last_layer`` are pulled into the final layer.
+   Edges spanning several layers get a dummy node per intermediate layer.
+3. Crossing reduction: alternating down/up sweeps order each layer by the
+   barycenter of its neighbours. The ordering with the fewest crossings is kept.
+4. Coordinate assignment: layer ``i`` sits at ``x = i * spacing_x``. Within a
+   layer, nodes are packed top to bottom at least ``spacing_y`` apart, as close
+   as possible to their predecessors' average height. They are then pushed below
+   any obstacle they would cover.
+
+Distinct layers never share an ``x`` and nodes in a layer are ``spacing_y``
+apart. With spacings larger than the component footprints, generated positions
+cannot overlap by construction. Each pass is linear in nodes plus edges, apart
+from the per-layer sorts.
+"""
+
+from __future__ import annotations
+
+from typing import Collection, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+# Canvas footprints (width, height) NiFi draws for each component kind
+PROCESSOR_SIZE = (352.0, 128.0)
+PORT_SIZE = (240.0, 80.0)
+GROUP_SIZE = (384.0, 176.0)
+
+Rect = Tuple[float, float, float, float]
+
+
+def _break_cycles(nodes: Sequence[str], succ: Mapping[str, List[str]]) -> List[Tuple[str, str]]:
+    """Return the edges as a DAG, reversing those that point back onto the DFS stack."""
+
+    state: Dict[str, int] = {}  # 1 = on stack, 2 = done
+    dag: List[Tuple[str, str]] = []
+    for root in nodes:
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(succ.get(root, ())))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if state.get(child) == 1:
+                    dag.append((child, node))
+                    continue
+                dag.append((node, child))
+                if child not in state:
+                    state[child] = 1
+                    stack.append((child, iter(succ.get(child, ()))))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
+    return dag
+
+
+def _longest_path_layers(nodes: Sequence[str], dag: Iterable[Tuple[str, str]]) -> Dict[str, int]:
+    succ: Dict[str, List[str]] = {node: [] for node in nodes}
+    indegree = {node: 0 for node in nodes}
+    for source, target in dag:
+        succ[source].append(target)
+        indegree[target] += 1
+    layer = {node: 0 for node in nodes}
+    ready = [node for node in nodes if indegree[node] == 0]
+    while ready:
+        node = ready.pop()
+        for target in succ[node]:
+            layer[target] = max(layer[target], layer[node] + 1)
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                ready.append(target)
+    return layer
+
+
+def _crossings(upper: Sequence[str], lower: Sequence[str], down: Mapping[str, List[str]]) -> int:
+    """Count edge crossings between two adjacent layers (inversions, via a Fenwick tree)."""
+
+    position = {node: index for index, node in enumerate(lower)}
+    targets = [position[t] for node in upper for t in sorted(down.get(node, ()), key=position.__getitem__)]
+    tree = [0] * (len(lower) + 1)
+    crossings = 0
+    for seen, target in enumerate(targets):
+        # Earlier edges that end strictly to the right of this one cross it
+        index, below = target + 1, 0
+        while index > 0:
+            below += tree[index]
+            index -= index & -index
+        crossings += seen - below
+        index = target + 1
+        while index <= len(lower):
+            tree[index] += 1
+            index += index & -index
+    return crossings
+
+
+def _total_crossings(layers: List[List[str]], down: Mapping[str, List[str]]) -> int:
+    return sum(_crossings(layers[i], layers[i + 1], down) for i in range(len(layers) - 1))
+
+
+def _reorder(layer: List[str], neighbours: Mapping[str, List[str]], reference: List[str]) -> List[str]:
+    position = {node: index for index, node in enumerate(reference)}
+    keyed = []
+    for index, node in enumerate(layer):
+        linked = [position[n] for n in neighbours.get(node, ()) if n in position]
+        # Nodes without neighbours keep their slot
+        keyed.append((sum(linked) / len(linked) if linked else float(index), index, node))
+    keyed.sort()
+    return [node for _, _, node in keyed]
+
+
+def _overlaps(a: Rect, b: Rect) -> bool:
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def layered_positions(
+    nodes: Sequence[str],
+    edges: Iterable[Tuple[str, str]],
+    *,
+    sizes: Optional[Mapping[str, Tuple[float, float]]] = None,
+    virtual: Collection[str] = (),
+    last_layer: Collection[str] = (),
+    obstacles: Iterable[Rect] = (),
+    spacing_x: float = 480.0,
+    spacing_y: float = 240.0,
+    sweeps: int = 4,
+) -> Dict[str, Tuple[float, float]]:
+    """Return ``{node: (x, y)}`` for every node not listed in ``virtual``.
+
+    ``virtual`` nodes (for example child groups placed elsewhere) take part in
+    layering and ordering but get no position. ``obstacles`` are ``(x, y, width,
+    height)`` rectangles that positioned nodes must not cover. ``sizes`` gives node
+    footprints for that check and defaults to a processor.
+    """
+
+    order = list(dict.fromkeys(nodes))
+    known = set(order)
+    succ: Dict[str, List[str]] = {node: [] for node in order}
+    for source, target in edges:
+        if source in known and target in known and source != target and target not in succ[source]:
+            succ[source].append(target)
+
+    dag = list(dict.fromkeys(_break_cycles(order, succ)))
+    layer = _longest_path_layers(order, dag)
+    has_successor = {source for source, _ in dag}
+    deepest = max(layer.values(), default=0)
+    for node in last_layer:
+        if node in layer and node not in has_successor:
+            layer[node] = deepest
+
+    # Split long edges with dummy nodes so every edge joins adjacent layers
+    down: Dict[str, List[str]] = {node: [] for node in order}
+    up: Dict[str, List[str]] = {node: [] for node in order}
+    layers: List[List[str]] = [[] for _ in range(deepest + 1)]
+    for node in order:
+        layers[layer[node]].append(node)
+    for index, (source, target) in enumerate(dag):
+        previous = source
+        for step in range(layer[source] + 1, layer[target]):
+            dummy = f"\0dummy:{index}:{step}"
+            down[dummy], up[dummy] = [], []
+            layers[step].append(dummy)
+            down[previous].append(dummy)
+            up[dummy].append(previous)
+            previous = dummy
+        down[previous].append(target)
+        up[target].append(previous)
+
+    best = [list(nodes_in_layer) for nodes_in_layer in layers]
+    best_crossings = _total_crossings(best, down)
+    for sweep in range(sweeps):
+        if best_crossings == 0:
+            break
+        if sweep % 2 == 0:
+            for i in range(1, len(layers)):
+                layers[i] = _reorder(layers[i], up, layers[i - 1])
+        else:
+            for i in range(len(layers) - 2, -1, -1):
+                layers[i] = _reorder(layers[i], down, layers[i + 1])
+        crossings = _total_crossings(layers, down)
+        if crossings < best_crossings:
+            best, best_crossings = [list(nodes_in_layer) for nodes_in_layer in layers], crossings
+
+    sizes = sizes or {}
+    blocked: List[Rect] = list(obstacles)
+    skip: Set[str] = set(virtual)
+    y_of: Dict[str, float] = {}
+    positions: Dict[str, Tuple[float, float]] = {}
+    for index, nodes_in_layer in enumerate(best):
+        x = index * spacing_x
+        wanted = []
+        for node in nodes_in_layer:
+            linked = [y_of[n] for n in up.get(node, ()) if n in y_of]
+            wanted.append(sum(linked) / len(linked) if linked else None)
+        # Pack top-down and bottom-up around the wanted heights, then average the two
+        top: List[float] = []
+        for want in wanted:
+            floor = top[-1] + spacing_y if top else None
+            y = want if want is not None else (floor if floor is not None else 0.0)
+            top.append(y if floor is None else max(y, floor))
+        bottom: List[float] = [0.0] * len(wanted)
+        for i in range(len(wanted) - 1, -1, -1):
+            ceiling = bottom[i + 1] - spacing_y if i + 1 < len(wanted) else None
+            y = wanted[i] if wanted[i] is not None else (ceiling if ceiling is not None else top[i])
+            bottom[i] = y if ceiling is None else min(y, ceiling)
+        previous: Optional[float] = None
+        for node, y_top, y_bottom in zip(nodes_in_layer, top, bottom):
+            y = (y_top + y_bottom) / 2.0
+            if previous is not None:
+                y = max(y, previous + spacing_y)
+            if node not in skip and not node.startswith("\0"):
+                width, height = sizes.get(node, PROCESSOR_SIZE)
+                moved = True
+                while moved:
+                    moved = False
+                    for rect in blocked:
+                        if _overlaps((x, y, width, height), rect):
+                            y = rect[1] + rect[3] + (spacing_y - height)
+                            moved = True
+                positions[node] = (x, y)
+            y_of[node] = y
+            previous = y
+    return positions
@@ -0,0 +1,243 @@
+"""Queue-depth history and back-pressure forecasts for connections.
+
+``rollup_connections`` only sees one instant, so a connection is reported the
+moment it is already BLOCKED. :class:`QueueRecorder` keeps the last
+``capacity`` samples of every connection's queued count and size in a
+fixed-size ring of ``array`` columns (timestamps, counts, bytes). From those it
+fits a fill rate by least squares and estimates the seconds left until the queue
+reaches ``backpressureObjectThreshold`` or the data-size threshold, whichever
+comes first.
+
+:class:`QueueHistory` persists the rings under ``<cache_dir>/queue-history`` per
+NiFi base URL, so each ``status connections`` / ``inspect connections``
+invocation adds one sample and the forecast sharpens with every run.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import re
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .config import AuthSettings
+
+HISTORY_FORMAT = 1
+DEFAULT_CAPACITY = 64
+# Samples older than this are ignored when fitting the fill rate
+DEFAULT_WINDOW_SECONDS = 900.0
+# Fewer samples than this give no forecast
+MIN_SAMPLES = 2
+
+_DATA_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(B|KB|MB|GB|TB)\s*$", re.IGNORECASE)
+_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
+
+
+def parse_data_size(value: Any) -> Optional[int]:
+    """Bytes in a NiFi data size such as ``"1 GB"`` (binary units, as NiFi uses), or ``None``."""
+
+    match = _DATA_SIZE.match(str(value or ""))
+    if not match:
+        return None
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def _slope(times: List[float], values: List[int]) -> float:
+    count = len(times)
+    mean_t = sum(times) / count
+    mean_v = sum(values) / count
+    spread = sum((t - mean_t) ** 2 for t in times)
+    if not spread:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in zip(times, values)) / spread
+
+
+class QueueRing:
+    """Fixed-size ring of ``(timestamp, queued count, queued bytes)`` samples."""
+
+    __slots__ = ("capacity", "_times", "_counts", "_sizes", "_next", "_length")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < MIN_SAMPLES:
+            raise ValueError(f"capacity must be at least {MIN_SAMPLES}")
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._counts = array("q", bytes(8 * capacity))
+        self._sizes = array("q", bytes(8 * capacity))
+        self._next = 0
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, timestamp: float, count: int, size: int) -> None:
+        slot = self._next
+        self._times[slot], self._counts[slot], self._sizes[slot] = timestamp, count, size
+        self._next = (slot + 1) % self.capacity
+        self._length = min(self._length + 1, self.capacity)
+
+    def _order(self) -> List[int]:
+        start = (self._next - self._length) % self.capacity
+        return [(start + offset) % self.capacity for offset in range(self._length)]
+
+    def samples(self) -> List[Tuple[float, int, int]]:
+        """Samples from oldest to newest."""
+
+        return [(self._times[i], self._counts[i], self._sizes[i]) for i in self._order()]
+
+    def rates(self, *, since: Optional[float] = None) -> Optional[Tuple[float, float]]:
+        """Least-squares ``(FlowFiles/s, bytes/s)`` over samples at or after ``since``."""
+
+        samples = [sample for sample in self.samples() if since is None or sample[0] >= since]
+        if len(samples) < MIN_SAMPLES:
+            return None
+        times = [sample[0] for sample in samples]
+        return _slope(times, [sample[1] for sample in samples]), _slope(times, [sample[2] for sample in samples])
+
+    def to_json(self) -> Dict[str, str]:
+        order = self._order()
+        columns = {
+            "t": array("d", (self._times[i] for i in order)),
+            "c": array("q", (self._counts[i] for i in order)),
+            "s": array("q", (self._sizes[i] for i in order)),
+        }
+        return {key: base64.b64encode(column.tobytes()).decode("ascii") for key, column in columns.items()}
+
+    @classmethod
+    def from_json(cls, payload: Mapping[str, str], capacity: int = DEFAULT_CAPACITY) -> "QueueRing":
+        columns = []
+        for key, typecode in (("t", "d"), ("c", "q"), ("s", "q")):
+            column = array(typecode)
+            column.frombytes(base64.b64decode(payload[key]))
+            columns.append(column)
+        ring = cls(capacity)
+        for timestamp, count, size in zip(*columns):
+            ring.append(timestamp, count, size)
+        return ring
+
+
+class QueueRecorder:
+    """Per-connection :class:`QueueRing` buffers fed from ``fetch_connections`` items."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, *, window: float = DEFAULT_WINDOW_SECONDS):
+        self.capacity = capacity
+        self.window = window
+        self.rings: Dict[str, QueueRing] = {}
+        self.last_recorded: Optional[float] = None
+
+    def record(self, items: Iterable[Mapping[str, Any]], *, now: Optional[float] = None) -> None:
+        """Append one sample per connection; connections no longer present are dropped."""
+
+        timestamp = time.time() if now is None else now
+        seen = set()
+        for item in items:
+            conn_id = item.get("id")
+            if not conn_id:
+                continue
+            seen.add(conn_id)
+            ring = self.rings.get(conn_id)
+            if ring is None:
+                ring = self.rings[conn_id] = QueueRing(self.capacity)
+            ring.append(timestamp, int(item.get("queuedCount") or 0), int(item.get("queuedBytes") or 0))
+        for conn_id in set(self.rings) - seen:
+            del self.rings[conn_id]
+        self.last_recorded = timestamp
+
+    def forecast(self, item: Mapping[str, Any], *, now: Optional[float] = None) -> Dict[str, Any]:
+        """Fill rates and seconds until back-pressure for one connection item.
+
+        ``now`` defaults to the time of the last :meth:`record` call.
+        """
+
+        ring = self.rings.get(item.get("id"))
+        timestamp = now if now is not None else self.last_recorded or time.time()
+        rates = ring.rates(since=timestamp - self.window) if ring is not None else None
+        result: Dict[str, Any] = {
+            "samples": len(ring) if ring is not None else 0,
+            "fillRate": None,
+            "bytesFillRate": None,
+            "secondsToBackpressure": None,
+            "limitedBy": None,
+        }
+        if rates is None:
+            return result
+        count_rate, bytes_rate = rates
+        result["fillRate"] = round(count_rate, 3)
+        result["bytesFillRate"] = round(bytes_rate, 3)
+        candidates = []
+        queued, threshold = int(item.get("queuedCount") or 0), int(item.get("backpressureObjectThreshold") or 0)
+        if threshold and count_rate > 0 and queued < threshold:
+            candidates.append(((threshold - queued) / count_rate, "count"))
+        size, size_threshold = int(item.get("queuedBytes") or 0), parse_data_size(item.get("backpressureDataSizeThreshold"))
+        if size_threshold and bytes_rate > 0 and size < size_threshold:
+            candidates.append(((size_threshold - size) / bytes_rate, "size"))
+        if candidates:
+            seconds, limit = min(candidates)
+            result["secondsToBackpressure"] = round(seconds, 1)
+            result["limitedBy"] = limit
+        return result
+
+    def at_risk(
+        self, items: Iterable[Mapping[str, Any]], horizon: float, *, now: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Connections predicted to reach back-pressure within ``horizon`` seconds, soonest first."""
+
+        predicted = []
+        for item in items:
+            forecast = self.forecast(item, now=now)
+            seconds = forecast["secondsToBackpressure"]
+            if seconds is not None and seconds <= horizon:
+                predicted.append(
+                    {key: item.get(key) for key in ("id", "name", "path", "queuedCount", "queuedBytes")} | forecast
+                )
+        return sorted(predicted, key=lambda entry: entry["secondsToBackpressure"])
+
+
+class QueueHistory:
+    """JSON file holding the :class:`QueueRecorder` rings for one NiFi instance."""
+
+    def __init__(self, path: Path, *, capacity: int = DEFAULT_CAPACITY):
+        self.path = Path(path)
+        self.capacity = capacity
+
+    @classmethod
+    def from_settings(cls, settings: AuthSettings) -> Optional["QueueHistory"]:
+        if not settings.queue_history:
+            return None
+        name = hashlib.sha256(str(settings.base_url).rstrip("/").encode("utf-8")).hexdigest()[:24]
+        return cls(settings.resolved_cache_dir() / "queue-history" / f"{name}.json")
+
+    def load(self) -> QueueRecorder:
+        recorder = QueueRecorder(self.capacity)
+        try:
+            with self.path.open("r", encoding="utf-8") as fp:
+                payload = json.load(fp)
+        except (OSError, ValueError):
+            return recorder
+        if not isinstance(payload, dict) or payload.get("format") != HISTORY_FORMAT:
+            return recorder
+        for conn_id, columns in (payload.get("connections") or {}).items():
+            try:
+                recorder.rings[conn_id] = QueueRing.from_json(columns, self.capacity)
+            except (KeyError, TypeError, ValueError):
+                continue
+        return recorder
+
+    def save(self, recorder: QueueRecorder) -> None:
+        payload = {
+            "format": HISTORY_FORMAT,
+            "connections": {conn_id: ring.to_json() for conn_id, ring in recorder.rings.items()},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            # History only sharpens forecasts; an unwritable cache leaves them empty
+            return
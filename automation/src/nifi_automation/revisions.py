@@ -0,0 +1,103 @@
+"""Client-side store of NiFi component revisions.
+
+Every NiFi entity in a response body carries ``revision.version``. The store
+records the newest version seen per component id, so a mutation can send it
+directly instead of issuing a GET first. NiFi rejects a stale version with
+``400`` ("... is not the most up-to-date revision", from its
+``InvalidRevisionExceptionMapper``). A component busy with another request
+answers ``409``. Both count as stale (:func:`is_stale_revision`): callers drop the
+entry, refetch and retry (see ``NiFiClient._with_revision``).
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+
+STALE_REVISION_MESSAGE = "is not the most up-to-date revision"
+
+# Entities sit at most a few levels deep (processGroupFlow -> flow -> processors -> entity)
+_MAX_DEPTH = 6
+
+
+def _entities(payload: Any, depth: int = 0) -> Iterator[Dict[str, Any]]:
+    if depth > _MAX_DEPTH:
+        return
+    if isinstance(payload, dict):
+        revision = payload.get("revision")
+        if isinstance(revision, dict) and "version" in revision:
+            yield payload
+        for value in payload.values():
+            if isinstance(value, (dict, list)):
+                yield from _entities(value, depth + 1)
+    elif isinstance(payload, list):
+        for item in payload:
+            if isinstance(item, (dict, list)):
+                yield from _entities(item, depth + 1)
+
+
+def _entity_id(entity: Dict[str, Any]) -> Optional[str]:
+    return entity.get("id") or (entity.get("component") or {}).get("id")
+
+
+def is_stale_revision(response: httpx.Response) -> bool:
+    """True when NiFi refused a mutation because the revision it carried is out of date."""
+
+    if response.status_code == 409:
+        return True
+    if response.status_code != 400:
+        return False
+    try:
+        return STALE_REVISION_MESSAGE in response.text
+    except (httpx.ResponseNotRead, UnicodeDecodeError):  # pragma: no cover - streamed bodies
+        return False
+
+
+class RevisionStore:
+    """Newest entity seen per component id, shared by the sync and async clients."""
+
+    def __init__(self) -> None:
+        self._entities: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, payload: Any, *, deleted: bool = False) -> None:
+        """Record every entity in ``payload``; ``deleted`` drops them instead."""
+
+        with self._lock:
+            for entity in _entities(payload):
+                entity_id = _entity_id(entity)
+                if not entity_id:
+                    continue
+                if deleted:
+                    self._entities.pop(entity_id, None)
+                    continue
+                known = self._entities.get(entity_id)
+                version = entity["revision"].get("version") or 0
+                if known is None or version >= (known["revision"].get("version") or 0):
+                    self._entities[entity_id] = entity
+
+    def observe_response(self, response: httpx.Response) -> None:
+        if response.status_code >= 300 or "json" not in response.headers.get("content-type", ""):
+            return
+        try:
+            payload = response.json()
+        except ValueError:
+            return
+        self.observe(payload, deleted=response.request.method == "DELETE")
+
+    def entity(self, component_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._entities.get(component_id)
+
+    def revision(self, component_id: str) -> Optional[Dict[str, Any]]:
+        entity = self.entity(component_id)
+        return dict(entity["revision"]) if entity is not None else None
+
+    def forget(self, component_id: str) -> None:
+        with self._lock:
+            self._entities.pop(component_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entities)
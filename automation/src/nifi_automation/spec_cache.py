@@ -0,0 +1,179 @@
+"""Memoized loading of flow specifications.
+
+Commands that read a spec repeat the YAML load, the group flattening and the
+child-group layout. ``run flow`` does it twice, once to deploy and once to validate
+the deployed topology. :func:`load_flow_spec_cached` keys the parsed
+:class:`~nifi_automation.flow_builder.FlowSpec` by a SHA-256 of the YAML file, of
+``config/flow-defaults.yaml``, of the spec dataclass fields and of the source of
+the modules that compute the spec (parsing and layout), so upgrading or editing
+them invalidates earlier entries. Repeat loads within
+a process are served from memory. With ``spec_cache`` enabled in the settings,
+repeat loads across runs are served from a JSON file under ``<cache_dir>/specs``.
+The spec dataclasses are rebuilt field by field on load, so a file planted in the
+cache directory can at worst describe a different flow, never run code. Each call
+returns an independent copy, because deploying mutates the spec.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import flow_builder, layered_layout
+from .config import AuthSettings
+from .flow_builder import (
+    FLOW_DEFAULTS_PATH,
+    ConnectionSpec,
+    FlowSpec,
+    PortSpec,
+    ProcessGroupSpec,
+    ProcessorSpec,
+    load_flow_spec,
+)
+
+# Bump when the cache entry encoding changes; code changes are covered by _code_digest()
+SPEC_CACHE_FORMAT = 2
+_MEMORY_ENTRIES = 16
+
+_memory: "OrderedDict[str, bytes]" = OrderedDict()
+_lock = threading.Lock()
+_code: Optional[str] = None
+
+
+def _schema() -> str:
+    # Entries written for an older dataclass layout must not be reused
+    return ";".join(
+        f"{cls.__name__}:{','.join(field.name for field in dataclasses.fields(cls))}"
+        for cls in (FlowSpec, ProcessGroupSpec, ProcessorSpec, ConnectionSpec, PortSpec)
+    )
+
+
+def _code_digest() -> str:
+    # Parse and layout output depend on these modules, not only on the YAML
+    global _code
+    if _code is None:
+        digest = hashlib.sha256()
+        for module in (flow_builder, layered_layout):
+            digest.update(Path(module.__file__).read_bytes())
+        _code = digest.hexdigest()
+    return _code
+
+
+def spec_digest(path: Path) -> str:
+    """Cache key for the spec at ``path``: its bytes, the flow defaults, the spec schema and the parser code."""
+
+    digest = hashlib.sha256(f"format={SPEC_CACHE_FORMAT};{_schema()};code={_code_digest()}".encode("utf-8"))
+    digest.update(Path(path).read_bytes())
+    if FLOW_DEFAULTS_PATH.exists():
+        digest.update(b"\0defaults\0")
+        digest.update(FLOW_DEFAULTS_PATH.read_bytes())
+    return digest.hexdigest()
+
+
+def _position(value: Any) -> Any:
+    return tuple(value) if value is not None else None
+
+
+def _processor(data: Dict[str, Any]) -> ProcessorSpec:
+    return ProcessorSpec(**{**data, "position": _position(data["position"])})
+
+
+def _port(data: Dict[str, Any]) -> PortSpec:
+    return PortSpec(**{**data, "position": _position(data["position"])})
+
+
+def _group(data: Dict[str, Any]) -> ProcessGroupSpec:
+    return ProcessGroupSpec(
+        **{
+            **data,
+            "position": _position(data["position"]),
+            "processors": [_processor(item) for item in data["processors"]],
+            "connections": [ConnectionSpec(**item) for item in data["connections"]],
+            "child_groups": [_group(item) for item in data["child_groups"]],
+            "input_ports": [_port(item) for item in data["input_ports"]],
+            "output_ports": [_port(item) for item in data["output_ports"]],
+        }
+    )
+
+
+def _dumps(spec: FlowSpec) -> bytes:
+    return json.dumps(dataclasses.asdict(spec), separators=(",", ":")).encode("utf-8")
+
+
+def _loads(blob: bytes) -> FlowSpec:
+    data = json.loads(blob)
+    return FlowSpec(**{**data, "root_group": _group(data["root_group"])})
+
+
+def _cache_dir(settings: Optional[AuthSettings]) -> Optional[Path]:
+    if settings is None or not getattr(settings, "spec_cache", False):
+        return None
+    return settings.resolved_cache_dir() / "specs"
+
+
+def _read(directory: Path, key: str) -> Optional[bytes]:
+    try:
+        return (directory / f"{key}.json").read_bytes()
+    except OSError:
+        return None
+
+
+def _write(directory: Path, key: str, blob: bytes) -> None:
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(blob)
+        os.replace(tmp, directory / f"{key}.json")
+    except OSError:
+        # A read-only or full cache directory must never break a command
+        return
+
+
+def _remember(key: str, blob: bytes) -> None:
+    with _lock:
+        _memory[key] = blob
+        _memory.move_to_end(key)
+        while len(_memory) > _MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def load_flow_spec_cached(path: Path, *, settings: Optional[AuthSettings] = None) -> FlowSpec:
+    """Return ``load_flow_spec(path)``, reusing an earlier parse of identical content."""
+
+    key = spec_digest(path)
+    with _lock:
+        blob = _memory.get(key)
+    directory = _cache_dir(settings)
+    if blob is None and directory is not None:
+        blob = _read(directory, key)
+        if blob is not None:
+            try:
+                spec = _loads(blob)
+            except (KeyError, TypeError, ValueError):
+                blob = None
+            else:
+                _remember(key, blob)
+                return spec
+    if blob is None:
+        spec = load_flow_spec(Path(path))
+        blob = _dumps(spec)
+        if directory is not None:
+            _write(directory, key, blob)
+        _remember(key, blob)
+        return spec
+    return _loads(blob)
+
+
+def clear_memory_cache() -> None:
+    """Forget the specs memoized in this process; on-disk entries are kept."""
+
+    with _lock:
+        _memory.clear()
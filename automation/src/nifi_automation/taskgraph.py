@@ -0,0 +1,115 @@
+"""Dependency-ordered execution of independent REST operations.
+
+A :class:`TaskGraph` holds named actions and the actions each one waits for.
+Dependencies must be added before their dependents, so the graph is acyclic by
+construction. :meth:`TaskGraph.run` starts every action whose dependencies have
+finished, up to ``max_workers`` at a time. After the first failure no new actions
+are started; in-flight ones finish and the original exception is re-raised.
+
+Actions whose key is already in :attr:`TaskGraph.results` count as finished and are
+not run again, which is how a resumed deploy skips completed work.
+"""
+
+from __future__ import annotations
+
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class TaskGraph:
+    """Named actions with dependencies; results are keyed by action name."""
+
+    def __init__(self) -> None:
+        self._actions: Dict[str, Tuple[Callable[[], Any], Tuple[str, ...]]] = {}
+        self._dependents: Dict[str, List[str]] = {}
+        self.results: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._actions
+
+    def __iter__(self) -> Iterator[str]:
+        """Task keys in insertion (topological) order."""
+
+        return iter(self._actions)
+
+    def add(self, key: str, action: Callable[[], Any], depends_on: Iterable[Optional[str]] = ()) -> str:
+        """Register ``action`` under ``key``; ``None`` entries in ``depends_on`` are ignored."""
+
+        if key in self._actions:
+            raise ValueError(f"Duplicate task '{key}'")
+        deps = tuple(dict.fromkeys(dep for dep in depends_on if dep is not None))
+        for dep in deps:
+            if dep not in self._actions:
+                raise ValueError(f"Task '{key}' depends on unknown task '{dep}'")
+        self._actions[key] = (action, deps)
+        self._dependents[key] = []
+        for dep in deps:
+            self._dependents[dep].append(key)
+        return key
+
+    def dependencies(self, key: str) -> Tuple[str, ...]:
+        return self._actions[key][1]
+
+    def action(self, key: str) -> Callable[[], Any]:
+        return self._actions[key][0]
+
+    def run(
+        self, max_workers: int = 1, *, on_result: Optional[Callable[[str, Any], None]] = None
+    ) -> Dict[str, Any]:
+        """Run every action once, respecting dependencies; returns :attr:`results`.
+
+        ``on_result(key, result)`` is called on the coordinating thread as each action finishes.
+        """
+
+        if max_workers <= 1:
+            # Insertion order is already a topological order
+            for key, (action, _) in self._actions.items():
+                if key in self.results:
+                    continue
+                self.results[key] = action()
+                if on_result is not None:
+                    on_result(key, self.results[key])
+            return self.results
+
+        waiting = {key: len(deps) for key, (_, deps) in self._actions.items()}
+        for key in self._actions:
+            if key in self.results:
+                for dependent in self._dependents[key]:
+                    waiting[dependent] -= 1
+        ready: Deque[str] = deque(
+            key for key, count in waiting.items() if count == 0 and key not in self.results
+        )
+        running: Dict[Future, str] = {}
+        failure: Optional[BaseException] = None
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="nifi-deploy") as pool:
+            while ready or running:
+                while ready and failure is None and len(running) < max_workers:
+                    key = ready.popleft()
+                    # Each action sees the caller's context variables (e.g. wait collectors)
+                    context = contextvars.copy_context()
+                    running[pool.submit(context.run, self._actions[key][0])] = key
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        failure = failure or error
+                        continue
+                    self.results[key] = future.result()
+                    if on_result is not None:
+                        on_result(key, self.results[key])
+                    for dependent in self._dependents[key]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0 and dependent not in self.results:
+                            ready.append(dependent)
+        if failure is not None:
+            raise failure
+        return self.results
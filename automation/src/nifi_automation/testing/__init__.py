@@ -0,0 +1,6 @@
+"""Offline test support for nifi_automation."""
+
+from .fake_nifi import FakeNiFi, FakeNiFiConfig
+from .synthetic import synthetic_flow, write_synthetic_flow
+
+__all__ = ["FakeNiFi", "FakeNiFiConfig", "synthetic_flow", "write_synthetic_flow"]
@@ -0,0 +1,900 @@
+"""In-process stand-in for the subset of the NiFi REST API this toolkit uses.
+
+``FakeNiFi`` runs a threaded HTTP server on ``127.0.0.1`` and keeps a small NiFi
+model in memory. The model covers process groups, processors, ports, labels,
+connections, controller services, revisions, drop requests, bulletins and versioned
+flow uploads. Stale revisions are rejected as NiFi does: ``400`` "not the most
+up-to-date revision", unless the clientId made the last change. Properties named
+in ``sensitive_properties`` behave like NiFi's sensitive ones: reads mask them
+and an upload keeps only ``#{parameter}`` references. Latency, injected
+``409`` conflicts and state-transition times are configurable. Flows of a chosen
+size can be seeded, so deploy, purge and status paths can be benchmarked without
+a live NiFi::
+
+    with FakeNiFi(FakeNiFiConfig(latency=0.005)) as nifi:
+        nifi.seed_flow(groups=20, processors_per_group=25)
+        with NiFiClient(nifi.settings(), nifi.token) as client:
+            ...
+
+Unsupported endpoints answer ``404`` with the path in the body.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from email.parser import BytesParser
+from email.policy import HTTP
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from ..auth import get_access_token
+from ..client import NiFiClient
+from ..config import AuthSettings
+
+API_PREFIX = "/nifi-api"
+FAKE_VERSION = "2.0.0-fake"
+DEFAULT_BUNDLE = {"group": "org.apache.nifi", "artifact": "nifi-standard-nar", "version": "2.0.0"}
+
+DEFAULT_PROCESSOR_TYPES = (
+    "org.apache.nifi.processors.standard.GenerateFlowFile",
+    "org.apache.nifi.processors.standard.LogAttribute",
+    "org.apache.nifi.processors.standard.UpdateAttribute",
+    "org.apache.nifi.processors.standard.RouteOnAttribute",
+    "org.apache.nifi.processors.standard.HandleHttpRequest",
+    "org.apache.nifi.processors.standard.HandleHttpResponse",
+    "org.apache.nifi.processors.standard.InvokeHTTP",
+)
+DEFAULT_SERVICE_TYPES = (
+    "org.apache.nifi.http.StandardHttpContextMap",
+    "org.apache.nifi.ssl.StandardSSLContextService",
+    "org.apache.nifi.json.JsonTreeReader",
+    "org.apache.nifi.json.JsonRecordSetWriter",
+)
+
+# Groups the process-group flow listing returns, keyed by the kind stored on each component
+_FLOW_KEYS = {
+    "processGroup": "processGroups",
+    "processor": "processors",
+    "inputPort": "inputPorts",
+    "outputPort": "outputPorts",
+    "connection": "connections",
+    "label": "labels",
+}
+# URL collection name -> component kind, for both ``/process-groups/{id}/<name>`` and ``/<name>/{id}``
+_KINDS = {
+    "process-groups": "processGroup",
+    "processors": "processor",
+    "input-ports": "inputPort",
+    "output-ports": "outputPort",
+    "connections": "connection",
+    "labels": "label",
+    "controller-services": "controllerService",
+}
+_RUN_STATUS = {"RUNNING": "Running", "STOPPED": "Stopped", "DISABLED": "Disabled"}
+SENSITIVE_MASK = "********"
+_PARAMETER_REFERENCE = re.compile(r"#\{[^}]+\}")
+
+
+@dataclass
+class FakeNiFiConfig:
+    """Knobs for the fake server; all times are in seconds."""
+
+    # Added to every request, plus up to ``latency_jitter`` of uniform noise
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # Per-request override: ``latency_for(method, path)`` returns seconds or ``None`` for the default
+    latency_for: Optional[Callable[[str, str], Optional[float]]] = None
+    # Probability that a mutation carrying a revision is rejected with 409 before it is applied
+    conflict_rate: float = 0.0
+    # ``fault_for(method, path)`` returns a status to answer with instead of handling the request, or ``None``
+    fault_for: Optional[Callable[[str, str], Optional[int]]] = None
+    # How long controller services stay ENABLING/DISABLING and drop requests stay unfinished
+    transition_seconds: float = 0.0
+    drop_seconds: float = 0.0
+    # ``False`` answers the versioned flow upload endpoint with 404, as NiFi releases without it do
+    supports_upload: bool = True
+    processor_types: Tuple[str, ...] = DEFAULT_PROCESSOR_TYPES
+    # Property names every processor definition reports as sensitive
+    sensitive_properties: Tuple[str, ...] = ()
+    service_types: Tuple[str, ...] = DEFAULT_SERVICE_TYPES
+    username: str = "admin"
+    password: str = "fake-password"
+    seed: int = 0
+
+
+@dataclass
+class _Component:
+    kind: str
+    id: str
+    parent_id: Optional[str]
+    component: Dict[str, Any]
+    version: int = 0
+    # clientId of the last mutation; NiFi accepts any version from that client
+    client_id: Optional[str] = None
+    # Pending state transition (controller services): state to report once ``settle_at`` passes
+    target_state: Optional[str] = None
+    settle_at: float = 0.0
+    queued: int = 0
+    queued_bytes: int = 0
+    validation_errors: List[str] = field(default_factory=list)
+
+
+class _Reply(Exception):
+    def __init__(self, status: int, payload: Any = None):
+        super().__init__(status)
+        self.status = status
+        self.payload = payload
+
+
+def _conflict(message: str) -> _Reply:
+    return _Reply(409, message)
+
+
+class FakeNiFi:
+    """Threaded fake NiFi server; use as a context manager or call :meth:`start`/:meth:`stop`."""
+
+    def __init__(self, config: Optional[FakeNiFiConfig] = None):
+        self.config = config or FakeNiFiConfig()
+        self.token = "fake-nifi-token"
+        self.requests: List[Tuple[str, str, int]] = []
+        self._lock = threading.RLock()
+        self._random = random.Random(self.config.seed)
+        self._components: Dict[str, _Component] = {}
+        self._children: Dict[str, List[str]] = {}
+        self._drops: Dict[str, Dict[str, Any]] = {}
+        self._bulletins: List[Dict[str, Any]] = []
+        self._bulletin_seq = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._add(_Component("processGroup", "root", None, {"id": "root", "name": "NiFi Flow"}))
+
+    # -- lifecycle -----------------------------------------------------------------
+
+    def start(self) -> "FakeNiFi":
+        handler = type("FakeNiFiHandler", (_Handler,), {"nifi": self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-nifi", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "FakeNiFi":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None, "server not started"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def settings(self, **overrides: Any) -> AuthSettings:
+        """``AuthSettings`` pointing at this server with on-disk caches disabled."""
+
+        values: Dict[str, Any] = {
+            "base_url": self.base_url,
+            "username": self.config.username,
+            "password": self.config.password,
+            "verify_ssl": False,
+            "catalog_cache": False,
+            "spec_cache": False,
+            "token_cache": False,
+            "deploy_journal": False,
+            "queue_history": False,
+            "bulletin_cursor": False,
+        }
+        values.update(overrides)
+        return AuthSettings(**values)
+
+    def client(self, **overrides: Any) -> NiFiClient:
+        """Logged-in :class:`NiFiClient` for this server; ``overrides`` are passed to :meth:`settings`."""
+
+        settings = self.settings(**overrides)
+        return NiFiClient(settings, get_access_token(settings))
+
+    # -- inspection and seeding ------------------------------------------------------
+
+    def request_count(self, method: Optional[str] = None, pattern: Optional[str] = None) -> int:
+        """Count recorded requests, optionally filtered by method and a regex on the path."""
+
+        regex = re.compile(pattern) if pattern else None
+        with self._lock:
+            return sum(
+                1
+                for req_method, path, _ in self.requests
+                if (method is None or req_method == method) and (regex is None or regex.search(path))
+            )
+
+    def reset_requests(self) -> None:
+        with self._lock:
+            self.requests.clear()
+
+    def components(self, kind: str) -> List[Dict[str, Any]]:
+        """Entities of ``kind`` as stored, with sensitive values unmasked."""
+
+        with self._lock:
+            return [self._entity(comp, reveal=True) for comp in self._components.values() if comp.kind == kind]
+
+    def add_bulletin(self, message: str, *, level: str = "ERROR", source_id: Optional[str] = None) -> int:
+        with self._lock:
+            self._bulletin_seq += 1
+            source = self._components.get(source_id) if source_id else None
+            self._bulletins.append(
+                {
+                    "id": self._bulletin_seq,
+                    "bulletin": {
+                        "id": self._bulletin_seq,
+                        "level": level,
+                        "message": message,
+                        "sourceId": source_id,
+                        "sourceName": source.component.get("name") if source else None,
+                        "groupId": source.parent_id if source else None,
+                        "timestamp": time.strftime("%H:%M:%S UTC", time.gmtime()),
+                    },
+                }
+            )
+            return self._bulletin_seq
+
+    def mark_invalid(self, component_id: str, *errors: str) -> None:
+        """Report ``component_id`` as INVALID with ``errors``; call with no errors to make it valid again."""
+
+        with self._lock:
+            self._components[component_id].validation_errors = list(errors)
+
+    def set_queue(self, connection_id: str, count: int, size: int = 0) -> None:
+        with self._lock:
+            conn = self._components[connection_id]
+            conn.queued, conn.queued_bytes = count, size
+
+    def seed_flow(
+        self,
+        *,
+        groups: int = 1,
+        processors_per_group: int = 5,
+        services: int = 0,
+        queued: int = 0,
+        parent_id: str = "root",
+    ) -> List[str]:
+        """Create ``groups`` child groups, each with a chain of connected processors.
+
+        Returns the ids of the created groups.
+        """
+
+        created: List[str] = []
+        with self._lock:
+            for g in range(groups):
+                pg = self._create("processGroup", parent_id, {"name": f"Group {g}", "position": {"x": g * 400.0, "y": 0.0}})
+                created.append(pg.id)
+                previous: Optional[_Component] = None
+                for p in range(processors_per_group):
+                    proc = self._create(
+                        "processor",
+                        pg.id,
+                        {
+                            "name": f"Processor {g}.{p}",
+                            "type": self.config.processor_types[p % len(self.config.processor_types)],
+                            "position": {"x": 0.0, "y": p * 200.0},
+                        },
+                    )
+                    if previous is not None:
+                        conn = self._create(
+                            "connection",
+                            pg.id,
+                            {
+                                "name": "",
+                                "source": {"id": previous.id, "type": "PROCESSOR", "groupId": pg.id},
+                                "destination": {"id": proc.id, "type": "PROCESSOR", "groupId": pg.id},
+                                "selectedRelationships": ["success"],
+                            },
+                        )
+                        conn.queued = queued
+                    previous = proc
+            for s in range(services):
+                self._create(
+                    "controllerService",
+                    "root",
+                    {"name": f"Service {s}", "type": self.config.service_types[s % len(self.config.service_types)]},
+                )
+        return created
+
+    # -- model helpers ----------------------------------------------------------------
+
+    def _add(self, comp: _Component) -> _Component:
+        self._components[comp.id] = comp
+        self._children.setdefault(comp.id, [])
+        if comp.parent_id is not None:
+            self._children.setdefault(comp.parent_id, []).append(comp.id)
+        return comp
+
+    def _create(self, kind: str, parent_id: str, component: Dict[str, Any]) -> _Component:
+        if parent_id not in self._components or self._components[parent_id].kind != "processGroup":
+            raise _Reply(404, f"Unable to find process group with id '{parent_id}'.")
+        comp_id = str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+        component = dict(component, id=comp_id, parentGroupId=parent_id)
+        if kind == "processor":
+            component.setdefault("state", "STOPPED")
+            component.setdefault("bundle", dict(DEFAULT_BUNDLE))
+            config = dict(component.get("config") or {})
+            config.setdefault("properties", {})
+            config.setdefault("autoTerminatedRelationships", [])
+            component["config"] = config
+            component.setdefault("relationships", [{"name": "success"}, {"name": "failure"}])
+        elif kind in {"inputPort", "outputPort"}:
+            component.setdefault("state", "STOPPED")
+        elif kind == "controllerService":
+            component.setdefault("state", "DISABLED")
+            component.setdefault("properties", {})
+            component.setdefault("bundle", dict(DEFAULT_BUNDLE))
+        elif kind == "connection":
+            for end in ("source", "destination"):
+                ref = component.get(end) or {}
+                if ref.get("id") not in self._components:
+                    raise _Reply(400, f"Unable to find {end} component with id '{ref.get('id')}'.")
+        return self._add(_Component(kind, comp_id, parent_id, component, version=1))
+
+    def _get(self, kind: str, comp_id: str) -> _Component:
+        comp = self._components.get(comp_id)
+        if comp is None or comp.kind != kind:
+            raise _Reply(404, f"Unable to find component with id '{comp_id}'.")
+        self._settle(comp)
+        return comp
+
+    def _settle(self, comp: _Component) -> None:
+        if comp.target_state and time.monotonic() >= comp.settle_at:
+            comp.component["state"] = comp.target_state
+            comp.target_state = None
+
+    def _check_revision(self, comp: _Component, revision: Dict[str, Any]) -> Optional[str]:
+        """Validate ``revision`` like NiFi's ``Revision.equals`` and return its clientId."""
+
+        if self.config.conflict_rate and self._random.random() < self.config.conflict_rate:
+            raise _conflict(f"[{comp.id}] conflict injected by FakeNiFi")
+        client_id = revision.get("clientId") or None
+        try:
+            sent = int(revision.get("version"))
+        except (TypeError, ValueError):
+            raise _Reply(400, "Revision version is required.") from None
+        if sent != comp.version and not (client_id and client_id == comp.client_id):
+            # InvalidRevisionExceptionMapper answers 400, not 409
+            raise _Reply(
+                400,
+                f"[{sent}, {client_id}, {comp.id}] is not the most up-to-date revision. "
+                "This component appears to have been modified",
+            )
+        return client_id
+
+    def _validation(self, comp: _Component) -> Tuple[str, List[str]]:
+        errors = list(comp.validation_errors)
+        return ("INVALID" if errors else "VALID"), errors
+
+    def _entity(self, comp: _Component, *, reveal: bool = False) -> Dict[str, Any]:
+        self._settle(comp)
+        component = json.loads(json.dumps(comp.component))
+        if comp.kind == "processor" and not reveal:
+            properties = component["config"]["properties"]
+            for name in self.config.sensitive_properties:
+                if properties.get(name) and not _PARAMETER_REFERENCE.fullmatch(properties[name]):
+                    properties[name] = SENSITIVE_MASK
+        entity: Dict[str, Any] = {
+            "id": comp.id,
+            "revision": {"version": comp.version},
+            "component": component,
+            "bulletins": [],
+        }
+        if comp.kind in {"processor", "inputPort", "outputPort", "controllerService"}:
+            status, errors = self._validation(comp)
+            if comp.kind != "controllerService" and component.get("state") == "DISABLED":
+                status = "DISABLED"
+            component["validationStatus"] = status
+            component["validationErrors"] = errors
+        if comp.kind == "processor":
+            entity["status"] = {"aggregateSnapshot": self._processor_status(comp)}
+        elif comp.kind == "connection":
+            entity["status"] = {"aggregateSnapshot": self._connection_status(comp)}
+            entity["sourceId"] = component["source"]["id"]
+            entity["destinationId"] = component["destination"]["id"]
+        elif comp.kind == "processGroup":
+            entity["status"] = {"aggregateSnapshot": {"id": comp.id, "name": component.get("name")}}
+            counts = self._group_counts(comp.id)
+            entity.update(counts)
+        return entity
+
+    def _group_counts(self, pg_id: str) -> Dict[str, int]:
+        counts = {"runningCount": 0, "stoppedCount": 0, "invalidCount": 0, "disabledCount": 0}
+        for child_id in self._children.get(pg_id, []):
+            child = self._components[child_id]
+            if child.kind == "processGroup":
+                for key, value in self._group_counts(child_id).items():
+                    counts[key] += value
+            elif child.kind == "processor":
+                state = child.component.get("state")
+                if self._validation(child)[0] == "INVALID" and state != "DISABLED":
+                    counts["invalidCount"] += 1
+                elif state == "RUNNING":
+                    counts["runningCount"] += 1
+                elif state == "DISABLED":
+                    counts["disabledCount"] += 1
+                else:
+                    counts["stoppedCount"] += 1
+        return counts
+
+    def _processor_status(self, comp: _Component) -> Dict[str, Any]:
+        state = comp.component.get("state", "STOPPED")
+        run_status = _RUN_STATUS.get(state, "Stopped")
+        if run_status == "Stopped" and self._validation(comp)[0] == "INVALID":
+            run_status = "Invalid"
+        return {
+            "id": comp.id,
+            "groupId": comp.parent_id,
+            "name": comp.component.get("name"),
+            "type": comp.component.get("type"),
+            "runStatus": run_status,
+        }
+
+    def _connection_status(self, comp: _Component) -> Dict[str, Any]:
+        threshold = int(comp.component.get("backPressureObjectThreshold") or 10000)
+        return {
+            "id": comp.id,
+            "groupId": comp.parent_id,
+            "name": comp.component.get("name") or "",
+            "queuedCount": str(comp.queued),
+            "queuedBytes": str(comp.queued_bytes),
+            "percentUseCount": int(comp.queued * 100 / threshold) if threshold else 0,
+            "percentUseBytes": 0,
+            "backPressureObjectThreshold": threshold,
+            "backPressureDataSizeThreshold": comp.component.get("backPressureDataSizeThreshold") or "1 GB",
+        }
+
+    def _group_flow(self, pg_id: str) -> Dict[str, Any]:
+        group = self._get("processGroup", pg_id)
+        flow: Dict[str, List[Dict[str, Any]]] = {key: [] for key in _FLOW_KEYS.values()}
+        for child_id in self._children.get(pg_id, []):
+            child = self._components[child_id]
+            key = _FLOW_KEYS.get(child.kind)
+            if key:
+                flow[key].append(self._entity(child))
+        return {
+            "processGroupFlow": {
+                "id": pg_id,
+                "breadcrumb": {"id": pg_id, "breadcrumb": {"id": pg_id, "name": group.component.get("name")}},
+                "flow": flow,
+            }
+        }
+
+    def _group_status(self, pg_id: str, recursive: bool) -> Dict[str, Any]:
+        group = self._get("processGroup", pg_id)
+        snapshot: Dict[str, Any] = {
+            "id": pg_id,
+            "name": group.component.get("name"),
+            "processorStatusSnapshots": [],
+            "inputPortStatusSnapshots": [],
+            "outputPortStatusSnapshots": [],
+            "connectionStatusSnapshots": [],
+            "processGroupStatusSnapshots": [],
+        }
+        for child_id in self._children.get(pg_id, []):
+            child = self._components[child_id]
+            if child.kind == "processor":
+                snapshot["processorStatusSnapshots"].append({"processorStatusSnapshot": self._processor_status(child)})
+            elif child.kind in {"inputPort", "outputPort"}:
+                key = "inputPortStatusSnapshots" if child.kind == "inputPort" else "outputPortStatusSnapshots"
+                port = {
+                    "id": child.id,
+                    "groupId": pg_id,
+                    "name": child.component.get("name"),
+                    "runStatus": _RUN_STATUS.get(child.component.get("state", "STOPPED"), "Stopped"),
+                }
+                snapshot[key].append({"portStatusSnapshot": port})
+            elif child.kind == "connection":
+                snapshot["connectionStatusSnapshots"].append({"connectionStatusSnapshot": self._connection_status(child)})
+            elif child.kind == "processGroup":
+                inner = self._group_status(child_id, recursive) if recursive else {"id": child_id, "name": child.component.get("name")}
+                snapshot["processGroupStatusSnapshots"].append({"processGroupStatusSnapshot": inner})
+        return snapshot
+
+    def _descendants(self, pg_id: str) -> List[_Component]:
+        found: List[_Component] = []
+        for child_id in self._children.get(pg_id, []):
+            child = self._components[child_id]
+            found.append(child)
+            if child.kind == "processGroup":
+                found.extend(self._descendants(child_id))
+        return found
+
+    def _remove(self, comp: _Component) -> None:
+        for child in self._descendants(comp.id) if comp.kind == "processGroup" else []:
+            self._components.pop(child.id, None)
+            self._children.pop(child.id, None)
+        self._components.pop(comp.id, None)
+        self._children.pop(comp.id, None)
+        if comp.parent_id is not None:
+            siblings = self._children.get(comp.parent_id, [])
+            if comp.id in siblings:
+                siblings.remove(comp.id)
+
+    def _bump(self, comp: _Component) -> Dict[str, Any]:
+        comp.version += 1
+        return self._entity(comp)
+
+    # -- request handling ----------------------------------------------------------
+
+    def handle(self, method: str, raw_path: str, body: bytes, headers: Dict[str, str]) -> Tuple[int, Any]:
+        split = urlsplit(raw_path)
+        path = split.path[len(API_PREFIX):] if split.path.startswith(API_PREFIX) else split.path
+        query = {key: values[-1] for key, values in parse_qs(split.query).items()}
+        delay = self.config.latency
+        if self.config.latency_for is not None:
+            override = self.config.latency_for(method, path)
+            if override is not None:
+                delay = override
+        if self.config.latency_jitter:
+            delay += self._random.uniform(0, self.config.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            fault = self.config.fault_for(method, path) if self.config.fault_for is not None else None
+            if fault is not None:
+                raise _Reply(fault, f"fault injected by FakeNiFi for {method} {path}")
+            status, payload = self._route(method, path, query, body, headers)
+        except _Reply as reply:
+            status, payload = reply.status, reply.payload
+        with self._lock:
+            self.requests.append((method, path, status))
+        return status, payload
+
+    def _route(self, method: str, path: str, query: Dict[str, str], body: bytes, headers: Dict[str, str]) -> Tuple[int, Any]:
+        if method == "POST" and path == "/access/token":
+            form = {key: values[-1] for key, values in parse_qs(body.decode("utf-8")).items()}
+            if form.get("username") != self.config.username or form.get("password") != self.config.password:
+                raise _Reply(400, "The supplied username and password are not valid.")
+            return 201, self.token
+        if headers.get("authorization") != f"Bearer {self.token}":
+            raise _Reply(401, "Unable to validate the access token.")
+        if method == "POST" and re.fullmatch(r"/process-groups/[^/]+/process-groups/upload", path):
+            if not self.config.supports_upload:
+                raise _Reply(404, path)
+            fields = _multipart_fields(body, headers.get("content-type", ""))
+            with self._lock:
+                return self._upload(path.split("/")[2], fields)
+        data = json.loads(body) if body else {}
+        with self._lock:
+            return self._dispatch(method, path.rstrip("/") or "/", query, data)
+
+    def _dispatch(self, method: str, path: str, query: Dict[str, str], data: Dict[str, Any]) -> Tuple[int, Any]:
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+
+        if parts[0] == "flow":
+            return self._flow(method, parts[1:], query, data)
+
+        if parts[0] == "flowfile-queues" and len(parts) >= 3 and parts[2] == "drop-requests":
+            return self._drop_request(method, parts[1], parts[3] if len(parts) > 3 else None)
+
+        if parts[0] == "process-groups" and len(parts) == 3 and method == "POST":
+            kind = _KINDS.get(parts[2])
+            if kind is None:
+                raise _Reply(404, path)
+            component = dict((data or {}).get("component") or {})
+            component.pop("id", None)
+            comp = self._create(kind, parts[1], component)
+            return 201, self._entity(comp)
+
+        kind = _KINDS.get(parts[0])
+        if kind is None or len(parts) < 2:
+            raise _Reply(404, path)
+        comp = self._get(kind, parts[1])
+
+        if len(parts) == 3 and parts[2] == "run-status" and method == "PUT":
+            client_id = self._check_revision(comp, data.get("revision") or {})
+            entity = self._set_run_status(comp, str(data.get("state")))
+            comp.client_id = client_id
+            return 200, entity
+        if len(parts) != 2:
+            raise _Reply(404, path)
+        if method == "GET":
+            return 200, self._entity(comp)
+        if method == "PUT":
+            client_id = self._check_revision(comp, data.get("revision") or {})
+            entity = self._update(comp, (data.get("component") or {}))
+            comp.client_id = client_id
+            return 200, entity
+        if method == "DELETE":
+            self._check_revision(comp, query)
+            self._check_deletable(comp)
+            entity = self._entity(comp)
+            self._remove(comp)
+            return 200, entity
+        raise _Reply(405, f"{method} not allowed on {path}")
+
+    def _upload(self, parent_id: str, fields: Dict[str, bytes]) -> Tuple[int, Any]:
+        try:
+            contents = json.loads(fields["file"])["flowContents"]
+        except (KeyError, ValueError) as exc:
+            raise _Reply(400, f"Unable to parse the uploaded flow: {exc}") from None
+        position = {
+            "x": float(fields.get("positionX") or 0),
+            "y": float(fields.get("positionY") or 0),
+        }
+        group = dict(contents, name=(fields.get("groupName") or b"").decode("utf-8") or contents.get("name"), position=position)
+        created: List[_Component] = []
+        try:
+            comp = self._import_group(parent_id, group, {}, created)
+        except _Reply:
+            # Like NiFi, a rejected upload leaves nothing behind
+            if created:
+                self._remove(created[0])
+            raise
+        return 201, self._entity(comp)
+
+    def _import_group(
+        self, parent_id: str, group: Dict[str, Any], ids: Dict[str, str], created: List[_Component]
+    ) -> _Component:
+        pg = self._create(
+            "processGroup",
+            parent_id,
+            {"name": group.get("name"), "position": group.get("position"), "comments": group.get("comments", "")},
+        )
+        created.append(pg)
+        ids[group.get("identifier", pg.id)] = pg.id
+        for kind, key in (("inputPort", "inputPorts"), ("outputPort", "outputPorts")):
+            for port in group.get(key) or []:
+                component = {name: port.get(name) for name in ("name", "position", "comments", "allowRemoteAccess")}
+                ids[port["identifier"]] = self._create(kind, pg.id, component).id
+        for proc in group.get("processors") or []:
+            component = {name: proc.get(name) for name in ("name", "type", "bundle", "position")}
+            component["state"] = "DISABLED" if proc.get("scheduledState") == "DISABLED" else "STOPPED"
+            component["config"] = {
+                # Literal sensitive values do not survive an import; parameter references do
+                "properties": {
+                    name: value
+                    for name, value in (proc.get("properties") or {}).items()
+                    if name not in self.config.sensitive_properties or _PARAMETER_REFERENCE.fullmatch(value or "")
+                },
+                "autoTerminatedRelationships": list(proc.get("autoTerminatedRelationships") or []),
+                "schedulingPeriod": proc.get("schedulingPeriod"),
+                "schedulingStrategy": proc.get("schedulingStrategy"),
+                "comments": proc.get("comments") or "",
+                "concurrentlySchedulableTaskCount": proc.get("concurrentlySchedulableTaskCount", 1),
+                "runDurationMillis": proc.get("runDurationMillis", 0),
+                "penaltyDuration": proc.get("penaltyDuration"),
+                "yieldDuration": proc.get("yieldDuration"),
+                "executionNode": proc.get("executionNode"),
+            }
+            ids[proc["identifier"]] = self._create("processor", pg.id, component).id
+        for child in group.get("processGroups") or []:
+            self._import_group(pg.id, child, ids, created)
+        for conn in group.get("connections") or []:
+            component = {
+                "name": conn.get("name"),
+                "selectedRelationships": list(conn.get("selectedRelationships") or []),
+                "backPressureObjectThreshold": conn.get("backPressureObjectThreshold"),
+                "backPressureDataSizeThreshold": conn.get("backPressureDataSizeThreshold"),
+                "flowFileExpiration": conn.get("flowFileExpiration"),
+                "prioritizers": list(conn.get("prioritizers") or []),
+                "loadBalanceStrategy": conn.get("loadBalanceStrategy"),
+                "loadBalancePartitionAttribute": conn.get("partitioningAttribute"),
+                "loadBalanceCompression": conn.get("loadBalanceCompression"),
+            }
+            for end in ("source", "destination"):
+                ref = conn.get(end) or {}
+                component[end] = {"id": ids.get(ref.get("id")), "type": ref.get("type"), "groupId": ids.get(ref.get("groupId"))}
+            self._create("connection", pg.id, component)
+        return pg
+
+    def _flow(self, method: str, parts: List[str], query: Dict[str, str], data: Dict[str, Any]) -> Tuple[int, Any]:
+        head = parts[0] if parts else ""
+        if method == "GET" and head == "about":
+            return 200, {"about": {"title": "NiFi", "version": FAKE_VERSION}}
+        if method == "GET" and head == "processor-types":
+            return 200, {"processorTypes": [{"type": t, "bundle": dict(DEFAULT_BUNDLE)} for t in self.config.processor_types]}
+        if method == "GET" and head == "controller-service-types":
+            types = [{"type": t, "bundle": dict(DEFAULT_BUNDLE)} for t in self.config.service_types]
+            return 200, {"controllerServiceTypes": types}
+        if method == "GET" and head in {"processor-definition", "controller-service-definition"}:
+            type_name = parts[-1]
+            definition: Dict[str, Any] = {"type": type_name, "propertyDescriptors": {}, "supportsDynamicProperties": True}
+            if head == "processor-definition":
+                definition["propertyDescriptors"] = {
+                    name: {"name": name, "displayName": name, "sensitive": True}
+                    for name in self.config.sensitive_properties
+                }
+                definition["supportedRelationships"] = [{"name": "success"}, {"name": "failure"}]
+                definition["supportsDynamicRelationships"] = False
+            return 200, definition
+        if method == "GET" and head == "bulletin-board":
+            after = int(query.get("after", 0) or 0)
+            limit = int(query.get("limit", 100) or 100)
+            rows = [b for b in self._bulletins if b["id"] > after][-limit:]
+            return 200, {"bulletinBoard": {"bulletins": rows}}
+        if head == "process-groups" and len(parts) >= 2:
+            pg_id = parts[1]
+            rest = parts[2:]
+            if method == "GET" and not rest:
+                return 200, self._group_flow(pg_id)
+            if method == "PUT" and not rest:
+                return 200, self._schedule_group(pg_id, str(data.get("state")))
+            if method == "GET" and rest == ["status"]:
+                recursive = query.get("recursive", "false").lower() == "true"
+                return 200, {"processGroupStatus": {"id": pg_id, "aggregateSnapshot": self._group_status(pg_id, recursive)}}
+            if method == "GET" and rest == ["controller-services"]:
+                self._get("processGroup", pg_id)
+                services = [
+                    self._entity(comp)
+                    for comp in self._components.values()
+                    if comp.kind == "controllerService"
+                    and (comp.parent_id == pg_id or query.get("includeInherited", "true").lower() == "true")
+                ]
+                return 200, {"controllerServices": services}
+        raise _Reply(404, "/flow/" + "/".join(parts))
+
+    def _schedule_group(self, pg_id: str, state: str) -> Dict[str, Any]:
+        if state not in {"RUNNING", "STOPPED"}:
+            raise _Reply(400, f"Unsupported state {state}")
+        for comp in [self._get("processGroup", pg_id)] + self._descendants(pg_id):
+            if comp.kind not in {"processor", "inputPort", "outputPort"}:
+                continue
+            current = comp.component.get("state")
+            if current == "DISABLED" or current == state:
+                continue
+            if state == "RUNNING" and self._validation(comp)[0] == "INVALID":
+                continue
+            comp.component["state"] = state
+            comp.version += 1
+        return {"id": pg_id, "state": state}
+
+    def _set_run_status(self, comp: _Component, state: str) -> Dict[str, Any]:
+        if comp.kind == "controllerService":
+            if state not in {"ENABLED", "DISABLED"}:
+                raise _Reply(400, f"Unsupported state {state}")
+            if state == "ENABLED" and self._validation(comp)[0] == "INVALID":
+                raise _conflict(f"Controller Service {comp.id} cannot be enabled because it is invalid")
+            if self.config.transition_seconds > 0:
+                comp.component["state"] = "ENABLING" if state == "ENABLED" else "DISABLING"
+                comp.target_state = state
+                comp.settle_at = time.monotonic() + self.config.transition_seconds
+            else:
+                comp.component["state"] = state
+            return self._bump(comp)
+        if state == "RUN_ONCE":
+            comp.component["state"] = "STOPPED"
+        elif state in {"RUNNING", "STOPPED", "DISABLED"}:
+            comp.component["state"] = state
+        else:
+            raise _Reply(400, f"Unsupported state {state}")
+        return self._bump(comp)
+
+    def _update(self, comp: _Component, update: Dict[str, Any]) -> Dict[str, Any]:
+        for key, value in update.items():
+            if key == "id":
+                continue
+            if key == "config" and comp.kind == "processor":
+                config = comp.component["config"]
+                for cfg_key, cfg_value in (value or {}).items():
+                    if cfg_key == "properties":
+                        merged = dict(config.get("properties") or {})
+                        for prop, prop_value in (cfg_value or {}).items():
+                            if prop_value is None:
+                                merged.pop(prop, None)
+                            else:
+                                merged[prop] = prop_value
+                        config["properties"] = merged
+                    else:
+                        config[cfg_key] = cfg_value
+            elif key == "properties" and comp.kind == "controllerService":
+                comp.component["properties"] = {**comp.component.get("properties", {}), **(value or {})}
+            else:
+                comp.component[key] = value
+        return self._bump(comp)
+
+    def _check_deletable(self, comp: _Component) -> None:
+        if comp.kind in {"processor", "inputPort", "outputPort"} and comp.component.get("state") == "RUNNING":
+            raise _conflict(f"{comp.id} is currently running")
+        if comp.kind == "controllerService" and comp.component.get("state") != "DISABLED":
+            raise _conflict(f"Controller Service {comp.id} is not disabled")
+        if comp.kind == "connection" and comp.queued:
+            raise _conflict(f"Cannot delete connection {comp.id} because its queue is not empty")
+        if comp.kind in {"processor", "inputPort", "outputPort"}:
+            for other in self._components.values():
+                if other.kind == "connection" and comp.id in (
+                    other.component["source"]["id"],
+                    other.component["destination"]["id"],
+                ):
+                    raise _conflict(f"Component {comp.id} has incoming or outgoing connections")
+        if comp.kind == "processGroup":
+            for child in self._descendants(comp.id):
+                self._settle(child)
+                if child.component.get("state") in {"RUNNING", "ENABLED", "ENABLING"}:
+                    raise _conflict(f"Process group {comp.id} contains active component {child.id}")
+
+    def _drop_request(self, method: str, connection_id: str, drop_id: Optional[str]) -> Tuple[int, Any]:
+        conn = self._get("connection", connection_id)
+        if method == "POST" and drop_id is None:
+            new_id = str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+            self._drops[new_id] = {
+                "connection": conn,
+                "dropped": conn.queued,
+                "finish_at": time.monotonic() + self.config.drop_seconds,
+            }
+            return 202, {"dropRequest": self._drop_view(new_id)}
+        if drop_id is None or drop_id not in self._drops:
+            raise _Reply(404, f"Unable to find drop request with id '{drop_id}'.")
+        view = self._drop_view(drop_id)
+        if method == "DELETE":
+            self._drops.pop(drop_id, None)
+            return 200, {"dropRequest": view}
+        if method == "GET":
+            return 200, {"dropRequest": view}
+        raise _Reply(405, f"{method} not allowed on drop requests")
+
+    def _drop_view(self, drop_id: str) -> Dict[str, Any]:
+        drop = self._drops[drop_id]
+        finished = time.monotonic() >= drop["finish_at"]
+        if finished:
+            drop["connection"].queued = 0
+            drop["connection"].queued_bytes = 0
+        return {
+            "id": drop_id,
+            "finished": finished,
+            "state": "Completed successfully" if finished else "Dropping FlowFiles",
+            "droppedCount": drop["dropped"] if finished else 0,
+        }
+
+
+def _multipart_fields(body: bytes, content_type: str) -> Dict[str, bytes]:
+    """Form fields of a ``multipart/form-data`` body, by name."""
+
+    message = BytesParser(policy=HTTP).parsebytes(b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body)
+    if not message.is_multipart():
+        raise _Reply(400, "Expected a multipart/form-data upload.")
+    fields: Dict[str, bytes] = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if name:
+            fields[name] = part.get_payload(decode=True) or b""
+    return fields
+
+
+class _Handler(BaseHTTPRequestHandler):
+    nifi: FakeNiFi
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY each keep-alive request stalls ~40 ms
+    disable_nagle_algorithm = True
+
+    def _serve(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        headers = {key.lower(): value for key, value in self.headers.items()}
+        status, payload = self.nifi.handle(self.command, self.path, body, headers)
+        if isinstance(payload, (dict, list)):
+            data = json.dumps(payload).encode("utf-8")
+            content_type = "application/json"
+        else:
+            data = str(payload if payload is not None else "").encode("utf-8")
+            content_type = "text/plain"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - signature from the base class
+        return
@@ -0,0 +1,88 @@
+"""Synthetic flow specifications for benchmarks and scale tests.
+
+:func:`synthetic_flow` builds a mapping in the same shape as the YAML flow files
+under ``flows/``. Processors are packed into leaf groups of ``chain`` processors,
+wired ``GenerateFlowFile -> UpdateAttribute ... -> LogAttribute``. The leaves are
+then nested ``depth`` levels below the root, ``fanout`` groups per level::
+
+    spec = load_flow_spec(write_synthetic_flow(tmp / "flow.yaml", 100, depth=3))
+"""
+
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import Any, Dict, List
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None  # type: ignore[assignment]
+
+GENERATE = "org.apache.nifi.processors.standard.GenerateFlowFile"
+UPDATE = "org.apache.nifi.processors.standard.UpdateAttribute"
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+ROOT_NAME = "NiFi Flow"
+
+
+def _leaf_group(index: int, size: int) -> Dict[str, Any]:
+    processors: List[Dict[str, Any]] = []
+    for position in range(size):
+        if position == 0:
+            kind, properties = GENERATE, {"Batch Size": "1"}
+        elif position == size - 1:
+            kind, properties = LOG, {}
+        else:
+            kind, properties = UPDATE, {"step": str(position)}
+        key = f"p{position}"
+        processors.append(
+            {
+                "id": key,
+                "name": f"{kind.rsplit('.', 1)[-1]} {position}",
+                "type": kind,
+                "properties": properties,
+            }
+        )
+    connections = [
+        {"source": f"p{position}", "destination": f"p{position + 1}", "relationships": ["success"]}
+        for position in range(size - 1)
+    ]
+    return {"name": f"leaf-{index:04d}", "processors": processors, "connections": connections}
+
+
+def _nest(groups: List[Dict[str, Any]], levels: int, fanout: int, prefix: str) -> List[Dict[str, Any]]:
+    if levels <= 0:
+        return groups
+    per_branch = math.ceil(len(groups) / fanout)
+    branches: List[Dict[str, Any]] = []
+    for index, start in enumerate(range(0, len(groups), per_branch)):
+        name = f"{prefix}{index}"
+        children = _nest(groups[start : start + per_branch], levels - 1, fanout, f"{name}.")
+        branches.append({"name": f"branch-{name}", "process_groups": children})
+    return branches
+
+
+def synthetic_flow(processors: int, *, depth: int = 1, fanout: int = 4, chain: int = 5) -> Dict[str, Any]:
+    """Return a flow mapping with ``processors`` processors, ``depth`` group levels below the root."""
+
+    if processors < 1:
+        raise ValueError("processors must be at least 1")
+    if depth < 1 or fanout < 1 or chain < 1:
+        raise ValueError("depth, fanout and chain must be at least 1")
+    sizes = [chain] * (processors // chain)
+    if processors % chain:
+        sizes.append(processors % chain)
+    leaves = [_leaf_group(index, size) for index, size in enumerate(sizes)]
+    return {"process_group": {"name": ROOT_NAME, "process_groups": _nest(leaves, depth - 1, fanout, "")}}
+
+
+def write_synthetic_flow(path: Path, processors: int, **options: Any) -> Path:
+    """Write :func:`synthetic_flow` as YAML to ``path`` and return the path."""
+
+    if yaml is None:
+        raise RuntimeError("PyYAML is required to write flow specifications")
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(yaml.safe_dump(synthetic_flow(processors, **options), sort_keys=False))
+    return target
@@ -0,0 +1,120 @@
+"""Owner-only on-disk cache of NiFi access tokens.
+
+Tokens are keyed by base URL and username and reused until shortly before the
+``exp`` claim of the JWT, so back-to-back CLI invocations skip the login round trip.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .config import AuthSettings
+
+TOKEN_FILE = "tokens.json"
+
+# Refresh this long before expiry, capped at a tenth of the token lifetime
+REFRESH_MARGIN_SECONDS = 300.0
+
+
+def _claims(token: str) -> Dict[str, Any]:
+    try:
+        payload = token.split(".")[1]
+        padded = payload + "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (IndexError, ValueError, UnicodeError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+def refresh_after(token: str) -> Optional[float]:
+    """Return the epoch time after which ``token`` should be replaced, or ``None`` if unknown."""
+
+    claims = _claims(token)
+    try:
+        expires = float(claims["exp"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    margin = REFRESH_MARGIN_SECONDS
+    try:
+        margin = min(margin, (expires - float(claims["iat"])) * 0.1)
+    except (KeyError, TypeError, ValueError):
+        pass
+    return expires - margin
+
+
+def _cache_key(settings: AuthSettings) -> str:
+    identity = f"{str(settings.base_url).rstrip('/')}|{settings.username}"
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """JSON file of tokens readable only by the current user."""
+
+    def __init__(self, path: Path):
+        self._path = Path(path)
+
+    @classmethod
+    def from_settings(cls, settings: AuthSettings) -> Optional["TokenCache"]:
+        if not settings.token_cache:
+            return None
+        return cls(settings.resolved_cache_dir() / TOKEN_FILE)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with self._path.open("r", encoding="utf-8") as fp:
+                data = json.load(fp)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            self._path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(f".{os.getpid()}.tmp")
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as fp:
+                json.dump(entries, fp)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self._path)
+        except OSError:
+            # Caching is an optimisation; an unwritable directory only costs a login
+            return
+
+    def get(self, settings: AuthSettings, *, now: Optional[float] = None) -> Optional[str]:
+        """Return a cached token for ``settings`` unless it is due for refresh."""
+
+        entry = self._load().get(_cache_key(settings)) or {}
+        token = entry.get("token")
+        if not token:
+            return None
+        deadline = refresh_after(token)
+        if deadline is not None and (now if now is not None else time.time()) >= deadline:
+            return None
+        return token
+
+    def put(self, settings: AuthSettings, token: str) -> None:
+        entries = self._load()
+        now = time.time()
+        # Drop entries whose tokens have expired for any server
+        entries = {
+            key: entry
+            for key, entry in entries.items()
+            if (refresh_after(entry.get("token", "")) or now + 1) > now
+        }
+        entries[_cache_key(settings)] = {"token": token}
+        self._save(entries)
+
+    def invalidate(self, settings: AuthSettings) -> None:
+        entries = self._load()
+        if entries.pop(_cache_key(settings), None) is not None:
+            self._save(entries)
@@ -0,0 +1,278 @@
+"""Compile flow specifications into NiFi's versioned flow format.
+
+A ``ProcessGroupSpec`` becomes a ``VersionedProcessGroup`` (processors, ports,
+connections and child groups). It is wrapped in a ``RegisteredFlowSnapshot``, the
+JSON that ``POST /process-groups/{id}/process-groups/upload`` accepts. One upload
+then creates a whole group tree. Component identifiers are derived from the spec
+path, so compiling the same spec twice yields the same document.
+
+Processor properties that hold a controller service id are listed under
+``externalControllerServices`` so NiFi can bind them to services outside the group.
+NiFi keeps only ``#{parameter}`` references for sensitive properties when it
+imports a snapshot, so literal sensitive values are left out and returned to the
+caller to set after the upload.
+"""
+
+from __future__ import annotations
+
+import re
+import uuid
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from .flow_builder import ConnectionSpec, FlowDeploymentError, PreparedProcessor, ProcessGroupSpec
+
+FLOW_ENCODING_VERSION = "1.0"
+_NAMESPACE = uuid.UUID("6f1b8e3c-2d4a-4c1e-9b7f-5a0d3c2e1f48")
+
+Prepare = Callable[[ProcessGroupSpec], List[PreparedProcessor]]
+BundleFor = Callable[[str], Dict[str, str]]
+# Group names below the uploaded group -> processor name -> sensitive property values
+SensitiveValues = Dict[Tuple[str, ...], Dict[str, Dict[str, str]]]
+
+_PARAMETER_REFERENCE = re.compile(r"#\{[^}]+\}")
+
+# ``ProcessorSpec.state`` -> versioned ``scheduledState``; anything else is a stopped, enabled processor
+_SCHEDULED_STATES = {"DISABLED": "DISABLED", "RUNNING": "RUNNING"}
+
+
+def versioned_id(*parts: str) -> str:
+    """Stable identifier for a component at ``parts`` (group path plus component key)."""
+
+    return str(uuid.uuid5(_NAMESPACE, "/".join(parts)))
+
+
+def _position(position: Optional[Tuple[float, float]]) -> Dict[str, float]:
+    x, y = position or (0.0, 0.0)
+    return {"x": float(x), "y": float(y)}
+
+
+def _processor(
+    prepared: PreparedProcessor,
+    identifier: str,
+    group_identifier: str,
+    bundle: Dict[str, str],
+    services: Mapping[str, str],
+    external: Dict[str, Dict[str, str]],
+    sensitive: Dict[str, str],
+) -> Dict[str, Any]:
+    spec = prepared.spec
+    descriptors = prepared.metadata.get("propertyDescriptors") or {}
+    properties: Dict[str, str] = {}
+    property_descriptors: Dict[str, Dict[str, Any]] = {}
+    for key, value in prepared.properties.items():
+        descriptor = descriptors.get(key) or {}
+        if descriptor.get("sensitive") and value and not _PARAMETER_REFERENCE.fullmatch(value):
+            sensitive[key] = value
+        else:
+            properties[key] = value
+        references_service = bool(descriptor.get("typeProvidedByValue")) or value in services
+        if references_service and value:
+            external[value] = {"identifier": value, "name": services.get(value, value)}
+        if references_service or descriptor.get("sensitive"):
+            property_descriptors[key] = {
+                "name": key,
+                "displayName": descriptor.get("displayName") or key,
+                "identifiesControllerService": references_service,
+                "sensitive": bool(descriptor.get("sensitive")),
+            }
+    return {
+        "identifier": identifier,
+        "groupIdentifier": group_identifier,
+        "componentType": "PROCESSOR",
+        "name": spec.name,
+        "comments": spec.comments or "",
+        "position": _position(spec.position),
+        "type": spec.type,
+        "bundle": {key: bundle.get(key) for key in ("group", "artifact", "version")},
+        "properties": properties,
+        "propertyDescriptors": property_descriptors,
+        "style": {},
+        "schedulingPeriod": spec.scheduling_period or "0 sec",
+        "schedulingStrategy": spec.scheduling_strategy or "TIMER_DRIVEN",
+        "executionNode": spec.execution_node or "ALL",
+        "penaltyDuration": spec.penalty_duration or "30 sec",
+        "yieldDuration": spec.yield_duration or "1 sec",
+        "bulletinLevel": "WARN",
+        "runDurationMillis": spec.run_duration_millis or 0,
+        "concurrentlySchedulableTaskCount": spec.concurrent_tasks or 1,
+        "autoTerminatedRelationships": sorted(prepared.auto_terminate),
+        "scheduledState": _SCHEDULED_STATES.get((spec.state or "").upper(), "ENABLED"),
+        "retryCount": 10,
+        "retriedRelationships": [],
+        "backoffMechanism": "PENALIZE_FLOWFILE",
+        "maxBackoffPeriod": "10 mins",
+    }
+
+
+def _port(port, identifier: str, group_identifier: str, port_type: str) -> Dict[str, Any]:
+    return {
+        "identifier": identifier,
+        "groupIdentifier": group_identifier,
+        "componentType": port_type,
+        "type": port_type,
+        "name": port.name,
+        "comments": port.comments or "",
+        "position": _position(port.position),
+        "concurrentlySchedulableTaskCount": 1,
+        "scheduledState": "ENABLED",
+        "allowRemoteAccess": bool(port.allow_remote),
+    }
+
+
+def _connection(
+    conn: ConnectionSpec,
+    identifier: str,
+    group_identifier: str,
+    source: Tuple[str, str, str],
+    destination: Tuple[str, str, str],
+) -> Dict[str, Any]:
+    source_id, source_type, source_group = source
+    destination_id, destination_type, destination_group = destination
+    return {
+        "identifier": identifier,
+        "groupIdentifier": group_identifier,
+        "componentType": "CONNECTION",
+        "name": conn.name,
+        "source": {"id": source_id, "type": source_type, "groupId": source_group, "name": conn.source},
+        "destination": {
+            "id": destination_id,
+            "type": destination_type,
+            "groupId": destination_group,
+            "name": conn.destination,
+        },
+        "labelIndex": 1,
+        "zIndex": 0,
+        # Only processors have selectable relationships; for ports NiFi rejects them.
+        "selectedRelationships": list(conn.relationships) if source_type == "PROCESSOR" else [],
+        "backPressureObjectThreshold": conn.back_pressure_object_threshold,
+        "backPressureDataSizeThreshold": conn.back_pressure_data_size_threshold,
+        "flowFileExpiration": conn.flowfile_expiration,
+        "prioritizers": list(conn.prioritizers),
+        "bends": [],
+        "loadBalanceStrategy": conn.load_balance_strategy,
+        "partitioningAttribute": conn.partitioning_attribute,
+        "loadBalanceCompression": conn.load_balance_compression,
+    }
+
+
+def _compile_group(
+    group: ProcessGroupSpec,
+    path: str,
+    names: Tuple[str, ...],
+    parent_identifier: Optional[str],
+    prepare: Prepare,
+    bundle_for: BundleFor,
+    services: Mapping[str, str],
+    external: Dict[str, Dict[str, str]],
+    sensitive: SensitiveValues,
+) -> Tuple[Dict[str, Any], Dict[str, Tuple[str, str, str]]]:
+    identifier = versioned_id(path)
+    # spec key -> (identifier, component type, group identifier); child entries override, as in FlowDeployer
+    components: Dict[str, Tuple[str, str, str]] = {}
+    prepared_processors = prepare(group)
+    input_ports = []
+    for port in group.input_ports:
+        port_id = versioned_id(path, "input-port", port.key)
+        input_ports.append(_port(port, port_id, identifier, "INPUT_PORT"))
+        components[port.key] = (port_id, "INPUT_PORT", identifier)
+    output_ports = []
+    for port in group.output_ports:
+        port_id = versioned_id(path, "output-port", port.key)
+        output_ports.append(_port(port, port_id, identifier, "OUTPUT_PORT"))
+        components[port.key] = (port_id, "OUTPUT_PORT", identifier)
+    processors = []
+    for prepared in prepared_processors:
+        proc_id = versioned_id(path, "processor", prepared.spec.key)
+        bundle = bundle_for(prepared.spec.type)
+        values: Dict[str, str] = {}
+        processors.append(_processor(prepared, proc_id, identifier, bundle, services, external, values))
+        if values:
+            sensitive.setdefault(names, {})[prepared.spec.name] = values
+        components[prepared.spec.key] = (proc_id, "PROCESSOR", identifier)
+
+    children = []
+    for index, child in enumerate(group.child_groups):
+        child_group, child_components = _compile_group(
+            child,
+            f"{path}/{index}:{child.name}",
+            (*names, child.name),
+            identifier,
+            prepare,
+            bundle_for,
+            services,
+            external,
+            sensitive,
+        )
+        children.append(child_group)
+        components.update(child_components)
+
+    connections = []
+    for index, conn in enumerate(group.connections):
+        ends = []
+        for key in (conn.source, conn.destination):
+            if key not in components:
+                raise FlowDeploymentError(f"Connection references unknown component '{key}'")
+            ends.append(components[key])
+        connections.append(_connection(conn, versioned_id(path, "connection", str(index)), identifier, ends[0], ends[1]))
+
+    versioned: Dict[str, Any] = {
+        "identifier": identifier,
+        "componentType": "PROCESS_GROUP",
+        "name": group.name,
+        "comments": group.comments or "",
+        "position": _position(group.position),
+        "processGroups": children,
+        "remoteProcessGroups": [],
+        "processors": processors,
+        "inputPorts": input_ports,
+        "outputPorts": output_ports,
+        "connections": connections,
+        "labels": [],
+        "funnels": [],
+        "controllerServices": [],
+        "defaultFlowFileExpiration": "0 sec",
+        "defaultBackPressureObjectThreshold": 10000,
+        "defaultBackPressureDataSizeThreshold": "1 GB",
+        "flowFileConcurrency": "UNBOUNDED",
+        "flowFileOutboundPolicy": "STREAM_WHEN_AVAILABLE",
+    }
+    if parent_identifier:
+        versioned["groupIdentifier"] = parent_identifier
+    return versioned, components
+
+
+def flow_snapshot(
+    group: ProcessGroupSpec,
+    *,
+    prepare: Prepare,
+    bundle_for: BundleFor,
+    controller_services: Optional[Mapping[str, str]] = None,
+    sensitive: Optional[SensitiveValues] = None,
+) -> Dict[str, Any]:
+    """Return the ``RegisteredFlowSnapshot`` document for uploading ``group`` as a new process group.
+
+    ``prepare`` returns the validated processors of a group (``FlowDeployer._prepare_group``),
+    ``bundle_for`` resolves a processor type to its bundle, and ``controller_services`` maps
+    service ids to names for the external service references. Literal values of sensitive
+    properties are left out of the snapshot and collected in ``sensitive``.
+    """
+
+    external: Dict[str, Dict[str, str]] = {}
+    contents, _ = _compile_group(
+        group,
+        group.name,
+        (),
+        None,
+        prepare,
+        bundle_for,
+        dict(controller_services or {}),
+        external,
+        sensitive if sensitive is not None else {},
+    )
+    return {
+        "flowContents": contents,
+        "externalControllerServices": external,
+        "parameterContexts": {},
+        "parameterProviders": {},
+        "flowEncodingVersion": FLOW_ENCODING_VERSION,
+    }
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+
+from nifi_automation.client import NiFiClient
+from nifi_automation.testing import FakeNiFi, FakeNiFiConfig
+
+
+@pytest.fixture()
+def fake_nifi(request: pytest.FixtureRequest) -> Iterator[FakeNiFi]:
+    """Running :class:`FakeNiFi`; configure with ``@pytest.mark.parametrize("fake_nifi", [FakeNiFiConfig(...)], indirect=True)``."""
+
+    config = getattr(request, "param", None) or FakeNiFiConfig()
+    with FakeNiFi(config) as server:
+        yield server
+
+
+@pytest.fixture()
+def fake_client(fake_nifi: FakeNiFi) -> Iterator[NiFiClient]:
+    """Logged-in :class:`NiFiClient` for ``fake_nifi``; use ``fake_nifi.client(**overrides)`` for other settings."""
+
+    with fake_nifi.client() as client:
+        yield client
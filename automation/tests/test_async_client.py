@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, List
+
+import httpx
+
+from nifi_automation.async_client import AsyncNiFiClient
+from nifi_automation.config import AuthSettings
+from nifi_automation.infra import status_adapter
+
+
+def _settings(**overrides: Any) -> AuthSettings:
+    return AuthSettings(
+        base_url="https://nifi.test/nifi-api",
+        username="user",
+        password="pass",
+        verify_ssl=False,
+        timeout=5.0,
+        catalog_cache=False,
+        **overrides,
+    )
+
+
+def _flow(name: str, children: List[str], processors: List[Dict[str, Any]] | None = None) -> Dict[str, Any]:
+    return {
+        "processGroupFlow": {
+            "breadcrumb": {"breadcrumb": {"name": name}},
+            "flow": {
+                "processGroups": [{"component": {"id": child, "name": child.upper()}} for child in children],
+                "processors": processors or [],
+            },
+        }
+    }
+
+
+def _client_with(handler, **kwargs: Any) -> AsyncNiFiClient:
+    client = AsyncNiFiClient(_settings(), "tok", **kwargs)
+    client._client = httpx.AsyncClient(
+        base_url="https://nifi.test/nifi-api",
+        transport=httpx.MockTransport(handler),
+    )
+    return client
+
+
+def test_fan_out_respects_max_in_flight() -> None:
+    active = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200, json={"revision": {"version": 1}, "component": {"id": request.url.path}})
+
+    async def scenario() -> List[Dict[str, Any]]:
+        async with _client_with(handler, max_in_flight=3) as client:
+            return await client.map(client.get_process_group, [f"pg-{i}" for i in range(12)])
+
+    results = asyncio.run(scenario())
+    assert len(results) == 12
+    assert peak == 3
+
+
+def test_walk_process_groups_feeds_status_adapter() -> None:
+    flows = {
+        "root": _flow("NiFi Flow", ["a", "b"]),
+        "a": _flow("A", ["c"], processors=[{"component": {"id": "p1", "name": "P1", "state": "RUNNING"}}]),
+        "b": _flow("B", []),
+        "c": _flow("C", [], processors=[{"component": {"id": "p2", "name": "P2", "state": "STOPPED"}}]),
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        pg_id = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json=flows[pg_id])
+
+    async def scenario() -> Dict[str, Any]:
+        async with _client_with(handler) as client:
+            return await status_adapter.fetch_processors_async(client)
+
+    items = asyncio.run(scenario())["items"]
+    assert {item["id"]: item["path"] for item in items} == {"p1": "NiFi Flow/A", "p2": "NiFi Flow/A/C"}
+
+
+def test_create_processor_resolves_bundle_once_for_concurrent_calls() -> None:
+    calls: Dict[str, int] = {}
+    bodies: List[Dict[str, Any]] = []
+    bundle = {"group": "org.apache.nifi", "artifact": "nifi-standard-nar", "version": "2.0.0"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls[request.url.path] = calls.get(request.url.path, 0) + 1
+        if request.url.path.endswith("/flow/processor-types"):
+            return httpx.Response(200, json={"processorTypes": [{"type": "org.example.Gen", "bundle": bundle}]})
+        body = json.loads(request.content)
+        bodies.append(body)
+        return httpx.Response(201, json={"component": {"id": body["component"]["name"]}})
+
+    async def scenario() -> List[Dict[str, Any]]:
+        async with _client_with(handler) as client:
+            return await client.gather(
+                *(client.create_processor("root", f"p{i}", "org.example.Gen", (0.0, float(i))) for i in range(5))
+            )
+
+    created = asyncio.run(scenario())
+    assert [item["id"] for item in created] == [f"p{i}" for i in range(5)]
+    assert calls["/nifi-api/flow/processor-types"] == 1
+    assert all(body["component"]["bundle"] == bundle for body in bodies)
+    assert bodies[0]["component"]["config"]["schedulingStrategy"] == "TIMER_DRIVEN"
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import types
+from pathlib import Path
+
+from nifi_automation.flow_builder import load_flow_spec
+from nifi_automation.testing import synthetic_flow, write_synthetic_flow
+
+
+def _load_script_module() -> types.ModuleType:
+    script_path = Path(__file__).resolve().parents[1] / "scripts" / "benchmark_flows.py"
+    spec = importlib.util.spec_from_file_location("benchmark_flows", str(script_path))
+    assert spec and spec.loader
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)  # type: ignore[arg-type]
+    return mod
+
+
+def _depth(group, level: int = 0) -> int:
+    return max([_depth(child, level + 1) for child in group.child_groups], default=level)
+
+
+def test_synthetic_flow_has_requested_size_and_depth(tmp_path: Path) -> None:
+    spec = load_flow_spec(write_synthetic_flow(tmp_path / "flow.yaml", 23, depth=3, fanout=2, chain=5))
+
+    def count(group) -> int:
+        return len(group.processors) + sum(count(child) for child in group.child_groups)
+
+    assert count(spec.root_group) == 23
+    assert _depth(spec.root_group) == 3
+    leaf = synthetic_flow(3)["process_group"]["process_groups"][0]
+    assert [conn["destination"] for conn in leaf["connections"]] == ["p1", "p2"]
+
+
+def test_benchmark_runs_every_stage_and_writes_json(tmp_path: Path) -> None:
+    bench = _load_script_module()
+    output = tmp_path / "bench.json"
+    bench.main(["--sizes", "10", "--latency", "0", "--output", str(output)])
+
+    document = json.loads(output.read_text())
+    (run,) = document["runs"]
+    assert run["processors"] == 10 and run["depth"] == 1
+    assert list(run["stages"]) == list(bench.STAGES)
+    assert run["stages"]["deploy"]["requests"] > 0
+    assert run["stages"]["purge"]["requests"] > 0
+    assert run["requests"] == sum(stage["requests"] for stage in run["stages"].values())
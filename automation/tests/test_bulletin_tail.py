@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from click.testing import CliRunner
+
+from nifi_automation.app import bulletin_service
+from nifi_automation.app.models import AppConfig, CommandResult
+from nifi_automation.bulletin_tail import BulletinCursor, dedupe, tail_bulletins
+from nifi_automation.cli.main import DISPATCH_TABLE, app
+from nifi_automation.testing import FakeNiFi
+
+
+def test_tail_reads_once_and_counts_what_it_could_not_reach(fake_nifi: FakeNiFi) -> None:
+    for index in range(7):
+        fake_nifi.add_bulletin(f"failed FlowFile[id={index}]", source_id="proc-1")
+    with fake_nifi.client() as client:
+        fake_nifi.reset_requests()
+        first = tail_bulletins(client, after=None, limit=5)
+        assert [row["id"] for row in first.items] == [3, 4, 5, 6, 7] and first.skipped == 0
+
+        fake_nifi.add_bulletin("another")
+        caught_up = tail_bulletins(client, after=first.cursor, limit=5)
+        assert [row["id"] for row in caught_up.items] == [8] and caught_up.skipped == 0
+
+        for index in range(12):
+            fake_nifi.add_bulletin(f"burst {index}")
+        # The board answers with the newest rows; the older ids are reported, not dropped silently
+        burst = tail_bulletins(client, after=caught_up.cursor, limit=5)
+        assert [row["id"] for row in burst.items] == [16, 17, 18, 19, 20] and burst.skipped == 7
+        assert tail_bulletins(client, after=burst.cursor).items == []
+    assert fake_nifi.request_count("GET", r"/flow/bulletin-board$") == 4
+
+
+def test_dedupe_groups_by_source_and_masked_message() -> None:
+    rows = [
+        {"id": 1, "level": "ERROR", "sourceId": "a", "message": "failed FlowFile[id=12]", "timestamp": "t1"},
+        {"id": 2, "level": "ERROR", "sourceId": "b", "message": "failed FlowFile[id=13]", "timestamp": "t2"},
+        {"id": 3, "level": "ERROR", "sourceId": "a", "message": "failed FlowFile[id=14]", "timestamp": "t3"},
+    ]
+    groups = dedupe(rows)
+    assert [(group["sourceId"], group["count"], group["firstId"], group["lastId"]) for group in groups] == [
+        ("a", 2, 1, 3),
+        ("b", 1, 2, 2),
+    ]
+    assert groups[0]["message"] == "failed FlowFile[id=14]" and groups[0]["lastTimestamp"] == "t3"
+
+
+def test_tail_resumes_from_the_stored_cursor(
+    fake_nifi: FakeNiFi, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fake_nifi.add_bulletin("old noise", level="INFO")
+    with fake_nifi.client(bulletin_cursor=True, cache_dir=tmp_path) as client:
+
+        @contextmanager
+        def open_client(config):
+            yield client
+
+        monkeypatch.setattr(bulletin_service, "open_client", open_client)
+        config = AppConfig(None, None, None, None, 30.0, "json", False, bulletin_severity="WARN")
+        first = bulletin_service.tail(config=config, emit=lambda event: None)
+        for _ in range(3):
+            fake_nifi.add_bulletin("disk full on /data/7", source_id="proc-1")
+        fake_nifi.add_bulletin("slow", level="WARNING", source_id="proc-2")
+        second = bulletin_service.tail(config=config, emit=lambda event: None)
+        third = bulletin_service.tail(config=config, emit=lambda event: None)
+        fake_nifi.add_bulletin("disk full on /data/9", source_id="proc-1")
+        followed: List[Dict[str, Any]] = []
+        follow = AppConfig(None, None, None, None, 30.0, "json", False, run_duration=0.0, bulletin_follow=True)
+        bulletin_service.tail(config=follow, emit=followed.append)
+        stored = BulletinCursor.from_settings(client.settings).get(client.settings)
+
+    assert first.message == "No new bulletins" and first.data["cursor"] == 1
+    assert second.data["after"] == 1 and second.data["total"] == 4
+    assert [(group["level"], group["count"]) for group in second.data["groups"]] == [("ERROR", 3), ("WARNING", 1)]
+    assert third.data["total"] == 0
+    assert [(event["event"], event.get("count")) for event in followed] == [("bulletin", 1), ("end", None)]
+    assert followed[-1]["cursor"] == stored == 6
+
+
+def test_tail_command_follows_as_ndjson() -> None:
+    key = ("tail", "bulletins")
+    captured: Dict[str, Any] = {}
+    events: List[Dict[str, Any]] = [{"event": "bulletin", "count": 2}, {"event": "end", "polls": 1}]
+
+    def handler(*, config, emit):
+        captured["config"] = config
+        for event in events:
+            emit(event)
+        return CommandResult(message="done")
+
+    original = DISPATCH_TABLE[key]
+    DISPATCH_TABLE[key] = handler
+    try:
+        result = CliRunner().invoke(app, ["tail", "bulletins", "--follow", "--severity", "warn", "--interval", "5"])
+        rejected = CliRunner().invoke(app, ["tail", "bulletins", "--interval", "5"])
+    finally:
+        DISPATCH_TABLE[key] = original
+
+    assert result.exit_code == 0
+    assert [json.loads(line) for line in result.stdout.splitlines()] == events
+    config = captured["config"]
+    assert (config.bulletin_follow, config.bulletin_severity, config.watch_interval) == (True, "WARN", 5.0)
+    assert rejected.exit_code != 0
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from nifi_automation.client import NiFiClient
+from nifi_automation.config import AuthSettings
+
+BUNDLE = {"group": "org.apache.nifi", "artifact": "nifi-standard-nar", "version": "2.0.0"}
+
+
+def _client(cache_dir: Path, calls: List[str], server: Dict[str, Any]) -> NiFiClient:
+    settings = AuthSettings(
+        base_url="https://nifi.test/nifi-api",
+        username="user",
+        password="pass",
+        verify_ssl=False,
+        cache_dir=cache_dir,
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/nifi-api")
+        calls.append(path)
+        if path == "/flow/about":
+            return httpx.Response(200, json={"about": {"version": server["version"]}})
+        if path == "/flow/processor-types":
+            return httpx.Response(200, json={"processorTypes": [{"type": t, "bundle": BUNDLE} for t in server["types"]]})
+        if path.startswith("/flow/processor-definition/"):
+            return httpx.Response(200, json={"type": path.rsplit("/", 1)[-1], "propertyDescriptors": {}})
+        raise AssertionError(f"unexpected request {path}")
+
+    client = NiFiClient(settings, "tok")
+    client._client = httpx.Client(base_url="https://nifi.test/nifi-api", transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_second_process_makes_no_catalog_requests(tmp_path: Path) -> None:
+    server = {"version": "2.0.0", "types": ["org.example.Gen"]}
+    first: List[str] = []
+    with _client(tmp_path, first, server) as client:
+        client.get_processor_metadata("org.example.Gen")
+    assert first == [
+        "/flow/about",
+        "/flow/processor-types",
+        "/flow/processor-definition/org.apache.nifi/nifi-standard-nar/2.0.0/org.example.Gen",
+    ]
+
+    second: List[str] = []
+    with _client(tmp_path, second, server) as client:
+        assert client.get_processor_metadata("org.example.Gen")["type"] == "org.example.Gen"
+    assert second == ["/flow/about"]
+
+
+def test_server_upgrade_invalidates_entries(tmp_path: Path) -> None:
+    server = {"version": "2.0.0", "types": ["org.example.Gen"]}
+    with _client(tmp_path, [], server) as client:
+        client.get_processor_metadata("org.example.Gen")
+
+    server["version"] = "2.1.0"
+    calls: List[str] = []
+    with _client(tmp_path, calls, server) as client:
+        client.get_processor_metadata("org.example.Gen")
+    assert "/flow/processor-types" in calls
+    versions = [p.name for p in next((tmp_path / "catalog").iterdir()).iterdir()]
+    assert versions == ["2.1.0"]
+
+
+def test_unknown_type_refreshes_cached_listing(tmp_path: Path) -> None:
+    server = {"version": "2.0.0", "types": ["org.example.Gen"]}
+    with _client(tmp_path, [], server) as client:
+        client._resolve_bundle("org.example.Gen")
+
+    server["types"].append("org.example.Added")
+    calls: List[str] = []
+    with _client(tmp_path, calls, server) as client:
+        assert client._resolve_bundle("org.example.Added") == BUNDLE
+    assert calls == ["/flow/about", "/flow/processor-types"]
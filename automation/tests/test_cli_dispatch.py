@@ -72,6 +72,38 @@ def test_dry_run_rejected_for_status() -> None:
     assert "dry-run" in result.stderr.lower()
 
 
+def test_stray_operand_rejected_for_status() -> None:
+    key = ("status", "flow")
+    original = _patch_dispatch(key, lambda *, config: CommandResult(status_token="UP"))
+    try:
+        result = runner.invoke(app, ["status", "flow", "extra-arg"])
+    finally:
+        DISPATCH_TABLE[key] = original
+
+    assert result.exit_code != 0
+    assert "unexpected positional argument" in result.stderr.lower()
+
+
+def test_incremental_rejected_for_status() -> None:
+    result = runner.invoke(app, ["status", "flow", "--incremental"])
+    assert result.exit_code != 0
+    assert "--incremental" in result.stderr
+
+
+def test_resume_rejected_outside_deploy_and_with_incremental(tmp_path: Path) -> None:
+    flow_spec = tmp_path / "NiFi_Flow.yaml"
+    flow_spec.write_text("name: test")
+
+    outside = runner.invoke(app, ["status", "flow", "--resume"])
+    combined = runner.invoke(app, ["deploy", "flow", str(flow_spec), "--resume", "--incremental"])
+    stray = runner.invoke(app, ["status", "flow", "extra-arg", "--resume"])
+
+    assert outside.exit_code != 0 and "--resume is only supported" in outside.stderr
+    assert combined.exit_code != 0 and "cannot be combined" in combined.stderr
+    # The operand check runs before the --resume checks
+    assert stray.exit_code != 0 and "unexpected positional argument" in stray.stderr.lower()
+
+
 def test_truncate_connections_supports_flags() -> None:
     captured: Dict[str, Any] = {}
 
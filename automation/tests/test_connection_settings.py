@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+
+import pytest
+import yaml
+
+from nifi_automation import flow_builder
+from nifi_automation.flow_builder import FlowDeployer, FlowDeploymentError, load_flow_spec
+from nifi_automation.flow_diff import IncrementalDeployer
+from nifi_automation.testing import FakeNiFi, synthetic_flow
+
+GENERATE = "org.apache.nifi.processors.standard.GenerateFlowFile"
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+def _write(path: Path, flow: dict) -> Path:
+    path.write_text(yaml.safe_dump(flow, sort_keys=False))
+    return path
+
+
+def _flow(connection: dict, *, nested: bool = False) -> dict:
+    leaf = {
+        "name": "Leaf",
+        "processors": [
+            {"id": "gen", "name": "Gen", "type": GENERATE, "properties": {}},
+            {"id": "log", "name": "Log", "type": LOG, "properties": {}},
+        ],
+        "connections": [{"source": "gen", "destination": "log", **connection}],
+    }
+    group = {"name": "High Volume", "process_groups": [leaf]} if nested else {**leaf, "name": "High Volume"}
+    return {"process_group": {"name": "NiFi Flow", "process_groups": [group]}}
+
+
+@pytest.fixture
+def flow_defaults(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    def write(defaults: dict) -> None:
+        path = _write(tmp_path / "flow-defaults.yaml", {"connection_defaults": defaults})
+        monkeypatch.setattr(flow_builder, "FLOW_DEFAULTS_PATH", path)
+        monkeypatch.setattr(flow_builder, "_connection_defaults", None)
+
+    return write
+
+
+def _connection(spec_path: Path):
+    group = load_flow_spec(spec_path).root_group.child_groups[0]
+    return (group.child_groups[0] if group.child_groups else group).connections[0]
+
+
+def test_settings_resolve_item_over_group_over_global(tmp_path: Path, flow_defaults) -> None:
+    flow_defaults(
+        {
+            "flowfile_expiration": "1 hour",
+            "prioritizers": ["FirstInFirstOutPrioritizer"],
+            "groups": {"High Volume": {"back_pressure_object_threshold": 100000, "load_balance_strategy": "round_robin"}},
+        }
+    )
+    conn = _connection(_write(tmp_path / "flow.yaml", _flow({"backPressureDataSizeThreshold": "10 GB"}, nested=True)))
+    assert conn.back_pressure_object_threshold == 100000
+    assert conn.back_pressure_data_size_threshold == "10 GB"
+    assert conn.flowfile_expiration == "1 hour"
+    assert conn.load_balance_strategy == "ROUND_ROBIN"
+    assert conn.prioritizers == ["org.apache.nifi.prioritizer.FirstInFirstOutPrioritizer"]
+
+    conn = _connection(_write(tmp_path / "plain.yaml", _flow({}, nested=False)))
+    assert conn.back_pressure_object_threshold == 100000
+
+    flow_defaults({})
+    conn = _connection(_write(tmp_path / "plain.yaml", _flow({})))
+    assert conn.queue_settings()["backPressureObjectThreshold"] == 10000
+    assert conn.queue_settings()["loadBalanceStrategy"] == "DO_NOT_LOAD_BALANCE"
+
+
+@pytest.mark.parametrize(
+    "settings, message",
+    [
+        ({"back_pressure_object_threshold": -1}, "non-negative integer"),
+        ({"back_pressure_object_threshold": "many"}, "non-negative integer"),
+        ({"back_pressure_data_size_threshold": "1 GiB"}, "not a data size"),
+        ({"flowfile_expiration": "soon"}, "not a time period"),
+        ({"load_balance_strategy": "EVERYWHERE"}, "load_balance_strategy must be one of"),
+        ({"load_balance_compression": "ZIP"}, "load_balance_compression must be one of"),
+        ({"load_balance_strategy": "PARTITION_BY_ATTRIBUTE"}, "requires partitioning_attribute"),
+        ({"prioritizers": "FirstInFirstOutPrioritizer"}, "prioritizers must be a list"),
+    ],
+)
+def test_invalid_settings_name_the_connection(tmp_path: Path, flow_defaults, settings: dict, message: str) -> None:
+    flow_defaults({})
+    with pytest.raises(FlowDeploymentError, match=message) as excinfo:
+        load_flow_spec(_write(tmp_path / "flow.yaml", _flow({"name": "hot path", **settings})))
+    assert "Connection 'hot path' in group 'High Volume'" in str(excinfo.value)
+
+
+@pytest.mark.parametrize("upload", [True, False])
+def test_settings_reach_nifi_and_incremental_deploys_update_them(
+    fake_nifi: FakeNiFi, tmp_path: Path, upload: bool
+) -> None:
+    flow = synthetic_flow(10)
+    first = flow["process_group"]["process_groups"][0]["connections"][0]
+    first.update(
+        {
+            "back_pressure_object_threshold": 50000,
+            "load_balance_strategy": "PARTITION_BY_ATTRIBUTE",
+            "partitioning_attribute": "customer",
+            "prioritizers": ["OldestFlowFileFirstPrioritizer"],
+        }
+    )
+    with fake_nifi.client() as client:
+        FlowDeployer(client, load_flow_spec(_write(tmp_path / "flow.yaml", flow)), upload=upload).deploy()
+        live = {item["component"]["backPressureObjectThreshold"]: item["component"] for item in fake_nifi.components("connection")}
+        assert live[50000]["loadBalanceStrategy"] == "PARTITION_BY_ATTRIBUTE"
+        assert live[50000]["loadBalancePartitionAttribute"] == "customer"
+        assert live[50000]["prioritizers"] == ["org.apache.nifi.prioritizer.OldestFlowFileFirstPrioritizer"]
+        assert not IncrementalDeployer(client, load_flow_spec(tmp_path / "flow.yaml")).diff()
+
+        edited = copy.deepcopy(flow)
+        edited["process_group"]["process_groups"][0]["connections"][0]["back_pressure_object_threshold"] = 75000
+        deployer = IncrementalDeployer(client, load_flow_spec(_write(tmp_path / "edited.yaml", edited)))
+        diff = deployer.diff()
+        assert diff.counts() == {"add": 0, "remove": 0, "update": 1}
+        assert diff.changes[0].fields == {"backPressureObjectThreshold": {"from": 50000, "to": 75000}}
+        deployer.apply(diff)
+    assert 75000 in {item["component"]["backPressureObjectThreshold"] for item in fake_nifi.components("connection")}
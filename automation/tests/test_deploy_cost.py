@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from nifi_automation.deploy_cost import estimate_deploy
+from nifi_automation.flow_builder import FlowDeployer, load_flow_spec
+from nifi_automation.infra import deploy_adapter, status_adapter
+from nifi_automation.testing import FakeNiFi, FakeNiFiConfig, write_synthetic_flow
+
+
+def _measured(nifi: FakeNiFi, flow: Path, upload: bool) -> dict:
+    counts = {}
+    with nifi.client() as client:
+        deployer = FlowDeployer(client, load_flow_spec(flow), upload=upload)
+        for name, step in (
+            ("prepare", deployer.compile),
+            ("labels", lambda: deployer._create_group_labels("root", deployer.spec.root_group)),
+            ("validate", lambda: (status_adapter.capture_snapshot(client), status_adapter.fetch_controllers(client))),
+        ):
+            before = len(nifi.requests)
+            graph = step()
+            if name == "prepare":
+                counts[name] = len(nifi.requests) - before
+                before = len(nifi.requests)
+                graph.run(max_workers=4)
+                name = "create"
+            counts[name] = len(nifi.requests) - before
+    return counts
+
+
+@pytest.mark.parametrize("upload", [True, False])
+def test_predicted_requests_match_a_deploy(tmp_path: Path, upload: bool) -> None:
+    flow = write_synthetic_flow(tmp_path / "flow.yaml", 30, depth=2, fanout=2)
+    with FakeNiFi() as planned, planned.client() as client:
+        report = estimate_deploy(client, load_flow_spec(flow), latency=0.01)
+        assert planned.request_count("POST", r"^/(?!access)") == 0
+    estimate = report.estimates[0 if upload else 1]
+    predicted = {name: phase["requests"] for name, phase in estimate.as_dict()["phases"].items()}
+
+    with FakeNiFi() as nifi:
+        measured = _measured(nifi, flow, upload)
+
+    assert {name: predicted[name] for name in measured} == measured
+    assert predicted["autoterminate"] == 0
+
+
+@pytest.mark.parametrize(
+    "fake_nifi",
+    [FakeNiFiConfig(latency_for=lambda method, path: 0.05 if path == "/flow/about" else None)],
+    indirect=True,
+)
+def test_dry_run_reports_cost_and_ranks_strategies(fake_nifi: FakeNiFi, tmp_path: Path) -> None:
+    flow = write_synthetic_flow(tmp_path / "flow.yaml", 40, depth=2, fanout=2)
+    with fake_nifi.client() as client:
+        summary = deploy_adapter.deploy_flow(client, flow, dry_run=True, start=True)["summary"]
+
+    cost = summary["cost"]
+    assert cost["latency_ms"] >= 50
+    assert set(cost["phases"]) == {"prepare", "create", "autoterminate", "state", "labels", "validate", "start"}
+    assert cost["phases"]["start"]["exact"] is False
+    upload, concurrent, sequential = cost["strategies"]
+    assert (upload["strategy"], sequential["max_workers"]) == ("upload", 1)
+    assert upload["requests"] < concurrent["requests"] == sequential["requests"]
+    assert upload["seconds"] < concurrent["seconds"] < sequential["seconds"]
+    assert fake_nifi.request_count("POST", r"^/(?!access)") == 0
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import itertools
+from pathlib import Path
+
+import httpx
+import pytest
+
+from nifi_automation.deploy_journal import DeployJournal
+from nifi_automation.flow_builder import FlowDeployer, FlowDeploymentError, load_flow_spec
+from nifi_automation.spec_cache import spec_digest
+from nifi_automation.testing import FakeNiFi, FakeNiFiConfig, write_synthetic_flow
+
+PROCESSOR_POST = r"^/process-groups/[^/]+/processors$"
+
+
+def _fail_processors_after(limit: int):
+    created = itertools.count()
+    state = {"failing": True}
+
+    def fault(method: str, path: str):
+        if state["failing"] and method == "POST" and path.endswith("/processors") and next(created) >= limit:
+            return 503
+        return None
+
+    return fault, state
+
+
+def _interrupted_deploy(tmp_path: Path, limit: int):
+    flow = write_synthetic_flow(tmp_path / "flow.yaml", 40, depth=2, fanout=2)
+    journal = DeployJournal(tmp_path / "journal.jsonl", spec_digest=spec_digest(flow))
+    fault, state = _fail_processors_after(limit)
+    nifi = FakeNiFi(FakeNiFiConfig(fault_for=fault))
+    nifi.start()
+    with nifi.client() as client, pytest.raises(httpx.HTTPStatusError):
+        FlowDeployer(client, load_flow_spec(flow), max_workers=4, upload=False, journal=journal).deploy()
+    state["failing"] = False
+    return nifi, flow, journal
+
+
+def _resume(nifi: FakeNiFi, flow: Path, journal: DeployJournal) -> FlowDeployer:
+    with nifi.client() as client:
+        deployer = FlowDeployer(client, load_flow_spec(flow), max_workers=4, upload=False, journal=journal, resume=True)
+        deployer.deploy()
+    return deployer
+
+
+def test_resume_only_runs_the_remaining_operations(tmp_path: Path) -> None:
+    nifi, flow, journal = _interrupted_deploy(tmp_path, limit=25)
+    try:
+        assert len(nifi.components("processor")) == 25
+        before = nifi.request_count("POST", PROCESSOR_POST)
+
+        deployer = _resume(nifi, flow, journal)
+
+        assert nifi.request_count("POST", PROCESSOR_POST) - before == 15
+        assert len(nifi.components("processor")) == 40
+        assert deployer.skipped >= 25
+        assert not journal.exists()
+    finally:
+        nifi.stop()
+
+
+def test_resume_adopts_components_missing_from_the_journal(tmp_path: Path) -> None:
+    nifi, flow, journal = _interrupted_deploy(tmp_path, limit=25)
+    try:
+        # As if the responses for the last operations never arrived
+        lines = journal.path.read_text(encoding="utf-8").splitlines()
+        journal.path.write_text("\n".join(lines[:-10]) + "\n", encoding="utf-8")
+        connections = len(nifi.components("connection"))
+        groups = len(nifi.components("processGroup"))
+
+        _resume(nifi, flow, journal)
+
+        assert len(nifi.components("processor")) == 40
+        assert len(nifi.components("processGroup")) >= groups
+        assert len(nifi.components("connection")) >= connections
+        with FakeNiFi() as clean, clean.client() as client:
+            FlowDeployer(client, load_flow_spec(flow), upload=False).deploy()
+            assert len(nifi.components("connection")) == len(clean.components("connection"))
+            assert len(nifi.components("processGroup")) == len(clean.components("processGroup"))
+    finally:
+        nifi.stop()
+
+
+def test_resume_refuses_a_journal_for_another_spec(tmp_path: Path) -> None:
+    nifi, flow, journal = _interrupted_deploy(tmp_path, limit=5)
+    try:
+        flow.write_text(flow.read_text(encoding="utf-8") + "\n# edited\n", encoding="utf-8")
+        edited = DeployJournal(journal.path, spec_digest=spec_digest(flow))
+        with pytest.raises(FlowDeploymentError, match="different flow specification"):
+            _resume(nifi, flow, edited)
+    finally:
+        nifi.stop()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+import yaml
+
+from nifi_automation import cleanup
+from nifi_automation.client import NiFiClient
+from nifi_automation.flow_builder import FlowDeployer, FlowDeploymentError, deploy_flow_from_file, load_flow_spec
+from nifi_automation.infra import status_adapter
+from nifi_automation.testing import FakeNiFi, FakeNiFiConfig, synthetic_flow, write_synthetic_flow
+
+SAMPLE = Path(__file__).parent / "data" / "NiFi_Flow_sample.yaml"
+
+
+def test_deploy_and_status_round_trip(fake_client: NiFiClient) -> None:
+    deploy_flow_from_file(fake_client, SAMPLE)
+    items = status_adapter.fetch_processors(fake_client, snapshot=status_adapter.capture_status(fake_client))["items"]
+    assert [(item["name"], item["path"], item["state"]) for item in items] == [
+        ("GenerateFlowFile", "NiFi Flow/TrivialFlow", "STOPPED")
+    ]
+
+
+@pytest.mark.parametrize(
+    "fake_nifi",
+    [FakeNiFiConfig(conflict_rate=0.3, transition_seconds=0.02, drop_seconds=0.02, seed=7)],
+    indirect=True,
+)
+def test_purge_survives_conflicts_and_transitions(fake_nifi: FakeNiFi) -> None:
+    fake_nifi.seed_flow(groups=3, processors_per_group=4, services=2, queued=10)
+    with fake_nifi.client() as client:
+        client.schedule_process_group("root", "RUNNING")
+        for service in fake_nifi.components("controllerService"):
+            client.enable_controller_service(service["id"])
+        cleanup.stop_root_processors(client)
+        cleanup.disable_root_controller_services(client)
+        cleanup.purge_root_process_group(client)
+    assert fake_nifi.components("processor") == []
+    assert fake_nifi.components("connection") == []
+    assert fake_nifi.request_count(pattern="drop-requests") > 0
+    assert any(status == 409 for _, _, status in fake_nifi.requests)
+
+
+def test_stale_revision_and_auth_are_enforced(fake_nifi: FakeNiFi) -> None:
+    (group,) = fake_nifi.seed_flow(groups=1, processors_per_group=1)
+    (processor,) = fake_nifi.components("processor")
+    with httpx.Client(base_url=fake_nifi.base_url) as raw:
+        assert raw.get("/flow/process-groups/root").status_code == 401
+        headers = {"Authorization": f"Bearer {fake_nifi.token}"}
+        stale = raw.put(
+            f"/processors/{processor['id']}/run-status",
+            json={"revision": {"version": 0}, "state": "RUNNING"},
+            headers=headers,
+        )
+        # Like NiFi's InvalidRevisionExceptionMapper: 400, not 409
+        assert stale.status_code == 400 and "is not the most up-to-date revision" in stale.text
+        flow = raw.get(f"/flow/process-groups/{group}", headers=headers).json()
+        assert flow["processGroupFlow"]["flow"]["processors"][0]["component"]["state"] == "STOPPED"
+
+        # The client that made the last change may send an older version (NiFi's Revision.equals)
+        version = raw.get(f"/processors/{processor['id']}", headers=headers).json()["revision"]["version"]
+        url = f"/processors/{processor['id']}/run-status"
+        mine = {"version": version, "clientId": "session-a"}
+        assert raw.put(url, json={"revision": mine, "state": "RUNNING"}, headers=headers).status_code == 200
+        again = raw.put(url, json={"revision": mine, "state": "STOPPED"}, headers=headers)
+        other = raw.put(url, json={"revision": {**mine, "clientId": "session-b"}, "state": "RUNNING"}, headers=headers)
+    assert again.status_code == 200
+    assert other.status_code == 400
+
+
+def _topology(nifi: FakeNiFi) -> set:
+    names = {item["id"]: item["component"].get("name") for item in nifi.components("processor")}
+    return {
+        (names[conn["component"]["source"]["id"]], names[conn["component"]["destination"]["id"]])
+        for conn in nifi.components("connection")
+    } | {("processors", len(names)), ("groups", len(nifi.components("processGroup")))}
+
+
+def test_concurrent_deploy_matches_sequential(tmp_path: Path) -> None:
+    flow = write_synthetic_flow(tmp_path / "flow.yaml", 40, depth=3, fanout=2)
+    topologies = []
+    for workers in (1, 8):
+        with FakeNiFi() as nifi, nifi.client() as client:
+            deployer = FlowDeployer(client, load_flow_spec(flow), max_workers=workers, upload=False)
+            assert len(deployer.compile()) > 40
+            deployer.deploy()
+            topologies.append(_topology(nifi))
+    assert topologies[0] == topologies[1]
+    assert ("processors", 40) in topologies[0]
+
+
+def test_spec_errors_surface_before_any_component_is_created(fake_nifi: FakeNiFi, tmp_path: Path) -> None:
+    flow = synthetic_flow(10)
+    flow["process_group"]["process_groups"][1]["connections"][0]["relationships"] = ["no-such-relationship"]
+    path = tmp_path / "flow.yaml"
+    path.write_text(yaml.safe_dump(flow))
+    with fake_nifi.client() as client:
+        with pytest.raises(FlowDeploymentError, match="unknown relationship"):
+            FlowDeployer(client, load_flow_spec(path), max_workers=4).deploy()
+    assert [group["id"] for group in fake_nifi.components("processGroup")] == ["root"]
+
+
+def test_processors_are_created_fully_configured_in_one_request(fake_nifi: FakeNiFi, tmp_path: Path) -> None:
+    flow = synthetic_flow(5, chain=5)
+    processor = flow["process_group"]["process_groups"][0]["processors"][-1]
+    processor.update({"comments": "sink", "concurrent_tasks": 3, "state": "DISABLED"})
+    path = tmp_path / "flow.yaml"
+    path.write_text(yaml.safe_dump(flow))
+    with fake_nifi.client() as client:
+        FlowDeployer(client, load_flow_spec(path), upload=False).deploy()
+    assert fake_nifi.request_count("POST", r"/processors$") == 5
+    assert fake_nifi.request_count("PUT", r"^/processors/") == 0
+    created = {item["component"]["name"]: item["component"] for item in fake_nifi.components("processor")}[processor["name"]]
+    assert created["state"] == "DISABLED"
+    assert created["config"]["comments"] == "sink"
+    assert created["config"]["concurrentlySchedulableTaskCount"] == 3
+    assert created["config"]["autoTerminatedRelationships"] == ["failure", "success"]
+
+
+@pytest.mark.parametrize(
+    "fake_nifi",
+    [FakeNiFiConfig(latency_for=lambda method, path: 0.2 if "-definition/" in path else None)],
+    indirect=True,
+)
+def test_prefetch_fetches_all_definitions_in_one_concurrent_burst(fake_nifi: FakeNiFi, tmp_path: Path) -> None:
+    flow = write_synthetic_flow(tmp_path / "flow.yaml", 30, depth=2, fanout=3)
+    with fake_nifi.client() as client:
+        deployer = FlowDeployer(client, load_flow_spec(flow))
+        started = time.perf_counter()
+        assert deployer.prefetch() == 3
+        # Three serial misses would take at least 0.6s
+        assert time.perf_counter() - started < 0.5
+        deployer.compile()
+    assert fake_nifi.request_count("GET", r"/processor-definition/") == 3
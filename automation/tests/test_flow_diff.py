@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from nifi_automation.cli.main import app
+from nifi_automation.flow_builder import FlowDeployer, load_flow_spec
+from nifi_automation.flow_diff import IncrementalDeployer
+from nifi_automation.infra import deploy_adapter, status_adapter
+from nifi_automation.infra.diag_adapter import validate_topology_against_spec
+from nifi_automation.testing import FakeNiFi, FakeNiFiConfig, synthetic_flow
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+def _write(path: Path, flow: dict) -> Path:
+    path.write_text(yaml.safe_dump(flow, sort_keys=False))
+    return path
+
+
+def _edited(flow: dict) -> dict:
+    edited = copy.deepcopy(flow)
+    leaves = edited["process_group"]["process_groups"]
+    leaves[0]["processors"][1]["properties"]["step"] = "changed"
+    del leaves[1]
+    leaves[2]["processors"].append({"id": "extra", "name": "Extra", "type": LOG, "properties": {}})
+    leaves[2]["connections"].append({"source": "p0", "destination": "extra", "relationships": ["success"]})
+    return edited
+
+
+def _states(nifi: FakeNiFi) -> dict:
+    return {item["id"]: item["component"]["state"] for item in nifi.components("processor")}
+
+
+def test_incremental_deploy_applies_only_the_diff(fake_nifi: FakeNiFi, tmp_path: Path) -> None:
+    flow = synthetic_flow(20)
+    edited = load_flow_spec(_write(tmp_path / "edited.yaml", _edited(flow)))
+    with fake_nifi.client() as client:
+        FlowDeployer(client, load_flow_spec(_write(tmp_path / "flow.yaml", flow))).deploy()
+        client.schedule_process_group("root", "RUNNING")
+        before = _states(fake_nifi)
+        fake_nifi.reset_requests()
+
+        deployer = IncrementalDeployer(client, edited)
+        diff = deployer.diff()
+        assert diff.counts() == {"add": 2, "remove": 1, "update": 1}
+        assert fake_nifi.request_count("PUT") == 0 and fake_nifi.request_count("DELETE") == 0
+        report = deployer.apply(diff)
+
+        ok = validate_topology_against_spec(client, edited, snapshot=status_adapter.capture_snapshot(client))["ok"]
+        assert ok
+        assert not IncrementalDeployer(client, edited).diff()
+
+    after = _states(fake_nifi)
+    # Untouched processors kept running; touched ones were restarted; the removed group is gone
+    kept = set(before) & set(after)
+    assert all(after[pid] == "RUNNING" for pid in kept)
+    assert len(before) - len(kept) == 5
+    assert sorted(report["stopped"]) == sorted(report["restarted"]) and len(report["stopped"]) == 2
+    assert fake_nifi.request_count("DELETE", "/process-groups/") == 1
+
+
+def test_incremental_dry_run_reports_changes_without_writing(fake_nifi: FakeNiFi, tmp_path: Path) -> None:
+    flow = synthetic_flow(20)
+    with fake_nifi.client() as client:
+        FlowDeployer(client, load_flow_spec(_write(tmp_path / "flow.yaml", flow))).deploy()
+        fake_nifi.reset_requests()
+        result = deploy_adapter.deploy_flow(
+            client, _write(tmp_path / "edited.yaml", _edited(flow)), dry_run=True, incremental=True
+        )
+    assert result["dry_run"] is True
+    assert result["summary"]["diff"]["counts"] == {"add": 2, "remove": 1, "update": 1}
+    assert all(method == "GET" for method, _, _ in fake_nifi.requests)
+
+
+@pytest.mark.parametrize("fake_nifi", [FakeNiFiConfig(sensitive_properties=("Request Password",))], indirect=True)
+def test_unchanged_spec_with_sensitive_values_has_an_empty_diff(fake_nifi: FakeNiFi, tmp_path: Path) -> None:
+    flow = synthetic_flow(10)
+    for leaf in flow["process_group"]["process_groups"]:
+        leaf["processors"][1]["properties"]["Request Password"] = "s3cret"
+    spec_path = _write(tmp_path / "flow.yaml", flow)
+    with fake_nifi.client() as client:
+        FlowDeployer(client, load_flow_spec(spec_path)).deploy()
+        fake_nifi.reset_requests()
+        diff = IncrementalDeployer(client, load_flow_spec(spec_path)).diff()
+    # Reads come back masked; an unchanged spec must not rewrite (and restart) those processors
+    assert not diff, diff.as_dict()
+    assert all(method == "GET" for method, _, _ in fake_nifi.requests)
+
+
+def test_incremental_is_rejected_outside_flow_deploys() -> None:
+    result = CliRunner().invoke(app, ["status", "flow", "--incremental"])
+    assert result.exit_code != 0
+    assert "--incremental is only supported" in result.output
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import httpx
+
+from nifi_automation.async_client import AsyncBridge
+from nifi_automation.client import NiFiClient
+from nifi_automation.config import AuthSettings
+from nifi_automation.diagnostics import FlowSnapshot
+from nifi_automation.infra import diag_adapter, status_adapter
+from nifi_automation.infra.layout_checker import check_layout
+
+
+def _settings() -> AuthSettings:
+    return AuthSettings(
+        base_url="https://nifi.test/nifi-api",
+        username="user",
+        password="pass",
+        verify_ssl=False,
+        timeout=5.0,
+    )
+
+
+def _processor(pid: str, status: str, x: float) -> Dict[str, Any]:
+    return {
+        "component": {
+            "id": pid,
+            "name": pid.upper(),
+            "state": "STOPPED",
+            "validationStatus": status,
+            "validationErrors": ["bad"] if status == "INVALID" else [],
+            "position": {"x": x, "y": 0.0},
+        },
+        "bulletins": [],
+    }
+
+
+FLOWS: Dict[str, Dict[str, Any]] = {
+    "root": {
+        "processGroupFlow": {
+            "breadcrumb": {"breadcrumb": {"name": "NiFi Flow"}},
+            "flow": {"processGroups": [{"component": {"id": "a", "name": "A"}}, {"component": {"id": "b", "name": "B"}}]},
+        }
+    },
+    "a": {
+        "processGroupFlow": {
+            "flow": {
+                "processors": [_processor("p1", "INVALID", 0.0), _processor("p2", "VALID", 400.0)],
+                "connections": [
+                    {
+                        "component": {
+                            "id": "c1",
+                            "name": "p1-p2",
+                            "source": {"id": "p1", "type": "PROCESSOR"},
+                            "destination": {"id": "p2", "type": "PROCESSOR"},
+                        },
+                        "status": {"aggregateSnapshot": {"queuedCount": "3", "percentUseCount": "0"}},
+                    }
+                ],
+            }
+        }
+    },
+    "b": {"processGroupFlow": {"flow": {"processors": [_processor("p3", "VALID", 0.0)]}}},
+}
+
+
+def _handler(calls: List[str]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        pg_id = request.url.path.rsplit("/", 1)[-1]
+        calls.append(pg_id)
+        return httpx.Response(200, json=FLOWS[pg_id])
+
+    return handler
+
+
+def _client(calls: List[str]) -> NiFiClient:
+    client = NiFiClient(_settings(), "tok")
+    client._client = httpx.Client(base_url="https://nifi.test/nifi-api", transport=httpx.MockTransport(_handler(calls)))
+    return client
+
+
+def test_snapshot_capture_uses_async_bridge() -> None:
+    sync_calls: List[str] = []
+    async_calls: List[str] = []
+    client = _client(sync_calls)
+    bridge = AsyncBridge(client.settings, client.token)
+    bridge.client._client = httpx.AsyncClient(
+        base_url="https://nifi.test/nifi-api",
+        transport=httpx.MockTransport(_handler(async_calls)),
+    )
+    client._async_bridge = bridge
+    try:
+        snapshot = FlowSnapshot.capture(client)
+    finally:
+        client.close()
+
+    assert sync_calls == []
+    assert sorted(async_calls) == ["a", "b", "root"]
+    assert [path for path, _ in snapshot.walk()] == [["NiFi Flow"], ["NiFi Flow", "A"], ["NiFi Flow", "B"]]
+    assert snapshot.find_child("root", "B")["component"]["id"] == "b"
+
+
+class _SequentialClient:
+    """Client without ``run_async``; snapshots fall back to the sequential walk."""
+
+    def __init__(self, calls: List[str]) -> None:
+        self._client = httpx.Client(base_url="https://nifi.test/nifi-api", transport=httpx.MockTransport(_handler(calls)))
+
+
+def test_collectors_share_one_walk() -> None:
+    calls: List[str] = []
+    client = _SequentialClient(calls)
+    snapshot = FlowSnapshot.capture(client)
+
+    details = diag_adapter.gather_validation_details(client, snapshot=snapshot)
+    processors = status_adapter.fetch_processors(client, snapshot=snapshot)["items"]
+    layout = check_layout(client, snapshot=snapshot)
+
+    assert sorted(calls) == ["a", "b", "root"]
+    assert [item["id"] for item in details["invalid_processors"]] == ["p1"]
+    assert details["connections"]["totals"] == {"all": 1, "nonempty": 1}
+    assert {item["id"] for item in processors} == {"p1", "p2", "p3"}
+    assert layout["overlaps"] == [] and layout["left_to_right_violations"] == []
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import httpx
+from click.testing import CliRunner
+
+from nifi_automation import instrumentation
+from nifi_automation.app.models import CommandResult
+from nifi_automation.app.polling import wait_until
+from nifi_automation.cli.main import DISPATCH_TABLE, app
+from nifi_automation.client import NiFiClient
+from nifi_automation.config import AuthSettings
+from nifi_automation.instrumentation import endpoint_template, phase, profiling
+
+PID = "0f1e2d3c-4b5a-6978-8695-a4b3c2d1e0f9"
+
+
+def _client() -> NiFiClient:
+    settings = AuthSettings(
+        base_url="https://nifi.test/nifi-api",
+        username="user",
+        password="pass",
+        verify_ssl=False,
+        catalog_cache=False,
+        token_cache=False,
+    )
+    puts = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(200, json={"id": PID, "revision": {"version": 1}, "component": {"id": PID}})
+        puts["count"] += 1
+        if puts["count"] == 1:
+            return httpx.Response(409, text="stale")
+        return httpx.Response(200, json={"id": PID, "revision": {"version": 2}, "component": {"id": PID}})
+
+    client = NiFiClient(settings, "tok")
+    client._client = httpx.Client(
+        base_url="https://nifi.test/nifi-api",
+        transport=httpx.MockTransport(handler),
+        event_hooks=client._client.event_hooks,
+    )
+    return client
+
+
+def test_endpoint_template_collapses_ids() -> None:
+    assert endpoint_template(f"/nifi-api/processors/{PID}/run-status") == "/processors/{id}/run-status"
+    assert endpoint_template("/flowfile-queues/abc/drop-requests/42") == "/flowfile-queues/abc/drop-requests/{id}"
+    assert (
+        endpoint_template("/nifi-api/flow/processor-definition/org.apache.nifi/nifi-standard-nar/2.0.0/x.Gen")
+        == "/flow/processor-definition/{bundle}/{type}"
+    )
+
+
+def test_profiler_records_requests_conflicts_phases_and_waits() -> None:
+    with profiling() as profiler, _client() as client:
+        with phase("start"):
+            client.set_processor_run_status(PID, "RUNNING")
+        wait_until(lambda: True, timeout=1, label="noop")
+    profile = profiler.as_dict()
+
+    put = profile["endpoints"]["PUT /processors/{id}/run-status"]
+    assert put["count"] == 2 and put["conflicts"] == 1 and put["retries"] == 1
+    # Initial fetch plus the refetch after the conflict
+    assert profile["endpoints"]["GET /processors/{id}"]["count"] == 2
+    assert profile["requests"] == 4
+    assert profile["phases"]["start"]["count"] == 1
+    assert [wait["label"] for wait in profile["waits"]] == ["noop"]
+    assert instrumentation.current_profiler() is None
+
+
+def test_cli_profile_attaches_details_and_writes_trace(tmp_path: Path) -> None:
+    key = ("status", "flow")
+
+    def handler(*, config):
+        with phase("status"):
+            return CommandResult(status_token="UP")
+
+    original = DISPATCH_TABLE[key]
+    DISPATCH_TABLE[key] = handler
+    trace = tmp_path / "trace.json"
+    try:
+        result = CliRunner().invoke(app, ["status", "flow", "--output", "json", "--profile-trace", str(trace)])
+    finally:
+        DISPATCH_TABLE[key] = original
+
+    assert result.exit_code == 0
+    payload = json.loads(result.stdout)
+    assert "status" in payload["details"]["profile"]["phases"]
+    written = json.loads(trace.read_text())
+    assert [event["kind"] for event in written["events"]] == ["phase"]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import itertools
+
+from nifi_automation.flow_builder import ConnectionSpec, ProcessGroupSpec, ProcessorSpec, _layout_group_components
+from nifi_automation.layered_layout import PROCESSOR_SIZE, _crossings, layered_positions
+
+
+def _disjoint(positions, size=PROCESSOR_SIZE) -> bool:
+    width, height = size
+    for (ax, ay), (bx, by) in itertools.combinations(positions.values(), 2):
+        if abs(ax - bx) < width and abs(ay - by) < height:
+            return False
+    return True
+
+
+def test_wide_cyclic_graph_has_no_overlaps_and_flows_left_to_right():
+    nodes = ["src"] + [f"fan{i}" for i in range(30)] + ["sink"]
+    edges = [("src", f"fan{i}") for i in range(30)] + [(f"fan{i}", "sink") for i in range(30)]
+    edges.append(("sink", "src"))  # retry loop
+
+    positions = layered_positions(nodes, edges)
+
+    assert set(positions) == set(nodes)
+    assert _disjoint(positions)
+    for source, target in edges[:-1]:
+        assert positions[source][0] < positions[target][0]
+
+
+def test_crossings_removed_for_swapped_pairs():
+    # a->d and b->c cross when both layers keep their input order
+    nodes = ["a", "b", "c", "d"]
+    edges = [("a", "d"), ("b", "c")]
+    assert _crossings(["a", "b"], ["c", "d"], {"a": ["d"], "b": ["c"]}) == 1
+
+    positions = layered_positions(nodes, edges)
+
+    def order(keys):
+        return sorted(keys, key=lambda k: positions[k][1])
+
+    assert order(["a", "b"]).index("a") == order(["c", "d"]).index("d")
+
+
+def test_obstacles_and_virtual_nodes_are_respected():
+    obstacle = (0.0, 0.0, 600.0, 600.0)
+    positions = layered_positions(
+        ["a", "group", "b"],
+        [("a", "group"), ("group", "b")],
+        virtual={"group"},
+        obstacles=[obstacle],
+    )
+
+    assert "group" not in positions
+    assert positions["a"][0] < positions["b"][0]
+    for x, y in positions.values():
+        width, height = PROCESSOR_SIZE
+        assert not (x < obstacle[2] and obstacle[0] < x + width and y < obstacle[3] and obstacle[1] < y + height)
+
+
+def test_group_layout_keeps_explicit_positions_and_avoids_them():
+    procs = [ProcessorSpec(key=f"p{i}", name=f"p{i}", type="t", position=None, properties={}) for i in range(6)]
+    procs[0].position = (480.0, 0.0)
+    procs[0].explicit_position = True
+    group = ProcessGroupSpec(
+        name="g",
+        position=None,
+        processors=procs,
+        connections=[
+            ConnectionSpec(name=f"c{i}", source=f"p{i}", destination=f"p{i + 1}", relationships=["success"])
+            for i in range(5)
+        ],
+    )
+
+    _layout_group_components(group)
+
+    assert procs[0].position == (480.0, 0.0)
+    assert _disjoint({p.key: p.position for p in procs})
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+import yaml
+
+from nifi_automation.app import metrics_service
+from nifi_automation.app.metrics_service import MetricFamily, MetricsExporter, render
+from nifi_automation.flow_builder import FlowDeployer, load_flow_spec
+from nifi_automation.testing import FakeNiFi, synthetic_flow
+
+
+def _samples(text: str) -> dict:
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if line and not line.startswith("#"))
+
+
+def test_scrapes_are_served_from_the_cache(
+    fake_nifi: FakeNiFi, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "flow.yaml"
+    path.write_text(yaml.safe_dump(synthetic_flow(5, chain=5)))
+    with fake_nifi.client() as client:
+        FlowDeployer(client, load_flow_spec(path)).deploy()
+        processors = {item["component"]["name"]: item["id"] for item in fake_nifi.components("processor")}
+        connection = fake_nifi.components("connection")[0]["id"]
+        fake_nifi.mark_invalid(processors["LogAttribute 4"], "'Log Level' is required")
+        fake_nifi.set_queue(connection, 40, 4096)
+        fake_nifi.reset_requests()
+
+        with MetricsExporter(client, refresh=3600, port=0) as exporter:
+            url = "http://{}:{}/metrics".format(*exporter.address)
+            responses = [httpx.get(url, headers={"Accept": "application/openmetrics-text"}) for _ in range(5)]
+            plain = httpx.get(url)
+            assert httpx.get(url.replace("/metrics", "/")).status_code == 404
+
+            # Five scrapes cost one status call and one controller listing, made before listening
+            assert fake_nifi.request_count("GET", r"/status$") == 1
+            assert fake_nifi.request_count("GET", r"/controller-services$") == 1
+
+            fake_nifi.set_queue(connection, 0)
+            assert exporter.refresh_now()
+            refreshed = _samples(exporter.render())
+
+            monkeypatch.setattr(metrics_service, "collect", lambda client: 1 / 0)
+            assert not exporter.refresh_now()
+            stale = _samples(exporter.render())
+
+    text = responses[-1].text
+    assert responses[-1].headers["content-type"].startswith("application/openmetrics-text")
+    assert text.endswith("# EOF\n") and not plain.text.endswith("# EOF\n")
+    assert plain.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE nifi_exporter_refresh_failures counter" in text
+    assert "# TYPE nifi_exporter_refresh_failures_total counter" in plain.text
+
+    samples = _samples(text)
+    labels = f'id="{processors["LogAttribute 4"]}",name="LogAttribute 4",path="NiFi Flow/leaf-0000",group="leaf-0000"'
+    assert samples[f"nifi_processor_invalid{{{labels}}}"] == "1"
+    assert samples[f'nifi_processor_state{{{labels},state="STOPPED"}}'] == "1"
+    queued = next(key for key in samples if key.startswith("nifi_connection_queued_count{") and connection in key)
+    assert samples[queued] == "40"
+    assert samples[queued.replace("queued_count", "queued_bytes")] == "4096"
+    # Roll-ups match 'status flow', which counts run states from the same status call
+    assert samples['nifi_processors{state="STOPPED"}'] == "5"
+    assert samples['nifi_connections{status="HEALTHY"}'] == "1"
+    assert samples['nifi_connections{status="EMPTY"}'] == "3"
+    assert samples['nifi_flow_status{status="HEALTHY"}'] == "1"
+    assert samples["nifi_exporter_up"] == "1"
+
+    assert refreshed[queued] == "0"
+    # A failed refresh keeps serving the last samples and reports the exporter down
+    assert stale[queued] == "0"
+    assert stale["nifi_exporter_up"] == "0" and stale["nifi_exporter_refresh_failures_total"] == "1"
+
+
+def test_label_values_are_escaped() -> None:
+    family = MetricFamily("nifi_processor_state", "Processor run state.")
+    family.add(1, name='say "hi"\\now', path="a\nb")
+    line = render([family], openmetrics=False).splitlines()[-1]
+    assert line == 'nifi_processor_state{name="say \\"hi\\"\\\\now",path="a\\nb"} 1'
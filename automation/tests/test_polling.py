@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+from nifi_automation.app import polling
+from nifi_automation.app.polling import Backoff, TimeoutExpired, collect_waits, wait_all, wait_until
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(polling.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(polling.time, "sleep", fake.sleep)
+    return fake
+
+
+def test_backoff_grows_to_cap() -> None:
+    delays = Backoff(initial=0.02, factor=2.0, maximum=0.1, jitter=0.0).delays()
+    assert [next(delays) for _ in range(5)] == [0.02, 0.04, 0.08, 0.1, 0.1]
+
+
+def test_satisfied_probe_does_not_sleep(clock: FakeClock) -> None:
+    assert wait_until(lambda: "ENABLED", until=lambda s: s == "ENABLED", timeout=5) == "ENABLED"
+    assert clock.sleeps == []
+
+
+def test_wait_all_probes_only_pending_targets(clock: FakeClock) -> None:
+    calls: List[str] = []
+    ready_after = {"a": 1, "b": 3}
+
+    def probe(key: str):
+        def inner() -> bool:
+            calls.append(key)
+            return calls.count(key) >= ready_after[key]
+
+        return inner
+
+    with collect_waits() as reports:
+        wait_all({key: probe(key) for key in ready_after}, timeout=5, label="both", backoff=Backoff(jitter=0.0))
+    assert calls == ["a", "b", "b", "b"]
+    assert clock.sleeps == [0.02, 0.04]
+    assert reports[0].as_dict() == {"label": "both", "elapsed": 0.06, "probes": 4, "targets": 2, "satisfied": True}
+
+
+def test_timeout_raises_with_last_values(clock: FakeClock) -> None:
+    with pytest.raises(RuntimeError, match="svc-1 stuck in ENABLING"):
+        wait_all(
+            {"svc-1": lambda: "ENABLING"},
+            until=lambda state: state == "ENABLED",
+            timeout=1.0,
+            on_timeout=lambda stuck: RuntimeError(", ".join(f"{k} stuck in {v}" for k, v in stuck.items())),
+        )
+    # The last sleep is clipped so the final probe lands on the deadline
+    assert sum(clock.sleeps) == pytest.approx(1.0)
+    assert max(clock.sleeps) <= polling.DEFAULT_BACKOFF.maximum * 1.1
+
+    with pytest.raises(TimeoutExpired):
+        wait_until(lambda: False, timeout=0.1)
+    assert wait_until(lambda: "STOPPING", until=lambda s: s == "STOPPED", timeout=0.1, raise_on_timeout=False) == "STOPPING"
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import copy
+from pathlib import Path
+
+import pytest
+import yaml
+
+from nifi_automation import flow_builder
+from nifi_automation.flow_builder import FlowDeployer, FlowDeploymentError, load_flow_spec
+from nifi_automation.flow_diff import IncrementalDeployer
+from nifi_automation.testing import FakeNiFi, synthetic_flow
+
+UPDATE = "org.apache.nifi.processors.standard.UpdateAttribute"
+
+
+def _write(path: Path, flow: dict) -> Path:
+    path.write_text(yaml.safe_dump(flow, sort_keys=False))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def processor_defaults(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    defaults = [{"type": UPDATE, "run_duration_millis": 25, "concurrent_tasks": 2, "yield_duration": "100 ms"}]
+    path = _write(tmp_path / "flow-defaults.yaml", {"processor_defaults": defaults})
+    monkeypatch.setattr(flow_builder, "FLOW_DEFAULTS_PATH", path)
+    monkeypatch.setattr(flow_builder, "_PROCESSOR_DEFAULTS_BY_TYPE", None)
+
+
+def _configs(nifi: FakeNiFi) -> dict:
+    return {item["component"]["name"]: item["component"]["config"] for item in nifi.components("processor")}
+
+
+@pytest.mark.parametrize("upload", [True, False])
+def test_settings_and_type_defaults_are_applied_at_creation(fake_nifi: FakeNiFi, tmp_path: Path, upload: bool) -> None:
+    flow = synthetic_flow(5, chain=5)
+    processors = flow["process_group"]["process_groups"][0]["processors"]
+    processors[1].update({"runDurationMillis": 50, "penalty_duration": "5 sec", "execution_node": "primary"})
+    with fake_nifi.client() as client:
+        FlowDeployer(client, load_flow_spec(_write(tmp_path / "flow.yaml", flow)), upload=upload).deploy()
+    configs = _configs(fake_nifi)
+    tuned, defaulted = configs[processors[1]["name"]], configs[processors[2]["name"]]
+    # The entry wins over the type default; unset fields fall back to it
+    assert tuned["runDurationMillis"] == 50
+    assert tuned["penaltyDuration"] == "5 sec"
+    assert tuned["executionNode"] == "PRIMARY"
+    assert tuned["concurrentlySchedulableTaskCount"] == 2
+    assert defaulted["runDurationMillis"] == 25 and defaulted["yieldDuration"] == "100 ms"
+    assert configs[processors[0]["name"]].get("runDurationMillis", 0) == 0
+
+
+def test_incremental_deploy_updates_changed_settings(fake_nifi: FakeNiFi, tmp_path: Path) -> None:
+    flow = synthetic_flow(5, chain=5)
+    with fake_nifi.client() as client:
+        FlowDeployer(client, load_flow_spec(_write(tmp_path / "flow.yaml", flow))).deploy()
+        assert not IncrementalDeployer(client, load_flow_spec(tmp_path / "flow.yaml")).diff()
+
+        edited = copy.deepcopy(flow)
+        edited["process_group"]["process_groups"][0]["processors"][1]["yield_duration"] = "2 sec"
+        deployer = IncrementalDeployer(client, load_flow_spec(_write(tmp_path / "edited.yaml", edited)))
+        diff = deployer.diff()
+        assert diff.counts() == {"add": 0, "remove": 0, "update": 1}
+        assert diff.changes[0].fields == {"yieldDuration": {"from": "100 ms", "to": "2 sec"}}
+        deployer.apply(diff)
+    assert _configs(fake_nifi)[edited["process_group"]["process_groups"][0]["processors"][1]["name"]]["yieldDuration"] == "2 sec"
+
+
+@pytest.mark.parametrize(
+    "settings, message",
+    [
+        ({"concurrent_tasks": 0}, "concurrent_tasks must be a positive integer"),
+        ({"run_duration_millis": -25}, "run_duration_millis must be a non-negative integer"),
+        ({"penalty_duration": "a while"}, "penalty_duration 'a while' is not a time period"),
+        ({"yieldDuration": "1 fortnight"}, "yield_duration '1 fortnight' is not a time period"),
+        ({"execution_node": "SOME"}, "execution_node must be ALL or PRIMARY"),
+    ],
+)
+def test_invalid_settings_name_the_processor(tmp_path: Path, settings: dict, message: str) -> None:
+    flow = synthetic_flow(5, chain=5)
+    flow["process_group"]["process_groups"][0]["processors"][1].update(settings)
+    with pytest.raises(FlowDeploymentError, match=message) as excinfo:
+        load_flow_spec(_write(tmp_path / "flow.yaml", flow))
+    assert "Processor 'p1' in group 'leaf-0000'" in str(excinfo.value)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import yaml
+
+from nifi_automation import queue_history
+from nifi_automation.app import conn_service
+from nifi_automation.app.models import AppConfig
+from nifi_automation.flow_builder import FlowDeployer, load_flow_spec
+from nifi_automation.infra import status_adapter
+from nifi_automation.queue_history import QueueHistory, QueueRecorder, QueueRing, parse_data_size
+from nifi_automation.testing import FakeNiFi, synthetic_flow
+
+
+def test_ring_keeps_the_newest_samples_and_fits_the_fill_rate() -> None:
+    ring = QueueRing(4)
+    for second in range(6):
+        ring.append(float(second), 10 * second, 1000 * second)
+    assert [sample[0] for sample in ring.samples()] == [2.0, 3.0, 4.0, 5.0]
+    assert ring.rates() == pytest.approx((10.0, 1000.0))
+    assert ring.rates(since=5.0) is None
+
+    restored = QueueRing.from_json(ring.to_json(), 4)
+    assert restored.samples() == ring.samples()
+
+
+def test_forecast_picks_the_threshold_reached_first() -> None:
+    recorder = QueueRecorder()
+    item = {"id": "c", "backpressureObjectThreshold": 10000, "backpressureDataSizeThreshold": "1 MB"}
+    for second, count in enumerate((100, 200, 300)):
+        recorder.record([{**item, "queuedCount": count, "queuedBytes": count * 1024}], now=1000.0 + second)
+
+    current = {**item, "queuedCount": 300, "queuedBytes": 300 * 1024}
+    forecast = recorder.forecast(current, now=1002.0)
+    # 724 KiB left at 100 KiB/s runs out long before 9700 FlowFiles at 100/s
+    assert (forecast["fillRate"], forecast["limitedBy"], forecast["secondsToBackpressure"]) == (100.0, "size", 7.2)
+    assert [entry["id"] for entry in recorder.at_risk([current], 10, now=1002.0)] == ["c"]
+    assert recorder.at_risk([current], 5, now=1002.0) == []
+    # Samples outside the window no longer count
+    assert recorder.forecast(current, now=1002.0 + recorder.window + 2)["fillRate"] is None
+    assert parse_data_size("1 GB") == 1024**3 and parse_data_size("lots") is None
+
+
+def test_status_connections_surfaces_filling_queues(
+    fake_nifi: FakeNiFi, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "flow.yaml"
+    path.write_text(yaml.safe_dump(synthetic_flow(5, chain=5)))
+    with fake_nifi.client(queue_history=True, cache_dir=tmp_path / "cache") as client:
+        settings = client.settings
+        FlowDeployer(client, load_flow_spec(path)).deploy()
+
+        @contextmanager
+        def open_client(config):
+            yield client
+
+        monkeypatch.setattr(conn_service, "open_client", open_client)
+        clock = iter([1000.0, 1030.0, 1060.0])
+        monkeypatch.setattr(queue_history, "time", SimpleNamespace(time=lambda: next(clock)))
+        connection = fake_nifi.components("connection")[0]["id"]
+        config = AppConfig(None, None, None, None, 30.0, "json", False, backpressure_horizon=600.0)
+
+        fake_nifi.set_queue(connection, 1000, 1024)
+        first = conn_service.status(config=config)
+        fake_nifi.set_queue(connection, 4000, 4096)
+        second = conn_service.status(config=config)
+        fake_nifi.set_queue(connection, 7000, 7168)
+        inspected = conn_service.inspect(config=config)
+        connections = status_adapter.fetch_connections(client)["items"]
+
+    # One sample predicts nothing; the persisted history makes the next run forecast
+    assert first.data["predicted"] == [] and first.message is None
+    assert second.status_token == "HEALTHY"
+    (predicted,) = second.data["predicted"]
+    assert (predicted["id"], predicted["fillRate"], predicted["limitedBy"]) == (connection, 100.0, "count")
+    assert predicted["secondsToBackpressure"] == 60.0
+    assert second.message == "1 connections predicted to hit back-pressure within 600s"
+
+    (item,) = inspected.data["items"]
+    assert item["samples"] == 3 and item["secondsToBackpressure"] == 30.0
+    assert QueueHistory.from_settings(settings).path.exists()
+    assert len(QueueHistory.from_settings(settings).load().rings) == len(connections)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import pytest
+
+from nifi_automation.client import NiFiClient
+from nifi_automation.config import AuthSettings
+from nifi_automation.revisions import RevisionStore
+
+
+def _processor(pid: str, version: int) -> Dict[str, Any]:
+    return {"id": pid, "revision": {"version": version}, "component": {"id": pid, "state": "STOPPED"}}
+
+
+def _client(server: Dict[str, Any], calls: List[Tuple[str, str]]) -> NiFiClient:
+    settings = AuthSettings(
+        base_url="https://nifi.test/nifi-api",
+        username="user",
+        password="pass",
+        verify_ssl=False,
+        catalog_cache=False,
+        token_cache=False,
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/nifi-api")
+        calls.append((request.method, path))
+        if path == "/flow/process-groups/root":
+            procs = [_processor(pid, version) for pid, version in server.items()]
+            return httpx.Response(200, json={"processGroupFlow": {"id": "root", "flow": {"processors": procs}}})
+        pid = path.split("/")[2]
+        if request.method == "GET":
+            return httpx.Response(200, json=_processor(pid, server[pid]))
+        if request.method == "PUT":
+            sent = json.loads(request.content)["revision"]["version"]
+            if sent != server[pid]:
+                # What NiFi's InvalidRevisionExceptionMapper answers
+                return httpx.Response(
+                    400,
+                    text=f"[{sent}, null, {pid}] is not the most up-to-date revision. "
+                    "This component appears to have been modified",
+                )
+            if server.get("reject"):
+                return httpx.Response(400, text="'Scheduling Period' is invalid")
+            server[pid] += 1
+            return httpx.Response(200, json=_processor(pid, server[pid]))
+        raise AssertionError(f"unexpected request {request.method} {path}")
+
+    client = NiFiClient(settings, "tok")
+    client._client = httpx.Client(
+        base_url="https://nifi.test/nifi-api",
+        transport=httpx.MockTransport(handler),
+        event_hooks=client._client.event_hooks,
+    )
+    return client
+
+
+def test_mutations_reuse_revisions_from_listing() -> None:
+    server = {"p1": 3}
+    calls: List[Tuple[str, str]] = []
+    with _client(server, calls) as client:
+        client.get_root_flow()
+        client.set_processor_run_status("p1", "RUNNING")
+        client.set_processor_run_status("p1", "STOPPED")
+        assert client.revisions.revision("p1")["version"] == 5
+    assert [method for method, _ in calls] == ["GET", "PUT", "PUT"]
+
+
+def test_conflict_refetches_and_retries() -> None:
+    server = {"p1": 1}
+    calls: List[Tuple[str, str]] = []
+    with _client(server, calls) as client:
+        client.get_root_flow()
+        server["p1"] = 7  # another writer bumped the revision
+        client.set_processor_run_status("p1", "RUNNING")
+    assert calls[1:] == [("PUT", "/processors/p1/run-status"), ("GET", "/processors/p1"), ("PUT", "/processors/p1/run-status")]
+    assert server["p1"] == 8
+
+
+def test_other_bad_requests_are_not_retried() -> None:
+    server = {"p1": 1}
+    calls: List[Tuple[str, str]] = []
+    with _client(server, calls) as client:
+        client.get_root_flow()
+        server["reject"] = True
+        with pytest.raises(httpx.HTTPStatusError) as excinfo:
+            client.set_processor_run_status("p1", "RUNNING")
+    assert excinfo.value.response.status_code == 400
+    assert calls[1:] == [("PUT", "/processors/p1/run-status")]
+
+
+def test_store_keeps_newest_and_forgets_deleted() -> None:
+    store = RevisionStore()
+    store.observe({"processors": [_processor("p1", 4)]})
+    store.observe(_processor("p1", 2))
+    assert store.revision("p1") == {"version": 4}
+    store.observe(_processor("p1", 4), deleted=True)
+    assert store.entity("p1") is None
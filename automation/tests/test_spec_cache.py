@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from nifi_automation import spec_cache
+from nifi_automation.config import AuthSettings
+from nifi_automation.flow_builder import load_flow_spec
+from nifi_automation.spec_cache import clear_memory_cache, load_flow_spec_cached, spec_digest
+from nifi_automation.testing import write_synthetic_flow
+
+
+def _settings(tmp_path: Path, **overrides) -> AuthSettings:
+    return AuthSettings(
+        base_url="https://nifi.test/nifi-api",
+        username="user",
+        password="pass",
+        cache_dir=tmp_path / "cache",
+        **overrides,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memory():
+    clear_memory_cache()
+    yield
+    clear_memory_cache()
+
+
+def _count_parses(monkeypatch: pytest.MonkeyPatch) -> list:
+    calls: list = []
+
+    def counting(path: Path):
+        calls.append(path)
+        return load_flow_spec(path)
+
+    monkeypatch.setattr(spec_cache, "load_flow_spec", counting)
+    return calls
+
+
+def test_repeat_loads_parse_once_and_return_independent_copies(monkeypatch, tmp_path: Path) -> None:
+    calls = _count_parses(monkeypatch)
+    flow = write_synthetic_flow(tmp_path / "flow.yaml", 40, depth=2)
+    first = load_flow_spec_cached(flow)
+    first.root_group.child_groups[0].name = "mutated"
+    second = load_flow_spec_cached(flow)
+    assert len(calls) == 1
+    assert second == load_flow_spec(flow)
+    assert second is not first
+
+
+def test_disk_cache_survives_the_process_and_tracks_content(monkeypatch, tmp_path: Path) -> None:
+    calls = _count_parses(monkeypatch)
+    settings = _settings(tmp_path)
+    flow = write_synthetic_flow(tmp_path / "flow.yaml", 20)
+    load_flow_spec_cached(flow, settings=settings)
+    clear_memory_cache()
+    assert load_flow_spec_cached(flow, settings=settings) == load_flow_spec(flow)
+    assert len(calls) == 1
+    assert (tmp_path / "cache" / "specs" / f"{spec_digest(flow)}.json").exists()
+
+    write_synthetic_flow(flow, 25)
+    assert load_flow_spec_cached(flow, settings=settings) == load_flow_spec(flow)
+    assert len(calls) == 2
+
+
+def test_corrupt_or_disabled_disk_cache_falls_back_to_parsing(monkeypatch, tmp_path: Path) -> None:
+    calls = _count_parses(monkeypatch)
+    flow = write_synthetic_flow(tmp_path / "flow.yaml", 10)
+    directory = tmp_path / "cache" / "specs"
+    directory.mkdir(parents=True)
+    (directory / f"{spec_digest(flow)}.json").write_bytes(b"not json")
+    assert load_flow_spec_cached(flow, settings=_settings(tmp_path)) == load_flow_spec(flow)
+    clear_memory_cache()
+    load_flow_spec_cached(flow, settings=_settings(tmp_path, spec_cache=False))
+    assert len(calls) == 2
+
+
+def test_disk_entries_are_data_not_code(monkeypatch, tmp_path: Path) -> None:
+    calls = _count_parses(monkeypatch)
+    settings = _settings(tmp_path)
+    flow = write_synthetic_flow(tmp_path / "flow.yaml", 10)
+    entry = tmp_path / "cache" / "specs" / f"{spec_digest(flow)}.json"
+    load_flow_spec_cached(flow, settings=settings)
+    assert json.loads(entry.read_text())["root_group"]["name"]
+
+    # A planted entry with unexpected fields is ignored and the spec is parsed again
+    entry.write_text(json.dumps({"root_group": {"__reduce__": "os.system"}}))
+    clear_memory_cache()
+    assert load_flow_spec_cached(flow, settings=settings) == load_flow_spec(flow)
+    assert len(calls) == 2
+
+
+def test_parser_code_changes_invalidate_entries(monkeypatch, tmp_path: Path) -> None:
+    flow = write_synthetic_flow(tmp_path / "flow.yaml", 10)
+    before = spec_digest(flow)
+    # As if flow_builder.py or layered_layout.py had been edited or upgraded
+    monkeypatch.setattr(spec_cache, "_code", "0" * 64)
+    assert spec_digest(flow) != before
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import httpx
+
+from nifi_automation.diagnostics import StatusSnapshot, count_processor_states
+from nifi_automation.infra import status_adapter
+
+
+def _proc(pid: str, group: str, run_status: str) -> Dict[str, Any]:
+    return {"id": pid, "processorStatusSnapshot": {"id": pid, "groupId": group, "name": pid.upper(), "runStatus": run_status}}
+
+
+STATUS = {
+    "processGroupStatus": {
+        "aggregateSnapshot": {
+            "id": "root-id",
+            "name": "NiFi Flow",
+            "processorStatusSnapshots": [],
+            "processGroupStatusSnapshots": [
+                {
+                    "id": "a",
+                    "processGroupStatusSnapshot": {
+                        "id": "a",
+                        "name": "A",
+                        "processorStatusSnapshots": [_proc("p1", "a", "Running"), _proc("p2", "a", "Invalid")],
+                        "connectionStatusSnapshots": [
+                            {
+                                "id": "c1",
+                                "connectionStatusSnapshot": {
+                                    "id": "c1",
+                                    "name": "success",
+                                    "queuedCount": "12",
+                                    "percentUseCount": 100,
+                                    "percentUseBytes": 0,
+                                },
+                            }
+                        ],
+                        "inputPortStatusSnapshots": [
+                            {"id": "in", "portStatusSnapshot": {"id": "in", "name": "IN", "runStatus": "Stopped"}}
+                        ],
+                        "processGroupStatusSnapshots": [
+                            {
+                                "id": "b",
+                                "processGroupStatusSnapshot": {
+                                    "id": "b",
+                                    "name": "B",
+                                    "processorStatusSnapshots": [_proc("p3", "b", "Stopped")],
+                                },
+                            }
+                        ],
+                    },
+                }
+            ],
+        }
+    }
+}
+
+GROUP_A = {
+    "processGroupFlow": {
+        "flow": {
+            "processors": [
+                {
+                    "component": {"id": "p2", "validationStatus": "INVALID", "validationErrors": ["'Directory' is required"]},
+                    "bulletins": [{"id": 7, "bulletin": {"message": "boom"}}],
+                }
+            ]
+        }
+    }
+}
+
+
+class _Client:
+    def __init__(self, calls: List[str]) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            if request.url.path.endswith("/root/status"):
+                assert request.url.params["recursive"] == "true"
+                return httpx.Response(200, json=STATUS)
+            return httpx.Response(200, json=GROUP_A)
+
+        self._client = httpx.Client(base_url="https://nifi.test/nifi-api", transport=httpx.MockTransport(handler))
+
+
+def test_status_snapshot_builds_item_lists_from_one_call() -> None:
+    calls: List[str] = []
+    client = _Client(calls)
+    snapshot = status_adapter.capture_status(client)
+
+    processors = {item["id"]: item for item in status_adapter.fetch_processors(client, snapshot=snapshot)["items"]}
+    connections = status_adapter.fetch_connections(client, snapshot=snapshot)["items"]
+    ports = status_adapter.fetch_ports(client, snapshot=snapshot)["items"]
+
+    # Only the group holding an invalid processor is fetched for validation details
+    assert calls == ["/nifi-api/flow/process-groups/root/status", "/nifi-api/flow/process-groups/a"]
+    assert processors["p1"]["state"] == "RUNNING"
+    assert processors["p2"]["state"] == "STOPPED"
+    assert processors["p2"]["validationErrors"] == ["'Directory' is required"]
+    assert processors["p2"]["bulletins"] == [{"id": 7, "bulletin": {"message": "boom"}}]
+    assert processors["p3"]["path"] == "NiFi Flow/A/B"
+    assert connections[0]["queuedCount"] == 12 and connections[0]["percentUseCount"] == 100.0
+    assert ports == [
+        {
+            "id": "in",
+            "name": "IN",
+            "path": "NiFi Flow/A",
+            "state": "STOPPED",
+            "portType": "INPUT",
+            "validationStatus": "VALID",
+            "validationErrors": [],
+        }
+    ]
+
+
+def test_state_counts_skip_validation_fetch() -> None:
+    calls: List[str] = []
+    client = _Client(calls)
+    counts = count_processor_states(client, snapshot=StatusSnapshot.capture(client, validation_details=False))
+
+    assert counts == {"RUNNING": 1, "STOPPED": 2}
+    assert calls == ["/nifi-api/flow/process-groups/root/status"]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from nifi_automation.taskgraph import TaskGraph
+
+
+def test_dependencies_run_first_and_siblings_overlap() -> None:
+    graph = TaskGraph()
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+    order: list[str] = []
+
+    def step(name: str):
+        def action() -> str:
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+                order.append(name)
+            return name.upper()
+
+        return action
+
+    graph.add("group", step("group"))
+    for name in ("a", "b", "c"):
+        graph.add(name, step(name), ["group"])
+    graph.add("conn", step("conn"), ["a", "c", None])
+
+    results = graph.run(max_workers=4)
+
+    assert results["conn"] == "CONN"
+    assert order[0] == "group" and order[-1] == "conn"
+    assert active["peak"] >= 2
+
+
+def test_failure_stops_new_work_and_reraises() -> None:
+    graph = TaskGraph()
+    ran: list[str] = []
+
+    def boom() -> None:
+        raise LookupError("create failed")
+
+    graph.add("group", boom)
+    graph.add("child", lambda: ran.append("child"), ["group"])
+    graph.add("other", lambda: ran.append("other"))
+
+    with pytest.raises(LookupError, match="create failed"):
+        graph.run(max_workers=2)
+    assert "child" not in ran
+
+
+def test_add_rejects_unknown_or_duplicate_keys() -> None:
+    graph = TaskGraph()
+    graph.add("a", lambda: None)
+    with pytest.raises(ValueError):
+        graph.add("a", lambda: None)
+    with pytest.raises(ValueError):
+        graph.add("b", lambda: None, ["missing"])
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_seeded_results_are_skipped_and_new_ones_reported(workers: int) -> None:
+    graph = TaskGraph()
+    ran: list[str] = []
+    graph.add("group", lambda: ran.append("group") or "G")
+    graph.add("proc", lambda: ran.append("proc") or "P", ["group"])
+    graph.add("conn", lambda: ran.append("conn") or graph.results["proc"] + "C", ["proc"])
+    graph.results.update({"group": "G", "proc": "P"})
+    reported: list[tuple] = []
+
+    graph.run(max_workers=workers, on_result=lambda key, result: reported.append((key, result)))
+
+    assert ran == ["conn"]
+    assert reported == [("conn", "PC")]
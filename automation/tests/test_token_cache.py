@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import base64
+import json
+import stat
+import time
+from pathlib import Path
+from typing import List
+
+import httpx
+
+from nifi_automation import auth
+from nifi_automation.client import NiFiClient
+from nifi_automation.config import AuthSettings
+from nifi_automation.token_cache import TokenCache
+
+
+def _jwt(exp: float, iat: float | None = None, marker: str = "a") -> str:
+    claims = {"sub": "user", "exp": int(exp), "iat": int(iat if iat is not None else time.time()), "m": marker}
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"eyJhbGciOiJIUzI1NiJ9.{payload}.sig"
+
+
+def _settings(tmp_path: Path, **overrides) -> AuthSettings:
+    values = dict(
+        base_url="https://nifi.test/nifi-api",
+        username="user",
+        password="pass",
+        verify_ssl=False,
+        cache_dir=tmp_path,
+    )
+    values.update(overrides)
+    return AuthSettings(**values)
+
+
+def test_cache_reuses_token_until_refresh_window(tmp_path: Path) -> None:
+    settings = _settings(tmp_path)
+    cache = TokenCache.from_settings(settings)
+    token = _jwt(time.time() + 3600)
+    cache.put(settings, token)
+
+    assert stat.S_IMODE(cache.path.stat().st_mode) == 0o600
+    assert cache.get(settings) == token
+    # Different user on the same server does not see the token
+    assert cache.get(_settings(tmp_path, username="other")) is None
+    # Within the refresh margin before expiry the token is treated as stale
+    assert cache.get(settings, now=time.time() + 3590) is None
+
+
+def test_get_access_token_logs_in_once(tmp_path: Path, monkeypatch) -> None:
+    settings = _settings(tmp_path)
+    logins: List[str] = []
+
+    def fake_obtain(_settings: AuthSettings) -> str:
+        logins.append("login")
+        return _jwt(time.time() + 3600)
+
+    monkeypatch.setattr(auth, "obtain_access_token", fake_obtain)
+    cache = TokenCache.from_settings(settings)
+    first = auth.get_access_token(settings, cache=cache)
+    second = auth.get_access_token(settings, cache=TokenCache.from_settings(settings))
+
+    assert first == second
+    assert logins == ["login"]
+
+
+def _client(settings: AuthSettings, token: str, seen: List[str], fresh: str) -> NiFiClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/access/token"):
+            seen.append("login")
+            return httpx.Response(201, text=fresh)
+        seen.append(request.headers["Authorization"])
+        if request.headers["Authorization"] != f"Bearer {fresh}":
+            return httpx.Response(401, text="Unauthorized")
+        return httpx.Response(200, json={"revision": {"version": 1}, "component": {"id": "pg"}})
+
+    client = NiFiClient(settings, token)
+    client._client = httpx.Client(
+        base_url=str(settings.base_url),
+        transport=httpx.MockTransport(handler),
+        auth=client._auth,
+    )
+    return client
+
+
+def test_client_reauthenticates_on_401(tmp_path: Path) -> None:
+    settings = _settings(tmp_path)
+    stale = _jwt(time.time() + 3600, marker="stale")
+    fresh = _jwt(time.time() + 3600, marker="fresh")
+    seen: List[str] = []
+
+    with _client(settings, stale, seen, fresh) as client:
+        assert client.get_process_group("pg")["component"]["id"] == "pg"
+        assert client.token == fresh
+
+    assert seen == [f"Bearer {stale}", "login", f"Bearer {fresh}"]
+    assert TokenCache.from_settings(settings).get(settings) == fresh
+
+
+def test_client_refreshes_expiring_token_before_request(tmp_path: Path) -> None:
+    settings = _settings(tmp_path)
+    expiring = _jwt(time.time() + 5, iat=time.time() - 3600, marker="old")
+    fresh = _jwt(time.time() + 3600, marker="new")
+    seen: List[str] = []
+
+    with _client(settings, expiring, seen, fresh) as client:
+        client.get_process_group("pg")
+
+    assert seen == ["login", f"Bearer {fresh}"]
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from nifi_automation.client import NiFiClient
+from nifi_automation.flow_builder import FlowDeployer, load_flow_spec
+from nifi_automation.testing import FakeNiFi, FakeNiFiConfig, synthetic_flow, write_synthetic_flow
+from nifi_automation.versioned_flow import flow_snapshot
+
+SAMPLE = Path(__file__).parent / "data" / "NiFi_Flow_sample.yaml"
+
+
+def _topology(nifi: FakeNiFi) -> set:
+    names = {item["id"]: item["component"].get("name") for item in nifi.components("processor")}
+    names.update({item["id"]: item["component"].get("name") for kind in ("inputPort", "outputPort") for item in nifi.components(kind)})
+    processors = {
+        (item["component"]["name"], tuple(sorted(item["component"]["config"]["autoTerminatedRelationships"])))
+        for item in nifi.components("processor")
+    }
+    connections = {
+        (
+            names[conn["component"]["source"]["id"]],
+            names[conn["component"]["destination"]["id"]],
+            tuple(conn["component"].get("selectedRelationships") or ()),
+        )
+        for conn in nifi.components("connection")
+    }
+    return processors | connections | {("groups", len(nifi.components("processGroup")))}
+
+
+def _deploy(flow: Path, **options) -> tuple[set, FakeNiFi]:
+    with FakeNiFi() as nifi, nifi.client() as client:
+        FlowDeployer(client, load_flow_spec(flow), **options).deploy()
+        return _topology(nifi), nifi
+
+
+def test_upload_deploy_matches_per_component_deploy(tmp_path: Path) -> None:
+    flow = write_synthetic_flow(tmp_path / "flow.yaml", 40, depth=2, fanout=4)
+    uploaded, upload_nifi = _deploy(flow)
+    created, component_nifi = _deploy(flow, upload=False)
+    assert uploaded == created
+    # One upload per top-level group instead of one POST per component
+    assert upload_nifi.request_count("POST", r"/upload$") == len(load_flow_spec(flow).root_group.child_groups)
+    assert len(upload_nifi.requests) * 5 < len(component_nifi.requests)
+
+
+def test_snapshot_is_deterministic_and_references_services(fake_client: NiFiClient) -> None:
+    deployer = FlowDeployer(fake_client, load_flow_spec(SAMPLE), {"http-context": "service-1"})
+    group = deployer.spec.root_group.child_groups[0]
+    group.processors[0].properties["HTTP Context Map"] = "http-context"
+    first, second = (
+        flow_snapshot(group, prepare=deployer._prepare_group, bundle_for=fake_client._resolve_bundle, controller_services={"service-1": "http-context"})
+        for _ in range(2)
+    )
+    assert first == second
+    assert first["flowContents"]["name"] == group.name
+    assert first["externalControllerServices"] == {"service-1": {"identifier": "service-1", "name": "http-context"}}
+    processor = first["flowContents"]["processors"][0]
+    assert processor["properties"]["HTTP Context Map"] == "service-1"
+    assert processor["propertyDescriptors"]["HTTP Context Map"]["identifiesControllerService"] is True
+
+
+@pytest.mark.parametrize("fake_nifi", [FakeNiFiConfig(supports_upload=False)], indirect=True)
+def test_falls_back_to_per_component_when_upload_is_unavailable(fake_nifi: FakeNiFi, tmp_path: Path) -> None:
+    flow = write_synthetic_flow(tmp_path / "flow.yaml", 20, depth=2, fanout=2)
+    with fake_nifi.client() as client:
+        FlowDeployer(client, load_flow_spec(flow)).deploy()
+    assert fake_nifi.request_count("POST", r"/upload$") == len(load_flow_spec(flow).root_group.child_groups)
+    assert _topology(fake_nifi) == _deploy(flow, upload=False)[0]
+
+
+@pytest.mark.parametrize("fake_nifi", [FakeNiFiConfig(sensitive_properties=("Request Password",))], indirect=True)
+def test_upload_reapplies_sensitive_values_nifi_drops(fake_nifi: FakeNiFi, tmp_path: Path) -> None:
+    flow = synthetic_flow(6, depth=2, fanout=2, chain=3)
+    leaves = [branch["process_groups"][0]["processors"] for branch in flow["process_group"]["process_groups"]]
+    leaves[0][1]["properties"]["Request Password"] = "s3cret"
+    leaves[1][1]["properties"]["Request Password"] = "#{password}"
+    path = tmp_path / "flow.yaml"
+    path.write_text(yaml.safe_dump(flow))
+    with fake_nifi.client() as client:
+        deployer = FlowDeployer(client, load_flow_spec(path))
+        group = deployer.spec.root_group.child_groups[0]
+        sensitive: dict = {}
+        snapshot = flow_snapshot(group, prepare=deployer._prepare_group, bundle_for=client._resolve_bundle, sensitive=sensitive)
+        deployer.deploy()
+        secret_id = next(
+            item["id"]
+            for item in fake_nifi.components("processor")
+            if item["component"]["config"]["properties"].get("Request Password") == "s3cret"
+        )
+        read_back = client._client.get(f"/processors/{secret_id}").json()["component"]["config"]["properties"]
+
+    uploaded = snapshot["flowContents"]["processGroups"][0]["processors"][1]
+    assert "Request Password" not in uploaded["properties"]
+    assert uploaded["propertyDescriptors"]["Request Password"]["sensitive"] is True
+    assert sensitive == {("leaf-0000",): {"UpdateAttribute 1": {"Request Password": "s3cret"}}}
+    passwords = sorted(
+        item["component"]["config"]["properties"].get("Request Password") or ""
+        for item in fake_nifi.components("processor")
+    )
+    assert passwords == ["", "", "", "", "#{password}", "s3cret"]
+    assert read_back["Request Password"] == "********"
+    assert fake_nifi.request_count("POST", r"/upload$") == 2
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from nifi_automation.app import watch_service
+from nifi_automation.app.models import CommandResult
+from nifi_automation.cli.main import DISPATCH_TABLE, app
+from nifi_automation.flow_builder import FlowDeployer, load_flow_spec
+from nifi_automation.testing import FakeNiFi, synthetic_flow
+
+
+def test_watch_emits_only_changes_and_backs_off_while_quiet(
+    fake_nifi: FakeNiFi, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sleeps: List[float] = []
+    monkeypatch.setattr(watch_service.time, "sleep", sleeps.append)
+    path = tmp_path / "flow.yaml"
+    path.write_text(yaml.safe_dump(synthetic_flow(5, chain=5)))
+    events: List[Dict[str, Any]] = []
+    with fake_nifi.client() as client:
+        FlowDeployer(client, load_flow_spec(path)).deploy()
+        processors = {item["component"]["name"]: item["id"] for item in fake_nifi.components("processor")}
+        connection = fake_nifi.components("connection")[0]["id"]
+
+        def emit(event: Dict[str, Any]) -> None:
+            events.append(event)
+            if event["event"] == "snapshot":
+                client.set_processor_state(processors["GenerateFlowFile 0"], "RUNNING")
+                fake_nifi.mark_invalid(processors["LogAttribute 4"], "'Log Level' is required")
+                fake_nifi.set_queue(connection, 40, 4096)
+
+        fake_nifi.reset_requests()
+        end = watch_service.watch(client, "flow", emit=emit, interval=1.0, max_interval=2.0, polls=5)
+
+    kinds = [event["event"] for event in events]
+    assert kinds == ["snapshot", "state", "invalid", "queue", "end"]
+    assert events[0]["states"] == {"STOPPED": 5} and events[0]["components"] == 9
+    state, invalid, queue = events[1:4]
+    assert (state["name"], state["from"], state["to"]) == ("GenerateFlowFile 0", "STOPPED", "RUNNING")
+    assert invalid["errors"] == ["'Log Level' is required"]
+    assert (queue["queuedCount"], queue["delta"], queue["bytesDelta"]) == (40, 40, 4096)
+    assert end == {key: value for key, value in events[-1].items() if key != "ts"}
+    assert (end["polls"], end["events"]) == (5, 4)
+    # One recursive status call per poll; validation details only when something turned invalid
+    assert fake_nifi.request_count("GET", r"/status$") == 5
+    assert fake_nifi.request_count("GET", r"^/flow/process-groups/(?!root)[^/]+$") == 1
+    # Quiet polls stretch the interval up to the cap; the change resets it
+    assert sleeps == [1.0, 1.0, 1.5, 2.0]
+
+
+def test_diff_reports_added_removed_and_recovered_components() -> None:
+    before = {
+        "a": {"kind": "processor", "id": "a", "name": "A", "path": "root", "state": "STOPPED", "validationStatus": "INVALID"},
+        "b": {"kind": "port", "id": "b", "name": "B", "path": "root", "state": "STOPPED"},
+    }
+    after = {
+        "a": {**before["a"], "validationStatus": "VALID"},
+        "c": {"kind": "connection", "id": "c", "name": "", "path": "root", "queuedCount": 0, "queuedBytes": 0},
+    }
+    events = watch_service.diff_observations(before, after)
+    assert [(event["event"], event["id"]) for event in events] == [("valid", "a"), ("added", "c"), ("removed", "b")]
+    assert watch_service.diff_observations(after, after) == []
+
+
+def test_watch_command_streams_ndjson() -> None:
+    key = ("watch", "connections")
+    captured: Dict[str, Any] = {}
+
+    def handler(*, config, emit):
+        captured["config"] = config
+        emit({"event": "snapshot", "components": 0})
+        emit({"event": "end", "polls": 1})
+        return CommandResult(message="done")
+
+    original = DISPATCH_TABLE[key]
+    DISPATCH_TABLE[key] = handler
+    try:
+        result = CliRunner().invoke(app, ["watch", "queues", "--interval", "0.5", "--duration", "3", "--output", "json"])
+    finally:
+        DISPATCH_TABLE[key] = original
+
+    assert result.exit_code == 0
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [line["event"] for line in lines] == ["snapshot", "end"]
+    config = captured["config"]
+    assert (config.watch_interval, config.watch_max_interval, config.run_duration) == (0.5, 30.0, 3.0)
+
+    rejected = CliRunner().invoke(app, ["status", "flow", "--interval", "1"])
+    assert rejected.exit_code != 0